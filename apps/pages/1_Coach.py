@@ -9,6 +9,7 @@ load_dotenv()
 
 from pageant_assistant.config.settings import (
     AVAILABLE_RUBRICS,
+    COACH_NARRATIVE_MODE,
     DEFAULT_RUBRIC,
     DEFAULT_STYLE,
     DEFAULT_TIME_LIMIT,
@@ -19,13 +20,17 @@ from pageant_assistant.config.settings import (
     VALID_TIME_LIMITS,
     WORDS_PER_SECOND,
 )
-from pageant_assistant.graphs.refiner import build_refiner_graph
+from pageant_assistant.graphs.edits import summarize_rewrite_stats
+from pageant_assistant.graphs.refiner import build_refiner_graph, coach_narrative
+from pageant_assistant.graphs.variants import run_variants, variant_grid
 from pageant_assistant.personas.manager import (
     format_persona_context,
     list_personas,
     load_persona,
 )
 from pageant_assistant.questions.bank import get_filter_options, get_random_question
+from pageant_assistant.questions.index import QuestionCursor
+from pageant_assistant.questions.semantic import resolve_custom_question, similar_questions
 from pageant_assistant.voice.audio import synthesize_speech, transcribe_audio
 
 logger = logging.getLogger(__name__)
@@ -39,14 +44,16 @@ st.set_page_config(
 # --- Session state defaults ---
 if "current_question" not in st.session_state:
     st.session_state.current_question = None
-if "shown_question_ids" not in st.session_state:
-    st.session_state.shown_question_ids = set()
+if "question_cursor" not in st.session_state:
+    st.session_state.question_cursor = QuestionCursor()
 if "tts_audio" not in st.session_state:
     st.session_state.tts_audio = None
 if "transcribed_text" not in st.session_state:
     st.session_state.transcribed_text = ""
 if "result" not in st.session_state:
     st.session_state.result = None
+if "variant_run" not in st.session_state:
+    st.session_state.variant_run = None
 if "active_persona_id" not in st.session_state:
     st.session_state.active_persona_id = None
 if "active_persona" not in st.session_state:
@@ -252,18 +259,19 @@ st.markdown(
 # --- Seed evidence store once per server session ---
 @st.cache_resource(show_spinner=False)
 def _seed_evidence_store() -> int:
-    """Seed the Chroma evidence store with Kenya/Africa corpus on first run.
+    """Sync the Chroma evidence store with the Kenya/Africa seed corpus.
 
     Wrapped in cache_resource so it executes only once per Streamlit server
-    session, not on every page rerun.
+    session, not on every page rerun.  Only seed chunks that changed since the
+    last deploy are re-embedded.
 
     Returns:
-        Number of chunks in the collection after seeding.
+        Number of chunks in the collection after syncing.
     """
     try:
-        from pageant_assistant.rag.seed import seed_if_empty
+        from pageant_assistant.rag.seed import sync_seed_corpus
 
-        n = seed_if_empty()
+        n = sync_seed_corpus()
         logger.info("Evidence store ready — %d chunk(s)", n)
         return n
     except Exception as exc:
@@ -315,6 +323,7 @@ with st.sidebar:
         else:
             st.session_state.active_persona = None
         st.session_state.result = None
+        st.session_state.variant_run = None
 
     try:
         st.page_link("streamlit_app.py", label="Edit My Profile", use_container_width=True)
@@ -342,6 +351,15 @@ with st.sidebar:
         format_func=lambda x: STYLE_PRESETS[x],
     )
 
+    compare_variants = st.toggle(
+        "Compare all styles & time limits",
+        help=(
+            "Polish the answer in every speaking style at every time limit "
+            f"({len(variant_grid())} versions), sharing one analysis and critique, "
+            "and rank them side by side."
+        ),
+    )
+
     rubric_name = st.selectbox(
         "Scoring rubric",
         options=list(AVAILABLE_RUBRICS.keys()),
@@ -397,21 +415,38 @@ col_input, col_spacer, col_output = st.columns([1, 0.05, 1.2])
 with col_input:
     st.markdown('<div class="section-label">Your Stage</div>', unsafe_allow_html=True)
 
-    # --- Draw a question ---
-    if st.button("Draw a Question"):
-        q = get_random_question(
-            pageant_type=filter_pageant,
-            question_type=filter_type,
-            difficulty=filter_difficulty,
-            exclude_ids=st.session_state.shown_question_ids,
-        )
+    def _set_question(q: dict) -> None:
         st.session_state.current_question = q
-        st.session_state.shown_question_ids.add(q["id"])
         # Clear previous results
         st.session_state.tts_audio = None
         st.session_state.transcribed_text = ""
         st.session_state.audio_transcribed = False
         st.session_state.result = None
+        st.session_state.variant_run = None
+
+    # --- Draw a question ---
+    if st.button("Draw a Question"):
+        _set_question(
+            get_random_question(
+                pageant_type=filter_pageant,
+                question_type=filter_type,
+                difficulty=filter_difficulty,
+                cursor=st.session_state.question_cursor,
+            )
+        )
+
+    # --- Or ask your own ---
+    with st.expander("Ask your own question"):
+        custom_text = st.text_input(
+            "Your question",
+            placeholder="Type any pageant question...",
+            label_visibility="collapsed",
+        )
+        if st.button("Use This Question") and custom_text.strip():
+            q, match_score = resolve_custom_question(custom_text)
+            _set_question(q)
+            if match_score is not None:
+                st.caption(f"Matched a question from the bank ({match_score:.0%} similar).")
 
     # --- Display current question ---
     if st.session_state.current_question:
@@ -426,6 +461,13 @@ with col_input:
             f"</div></div>",
             unsafe_allow_html=True,
         )
+        similar = [] if q.get("custom") else similar_questions(q["id"], k=3)
+        if similar:
+            with st.expander("Practice similar questions"):
+                for similar_q, _score in similar:
+                    if st.button(similar_q["text"], key=f"similar_{similar_q['id']}"):
+                        _set_question(similar_q)
+                        st.rerun()
     else:
         st.markdown(
             "<div style='text-align: center; padding: 1.5rem; color: #3a3a4a; "
@@ -495,16 +537,18 @@ with col_output:
                 "rewrite": "Polishing the answer...",
                 "claim_verifier": "Verifying factual claims...",
                 "coach_report": "Writing coach report...",
+                "coach_narrative": "Adding coach's commentary...",
                 "generate_exemplar": "Creating winning example...",
             }
 
             with st.status("The judges are deliberating...", expanded=True) as status:
                 try:
-                    graph = build_refiner_graph()
-
                     persona_ctx = ""
                     if st.session_state.active_persona:
-                        persona_ctx = format_persona_context(st.session_state.active_persona)
+                        persona_ctx = format_persona_context(
+                            st.session_state.active_persona,
+                            question=st.session_state.current_question["text"],
+                        )
 
                     input_state = {
                         "question": st.session_state.current_question["text"],
@@ -517,18 +561,45 @@ with col_output:
                         "iteration_count": 0,
                         "persona_id": st.session_state.active_persona_id or "",
                         "persona_context": persona_ctx,
+                        "persona_country": (
+                            st.session_state.active_persona.country
+                            if st.session_state.active_persona
+                            else ""
+                        ),
                     }
 
-                    # Stream node-by-node for live progress updates
-                    accumulated = dict(input_state)
-                    for chunk in graph.stream(input_state):
-                        for node_name, node_output in chunk.items():
-                            accumulated.update(node_output)
-                            label = _NODE_LABELS.get(node_name)
-                            if label:
-                                status.write(label)
-
-                    st.session_state.result = accumulated
+                    if compare_variants:
+                        # Shared analysis/evidence/critique, then every style × time limit
+                        status.write("Analyzing, researching and scoring your answer...")
+                        total = len(variant_grid())
+                        done = []
+
+                        def _variant_done(variant) -> None:
+                            done.append(variant)
+                            name = STYLE_PRESETS.get(variant.style_preset, variant.style_preset)
+                            outcome = "failed" if variant.error else "ready"
+                            status.write(
+                                f"{len(done)}/{total} — {name}, {variant.time_limit}s {outcome}"
+                            )
+
+                        st.session_state.variant_run = run_variants(
+                            input_state, on_variant=_variant_done
+                        )
+                        st.session_state.result = None
+                    else:
+                        graph = build_refiner_graph()
+
+                        # Stream node-by-node for live progress updates
+                        accumulated = dict(input_state)
+                        for chunk in graph.stream(input_state):
+                            for node_name, node_output in chunk.items():
+                                accumulated.update(node_output)
+                                label = _NODE_LABELS.get(node_name)
+                                if label:
+                                    status.write(label)
+
+                        st.session_state.result = accumulated
+                        st.session_state.variant_run = None
                     status.update(label="Coaching complete", state="complete", expanded=False)
 
                 except requests.HTTPError as e:
@@ -607,7 +678,8 @@ with col_output:
             # --- Structured rubric scores (M3) ---
             critic_scores = result.get("critic_scores")
             if critic_scores and critic_scores.get("dimension_scores"):
-                overall = critic_scores.get("overall_score", 0)
+                # Rubric-weighted overall (cap rules applied); critic's own as fallback
+                overall = result.get("rubric_score", critic_scores.get("overall_score", 0))
                 st.markdown(
                     f"<div style='font-family: Cormorant Garamond, serif; "
                     f"font-size: 2rem; font-weight: 600; text-align: center; "
@@ -673,6 +745,81 @@ with col_output:
             # --- Full coach report text ---
             st.markdown(result.get("coach_report", ""))
 
+            # --- Early-exit decisions that skipped a rewrite or second pass ---
+            for decision in result.get("loop_decisions") or []:
+                if not decision.get("proceed"):
+                    skipped = "rewrite" if decision.get("stage") == "rewrite" else "second pass"
+                    st.caption(f"Skipped the {skipped}: {decision.get('reason', '')}")
+
+            # --- Rewrite token accounting (edit-script mode) ---
+            rewrite_totals = summarize_rewrite_stats(result.get("rewrite_stats") or [])
+            if rewrite_totals["edit_passes"] or rewrite_totals["fallbacks"]:
+                st.caption(
+                    f"Rewrite: {rewrite_totals['edit_passes']} of {rewrite_totals['passes']} "
+                    f"pass(es) used edit scripts, {rewrite_totals['output_tokens']} output "
+                    f"tokens, ~{rewrite_totals['saved_tokens']} saved vs full rewrites."
+                )
+
+            # --- Optional LLM commentary (written on request in "lazy" mode) ---
+            if result.get("coach_narrative"):
+                st.markdown(result["coach_narrative"])
+            elif COACH_NARRATIVE_MODE == "lazy" and result.get("critic_scores"):
+                if st.button("Add coach's commentary"):
+                    with st.spinner("Writing commentary..."):
+                        try:
+                            result.update(coach_narrative(result))
+                            st.markdown(result["coach_narrative"])
+                        except Exception as e:
+                            st.error(f"Could not write commentary: {e}")
+
+    elif st.session_state.variant_run:
+        # --- Variant mode: every style × time limit, ranked side by side ---
+        run = st.session_state.variant_run
+        ranks = {(v.style_preset, v.time_limit): i for i, v in enumerate(run.variants, 1)}
+        basis = (
+            f"the critique's rubric score ({run.base_score:.1f}/10) × time fit"
+            if run.base_score is not None
+            else "time fit"
+        )
+        st.caption(f"{len(run.variants)} versions in {run.seconds:.0f}s, ranked by {basis}.")
+
+        limits = sorted({v.time_limit for v in run.variants})
+        by_key = {(v.style_preset, v.time_limit): v for v in run.variants}
+        for style_key in [
+            k for k in STYLE_PRESETS if any(k == v.style_preset for v in run.variants)
+        ]:
+            st.markdown(
+                f'<div class="section-label" style="margin-top: 1rem;">'
+                f"{STYLE_PRESETS[style_key]}</div>",
+                unsafe_allow_html=True,
+            )
+            for column, limit in zip(st.columns(len(limits)), limits):
+                variant = by_key.get((style_key, limit))
+                if variant is None:
+                    continue
+                with column:
+                    rank = ranks[(style_key, limit)]
+                    color = "#c9a84c" if rank == 1 else "#6b6b7b"
+                    st.markdown(
+                        f"<div style='font-family: Inter, sans-serif; font-size: 0.75rem; "
+                        f"color: {color}; margin-bottom: 0.35rem;'>"
+                        f"#{rank} · {limit}s · {variant.word_count}/{variant.word_budget} words"
+                        f" · {variant.rank_score:.1f}</div>",
+                        unsafe_allow_html=True,
+                    )
+                    if variant.error:
+                        st.error(f"Could not polish this version: {variant.error}")
+                        continue
+                    st.markdown(
+                        f'<div class="answer-card">{variant.answer}</div>',
+                        unsafe_allow_html=True,
+                    )
+                    if variant.claim_flags:
+                        st.warning(
+                            "Verify before using on stage:\n\n"
+                            + "\n".join(f"- {flag}" for flag in variant.claim_flags)
+                        )
+
     elif st.session_state.current_question and not run_btn:
         st.markdown(
             "<div style='text-align: center; padding: 4rem 2rem; color: #3a3a4a; "
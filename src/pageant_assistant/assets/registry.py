@@ -0,0 +1,227 @@
+"""Immutable snapshot of the static assets the graph reads on every run.
+
+The critic used to read and parse a rubric file, re-render its prompt text,
+and read and parse the exemplar library on every pass.  ``AssetSnapshot``
+holds all of it, loaded once:
+
+- **Rubrics** — every ``rubrics/*.json`` validated against
+  ``RubricDefinition``, with the critic's prompt text pre-rendered.  Invalid
+  files are logged and replaced by the fallback rubric, as before.
+- **Exemplars** — the library indexed by ``(pageant, question_type)`` and by
+  question type, with each exemplar's prompt reference pre-rendered.
+- **Style instructions** — ``STYLE_INSTRUCTIONS`` from ``llm.prompts``.
+
+``get_assets()`` returns the current snapshot.  At most every
+``ASSET_RELOAD_INTERVAL_S`` seconds it stats the asset files; if any
+changed, a new snapshot is built and swapped in with a single reference
+assignment, so a run that already holds a snapshot keeps a consistent view
+and hot paths do no I/O in between.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from pydantic import ValidationError
+
+from pageant_assistant.config.settings import ASSET_RELOAD_INTERVAL_S, EXEMPLARS_DIR, RUBRICS_DIR
+from pageant_assistant.llm.prompts import STYLE_INSTRUCTIONS
+from pageant_assistant.schemas.rubric import RubricDefinition
+
+logger = logging.getLogger(__name__)
+
+EXEMPLARS_FILE = EXEMPLARS_DIR / "exemplar_library.json"
+
+# Module-level singleton — see get_assets()
+_snapshot: AssetSnapshot | None = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RubricAsset:
+    """A validated rubric and its pre-rendered prompt text."""
+
+    name: str
+    data: Mapping[str, Any]  # the rubric file's contents (read-only view)
+    prompt_text: str
+    definition: RubricDefinition
+
+    @property
+    def is_fallback(self) -> bool:
+        return self.definition.version == "fallback"
+
+
+@lru_cache(maxsize=64)
+def _fallback_rubric(name: str) -> RubricAsset:
+    from pageant_assistant.rubrics.loader import fallback_rubric, format_rubric_for_prompt
+
+    data = fallback_rubric(name)
+    return RubricAsset(
+        name, MappingProxyType(data), format_rubric_for_prompt(data), RubricDefinition(**data)
+    )
+
+
+def _stamp(paths: list[Path]) -> tuple[tuple[str, int, int], ...]:
+    stamps = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        stamps.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
+def _asset_paths(rubrics_dir: Path, exemplars_file: Path) -> list[Path]:
+    return sorted(rubrics_dir.glob("*.json")) + [exemplars_file]
+
+
+class AssetSnapshot:
+    """Rubrics, exemplars, and style instructions as of one point in time.
+
+    Treat as read-only: lookups return shared objects (``load_rubric`` and
+    ``find_exemplar`` hand out copies for callers that mutate).
+
+    Args:
+        rubrics: Rubric assets by name (file stem, e.g. ``"miss_universe"``).
+        exemplars: The exemplar library, in file order.
+        styles: Style instructions by preset key.
+        stamp: (path, mtime_ns, size) of every file the snapshot was built from.
+    """
+
+    def __init__(
+        self,
+        rubrics: Mapping[str, RubricAsset],
+        exemplars: list[dict[str, Any]],
+        styles: Mapping[str, str],
+        stamp: tuple[tuple[str, int, int], ...] = (),
+    ) -> None:
+        from pageant_assistant.exemplars.library import format_exemplar_reference
+
+        self.rubrics = MappingProxyType(dict(rubrics))
+        self.exemplars: tuple[dict[str, Any], ...] = tuple(exemplars)
+        self.styles = MappingProxyType(dict(styles))
+        self.stamp = stamp
+
+        by_cell: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        by_type: dict[str, list[dict[str, Any]]] = {}
+        for ex in self.exemplars:
+            by_cell.setdefault((ex.get("pageant"), ex.get("question_type")), []).append(ex)
+            by_type.setdefault(ex.get("question_type"), []).append(ex)
+        self._by_cell = {k: tuple(v) for k, v in by_cell.items()}
+        self._by_type = {k: tuple(v) for k, v in by_type.items()}
+        self._pageants = frozenset(ex.get("pageant") for ex in self.exemplars)
+        self._latest: dict[str | None, dict[str, Any]] = {}
+        for ex in self.exemplars:
+            for key in (ex.get("pageant"), None):
+                best = self._latest.get(key)
+                if best is None or ex.get("year", 0) > best.get("year", 0):
+                    self._latest[key] = ex
+        self._references = {id(ex): format_exemplar_reference(ex) for ex in self.exemplars}
+
+    @classmethod
+    def load(cls, rubrics_dir: Path, exemplars_file: Path) -> AssetSnapshot:
+        """Read, validate, and pre-render every asset file."""
+        from pageant_assistant.rubrics.loader import format_rubric_for_prompt
+
+        stamp = _stamp(_asset_paths(rubrics_dir, exemplars_file))
+        rubrics: dict[str, RubricAsset] = {}
+        for path in sorted(rubrics_dir.glob("*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                definition = RubricDefinition(**data)
+            except (OSError, json.JSONDecodeError, TypeError, ValidationError) as exc:
+                logger.warning("Assets: invalid rubric %s — using fallback (%s)", path.name, exc)
+                continue
+            rubrics[path.stem] = RubricAsset(
+                path.stem, MappingProxyType(data), format_rubric_for_prompt(data), definition
+            )
+
+        exemplars: list[dict[str, Any]] = []
+        if exemplars_file.exists():
+            try:
+                loaded = json.loads(exemplars_file.read_text(encoding="utf-8"))
+                exemplars = [e for e in loaded.get("exemplars", []) if isinstance(e, dict)]
+            except (OSError, json.JSONDecodeError, AttributeError) as exc:
+                logger.warning("Assets: could not read %s (%s)", exemplars_file, exc)
+
+        logger.info("Assets: loaded %d rubric(s), %d exemplar(s)", len(rubrics), len(exemplars))
+        return cls(rubrics, exemplars, STYLE_INSTRUCTIONS, stamp)
+
+    # -- rubrics -------------------------------------------------------------
+
+    def rubric(self, name: str) -> RubricAsset:
+        """Return the rubric *name*, or the fallback rubric if missing/invalid."""
+        return self.rubrics.get(name) or _fallback_rubric(name)
+
+    # -- exemplars -----------------------------------------------------------
+
+    def find_exemplar(
+        self,
+        question_type: str,
+        theme_tags: list[str] | None = None,
+        pageant: str = "Miss Universe",
+    ) -> dict[str, Any] | None:
+        """Index-backed ``exemplars.library.find_exemplar`` (same matching rules)."""
+        if not self.exemplars:
+            return None
+        has_pageant = pageant in self._pageants
+        type_matches = (
+            self._by_cell.get((pageant, question_type), ())
+            if has_pageant
+            else self._by_type.get(question_type, ())
+        )
+        if type_matches and theme_tags:
+            tag_set = {t.lower() for t in theme_tags}
+            # max() keeps the first of equal overlaps, like the stable sort it replaces
+            return max(
+                type_matches,
+                key=lambda ex: len(tag_set & {t.lower() for t in ex.get("theme_tags", [])}),
+            )
+        if type_matches:
+            return type_matches[0]
+        return self._latest.get(pageant if has_pageant else None)
+
+    def exemplar_reference(self, exemplar: dict[str, Any] | None) -> str:
+        """Pre-rendered ``format_exemplar_reference`` text for a library exemplar."""
+        if not exemplar:
+            return ""
+        rendered = self._references.get(id(exemplar))
+        if rendered is None:
+            from pageant_assistant.exemplars.library import format_exemplar_reference
+
+            rendered = format_exemplar_reference(exemplar)
+        return rendered
+
+    # -- styles --------------------------------------------------------------
+
+    def style(self, key: str) -> str:
+        """Style instructions for preset *key* ("" if unknown)."""
+        return self.styles.get(key, "")
+
+
+def get_assets() -> AssetSnapshot:
+    """Return the current asset snapshot, swapping in a new one if files changed.
+
+    Files are checked at most every ``ASSET_RELOAD_INTERVAL_S`` seconds.
+    """
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < ASSET_RELOAD_INTERVAL_S:
+        return snapshot
+    with _lock:
+        stamp = _stamp(_asset_paths(RUBRICS_DIR, EXEMPLARS_FILE))
+        if _snapshot is None or stamp != _snapshot.stamp:
+            _snapshot = AssetSnapshot.load(RUBRICS_DIR, EXEMPLARS_FILE)
+        _checked_at = time.monotonic()
+        return _snapshot
@@ -37,8 +37,29 @@ TEMPERATURE = {
     "critic": 0.1,  # Consistent scoring
     "rewrite": 0.6,  # Creative within constraints
     "exemplar": 0.75,  # Slightly higher creativity for showcase answer
+    "question_generation": 0.9,  # Diverse offline question-bank generation
 }
 
+# Optional LLM commentary under the (deterministic) coach report:
+# "lazy" writes it only when requested from the Coach Report tab, "parallel"
+# runs it alongside the exemplar node, "off" disables it
+COACH_NARRATIVE_MODE = os.getenv("COACH_NARRATIVE_MODE", "lazy")
+
+# Rewrite node output: "full" (default) regenerates the whole answer; "edits"
+# opts in to sentence-level edit operations applied locally (fewer output
+# tokens, falling back to a full rewrite if the edits are invalid)
+REWRITE_MODE = os.getenv("REWRITE_MODE", "full")
+
+# Stream the critic's JSON and start the rewrite as soon as its overall score,
+# top fixes and flags are parsed (graphs.critic_stream).  Off by default: the
+# speculative rewrite is a paid LLM call, and it is wasted whenever the final
+# critique changes the rewrite prompt or the answer is accepted without one
+CRITIC_STREAMING = os.getenv("CRITIC_STREAMING", "false").lower() == "true"
+
+# Variant mode (graphs.variants) drafts every style × time limit from one shared
+# analysis/evidence/critique; this caps how many variant LLM calls run at once
+VARIANT_MAX_IN_FLIGHT = int(os.getenv("VARIANT_MAX_IN_FLIGHT", "4"))
+
 # --- Time Limits ---
 VALID_TIME_LIMITS = [20, 30, 40]  # seconds
 DEFAULT_TIME_LIMIT = 30
@@ -68,10 +89,48 @@ WORDS_PER_SECOND: dict[str, float] = {
 # --- Paths ---
 DATA_DIR = PROJECT_ROOT / "data"
 CHROMA_DIR = DATA_DIR / "chroma"
+VECTOR_DIR = DATA_DIR / "vectors"  # NumPy backend indexes (one sub-directory per collection)
+RAG_SNAPSHOT_DIR = DATA_DIR / "snapshot"  # Prebuilt seed index, baked into the Docker image
+RAG_CACHE_DIR = DATA_DIR / "rag_cache"  # Cached rag_research results, per shard set and version
+WEB_CACHE_DIR = DATA_DIR / "web_cache"  # Cached web search results, one file per query
 RUBRICS_DIR = PROJECT_ROOT / "src" / "pageant_assistant" / "rubrics"
 QUESTIONS_DIR = DATA_DIR / "questions"
 PERSONAS_DIR = DATA_DIR / "personas"
 EXEMPLARS_DIR = DATA_DIR / "exemplars"
+QUESTION_SHARDS_DIR = QUESTIONS_DIR / "shards"  # Extra questions as JSONL, one per line
+QUESTION_DB = QUESTIONS_DIR / "question_bank.sqlite"  # Compiled from the JSON/JSONL sources
+QUESTION_VECTORS_FILE = QUESTIONS_DIR / "question_vectors.npy"  # + .json ids/hashes sidecar
+EXEMPLAR_VECTORS_FILE = EXEMPLARS_DIR / "exemplar_vectors.npy"  # same layout as question vectors
+# How often (seconds) question sources are checked for edits; changes reload
+# the bank without restarting Streamlit
+QUESTION_RELOAD_INTERVAL_S = float(os.getenv("QUESTION_RELOAD_INTERVAL_S", "2"))
+# Cosine similarity above which a custom question is treated as a bank question
+QUESTION_MATCH_THRESHOLD = float(os.getenv("QUESTION_MATCH_THRESHOLD", "0.85"))
+# Cosine similarity at or above which two bank questions count as duplicates
+QUESTION_DUPLICATE_THRESHOLD = float(os.getenv("QUESTION_DUPLICATE_THRESHOLD", "0.92"))
+
+# How often (seconds) the personas directory is re-scanned for files changed
+# outside the app; saves and deletes made through the app show up at once
+PERSONA_RELOAD_INTERVAL_S = float(os.getenv("PERSONA_RELOAD_INTERVAL_S", "2"))
+# Persona stories injected into prompts: at most PERSONA_STORY_TOP_K, ranked by
+# relevance to the question, within PERSONA_CONTEXT_TOKEN_BUDGET (approximate
+# tokens for the whole persona block, profile lines included)
+PERSONA_STORY_TOP_K = int(os.getenv("PERSONA_STORY_TOP_K", "3"))
+PERSONA_CONTEXT_TOKEN_BUDGET = int(os.getenv("PERSONA_CONTEXT_TOKEN_BUDGET", "400"))
+
+# Predictive early exit from the critic -> rewrite loop (graphs.early_exit):
+# once EARLY_EXIT_MIN_SAMPLES cycles are logged, a cycle runs only if its
+# predicted score gain per second of latency reaches EARLY_EXIT_MIN_GAIN_PER_S
+EARLY_EXIT_LOG_FILE = DATA_DIR / "critic_cycles.jsonl"  # (features, gain, seconds) per cycle
+EARLY_EXIT_MIN_SAMPLES = int(os.getenv("EARLY_EXIT_MIN_SAMPLES", "30"))
+EARLY_EXIT_MIN_GAIN_PER_S = float(os.getenv("EARLY_EXIT_MIN_GAIN_PER_S", "0.05"))
+EARLY_EXIT_MEANINGFUL_GAIN = 0.5  # score points; used for calibration probabilities
+EARLY_EXIT_DEFAULT_CYCLE_S = 8.0  # assumed cycle latency until cycles report their own
+# A cycle is only logged when it runs, so the log under-represents answers the
+# loop stops on.  This share of skipped cycles (model or fixed rule) runs anyway
+# and is logged as exploration.  Off by default: each explored cycle costs extra
+# LLM calls for a real user; set e.g. 0.05 while collecting training data
+EARLY_EXIT_EXPLORE_RATE = float(os.getenv("EARLY_EXIT_EXPLORE_RATE", "0"))
 
 # Ensure required data directories exist on import
 for _d in (DATA_DIR, CHROMA_DIR, QUESTIONS_DIR, PERSONAS_DIR, EXEMPLARS_DIR):
@@ -87,9 +146,40 @@ AVAILABLE_RUBRICS: dict[str, str] = {
     "miss_earth": "Miss Earth",
     "miss_charm": "Miss Charm",
 }
+# How often (seconds) rubric and exemplar files are checked for edits; changes
+# swap in a new asset snapshot (see assets/registry.py) without a restart
+ASSET_RELOAD_INTERVAL_S = float(os.getenv("ASSET_RELOAD_INTERVAL_S", "2"))
 
 # --- RAG ---
 RAG_COLLECTION_NAME = "pageant_evidence"
+# Vector engine: "chroma" (persistent Chroma client) or "numpy" (in-process,
+# memory-mapped exact search — fastest cold start for corpora up to ~10k chunks)
+RAG_BACKEND = os.getenv("RAG_BACKEND", "chroma").lower()
+# Stored-vector precision for the NumPy backend: "float32", "float16", or "int8".
+# Compact matrices are scanned first; the top candidates are re-scored exactly
+# against the float32 matrix (memory-mapped, so only those rows are paged in)
+RAG_VECTOR_DTYPE = os.getenv("RAG_VECTOR_DTYPE", "float32").lower()
+# Embedding model: "minilm" (stock all-MiniLM-L6-v2) or "minilm-int8" (quantized)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "minilm").lower()
+# Retrieval runs on a bounded thread pool shared by all sessions; a query that
+# exceeds the timeout returns no evidence instead of stalling its session
+RAG_RETRIEVAL_WORKERS = int(os.getenv("RAG_RETRIEVAL_WORKERS", "4"))
+RAG_RETRIEVAL_TIMEOUT = float(os.getenv("RAG_RETRIEVAL_TIMEOUT", "10"))
+# Optional shared embedding sidecar (python -m pageant_assistant.rag.embed_service).
+# "unix:/path/to.sock" or "tcp:127.0.0.1:8765"; empty = load the model in-process
+EMBEDDING_SERVICE = os.getenv("EMBEDDING_SERVICE", "")
+EMBEDDING_BATCH_MAX = int(os.getenv("EMBEDDING_BATCH_MAX", "64"))  # texts per model call
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+# rag_research results cached per (question, type, country shard, corpus version);
+# in-memory entries, 0 disables the cache
+RAG_CACHE_SIZE = int(os.getenv("RAG_CACHE_SIZE", "512"))
+# Live web evidence when the local corpus has nothing relevant: "" (off),
+# "duckduckgo", or "stub" (canned results, for tests/offline development).
+# Fetched snippets are written back to the store so later runs stay local
+WEB_SEARCH_PROVIDER = os.getenv("WEB_SEARCH_PROVIDER", "").lower()
+WEB_SEARCH_BUDGET_S = float(os.getenv("WEB_SEARCH_BUDGET_S", "4"))  # hard limit per run
+WEB_SEARCH_MAX_RESULTS = int(os.getenv("WEB_SEARCH_MAX_RESULTS", "5"))
+WEB_CACHE_TTL_HOURS = float(os.getenv("WEB_CACHE_TTL_HOURS", "168"))
 
 # --- Voice Configuration ---
 STT_MODEL = "whisper-large-v3-turbo"
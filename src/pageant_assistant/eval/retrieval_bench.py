@@ -0,0 +1,531 @@
+"""Offline benchmarks for embedding models, stored-vector precision, and scale.
+
+Three comparisons:
+
+- **Models** — ``minilm`` (Chroma's DefaultEmbeddingFunction) vs
+  ``minilm-int8`` (``rag.quantized``) on the seed corpus, with the question
+  bank as queries.  Each model runs in a fresh subprocess so its resident
+  memory can be measured in isolation.  Recall@k is the overlap between a
+  model's top-k seed chunks and the baseline model's top-k.
+- **Storage** — ``NumpyBackend`` with float32 / float16 / int8 vectors on a
+  synthetic clustered corpus (default 100k x 384).  Recall@k is measured
+  against exact float32 brute force.
+- **Scale** (``--scale``) — every store backend at 1k / 10k / 100k / 1M
+  synthetic chunks: index build time, cold-open time, query p50/p95/p99,
+  resident memory and on-disk size, and recall@k against labelled queries
+  (exact float32 top-k), plus embedding throughput of the configured model.
+  Corpora are seeded, each (backend, size) runs in a fresh subprocess, and
+  latencies are pooled over ``--repeats`` passes, so runs are comparable;
+  ``--baseline`` fails the run when a case regresses against a saved report.
+
+Nothing here needs the network once the embedding model is cached (the
+scale suite skips embedding throughput if the model cannot be loaded).
+
+Usage:
+    python -m pageant_assistant.eval.retrieval_bench --synthetic 100000 --k 6
+    python -m pageant_assistant.eval.retrieval_bench --skip-models --json bench.json
+    python -m pageant_assistant.eval.retrieval_bench --scale --json scale.json
+    python -m pageant_assistant.eval.retrieval_bench --scale --sizes 1000,10000 \\
+        --baseline scale.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MB (Linux), else 0."""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _percentiles(samples_ms: Sequence[float]) -> dict[str, float]:
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    return {f"p{p}_ms": round(float(np.percentile(arr, p)), 3) for p in (50, 95, 99)}
+
+
+def recall_at_k(found: Sequence[Sequence[Any]], truth: Sequence[Sequence[Any]]) -> float:
+    """Mean fraction of each ground-truth top-k list present in the found list.
+
+    Example:
+        >>> recall_at_k([[1, 2]], [[2, 3]])
+        0.5
+    """
+    if not truth:
+        return 0.0
+    hits = [len(set(f) & set(t)) / max(len(t), 1) for f, t in zip(found, truth)]
+    return float(np.mean(hits))
+
+
+def exact_top_k(matrix: np.ndarray, queries: np.ndarray, k: int) -> list[list[int]]:
+    """Brute-force float32 top-k row indices for each query (ground truth)."""
+    truth = []
+    for q in queries:
+        scores = matrix @ q
+        top = np.argpartition(-scores, k - 1)[:k]
+        truth.append(top[np.argsort(-scores[top])].tolist())
+    return truth
+
+
+def synthetic_corpus(
+    n: int, dim: int = EMBEDDING_DIM, n_queries: int = 200, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Clustered unit vectors plus queries drawn near random corpus rows.
+
+    Real sentence embeddings are strongly clustered by topic, which is what
+    makes approximate scans hard; uniform random vectors would flatter them.
+
+    Returns:
+        ``(corpus (n, dim), queries (n_queries, dim))``, both float32 unit-norm.
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = max(8, n // 500)
+    centres = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, n_clusters, size=n)
+    corpus = centres[assignment] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+    picks = rng.integers(0, n, size=n_queries)
+    queries = corpus[picks] + 0.15 * rng.standard_normal((n_queries, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return corpus.astype(np.float32), queries.astype(np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Storage precision
+# ---------------------------------------------------------------------------
+
+
+def bench_storage(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    k: int = 6,
+    dtypes: Sequence[str] = ("float32", "float16", "int8"),
+    work_dir: Path | None = None,
+) -> list[dict[str, Any]]:
+    """Measure NumpyBackend query latency and recall@k per stored-vector dtype.
+
+    Args:
+        corpus: (N, dim) unit vectors to index.
+        queries: (Q, dim) query vectors.
+        k: Results per query.
+        dtypes: Precisions to compare (see ``NumpyBackend.vector_dtype``).
+        work_dir: Where to write the indexes (default: a temporary directory).
+
+    Returns:
+        One dict per dtype with ``recall_at_k``, latency percentiles, and
+        ``scan_mb`` (bytes scanned per query).
+    """
+    from pageant_assistant.rag.backends import NumpyBackend
+
+    truth = exact_top_k(corpus, queries, k)
+    ids = [f"c{i}" for i in range(len(corpus))]
+    rows = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        for dtype in dtypes:
+            backend = NumpyBackend(Path(tmp) / dtype, vector_dtype=dtype)
+            backend.upsert(ids, [""] * len(ids), [{}] * len(ids), corpus)
+            backend.query(queries[0], k)  # warm the page cache
+            found, latencies = [], []
+            for q in queries:
+                start = time.perf_counter()
+                hits = backend.query(q, k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                found.append([int(chunk["id"][1:]) for chunk, _ in hits])
+            rows.append(
+                {
+                    "dtype": dtype,
+                    "n": len(corpus),
+                    "k": k,
+                    "recall_at_k": round(recall_at_k(found, truth), 4),
+                    "scan_mb": round(backend.scan_bytes() / 2**20, 1),
+                    **_percentiles(latencies),
+                }
+            )
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Embedding models
+# ---------------------------------------------------------------------------
+
+
+def _profile_model(model: str, docs: list[str], queries: list[str]) -> dict[str, Any]:
+    """Run in a fresh subprocess: load *model*, embed, and report timings/RSS."""
+    import pageant_assistant.rag.embeddings as embeddings
+
+    embeddings.EMBEDDING_MODEL = model
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    fn = embeddings.local_embedding_function()
+    fn(["warm up"])
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    doc_vecs = np.asarray(fn(docs), dtype=np.float32)
+    docs_per_s = len(docs) / (time.perf_counter() - start)
+    latencies, query_vecs = [], []
+    for q in queries:
+        start = time.perf_counter()
+        query_vecs.append(np.asarray(fn([q]), dtype=np.float32)[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "model": model,
+        "load_s": round(load_s, 2),
+        "rss_mb": round(_rss_mb() - rss_before, 1),
+        "docs_per_s": round(docs_per_s, 1),
+        **_percentiles(latencies),
+        "doc_vecs": doc_vecs,
+        "query_vecs": np.stack(query_vecs),
+    }
+
+
+def bench_models(
+    k: int = 6, models: Sequence[str] = ("minilm", "minilm-int8")
+) -> list[dict[str, Any]]:
+    """Compare embedding models on the seed corpus with question-bank queries.
+
+    The first model is the baseline: recall@k for every model is measured
+    against the baseline's own top-k.
+
+    Returns:
+        One dict per model with load time, RSS delta, document throughput,
+        single-query latency percentiles, and ``recall_at_k``.
+    """
+    from pageant_assistant.questions.bank import load_questions
+    from pageant_assistant.rag.seed import SEED_CORPUS
+
+    docs = [c["text"] for c in SEED_CORPUS]
+    queries = [q["text"] for q in load_questions()]
+    profiles = []
+    for model in models:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            profiles.append(pool.submit(_profile_model, model, docs, queries).result())
+
+    k = min(k, len(docs))
+    baseline = profiles[0]
+    truth = exact_top_k(baseline["doc_vecs"], baseline["query_vecs"], k)
+    rows = []
+    for p in profiles:
+        found = exact_top_k(p.pop("doc_vecs"), p.pop("query_vecs"), k)
+        rows.append({**p, "k": k, "recall_at_k": round(recall_at_k(found, truth), 4)})
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Scale
+# ---------------------------------------------------------------------------
+
+SCALE_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+SCALE_BACKENDS = ("numpy", "chroma")
+_UPSERT_BATCH = 4096  # below Chroma's maximum batch size
+
+_WORDS = (
+    "youth unemployment education girls health climate water poverty mental access "
+    "rural women leadership policy programme report survey rate percent county school "
+    "violence nutrition digital skills finance community government funding training"
+).split()
+
+
+def synthetic_documents(n: int, seed: int = 0) -> list[str]:
+    """Seeded pseudo-sentences (15-40 words) for embedding throughput runs."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(15, 41, size=n)
+    return [" ".join(rng.choice(_WORDS, size=int(m))) for m in lengths]
+
+
+def _open_backend(backend: str, path: Path, dtype: str) -> Any:
+    from pageant_assistant.rag.backends import ChromaBackend, NumpyBackend
+
+    if backend == "chroma":
+        return ChromaBackend(path, "bench")
+    if backend == "numpy":
+        return NumpyBackend(path, vector_dtype=dtype)
+    raise ValueError(f"Unknown backend {backend!r}; expected one of {SCALE_BACKENDS}")
+
+
+def _disk_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / 2**20
+
+
+def profile_backend(
+    backend: str,
+    n: int,
+    *,
+    k: int = 6,
+    dim: int = EMBEDDING_DIM,
+    n_queries: int = 200,
+    repeats: int = 3,
+    seed: int = 0,
+    dtype: str = "float32",
+    work_dir: Path | None = None,
+) -> dict[str, Any]:
+    """Build, reopen, and query one backend on a seeded synthetic corpus.
+
+    Intended to run in a fresh subprocess (see ``bench_scale``) so that
+    ``rss_mb`` reflects only the reopened index.
+
+    Args:
+        backend: ``"numpy"`` or ``"chroma"``.
+        n: Corpus size.
+        k: Results per query.
+        dim: Vector dimension.
+        n_queries: Labelled queries; ground truth is exact float32 top-k.
+        repeats: Query passes pooled into the latency percentiles.
+        seed: Corpus seed — identical seeds give identical corpora.
+        dtype: Stored-vector precision (NumPy backend only).
+        work_dir: Parent directory for the index (default: a temp directory).
+
+    Returns:
+        Dict with ``index_s`` (build), ``open_s`` (cold open), latency
+        percentiles, ``qps``, ``rss_mb``, ``disk_mb``, and ``recall_at_k``.
+    """
+    import gc
+
+    corpus, queries = synthetic_corpus(n, dim=dim, n_queries=n_queries, seed=seed)
+    truth = exact_top_k(corpus, queries, k)
+    ids = [f"c{i}" for i in range(n)]
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        path = Path(tmp) / backend
+        start = time.perf_counter()
+        index = _open_backend(backend, path, dtype)
+        # NumPy rewrites its matrix per upsert, so it gets the corpus in one call
+        batch = _UPSERT_BATCH if backend == "chroma" else n
+        for lo in range(0, n, batch):
+            hi = min(lo + batch, n)
+            index.upsert(
+                ids[lo:hi], [""] * (hi - lo), [{"topic": "bench"}] * (hi - lo), corpus[lo:hi]
+            )
+        index_s = time.perf_counter() - start
+        del index
+        gc.collect()
+
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        index = _open_backend(backend, path, dtype)
+        index.query(queries[0], k)
+        open_s = time.perf_counter() - start
+
+        found: list[list[int]] = []
+        latencies: list[float] = []
+        for rep in range(repeats):
+            for q in queries:
+                start = time.perf_counter()
+                hits = index.query(q, k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if rep == 0:
+                    found.append([int(chunk["id"][1:]) for chunk, _ in hits])
+        rss_mb = _rss_mb() - rss_before
+        disk_mb = _disk_mb(path)
+    return {
+        "backend": backend,
+        "dtype": dtype if backend == "numpy" else "-",
+        "n": n,
+        "k": k,
+        "index_s": round(index_s, 2),
+        "open_s": round(open_s, 3),
+        **_percentiles(latencies),
+        "qps": round(1000 * len(latencies) / sum(latencies), 1),
+        "rss_mb": round(rss_mb, 1),
+        "disk_mb": round(disk_mb, 1),
+        "recall_at_k": round(recall_at_k(found, truth), 4),
+    }
+
+
+def bench_scale(
+    sizes: Sequence[int] = SCALE_SIZES,
+    backends: Sequence[str] = SCALE_BACKENDS,
+    *,
+    isolate: bool = True,
+    **kwargs: Any,
+) -> list[dict[str, Any]]:
+    """Run ``profile_backend`` for every (backend, size) pair.
+
+    Args:
+        sizes: Corpus sizes.
+        backends: Backends, optionally with a dtype suffix (``"numpy:int8"``).
+        isolate: Run each case in a fresh subprocess (accurate memory).
+        **kwargs: Passed through to ``profile_backend``.
+
+    Returns:
+        One row per case, in (size, backend) order.
+    """
+    rows = []
+    for n in sizes:
+        for spec in backends:
+            backend, _, dtype = spec.partition(":")
+            case = {**kwargs, "dtype": dtype or "float32"}
+            logger.info("bench_scale: %s n=%d", spec, n)
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    rows.append(pool.submit(profile_backend, backend, n, **case).result())
+            else:
+                rows.append(profile_backend(backend, n, **case))
+    return rows
+
+
+def bench_embedding(
+    embed_fn: Any, n_docs: int = 2000, n_queries: int = 100, seed: int = 0
+) -> dict[str, Any]:
+    """Embedding throughput (docs/s in one batch call) and single-query latency."""
+    docs = synthetic_documents(n_docs + n_queries, seed=seed)
+    embed_fn(docs[:8])  # warm up
+    start = time.perf_counter()
+    embed_fn(docs[:n_docs])
+    docs_per_s = n_docs / (time.perf_counter() - start)
+    latencies = []
+    for q in docs[n_docs:]:
+        start = time.perf_counter()
+        embed_fn([q])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"n_docs": n_docs, "docs_per_s": round(docs_per_s, 1), **_percentiles(latencies)}
+
+
+def find_regressions(
+    rows: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    *,
+    latency_tolerance: float = 0.25,
+    recall_tolerance: float = 0.01,
+) -> list[str]:
+    """Compare scale rows with a saved baseline report.
+
+    A case regresses when its p95 latency grows by more than
+    *latency_tolerance* (relative) or its recall@k drops by more than
+    *recall_tolerance* (absolute).  Cases missing from the baseline are
+    ignored.
+
+    Returns:
+        Human-readable descriptions, empty when nothing regressed.
+
+    Example:
+        >>> base = [{"backend": "numpy", "dtype": "float32", "n": 1000, "p95_ms": 1.0,
+        ...          "recall_at_k": 1.0}]
+        >>> find_regressions([{**base[0], "p95_ms": 2.0}], base)
+        ['numpy/float32 n=1000: p95 1.0ms -> 2.0ms']
+    """
+
+    def key(r: dict[str, Any]) -> tuple[Any, ...]:
+        return (r["backend"], r["dtype"], r["n"])
+
+    previous = {key(r): r for r in baseline}
+    problems = []
+    for row in rows:
+        old = previous.get(key(row))
+        if old is None:
+            continue
+        label = f"{row['backend']}/{row['dtype']} n={row['n']}"
+        if row["p95_ms"] > old["p95_ms"] * (1 + latency_tolerance):
+            problems.append(f"{label}: p95 {old['p95_ms']}ms -> {row['p95_ms']}ms")
+        if row["recall_at_k"] < old["recall_at_k"] - recall_tolerance:
+            problems.append(f"{label}: recall@k {old['recall_at_k']} -> {row['recall_at_k']}")
+    return problems
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _print_table(title: str, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    cols = list(rows[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    print(f"\n{title}")
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in cols))
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(float(x)) for x in text.split(",") if x]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: ``python -m pageant_assistant.eval.retrieval_bench``."""
+    parser = argparse.ArgumentParser(description="Benchmark embedding models and vector storage.")
+    parser.add_argument("--synthetic", type=int, default=100_000, help="Synthetic corpus size")
+    parser.add_argument("--queries", type=int, default=200, help="Synthetic queries")
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--skip-models", action="store_true", help="Skip embedding-model runs")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    scale = parser.add_argument_group("scale suite")
+    scale.add_argument("--scale", action="store_true", help="Run the backend scaling suite")
+    scale.add_argument(
+        "--sizes", type=_int_list, default=list(SCALE_SIZES), help="e.g. 1000,10000,1e5"
+    )
+    scale.add_argument(
+        "--backends",
+        default=",".join(SCALE_BACKENDS),
+        help="Comma-separated; NumPy dtypes as numpy:int8 (default: %(default)s)",
+    )
+    scale.add_argument("--repeats", type=int, default=3, help="Query passes per case")
+    scale.add_argument("--seed", type=int, default=0)
+    scale.add_argument("--baseline", type=Path, help="Fail if a case regresses vs this report")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    results: dict[str, Any] = {}
+    if args.scale:
+        if not args.skip_models:
+            try:
+                from pageant_assistant.rag.embeddings import local_embedding_function
+
+                results["embedding"] = [bench_embedding(local_embedding_function())]
+                _print_table("Embedding throughput (synthetic documents)", results["embedding"])
+            except Exception as exc:  # model not cached and no network
+                logger.warning("Embedding model unavailable (%s) — skipping throughput", exc)
+        results["scale"] = bench_scale(
+            args.sizes,
+            args.backends.split(","),
+            k=args.k,
+            n_queries=args.queries,
+            repeats=args.repeats,
+            seed=args.seed,
+        )
+        _print_table(f"Backends at scale (k={args.k}, seed={args.seed})", results["scale"])
+    else:
+        if not args.skip_models:
+            results["models"] = bench_models(k=args.k)
+            _print_table("Embedding models (seed corpus, question-bank queries)", results["models"])
+        corpus, queries = synthetic_corpus(args.synthetic, n_queries=args.queries)
+        results["storage"] = bench_storage(corpus, queries, k=args.k)
+        _print_table(f"Stored vectors (synthetic, n={args.synthetic})", results["storage"])
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.baseline and "scale" in results:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("scale", [])
+        problems = find_regressions(results["scale"], baseline)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,21 +1,19 @@
-"""Exemplar library: load and search real winning answers for structural reference."""
+"""Exemplar library: load and search real winning answers for structural reference.
 
-import json
+The library file is read and indexed once by the asset registry
+(``assets.registry``); these functions serve from that snapshot.
+"""
 
-from pageant_assistant.config.settings import EXEMPLARS_DIR
+import copy
 
-EXEMPLARS_FILE = EXEMPLARS_DIR / "exemplar_library.json"
+from pageant_assistant.assets.registry import EXEMPLARS_FILE, get_assets
+
+__all__ = ["EXEMPLARS_FILE", "find_exemplar", "format_exemplar_reference", "load_exemplars"]
 
 
 def load_exemplars() -> list[dict]:
     """Load all exemplars from the JSON library."""
-    if not EXEMPLARS_FILE.exists():
-        return []
-    try:
-        data = json.loads(EXEMPLARS_FILE.read_text(encoding="utf-8"))
-        return data.get("exemplars", [])
-    except (json.JSONDecodeError, KeyError):
-        return []
+    return copy.deepcopy(list(get_assets().exemplars))
 
 
 def find_exemplar(
@@ -29,36 +27,13 @@ def find_exemplar(
     1. Exact question_type match + most overlapping theme_tags
     2. Exact question_type match (any)
     3. None if no match
-    """
-    exemplars = load_exemplars()
-    if not exemplars:
-        return None
-
-    # Filter by pageant
-    candidates = [e for e in exemplars if e.get("pageant") == pageant]
-    if not candidates:
-        candidates = exemplars
-
-    # Filter by question type
-    type_matches = [e for e in candidates if e.get("question_type") == question_type]
-
-    if type_matches and theme_tags:
-        # Rank by tag overlap
-        tag_set = set(t.lower() for t in theme_tags)
 
-        def tag_overlap(ex: dict) -> int:
-            ex_tags = set(t.lower() for t in ex.get("theme_tags", []))
-            return len(tag_set & ex_tags)
-
-        type_matches.sort(key=tag_overlap, reverse=True)
-        return type_matches[0]
-
-    if type_matches:
-        return type_matches[0]
-
-    # No type match — return the most recent exemplar as a loose reference
-    candidates.sort(key=lambda e: e.get("year", 0), reverse=True)
-    return candidates[0] if candidates else None
+    Candidates are restricted to *pageant* when the library has any of its
+    exemplars.  With no type match, the most recent exemplar is returned as
+    a loose reference.
+    """
+    exemplar = get_assets().find_exemplar(question_type, theme_tags, pageant)
+    return copy.deepcopy(exemplar) if exemplar is not None else None
 
 
 def format_exemplar_reference(exemplar: dict | None) -> str:
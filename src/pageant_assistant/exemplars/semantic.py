@@ -0,0 +1,187 @@
+"""Semantic exemplar matching: the winning answer closest to the current question.
+
+``find_exemplar`` matches on question type and theme tags, but the critic
+only knows a type guessed from the question analysis, so it effectively
+returned the first exemplar of that type.  Here every exemplar is embedded
+once from its ``question_text``, ``theme_tags`` and ``structural_notes``
+(with the same model as the evidence store, see ``rag.embeddings``) into a
+unit-norm matrix whose rows line up with the asset snapshot's exemplars.
+
+- Matching is one matrix-vector product over the candidate rows plus
+  ``argpartition``, restricted to the requested pageant when the library
+  has any of its exemplars.
+- The matrix is persisted to ``EXEMPLAR_VECTORS_FILE`` (same layout as the
+  question vectors) and rebuilt incrementally when the library reloads, so
+  only new or edited exemplars are embedded.
+- If embedding is unavailable, ``match_exemplar`` falls back to the
+  type/tag lookup of the asset snapshot.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+
+import numpy as np
+
+from pageant_assistant.assets.registry import AssetSnapshot, get_assets
+from pageant_assistant.config.settings import EXEMPLAR_VECTORS_FILE
+from pageant_assistant.questions.semantic import (
+    QuestionVectors,
+    build_question_vectors,
+    text_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# Module-level singleton — (asset snapshot it was built for, index)
+_index: tuple[AssetSnapshot | None, ExemplarIndex | None] = (None, None)
+_lock = threading.Lock()
+
+
+def exemplar_document(exemplar: dict[str, Any]) -> str:
+    """The text embedded for an exemplar: its question, themes, and structure."""
+    parts = [exemplar.get("question_text", "")]
+    if exemplar.get("theme_tags"):
+        parts.append("Themes: " + ", ".join(exemplar["theme_tags"]))
+    if exemplar.get("structural_notes"):
+        parts.append("Structure: " + exemplar["structural_notes"])
+    return "\n".join(p for p in parts if p)
+
+
+def _records(exemplars: tuple[dict[str, Any], ...]) -> list[dict[str, str]]:
+    records = []
+    for ex in exemplars:
+        text = exemplar_document(ex)
+        records.append({"id": str(ex.get("id") or text_hash(text)), "text": text})
+    return records
+
+
+class ExemplarIndex:
+    """Exemplar embeddings aligned with an asset snapshot, with pageant filters.
+
+    Args:
+        snapshot: The asset snapshot whose ``exemplars`` the rows line up with.
+        vectors: One unit-norm row per exemplar.
+    """
+
+    def __init__(self, snapshot: AssetSnapshot, vectors: QuestionVectors) -> None:
+        self.snapshot = snapshot
+        self.vectors = vectors
+        by_pageant: dict[str, list[int]] = {}
+        for row, ex in enumerate(snapshot.exemplars):
+            by_pageant.setdefault(ex.get("pageant"), []).append(row)
+        self.rows_by_pageant = {p: np.asarray(rows) for p, rows in by_pageant.items()}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(
+        self, vector: np.ndarray, k: int = 1, pageant: str | None = None
+    ) -> list[tuple[dict[str, Any], float]]:
+        """Return up to *k* ``(exemplar, cosine)`` pairs nearest to *vector*.
+
+        Candidates are restricted to *pageant* when the library has any of
+        its exemplars; otherwise the whole library is searched.
+        """
+        candidates = self.rows_by_pageant.get(pageant) if pageant else None
+        hits = self.vectors.top_k(vector, k, candidates=candidates)
+        return [(self.snapshot.exemplars[row], score) for row, score in hits]
+
+
+def get_exemplar_index() -> ExemplarIndex | None:
+    """Return the index for the current asset snapshot (built/loaded lazily).
+
+    Returns None if the library is empty or embedding fails.  A failure is
+    cached for the snapshot, so callers fall back to type/tag matching
+    without retrying the model load until the library reloads.
+    """
+    global _index
+    from pageant_assistant.rag.embeddings import embedding_model_id, get_embedding_function
+
+    snapshot = get_assets()
+    built_for, index = _index
+    if built_for is snapshot:
+        return index
+    with _lock:
+        built_for, index = _index
+        if built_for is snapshot:
+            return index
+        if not snapshot.exemplars:
+            _index = (snapshot, None)
+            return None
+        previous = index.vectors if index else QuestionVectors.load(EXEMPLAR_VECTORS_FILE)
+        try:
+            vectors, embedded = build_question_vectors(
+                _records(snapshot.exemplars),
+                get_embedding_function(),
+                embedding_model_id(),
+                previous,
+            )
+        except Exception as exc:
+            logger.warning("Exemplar vectors unavailable (%s) — using type/tag matching", exc)
+            _index = (snapshot, None)
+            return None
+        if embedded or previous is None or previous.ids != vectors.ids:
+            try:
+                vectors.save(EXEMPLAR_VECTORS_FILE)
+            except OSError as exc:
+                logger.warning("Exemplar vectors: could not persist (%s)", exc)
+        logger.info("Exemplar vectors: %d exemplar(s), %d newly embedded", len(vectors), embedded)
+        index = ExemplarIndex(snapshot, vectors)
+        _index = (snapshot, index)
+        return index
+
+
+def search_exemplars(
+    question: str, k: int = 3, *, pageant: str | None = None
+) -> list[tuple[dict[str, Any], float]]:
+    """Return the *k* exemplars whose questions are closest to *question*.
+
+    Args:
+        question: The question being answered.
+        k: Number of results.
+        pageant: Prefer this pageant's exemplars (e.g. ``"Miss Universe"``).
+
+    Returns:
+        ``(exemplar, cosine)`` pairs, best first; empty if matching is
+        unavailable.  Exemplars are shared snapshot objects — do not mutate.
+    """
+    from pageant_assistant.rag.embeddings import get_embedding_function
+
+    index = get_exemplar_index()
+    if index is None or not question.strip():
+        return []
+    try:
+        query = np.asarray(get_embedding_function()([question]), dtype=np.float32)[0]
+    except Exception as exc:
+        logger.warning("search_exemplars: embedding failed (%s)", exc)
+        return []
+    return index.search(query, k, pageant)
+
+
+def match_exemplar(
+    question: str, *, pageant: str | None = None, question_type: str = "personal"
+) -> dict[str, Any] | None:
+    """Return the exemplar nearest in meaning to *question*.
+
+    Falls back to ``AssetSnapshot.find_exemplar`` (by *question_type*) when
+    semantic matching is unavailable.
+
+    Example:
+        >>> match_exemplar("What lesson has failure taught you?", pageant="Miss Universe")
+        ... # doctest: +SKIP
+        {'id': 'mu-2018-final', ...}
+    """
+    hits = search_exemplars(question, k=1, pageant=pageant)
+    if hits:
+        return hits[0][0]
+    return get_assets().find_exemplar(question_type, pageant=pageant or "Miss Universe")
+
+
+def reset_exemplar_index() -> None:
+    """Drop the in-memory index (for tests/tools); the next call rebuilds it."""
+    global _index
+    with _lock:
+        _index = (None, None)
@@ -0,0 +1,228 @@
+"""Streaming critic: act on the score and top fixes before the JSON finishes.
+
+``CRITIC_PROMPT`` orders the critic's JSON so the fields the rewrite needs
+come first — ``overall_score``, ``top_fixes``, ``genericness_flags``,
+``risk_flags`` — and the long per-dimension reasons last.
+``CriticStreamParser`` pulls those leading fields out of the token stream
+as soon as each one is complete, so the critic node can start the rewrite
+LLM call speculatively while the dimension reasons are still streaming.
+
+Speculation is safe because it is keyed by the exact rewrite prompt: the
+rewrite node only takes a speculative result whose prompt equals the one it
+builds from the final, fully parsed critic output.  It is not free: each
+speculative call is a real, paid LLM request.  The critic node discards the
+call as soon as it knows the rewrite will not use it (a parse failure,
+fields that changed, an early exit), which cancels it if it has not started
+yet.  ``speculation_stats()`` counts calls that were used, cancelled before
+they ran, or wasted (ran but were never used).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from pydantic import ValidationError
+
+from pageant_assistant.schemas.rubric import CriticFix
+
+logger = logging.getLogger(__name__)
+
+EARLY_FIELDS = ("overall_score", "top_fixes", "genericness_flags", "risk_flags")
+
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?(?=\s*[,}\s])")
+_MAX_SPECULATIONS = 16
+_SPECULATION_WORKERS = 4
+
+# Module-level singletons — see speculate()
+_pool: ThreadPoolExecutor | None = None
+_speculations: OrderedDict[str, Future] = OrderedDict()
+_stats: Counter[str] = Counter()
+_lock = threading.Lock()
+
+
+def _array_end(text: str, start: int) -> int | None:
+    """Index just past the JSON array opening at *start*, or None if incomplete."""
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "[{":
+            depth += 1
+        elif ch in "]}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+class CriticStreamParser:
+    """Incrementally extracts the critic's leading fields from streamed JSON.
+
+    Example:
+        >>> parser = CriticStreamParser()
+        >>> parser.feed('{"overall_score": 6.5, "top_fixes": [') is None
+        True
+        >>> parser.fields["overall_score"]
+        6.5
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.fields: dict[str, Any] = {}
+
+    def feed(self, chunk: str) -> dict[str, Any] | None:
+        """Add streamed text; return the early fields once all are complete.
+
+        Returns:
+            ``{overall_score, top_fixes, genericness_flags, risk_flags}`` the
+            first time they are all known (shaped like ``critic_scores``),
+            otherwise None.
+        """
+        self.text += chunk
+        if len(self.fields) == len(EARLY_FIELDS):
+            return None
+        for key in EARLY_FIELDS:
+            if key not in self.fields:
+                value = self._extract(key)
+                if value is not None:
+                    self.fields[key] = value
+        if len(self.fields) == len(EARLY_FIELDS):
+            return dict(self.fields)
+        return None
+
+    def _extract(self, key: str) -> Any:
+        match = re.search(rf'"{key}"\s*:\s*', self.text)
+        if not match:
+            return None
+        start = match.end()
+        if key == "overall_score":
+            number = _NUMBER_RE.match(self.text, start)
+            if not number:
+                return None
+            score = float(number.group())
+            return score if 0 <= score <= 10 else None
+        if start >= len(self.text) or self.text[start] != "[":
+            return None
+        end = _array_end(self.text, start)
+        if end is None:
+            return None
+        try:
+            value = json.loads(self.text[start:end])
+            if key == "top_fixes":
+                value = [CriticFix(**fix).model_dump() for fix in value]
+            elif not all(isinstance(flag, str) for flag in value):
+                return None
+        except (ValueError, TypeError, ValidationError):
+            return None
+        return value
+
+
+def stream_critic(llm: Any, prompt: str, on_early: Callable[[dict[str, Any]], None]) -> str:
+    """Run the critic, calling *on_early* as soon as the early fields are parsed.
+
+    Falls back to a single ``invoke`` for clients without ``stream``.
+
+    Returns:
+        The critic's full response text.
+    """
+    if not hasattr(llm, "stream"):
+        return llm.invoke(prompt).content
+    parser = CriticStreamParser()
+    for chunk in llm.stream(prompt):
+        early = parser.feed(chunk.content or "")
+        if early is not None:
+            try:
+                on_early(early)
+            except Exception as exc:  # speculation must never break the critic
+                logger.warning("stream_critic: early callback failed (%s)", exc)
+    return parser.text
+
+
+# ---------------------------------------------------------------------------
+# Speculative calls keyed by prompt
+# ---------------------------------------------------------------------------
+
+
+def prompt_key(prompt: str) -> str:
+    """Digest identifying a speculative call by its exact prompt."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def speculate(prompt: str, call: Callable[[], Any]) -> None:
+    """Start *call* in the background, to be claimed by ``take_speculation(prompt)``."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(_SPECULATION_WORKERS, thread_name_prefix="speculate")
+        key = prompt_key(prompt)
+        if key in _speculations:
+            return
+        _speculations[key] = _pool.submit(call)
+        _stats["started"] += 1
+        while len(_speculations) > _MAX_SPECULATIONS:
+            _, evicted = _speculations.popitem(last=False)
+            _settle(evicted, "evicted unclaimed")
+
+
+def _settle(future: Future, reason: str) -> None:
+    """Cancel an unused speculative call, counting it as cancelled or wasted (lock held)."""
+    if future.cancel():
+        _stats["cancelled"] += 1
+        logger.info("speculative rewrite %s — cancelled before it ran", reason)
+    else:
+        _stats["wasted"] += 1
+        logger.info("speculative rewrite %s — call already made, result unused", reason)
+
+
+def take_speculation(prompt: str) -> Future | None:
+    """Claim the speculative call started for exactly *prompt*, if any."""
+    with _lock:
+        future = _speculations.pop(prompt_key(prompt), None)
+        if future is not None:
+            _stats["used"] += 1
+        return future
+
+
+def discard_speculation(prompt: str, reason: str) -> bool:
+    """Drop the speculative call for *prompt*, cancelling it if it has not run.
+
+    Returns:
+        True if there was a call to discard.
+    """
+    with _lock:
+        future = _speculations.pop(prompt_key(prompt), None)
+        if future is not None:
+            _settle(future, reason)
+        return future is not None
+
+
+def speculation_stats() -> dict[str, int]:
+    """Counts of speculative calls: started, used, cancelled, and wasted (paid, unused)."""
+    with _lock:
+        return {k: _stats[k] for k in ("started", "used", "cancelled", "wasted")}
+
+
+def clear_speculations() -> None:
+    """Cancel unclaimed speculative calls and reset the counts (for tests/tools)."""
+    with _lock:
+        for future in _speculations.values():
+            future.cancel()
+        _speculations.clear()
+        _stats.clear()
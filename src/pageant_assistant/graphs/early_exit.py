@@ -0,0 +1,392 @@
+"""Predictive early exit for the critic → rewrite loop.
+
+Each critic → rewrite cycle costs two LLM calls, but many answers barely
+move after the first rewrite.  This module learns, from the app's own runs,
+how much one more cycle is likely to raise the critic's overall score:
+
+- **Logging** — whenever a critic pass scores an answer the previous pass
+  already scored (i.e. after a rewrite), ``log_cycle`` appends a training
+  pair to ``EARLY_EXIT_LOG_FILE``: the features of the earlier pass, the
+  score gain, and the seconds the cycle took.
+- **Features** — cheap and local: the critic's overall and weakest
+  dimension scores, its fix/flag counts, word count against the word budget,
+  sentence count, persona mentions, and the pass number.
+- **Model** — ridge regression on standardised features (closed form,
+  NumPy only), refitted when the log changes.  Residual spread gives
+  ``P(gain >= EARLY_EXIT_MEANINGFUL_GAIN)``.
+- **Policy** — a cycle runs only if predicted gain per second of expected
+  latency reaches ``EARLY_EXIT_MIN_GAIN_PER_S``.  With fewer than
+  ``EARLY_EXIT_MIN_SAMPLES`` pairs there is no model and the graph keeps its
+  fixed rules.
+- **Exploration** — pairs only exist for cycles that ran, so the log is
+  selection-biased towards answers the policy chose to rewrite (before the
+  model, answers scoring below 5).  ``should_explore`` runs a random
+  ``EARLY_EXIT_EXPLORE_RATE`` share (opt-in; 0 by default) of skipped
+  cycles anyway, only where a later critic pass scores them; their pairs
+  are logged with ``"explored": true``.
+
+Calibration metrics (cross-validated MAE/RMSE/R², interval coverage, Brier
+score and reliability bins) are on ``GainPredictor.calibration`` and
+printed by ``python -m pageant_assistant.graphs.early_exit``.  They are
+measured on the same biased log, so they overstate accuracy on the answers
+the policy skips; the report shows how many pairs came from exploration.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from pageant_assistant.config.settings import (
+    EARLY_EXIT_DEFAULT_CYCLE_S,
+    EARLY_EXIT_EXPLORE_RATE,
+    EARLY_EXIT_LOG_FILE,
+    EARLY_EXIT_MEANINGFUL_GAIN,
+    EARLY_EXIT_MIN_GAIN_PER_S,
+    EARLY_EXIT_MIN_SAMPLES,
+)
+
+logger = logging.getLogger(__name__)
+
+FEATURE_NAMES = (
+    "overall_score",
+    "min_dimension_score",
+    "top_fixes",
+    "genericness_flags",
+    "risk_flags",
+    "word_ratio",
+    "over_budget",
+    "sentences",
+    "persona_mentions",
+    "pass",
+)
+
+_RIDGE_ALPHA = 1.0
+_CV_FOLDS = 5
+_RELOAD_INTERVAL_S = 30.0
+_WORD_RE = re.compile(r"[a-z][a-z'’-]{4,}")
+# Words of the persona block's own template, not the contestant's content
+_PERSONA_LABELS = frozenset(
+    {
+        "contestant",
+        "profile",
+        "country",
+        "platform",
+        "advocacy",
+        "values",
+        "personal",
+        "stories",
+        "lesson",
+        "these",
+        "authentic",
+        "anchors",
+    }
+)
+
+# Module-level singleton — (log stamp it was fitted on, predictor)
+_predictor: tuple[Any, GainPredictor | None] = (None, None)
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Features
+# ---------------------------------------------------------------------------
+
+
+def persona_mentions(answer: str, persona_context: str) -> int:
+    """Count distinct words from the persona block (5+ letters) used in *answer*."""
+    if not persona_context:
+        return 0
+    persona_words = set(_WORD_RE.findall(persona_context.lower())) - _PERSONA_LABELS
+    return len(persona_words & set(_WORD_RE.findall(answer.lower())))
+
+
+def answer_features(
+    answer: str,
+    critic_scores: dict[str, Any],
+    *,
+    word_budget: int,
+    persona_context: str = "",
+    iteration: int = 1,
+) -> list[float]:
+    """Feature vector (in ``FEATURE_NAMES`` order) for a critic-scored answer."""
+    dims = [float(d.get("score", 0)) for d in critic_scores.get("dimension_scores") or []]
+    overall = float(critic_scores.get("overall_score", 0))
+    words = len(answer.split())
+    ratio = words / word_budget if word_budget else 1.0
+    return [
+        overall,
+        min(dims) if dims else overall,
+        float(len(critic_scores.get("top_fixes") or [])),
+        float(len(critic_scores.get("genericness_flags") or [])),
+        float(len(critic_scores.get("risk_flags") or [])),
+        ratio,
+        max(0.0, ratio - 1.0),
+        float(len([s for s in re.split(r"[.!?]+", answer) if s.strip()])),
+        float(persona_mentions(answer, persona_context)),
+        float(iteration),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+
+def log_cycle(
+    features: list[float],
+    gain: float,
+    seconds: float,
+    path: Path | None = None,
+    *,
+    explored: bool = False,
+) -> None:
+    """Append one (features, gain, seconds) training pair to the log.
+
+    *explored* marks a cycle that ran only because of ``should_explore``.
+    """
+    path = path or EARLY_EXIT_LOG_FILE
+    record = {"features": features, "gain": round(gain, 3), "seconds": round(seconds, 3)}
+    if explored:
+        record["explored"] = True
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _lock, path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as exc:
+        logger.warning("early_exit: could not log cycle (%s)", exc)
+
+
+def load_cycles(path: Path | None = None) -> list[dict[str, Any]]:
+    """Read logged training pairs, skipping malformed lines."""
+    path = path or EARLY_EXIT_LOG_FILE
+    records = []
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            if len(record["features"]) == len(FEATURE_NAMES):
+                records.append(record)
+        except (ValueError, KeyError, TypeError):
+            continue
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+
+def _normal_cdf(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+
+
+class _Ridge:
+    """Ridge regression on standardised features (intercept not penalised)."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, alpha: float = _RIDGE_ALPHA) -> None:
+        self.mean = X.mean(axis=0)
+        self.scale = np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)
+        Z = (X - self.mean) / self.scale
+        self.intercept = float(y.mean())
+        A = Z.T @ Z + alpha * np.eye(Z.shape[1])
+        self.coef = np.linalg.solve(A, Z.T @ (y - self.intercept))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.intercept + ((X - self.mean) / self.scale) @ self.coef
+
+
+@dataclass
+class LoopDecision:
+    """Whether to run another critic → rewrite cycle, and why."""
+
+    proceed: bool
+    expected_gain: float
+    p_meaningful_gain: float
+    expected_seconds: float
+    gain_per_second: float
+    reason: str = ""
+    explored: bool = False
+
+
+@dataclass
+class GainPredictor:
+    """Predicts the score gain of one more critic → rewrite cycle.
+
+    Build with ``GainPredictor.fit(records)``; records are ``log_cycle`` pairs.
+    """
+
+    model: _Ridge
+    sigma: float
+    cycle_seconds: float
+    n_samples: int
+    calibration: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def fit(cls, records: list[dict[str, Any]]) -> GainPredictor:
+        X = np.asarray([r["features"] for r in records], dtype=np.float64)
+        y = np.asarray([r["gain"] for r in records], dtype=np.float64)
+        seconds = [float(r.get("seconds", 0)) for r in records if r.get("seconds")]
+        model = _Ridge(X, y)
+        calibration = _cross_validate(X, y)
+        sigma = calibration.get("rmse") or float(np.std(y - model.predict(X))) or 1.0
+        return cls(
+            model=model,
+            sigma=max(sigma, 1e-3),
+            cycle_seconds=float(np.median(seconds)) if seconds else EARLY_EXIT_DEFAULT_CYCLE_S,
+            n_samples=len(records),
+            calibration=calibration,
+        )
+
+    def predict(self, features: list[float]) -> tuple[float, float]:
+        """Return ``(expected gain, P(gain >= EARLY_EXIT_MEANINGFUL_GAIN))``."""
+        gain = float(self.model.predict(np.asarray([features], dtype=np.float64))[0])
+        z = np.asarray([(gain - EARLY_EXIT_MEANINGFUL_GAIN) / self.sigma])
+        return gain, float(_normal_cdf(z)[0])
+
+    def decide(self, features: list[float]) -> LoopDecision:
+        """Run another cycle only if expected gain per second clears the threshold."""
+        gain, p = self.predict(features)
+        rate = gain / self.cycle_seconds if self.cycle_seconds > 0 else gain
+        proceed = rate >= EARLY_EXIT_MIN_GAIN_PER_S
+        return LoopDecision(
+            proceed=proceed,
+            expected_gain=round(gain, 3),
+            p_meaningful_gain=round(p, 3),
+            expected_seconds=round(self.cycle_seconds, 2),
+            gain_per_second=round(rate, 4),
+            reason=(
+                f"predicted +{gain:.2f} in ~{self.cycle_seconds:.1f}s "
+                f"({'≥' if proceed else '<'} {EARLY_EXIT_MIN_GAIN_PER_S}/s)"
+            ),
+        )
+
+
+def _cross_validate(X: np.ndarray, y: np.ndarray) -> dict[str, Any]:
+    """K-fold out-of-sample error and probability calibration."""
+    n = len(y)
+    folds = min(_CV_FOLDS, n)
+    if folds < 2:
+        return {"n": n}
+    order = np.random.default_rng(0).permutation(n)
+    pred = np.empty(n)
+    for k in range(folds):
+        test = order[k::folds]
+        train = np.setdiff1d(order, test)
+        pred[test] = _Ridge(X[train], y[train]).predict(X[test])
+    resid = y - pred
+    rmse = float(np.sqrt(np.mean(resid**2)))
+    sigma = max(rmse, 1e-3)
+    var = float(np.var(y))
+    prob = _normal_cdf((pred - EARLY_EXIT_MEANINGFUL_GAIN) / sigma)
+    hit = (y >= EARLY_EXIT_MEANINGFUL_GAIN).astype(float)
+    bins = []
+    for lo, hi in ((0.0, 0.25), (0.25, 0.5), (0.5, 0.75), (0.75, 1.01)):
+        mask = (prob >= lo) & (prob < hi)
+        if mask.any():
+            bins.append(
+                {
+                    "range": [lo, min(hi, 1.0)],
+                    "n": int(mask.sum()),
+                    "predicted": round(float(prob[mask].mean()), 3),
+                    "observed": round(float(hit[mask].mean()), 3),
+                }
+            )
+    return {
+        "n": n,
+        "mae": round(float(np.mean(np.abs(resid))), 3),
+        "rmse": round(rmse, 3),
+        "r2": round(1.0 - float(np.mean(resid**2)) / var, 3) if var > 0 else None,
+        "bias": round(float(resid.mean()), 3),
+        "interval80_coverage": round(float(np.mean(np.abs(resid) <= 1.2816 * sigma)), 3),
+        "brier": round(float(np.mean((prob - hit) ** 2)), 4),
+        "reliability": bins,
+    }
+
+
+def should_explore() -> bool:
+    """Whether a cycle the loop would skip should run anyway (``EARLY_EXIT_EXPLORE_RATE``)."""
+    return EARLY_EXIT_EXPLORE_RATE > 0 and random.random() < EARLY_EXIT_EXPLORE_RATE
+
+
+def get_gain_predictor() -> GainPredictor | None:
+    """Return a predictor fitted on the current log, or None if too little data.
+
+    The log is re-stat'ed at most every 30 seconds and the model refitted
+    when it grew.
+    """
+    global _predictor, _checked_at
+    stamp, predictor = _predictor
+    if stamp is not None and time.monotonic() - _checked_at < _RELOAD_INTERVAL_S:
+        return predictor
+    with _lock:
+        try:
+            st = EARLY_EXIT_LOG_FILE.stat()
+            current = (str(EARLY_EXIT_LOG_FILE), st.st_mtime_ns, st.st_size)
+        except OSError:
+            current = (str(EARLY_EXIT_LOG_FILE), 0, 0)
+        _checked_at = time.monotonic()
+        if current == _predictor[0]:
+            return _predictor[1]
+    records = load_cycles()
+    predictor = None
+    if len(records) >= EARLY_EXIT_MIN_SAMPLES:
+        predictor = GainPredictor.fit(records)
+        logger.info(
+            "early_exit: fitted on %d cycle(s), CV RMSE %s",
+            len(records),
+            predictor.calibration.get("rmse"),
+        )
+    with _lock:
+        _predictor = (current, predictor)
+    return predictor
+
+
+def reset_gain_predictor() -> None:
+    """Forget the fitted model (for tests/tools); the next call refits."""
+    global _predictor, _checked_at
+    with _lock:
+        _predictor = (None, None)
+        _checked_at = 0.0
+
+
+def main() -> None:
+    """Print the predictor's calibration report for the current log."""
+    predictor = get_gain_predictor()
+    if predictor is None:
+        print(
+            f"{len(load_cycles())} logged cycle(s); need {EARLY_EXIT_MIN_SAMPLES} "
+            "to fit the early-exit model."
+        )
+        return
+    report = {
+        "samples": predictor.n_samples,
+        "explored_samples": sum(1 for r in load_cycles() if r.get("explored")),
+        "cycle_seconds": predictor.cycle_seconds,
+        "coefficients": dict(zip(FEATURE_NAMES, np.round(predictor.model.coef, 4).tolist())),
+        "calibration": predictor.calibration,
+        "note": (
+            "Pairs are only logged for cycles that ran, so calibration is measured "
+            "mostly on answers the policy chose to rewrite; explored pairs are the "
+            "only ones from answers it would have skipped."
+        ),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
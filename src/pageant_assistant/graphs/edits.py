@@ -0,0 +1,138 @@
+"""Sentence-level edit scripts for the rewrite node.
+
+A full rewrite makes the LLM re-emit the whole answer even when the critic
+asked for one or two sentence fixes, and output tokens dominate latency.
+In edit-script mode the draft is shown with numbered sentences and the LLM
+returns only the operations to apply:
+
+    {"edits": [{"op": "replace", "index": 2, "text": "..."},
+               {"op": "insert", "index": 4, "text": "..."},
+               {"op": "delete", "index": 5}]}
+
+``replace``/``delete`` target sentence *index* (1-based); ``insert`` adds
+text after sentence *index* (0 = before the first).  Scripts are validated
+before anything is applied; an invalid script raises ``EditScriptError`` so
+the caller can fall back to a full rewrite.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import defaultdict
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, ValidationError
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class EditScriptError(ValueError):
+    """The LLM's edit script cannot be parsed or applied."""
+
+
+class EditOperation(BaseModel):
+    """One sentence-level edit."""
+
+    op: Literal["replace", "insert", "delete"]
+    index: int = Field(ge=0)
+    text: str = ""
+
+
+class EditScript(BaseModel):
+    """The rewrite LLM's reply in edit-script mode."""
+
+    edits: list[EditOperation] = Field(min_length=1)
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split an answer into sentences (on ``.``, ``!`` or ``?`` plus whitespace)."""
+    return [s.strip() for s in _SENTENCE_RE.split(text.strip()) if s.strip()]
+
+
+def number_sentences(sentences: list[str]) -> str:
+    """Render sentences as ``[1] ...`` lines for the edit-script prompt."""
+    return "\n".join(f"[{i}] {s}" for i, s in enumerate(sentences, 1))
+
+
+def parse_edit_script(text: str) -> EditScript:
+    """Parse the LLM reply (markdown code fences tolerated).
+
+    Raises:
+        EditScriptError: If the reply is not a valid edit script.
+    """
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = re.sub(r"^```(?:json)?\s*", "", cleaned)
+        cleaned = re.sub(r"\s*```$", "", cleaned)
+    try:
+        return EditScript(**json.loads(cleaned))
+    except (json.JSONDecodeError, TypeError, ValidationError) as exc:
+        raise EditScriptError(f"unparseable edit script: {exc}") from exc
+
+
+def apply_edit_script(sentences: list[str], script: EditScript) -> str:
+    """Apply *script* to *sentences* and return the edited answer.
+
+    Indices refer to the original numbering, so edits do not shift each
+    other.  Several inserts at the same position keep their script order.
+
+    Raises:
+        EditScriptError: If an index is out of range, a sentence is edited
+            twice, a replace/insert has no text, or nothing would remain.
+
+    Example:
+        >>> script = EditScript(edits=[{"op": "replace", "index": 2, "text": "Two!"}])
+        >>> apply_edit_script(["One.", "Two.", "Three."], script)
+        'One. Two! Three.'
+    """
+    n = len(sentences)
+    replaced: dict[int, str] = {}
+    deleted: set[int] = set()
+    inserts: dict[int, list[str]] = defaultdict(list)
+    for edit in script.edits:
+        text = " ".join(edit.text.split())
+        if edit.op == "insert":
+            if edit.index > n:
+                raise EditScriptError(f"insert after sentence {edit.index} of {n}")
+            if not text:
+                raise EditScriptError("insert without text")
+            inserts[edit.index].append(text)
+            continue
+        if not 1 <= edit.index <= n:
+            raise EditScriptError(f"{edit.op} of sentence {edit.index} of {n}")
+        if edit.index in replaced or edit.index in deleted:
+            raise EditScriptError(f"sentence {edit.index} edited twice")
+        if edit.op == "delete":
+            deleted.add(edit.index)
+        elif not text:
+            raise EditScriptError(f"replace of sentence {edit.index} without text")
+        else:
+            replaced[edit.index] = text
+
+    out = list(inserts[0])
+    for i, sentence in enumerate(sentences, 1):
+        if i not in deleted:
+            out.append(replaced.get(i, sentence))
+        out += inserts[i]
+    if not out:
+        raise EditScriptError("edit script deletes the whole answer")
+    return " ".join(out)
+
+
+def summarize_rewrite_stats(stats: list[dict[str, Any]]) -> dict[str, int]:
+    """Totals of the rewrite node's per-pass ``rewrite_stats`` for one run.
+
+    Returns:
+        ``passes``, ``edit_passes``, ``fallbacks``, ``output_tokens`` (all
+        rewrite output, fallbacks included), and ``saved_tokens`` (estimated
+        output tokens saved versus full rewrites; negative if fallbacks cost
+        more than edits saved).
+    """
+    return {
+        "passes": len(stats),
+        "edit_passes": sum(s.get("mode") == "edits" for s in stats),
+        "fallbacks": sum(s.get("mode") == "fallback" for s in stats),
+        "output_tokens": sum(int(s.get("output_tokens", 0)) for s in stats),
+        "saved_tokens": sum(int(s.get("saved_tokens", 0)) for s in stats),
+    }
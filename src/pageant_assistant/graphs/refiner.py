@@ -9,34 +9,62 @@ M4 additions: CRAG evidence retrieval (rag_research), claim verification (claim_
 """
 
 import json
+import logging
 import re
+import time
+from dataclasses import asdict
 
 from langgraph.graph import END, START, StateGraph
 
+from pageant_assistant.assets.registry import get_assets
 from pageant_assistant.config.settings import (
+    COACH_NARRATIVE_MODE,
+    CRITIC_STREAMING,
     DEFAULT_RUBRIC,
     DEFAULT_TIME_LIMIT,
+    REWRITE_MODE,
     WORDS_PER_SECOND,
 )
-from pageant_assistant.exemplars.library import (
-    find_exemplar,
-    format_exemplar_reference,
+from pageant_assistant.exemplars.semantic import match_exemplar
+from pageant_assistant.graphs.critic_stream import (
+    discard_speculation,
+    speculate,
+    stream_critic,
+    take_speculation,
+)
+from pageant_assistant.graphs.early_exit import (
+    answer_features,
+    get_gain_predictor,
+    log_cycle,
+    should_explore,
+)
+from pageant_assistant.graphs.edits import (
+    EditScriptError,
+    apply_edit_script,
+    number_sentences,
+    parse_edit_script,
+    split_sentences,
 )
 from pageant_assistant.llm.prompts import (
+    COACH_NARRATIVE_PROMPT,
     COACH_REPORT_PROMPT,
     CRITIC_PROMPT,
     DRAFTING_PROMPT,
     EXEMPLAR_PROMPT,
     QUESTION_ANALYSIS_PROMPT,
+    REWRITE_EDITS_PROMPT,
     REWRITE_PROMPT,
-    STYLE_INSTRUCTIONS,
 )
 from pageant_assistant.llm.providers import get_llm
+from pageant_assistant.personas.stories import estimate_tokens
 from pageant_assistant.rag.nodes import claim_verifier, rag_research
-from pageant_assistant.rubrics.loader import format_rubric_for_prompt, load_rubric
+from pageant_assistant.rubrics.report import render_coach_report
+from pageant_assistant.rubrics.scoring import score_with_rubric
 from pageant_assistant.schemas.rubric import CriticOutput
 from pageant_assistant.schemas.state import RefinerState
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Helper
 # ---------------------------------------------------------------------------
@@ -109,6 +137,37 @@ def _format_critique_for_rewrite(state: RefinerState) -> str:
     return "\n".join(lines)
 
 
+def _predict_cycle(features: list[float], stage: str, *, explore: bool = True) -> dict | None:
+    """The early-exit model's decision on one more cycle (None without a model).
+
+    *explore* allows ``should_explore`` to run a skipped cycle anyway; pass
+    False when no later critic pass would score the cycle, since an
+    unscored cycle yields no training pair.
+    """
+    predictor = get_gain_predictor()
+    if predictor is None:
+        return None
+    decision = predictor.decide(features)
+    if explore and not decision.proceed and should_explore():
+        decision.proceed = decision.explored = True
+        decision.reason += " — running it anyway to explore"
+    logger.info("early exit (%s): %s", stage, decision.reason)
+    return {"stage": stage, **asdict(decision)}
+
+
+def _latest_decision(state: RefinerState, stage: str) -> dict | None:
+    decisions = state.get("loop_decisions") or []
+    if decisions and decisions[-1].get("stage") == stage:
+        return decisions[-1]
+    return None
+
+
+def _output_tokens(response) -> int:
+    """Completion tokens reported by the provider, else a length estimate."""
+    usage = getattr(response, "usage", None) or {}
+    return int(usage.get("completion_tokens") or estimate_tokens(response.content))
+
+
 def _clean_prompt(text: str) -> str:
     """Collapse runs of 3+ newlines (from empty template variables) into one blank line."""
     return re.sub(r"\n{3,}", "\n\n", text)
@@ -132,14 +191,15 @@ def drafting(state: RefinerState) -> dict:
     llm = get_llm("drafting")
     time_limit = state.get("time_limit", DEFAULT_TIME_LIMIT)
     style_key = state.get("style_preset", "structured_narrative")
+    style = get_assets().style(style_key)
     prompt = DRAFTING_PROMPT.format(
         question=state["question"],
         raw_answer=state["raw_answer"],
         question_analysis=state["question_analysis"],
         time_limit=time_limit,
         word_budget=_word_budget(time_limit, style_key),
-        style_description=STYLE_INSTRUCTIONS.get(style_key, ""),
-        style_instructions=STYLE_INSTRUCTIONS.get(style_key, ""),
+        style_description=style,
+        style_instructions=style,
         persona_context=state.get("persona_context", ""),
         evidence_block=state.get("rag_evidence") or "",
     )
@@ -148,22 +208,32 @@ def drafting(state: RefinerState) -> dict:
     return {"draft_answer": response.content}
 
 
-def critic(state: RefinerState) -> dict:
-    """Score the draft against the rubric and flag issues."""
+def critic(state: RefinerState, *, speculate_rewrite: bool = True) -> dict:
+    """Score the draft against the rubric and flag issues.
+
+    Args:
+        state: Current graph state.
+        speculate_rewrite: Start the rewrite's LLM call while the critic is
+            still streaming.  Off when no rewrite of this answer will follow
+            (the variant fan-out critiques the raw answer only).
+    """
     llm = get_llm("critic")
     time_limit = state.get("time_limit", DEFAULT_TIME_LIMIT)
 
-    # Load rubric
+    # Rubric text and exemplar notes come pre-rendered from the asset snapshot
+    assets = get_assets()
     rubric_name = state.get("rubric_name", DEFAULT_RUBRIC)
-    rubric = load_rubric(rubric_name)
-    rubric_text = format_rubric_for_prompt(rubric)
+    rubric = assets.rubric(rubric_name)
+    rubric_text = rubric.prompt_text
 
-    # Find matching exemplar for structural reference
+    # Find the exemplar whose question is closest to this one, preferring the
+    # rubric's pageant; the inferred question type is the fallback key
     question_analysis = state.get("question_analysis", "")
-    # Infer question type from analysis (best effort)
     q_type = _infer_question_type(question_analysis)
-    exemplar = find_exemplar(question_type=q_type)
-    exemplar_notes = format_exemplar_reference(exemplar) if exemplar else ""
+    exemplar = match_exemplar(
+        state["question"], pageant=rubric.definition.pageant, question_type=q_type
+    )
+    exemplar_notes = assets.exemplar_reference(exemplar)
 
     # On second pass, score the rewrite instead of the original draft
     answer_to_score = state.get("refined_answer") or state["draft_answer"]
@@ -179,19 +249,54 @@ def critic(state: RefinerState) -> dict:
         exemplar_structural_notes=exemplar_notes,
     )
     prompt = _clean_prompt(prompt)
-    response = llm.invoke(prompt)
+    iteration = state.get("iteration_count", 0) + 1
+    started = time.perf_counter()
+    speculated: list[str] = []
+    if CRITIC_STREAMING and speculate_rewrite:
+        # The rewrite starts as soon as the score, fixes and flags have streamed
+        critique = stream_critic(
+            llm,
+            prompt,
+            lambda early: speculated.append(_speculate_rewrite(state, early, iteration)),
+        )
+    else:
+        critique = llm.invoke(prompt).content
+    critic_seconds = time.perf_counter() - started
 
     # Try to parse structured JSON
-    parsed = _parse_critic_json(response.content)
+    parsed = _parse_critic_json(critique)
 
     result = {
-        "critique": response.content,
-        "iteration_count": state.get("iteration_count", 0) + 1,
+        "critique": critique,
+        "iteration_count": iteration,
         "rubric_name": rubric_name,
+        "loop_features": [],
     }
 
     if parsed:
-        result["critic_scores"] = parsed.model_dump()
+        scores = parsed.model_dump()
+        result["critic_scores"] = scores
+        # This pass scored a rewrite of the answer the previous pass scored:
+        # log the cycle as a training pair for the early-exit model
+        previous = state.get("critic_scores")
+        if state.get("loop_features") and previous and state.get("refined_answer"):
+            log_cycle(
+                state["loop_features"],
+                scores["overall_score"] - previous.get("overall_score", 0),
+                state.get("rewrite_latency_s", 0.0) + critic_seconds,
+                explored=any(d.get("explored") for d in state.get("loop_decisions") or []),
+            )
+        result["loop_features"] = answer_features(
+            answer_to_score,
+            scores,
+            word_budget=_word_budget(time_limit, style_key),
+            persona_context=state.get("persona_context", ""),
+            iteration=iteration,
+        )
+        # Only a rewrite on the first pass is re-scored (should_reloop caps at 2)
+        decision = _predict_cycle(result["loop_features"], "rewrite", explore=iteration < 2)
+        if decision:
+            result["loop_decisions"] = [*(state.get("loop_decisions") or []), decision]
     if exemplar:
         result["exemplar_ref"] = {
             "id": exemplar.get("id", ""),
@@ -200,31 +305,235 @@ def critic(state: RefinerState) -> dict:
             "structural_notes": exemplar.get("structural_notes", ""),
         }
 
+    for speculative_prompt in speculated:
+        _settle_speculation(speculative_prompt, {**state, **result})
     return result
 
 
 def rewrite(state: RefinerState) -> dict:
-    """Apply critic edits and style to produce the refined answer."""
+    """Apply critic edits and style to produce the refined answer.
+
+    With ``REWRITE_MODE = "edits"`` the LLM returns sentence-level edit
+    operations that are applied locally (see ``graphs.edits``); an invalid
+    script falls back to a full rewrite.  If the streaming critic already
+    started this exact LLM call, its result is used.  Each pass appends its
+    output-token accounting to ``rewrite_stats``.
+    """
     llm = get_llm("rewrite")
+    stats = list(state.get("rewrite_stats") or [])
+    started = time.perf_counter()
+
+    prompt, sentences = _first_rewrite_prompt(state)
+    response, speculative = _invoke_rewrite(llm, prompt)
+
+    edit_tokens = None
+    if sentences is not None:
+        edit_tokens = _output_tokens(response)
+        try:
+            refined = apply_edit_script(sentences, parse_edit_script(response.content))
+        except EditScriptError as exc:
+            logger.warning("rewrite: %s — falling back to a full rewrite", exc)
+        else:
+            full_tokens = estimate_tokens(refined)
+            stats.append(
+                {
+                    "mode": "edits",
+                    "output_tokens": edit_tokens,
+                    "full_rewrite_tokens": full_tokens,
+                    "saved_tokens": full_tokens - edit_tokens,
+                    "speculative": speculative,
+                }
+            )
+            logger.info(
+                "rewrite: edit script used %d output tokens (~%d saved)",
+                edit_tokens,
+                full_tokens - edit_tokens,
+            )
+            return _rewrite_result(state, refined, stats, time.perf_counter() - started)
+
+        answer = state.get("refined_answer") or state["draft_answer"]
+        prompt = _clean_prompt(
+            REWRITE_PROMPT.format(draft_answer=answer, **_rewrite_context(state))
+        )
+        response, speculative = llm.invoke(prompt), False
+
+    tokens = _output_tokens(response)
+    stats.append(
+        {
+            "mode": "full" if edit_tokens is None else "fallback",
+            "output_tokens": tokens + (edit_tokens or 0),
+            "full_rewrite_tokens": tokens,
+            "saved_tokens": -(edit_tokens or 0),
+            "speculative": speculative,
+        }
+    )
+    return _rewrite_result(state, response.content, stats, time.perf_counter() - started)
+
+
+def _rewrite_context(state: RefinerState) -> dict:
+    """Prompt fields shared by the full and edit-script rewrite prompts."""
     time_limit = state.get("time_limit", DEFAULT_TIME_LIMIT)
     style_key = state.get("style_preset", "structured_narrative")
-    prompt = REWRITE_PROMPT.format(
-        question=state["question"],
-        draft_answer=state.get("refined_answer") or state["draft_answer"],
-        critique=_format_critique_for_rewrite(state),
-        time_limit=time_limit,
-        word_budget=_word_budget(time_limit, style_key),
-        style_instructions=STYLE_INSTRUCTIONS.get(style_key, ""),
-        persona_context=state.get("persona_context", ""),
-        evidence_block=state.get("rag_evidence") or "",
+    return {
+        "question": state["question"],
+        "critique": _format_critique_for_rewrite(state),
+        "time_limit": time_limit,
+        "word_budget": _word_budget(time_limit, style_key),
+        "style_instructions": get_assets().style(style_key),
+        "persona_context": state.get("persona_context", ""),
+        "evidence_block": state.get("rag_evidence") or "",
+    }
+
+
+def _first_rewrite_prompt(state: RefinerState) -> tuple[str, list[str] | None]:
+    """The rewrite's first LLM prompt, and the numbered sentences in edit-script mode."""
+    answer = state.get("refined_answer") or state["draft_answer"]
+    context = _rewrite_context(state)
+    if REWRITE_MODE == "edits":
+        sentences = split_sentences(answer)
+        prompt = REWRITE_EDITS_PROMPT.format(
+            numbered_sentences=number_sentences(sentences),
+            word_count=len(answer.split()),
+            **context,
+        )
+        return _clean_prompt(prompt), sentences
+    return _clean_prompt(REWRITE_PROMPT.format(draft_answer=answer, **context)), None
+
+
+def _invoke_rewrite(llm, prompt: str) -> tuple[object, bool]:
+    """Claim the streaming critic's speculative call for *prompt*, else invoke."""
+    future = take_speculation(prompt)
+    if future is not None:
+        try:
+            return future.result(), True
+        except Exception as exc:
+            logger.warning("rewrite: speculative call failed (%s) — retrying", exc)
+    return llm.invoke(prompt), False
+
+
+def _speculate_rewrite(state: RefinerState, early_scores: dict, iteration: int) -> str:
+    """Start the rewrite's LLM call from the critic's early fields.
+
+    The early fields carry no dimension scores, so the early-exit decision is
+    left to the final critique: ``_settle_speculation`` discards the call if
+    the rewrite is skipped.  The rewrite node only uses the result if the
+    final critic output yields the same prompt.
+
+    Returns:
+        The speculative prompt.
+    """
+    provisional = {**state, "critic_scores": early_scores, "iteration_count": iteration}
+    prompt, _ = _first_rewrite_prompt(provisional)
+    llm = get_llm("rewrite")
+    speculate(prompt, lambda: llm.invoke(prompt))
+    logger.info(
+        "critic: score %.1f and fixes parsed — rewrite started", early_scores["overall_score"]
     )
-    prompt = _clean_prompt(prompt)
-    response = llm.invoke(prompt)
-    return {"refined_answer": response.content}
+    return prompt
+
+
+def _settle_speculation(prompt: str, state: RefinerState) -> None:
+    """Discard the speculative rewrite for *prompt* unless the rewrite node will claim it.
+
+    *state* is the state after the critic pass.  The call is dropped, and
+    cancelled if it has not started, when the early-exit model skips the
+    rewrite or when the final critique yields a different rewrite prompt.
+    """
+    decision = _latest_decision(state, "rewrite")
+    if decision is not None and not decision["proceed"]:
+        discard_speculation(prompt, "not needed (rewrite skipped)")
+    elif _first_rewrite_prompt(state)[0] != prompt:
+        discard_speculation(prompt, "not needed (final critique changed the prompt)")
+
+
+def _rewrite_result(state: RefinerState, refined: str, stats: list, seconds: float) -> dict:
+    """The rewrite node's output, with the early-exit model's reloop decision."""
+    result = {"refined_answer": refined, "rewrite_stats": stats, "rewrite_latency_s": seconds}
+    critic_scores = state.get("critic_scores")
+    if critic_scores and state.get("iteration_count", 0) < 2:
+        # The refined answer has not been scored yet; pair its text features
+        # with the latest critic scores
+        time_limit = state.get("time_limit", DEFAULT_TIME_LIMIT)
+        style_key = state.get("style_preset", "structured_narrative")
+        features = answer_features(
+            refined,
+            critic_scores,
+            word_budget=_word_budget(time_limit, style_key),
+            persona_context=state.get("persona_context", ""),
+            iteration=state.get("iteration_count", 0) + 1,
+        )
+        decision = _predict_cycle(features, "reloop")
+        if decision is None and critic_scores.get("overall_score", 0) >= 5.0 and should_explore():
+            # should_reloop's fixed rule would stop here; log this cycle too
+            decision = {
+                "stage": "reloop",
+                "proceed": True,
+                "explored": True,
+                "reason": "score ≥ 5 — second pass run anyway to explore",
+            }
+        if decision:
+            result["loop_decisions"] = [*(state.get("loop_decisions") or []), decision]
+    return result
+
+
+def accept_answer(state: RefinerState) -> dict:
+    """Keep the current answer when another rewrite is not worth its latency."""
+    return {"refined_answer": state.get("refined_answer") or state["draft_answer"]}
 
 
 def coach_report(state: RefinerState) -> dict:
-    """Generate the coach report with scores and practice notes."""
+    """Render the coach report with scores and practice notes.
+
+    Built locally from the critic's structured scores: the rubric's weights
+    and cap rules give the overall score, and the critic's fixes and flags
+    give the practice notes.  Only when the critic's output could not be
+    parsed is the report written by the LLM.
+    """
+    critic_scores = state.get("critic_scores")
+    if not critic_scores:
+        return {"coach_report": _llm_coach_report(state)}
+
+    rubric = get_assets().rubric(state.get("rubric_name", DEFAULT_RUBRIC))
+    breakdown = score_with_rubric(critic_scores, rubric.definition)
+    time_limit = state.get("time_limit", DEFAULT_TIME_LIMIT)
+    report = render_coach_report(
+        breakdown,
+        critic_scores,
+        raw_answer=state.get("raw_answer", ""),
+        refined_answer=state.get("refined_answer", ""),
+        time_limit=time_limit,
+        word_budget=_word_budget(time_limit, state.get("style_preset", "structured_narrative")),
+        rewritten=_rewrote_latest_critique(state),
+    )
+    return {"coach_report": report, "rubric_score": breakdown.overall}
+
+
+def _rewrote_latest_critique(state: RefinerState) -> bool:
+    """Whether the final answer is a rewrite addressing the latest critique's fixes."""
+    decision = _latest_decision(state, "rewrite")
+    skipped = decision is not None and not decision["proceed"]
+    return bool(state.get("rewrite_stats")) and not skipped
+
+
+def coach_narrative(state: RefinerState) -> dict:
+    """Write the optional LLM commentary shown under the coach report.
+
+    Runs alongside ``generate_exemplar`` when ``COACH_NARRATIVE_MODE`` is
+    ``"parallel"``; in ``"lazy"`` mode the Coach page calls it on request.
+    """
+    llm = get_llm("drafting")
+    prompt = COACH_NARRATIVE_PROMPT.format(
+        question=state["question"],
+        raw_answer=state["raw_answer"],
+        refined_answer=state.get("refined_answer", ""),
+        structured_scores=_format_structured_scores(state.get("critic_scores")),
+    )
+    response = llm.invoke(_clean_prompt(prompt))
+    return {"coach_narrative": response.content}
+
+
+def _llm_coach_report(state: RefinerState) -> str:
+    """Have the LLM write the whole report (used when scores are unstructured)."""
     llm = get_llm("drafting")  # Moderate creativity for report writing
 
     structured = _format_structured_scores(state.get("critic_scores"))
@@ -237,7 +546,7 @@ def coach_report(state: RefinerState) -> dict:
         structured_scores=structured,
     )
     response = llm.invoke(prompt)
-    return {"coach_report": response.content}
+    return response.content
 
 
 def generate_exemplar(state: RefinerState) -> dict:
@@ -262,7 +571,7 @@ def generate_exemplar(state: RefinerState) -> dict:
         question_analysis=state["question_analysis"],
         time_limit=time_limit,
         word_budget=_word_budget(time_limit, style_key),
-        style_instructions=STYLE_INSTRUCTIONS.get(style_key, ""),
+        style_instructions=get_assets().style(style_key),
         exemplar_reference=exemplar_text,
     )
     response = llm.invoke(prompt)
@@ -290,9 +599,25 @@ def _infer_question_type(question_analysis: str) -> str:
 # ---------------------------------------------------------------------------
 
 
+def should_rewrite(state: RefinerState) -> str:
+    """After the critic: rewrite, unless the early-exit model says it is not worth it.
+
+    Returns:
+        ``"rewrite"``, or ``"accept_answer"`` to keep the answer as scored.
+        Without a fitted model the answer is always rewritten.
+    """
+    decision = _latest_decision(state, "rewrite")
+    if decision is not None and not decision["proceed"]:
+        return "accept_answer"
+    return "rewrite"
+
+
 def should_reloop(state: RefinerState) -> str:
     """Decide whether to do another critic->rewrite pass or proceed to verification.
 
+    Once the early-exit model is fitted, its expected gain per second decides;
+    until then the answer loops back only if it scored below 5.
+
     Returns:
         ``"critic"`` to loop again, or ``"claim_verifier"`` to continue to the
         claim verification and coach report nodes.
@@ -301,6 +626,10 @@ def should_reloop(state: RefinerState) -> str:
     if state.get("iteration_count", 0) >= 2:
         return "claim_verifier"
 
+    decision = _latest_decision(state, "reloop")
+    if decision is not None:
+        return "critic" if decision["proceed"] else "claim_verifier"
+
     # Prefer structured score when available (M3 JSON critic output)
     critic_scores = state.get("critic_scores")
     if critic_scores and "overall_score" in critic_scores:
@@ -339,11 +668,14 @@ def build_refiner_graph() -> StateGraph:
         → rag_research          (retrieve + grade Kenya/Africa evidence)
         → drafting              (evidence_block injected when relevant)
         → critic
-        → rewrite               (evidence_block injected when relevant)
-        → [loop back to critic if score < 5, max 2 iterations]
+        → rewrite               (evidence_block injected when relevant; skipped
+                                 via accept_answer when the early-exit model
+                                 predicts too little gain per second)
+        → [loop back to critic if score < 5 — or predicted gain per second
+           is high enough, once the model is fitted — max 2 iterations]
         → claim_verifier        (flag unsupported factual claims)
-        → coach_report
-        → generate_exemplar
+        → coach_report          (rendered locally from the critic's scores)
+        → generate_exemplar     (+ coach_narrative in parallel if enabled)
         → END
 
     Returns:
@@ -357,16 +689,20 @@ def build_refiner_graph() -> StateGraph:
     graph.add_node("drafting", drafting)
     graph.add_node("critic", critic)
     graph.add_node("rewrite", rewrite)
+    graph.add_node("accept_answer", accept_answer)
     graph.add_node("claim_verifier", claim_verifier)
     graph.add_node("coach_report", coach_report)
     graph.add_node("generate_exemplar", generate_exemplar)
+    if COACH_NARRATIVE_MODE == "parallel":
+        graph.add_node("coach_narrative", coach_narrative)
 
     # Linear flow: START → understand → research → draft → critic → rewrite
     graph.add_edge(START, "question_understanding")
     graph.add_edge("question_understanding", "rag_research")
     graph.add_edge("rag_research", "drafting")
     graph.add_edge("drafting", "critic")
-    graph.add_edge("critic", "rewrite")
+    graph.add_conditional_edges("critic", should_rewrite)
+    graph.add_edge("accept_answer", "claim_verifier")
 
     # Conditional: loop back to critic OR proceed to claim verification
     graph.add_conditional_edges("rewrite", should_reloop)
@@ -375,5 +711,8 @@ def build_refiner_graph() -> StateGraph:
     graph.add_edge("claim_verifier", "coach_report")
     graph.add_edge("coach_report", "generate_exemplar")
     graph.add_edge("generate_exemplar", END)
+    if COACH_NARRATIVE_MODE == "parallel":
+        graph.add_edge("coach_report", "coach_narrative")
+        graph.add_edge("coach_narrative", END)
 
     return graph.compile()
@@ -0,0 +1,250 @@
+"""Variant mode: one answer drafted in every style and time limit at once.
+
+Coaches compare the same answer across all ``STYLE_PRESETS`` and
+``VALID_TIME_LIMITS``.  Running the refiner graph once per combination
+repeats work that does not depend on the style or time limit, so
+``run_variants`` splits the pipeline:
+
+    shared (once):    question_understanding -> rag_research -> critic(raw answer)
+    per variant:      drafting -> rewrite -> claim_verifier
+
+The per-variant stages run on a thread pool of ``VARIANT_MAX_IN_FLIGHT``
+workers.  Each worker makes its LLM calls one after another, so at most that
+many variant calls are in flight at once.  Variants are then ranked locally,
+without another LLM call: the rubric score of the shared critique,
+discounted by how far each variant misses its word budget (see
+``time_fit``).
+
+Example:
+    >>> run = run_variants({"question": q, "raw_answer": a, "rubric_name": "miss_universe"})
+    >>> best = run.variants[0]
+    >>> best.style_preset, best.time_limit, best.answer
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any
+
+from pageant_assistant.assets.registry import get_assets
+from pageant_assistant.config.settings import (
+    DEFAULT_RUBRIC,
+    STYLE_PRESETS,
+    VALID_TIME_LIMITS,
+    VARIANT_MAX_IN_FLIGHT,
+)
+from pageant_assistant.graphs.refiner import (
+    _word_budget,
+    critic,
+    drafting,
+    question_understanding,
+    rewrite,
+)
+from pageant_assistant.rag.nodes import claim_verifier, rag_research
+from pageant_assistant.rubrics.scoring import score_with_rubric
+from pageant_assistant.schemas.state import RefinerState
+
+logger = logging.getLogger(__name__)
+
+# Running over time costs more than finishing early: judges cut answers off
+_OVER_BUDGET_PENALTY = 2.0
+
+
+@dataclass
+class Variant:
+    """One style × time-limit rendering of the answer, with its ranking inputs."""
+
+    style_preset: str
+    time_limit: int
+    word_budget: int
+    answer: str = ""
+    word_count: int = 0
+    time_fit: float = 0.0
+    rank_score: float = 0.0
+    claim_flags: list[str] = field(default_factory=list)
+    rewrite_stats: list[dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class VariantRun:
+    """Shared upstream state plus every variant, best first.
+
+    Attributes:
+        shared: State after the shared stages (``question_analysis``,
+            ``rag_evidence``, ``critique``/``critic_scores`` of the raw answer).
+        base_score: Rubric score of the raw answer's critique, or None when
+            the critic's output could not be parsed (ranking is then by time
+            fit alone).
+        variants: Ranked variants; failed ones last.
+        seconds: Wall-clock time of the whole run.
+    """
+
+    shared: dict[str, Any]
+    base_score: float | None
+    variants: list[Variant]
+    seconds: float = 0.0
+
+
+def variant_grid(
+    styles: Iterable[str] | None = None, time_limits: Iterable[int] | None = None
+) -> list[tuple[str, int]]:
+    """Every (style, time limit) pair, styles outermost, in settings order."""
+    styles = list(styles) if styles is not None else list(STYLE_PRESETS)
+    time_limits = list(time_limits) if time_limits is not None else list(VALID_TIME_LIMITS)
+    return [(style, limit) for style in styles for limit in time_limits]
+
+
+def time_fit(word_count: int, word_budget: int) -> float:
+    """How well *word_count* fits *word_budget*, from 1.0 (exact) down to 0.0.
+
+    Each word short of the budget costs ``1 / budget``; each word over it
+    costs twice that.
+    """
+    if word_budget <= 0:
+        return 0.0
+    miss = (word_count - word_budget) / word_budget
+    if miss > 0:
+        miss *= _OVER_BUDGET_PENALTY
+    return max(0.0, 1.0 - abs(miss))
+
+
+def rank_variants(variants: list[Variant], base_score: float | None) -> list[Variant]:
+    """Score each variant and return them best first.
+
+    ``rank_score`` is ``base_score × time_fit`` (``10 × time_fit`` without a
+    base score), so it reads on the familiar 0–10 scale.  Ties keep grid
+    order; variants that failed sort last with a score of 0.
+    """
+    base = 10.0 if base_score is None else base_score
+    for variant in variants:
+        if variant.error:
+            variant.time_fit = variant.rank_score = 0.0
+            continue
+        variant.time_fit = round(time_fit(variant.word_count, variant.word_budget), 3)
+        variant.rank_score = round(base * variant.time_fit, 2)
+    return sorted(variants, key=lambda v: (bool(v.error), -v.rank_score))
+
+
+# ---------------------------------------------------------------------------
+# Pipeline stages
+# ---------------------------------------------------------------------------
+
+
+def shared_stages(input_state: RefinerState) -> dict[str, Any]:
+    """Run the stages every variant shares: analysis, evidence, raw critique.
+
+    The critic scores the raw answer against the selected (or default) style
+    and time limit; its fixes then guide every variant's rewrite.
+    """
+    state = dict(input_state)
+    state.update(question_understanding(state))
+    state.update(rag_research(state))
+    critique = critic({**state, "draft_answer": state["raw_answer"]}, speculate_rewrite=False)
+    # The critic's loop bookkeeping belongs to the single-answer graph
+    for key in ("loop_features", "loop_decisions"):
+        critique.pop(key, None)
+    state.update(critique)
+    return state
+
+
+def run_variant(shared: dict[str, Any], style_preset: str, time_limit: int) -> Variant:
+    """Draft, rewrite and fact-check one variant from the shared state.
+
+    Errors are caught and recorded on the returned ``Variant`` so one failed
+    call does not sink the other variants.
+    """
+    variant = Variant(
+        style_preset=style_preset,
+        time_limit=time_limit,
+        word_budget=_word_budget(time_limit, style_preset),
+    )
+    started = time.perf_counter()
+    state = {
+        **shared,
+        "style_preset": style_preset,
+        "time_limit": time_limit,
+        "iteration_count": 1,  # one rewrite, no second critic pass
+        "rewrite_stats": [],
+    }
+    try:
+        state.update(drafting(state))
+        state.update(rewrite(state))
+        state.update(claim_verifier(state))
+    except Exception as exc:
+        logger.warning("variant %s/%ss failed: %s", style_preset, time_limit, exc)
+        variant.error = str(exc) or type(exc).__name__
+    else:
+        variant.answer = state.get("refined_answer", "")
+        variant.word_count = len(variant.answer.split())
+        variant.claim_flags = list(state.get("claim_flags") or [])
+        variant.rewrite_stats = list(state.get("rewrite_stats") or [])
+    variant.seconds = round(time.perf_counter() - started, 2)
+    return variant
+
+
+def run_variants(
+    input_state: RefinerState,
+    *,
+    styles: Iterable[str] | None = None,
+    time_limits: Iterable[int] | None = None,
+    max_in_flight: int | None = None,
+    on_variant: Callable[[Variant], None] | None = None,
+) -> VariantRun:
+    """Refine one answer in every style × time limit, sharing upstream work.
+
+    Args:
+        input_state: Graph inputs as for ``build_refiner_graph`` (question,
+            raw_answer, rubric_name, persona fields).  ``style_preset`` and
+            ``time_limit`` only set the budget the raw answer is critiqued
+            against.
+        styles: Style preset keys (default: all ``STYLE_PRESETS``).
+        time_limits: Time limits in seconds (default: ``VALID_TIME_LIMITS``).
+        max_in_flight: Concurrent variants, and so concurrent LLM calls
+            (default ``VARIANT_MAX_IN_FLIGHT``).
+        on_variant: Called on the calling thread as each variant finishes,
+            e.g. to report progress.
+
+    Returns:
+        A ``VariantRun`` with the variants ranked best first.  Errors in the
+        shared stages propagate; per-variant errors are recorded on the variant.
+    """
+    started = time.perf_counter()
+    shared = shared_stages(input_state)
+
+    base_score = None
+    critic_scores = shared.get("critic_scores")
+    if critic_scores:
+        rubric = get_assets().rubric(shared.get("rubric_name", DEFAULT_RUBRIC))
+        base_score = score_with_rubric(critic_scores, rubric.definition).overall
+
+    grid = variant_grid(styles, time_limits)
+    workers = max(1, min(max_in_flight or VARIANT_MAX_IN_FLIGHT, len(grid) or 1))
+    variants: list[Variant] = []
+    with ThreadPoolExecutor(workers, thread_name_prefix="variant") as pool:
+        futures = [pool.submit(run_variant, shared, style, limit) for style, limit in grid]
+        for future in as_completed(futures):
+            variant = future.result()
+            variants.append(variant)
+            if on_variant is not None:
+                on_variant(variant)
+
+    # Restore grid order so equal scores rank deterministically
+    order = {pair: i for i, pair in enumerate(grid)}
+    variants.sort(key=lambda v: order[(v.style_preset, v.time_limit)])
+    ranked = rank_variants(variants, base_score)
+    seconds = round(time.perf_counter() - started, 2)
+    logger.info(
+        "variants: %d drafted in %.1fs (%d in flight); best %s/%ss",
+        len(ranked),
+        seconds,
+        workers,
+        ranked[0].style_preset if ranked else "-",
+        ranked[0].time_limit if ranked else "-",
+    )
+    return VariantRun(shared=shared, base_score=base_score, variants=ranked, seconds=seconds)
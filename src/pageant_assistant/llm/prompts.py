@@ -110,22 +110,23 @@ and the answer does not reference their specific stories, values, or platform).
 
 RISK SIGNALS to check for: unsupported_stat, risky_claim, controversial_framing.
 
-You MUST respond with valid JSON matching this exact structure (no markdown, no \
-commentary, just the JSON object):
+You MUST respond with valid JSON matching this exact structure, with the keys \
+in this order (no markdown, no commentary, just the JSON object):
 {{
   "overall_score": <float 0-10>,
-  "dimension_scores": [
-    {{"name": "<dimension name>", "score": <float 0-10>, "reason": "<1 line>"}}
-  ],
-  "time_fit_estimate_words": <int>,
   "top_fixes": [
     {{"type": "<fix type>", "target": "<what part>", "instruction": "<concrete edit>"}}
   ],
   "genericness_flags": ["<signal>" or empty list],
-  "risk_flags": ["<signal>" or empty list]
+  "risk_flags": ["<signal>" or empty list],
+  "time_fit_estimate_words": <int>,
+  "dimension_scores": [
+    {{"name": "<dimension name>", "score": <float 0-10>, "reason": "<1 line>"}}
+  ]
 }}
 
 RULES:
+- Decide your dimension scores first, then write them out last as shown above.
 - Score each dimension independently. Be honest — 5 means average, 8+ means excellent.
 - The overall_score is the weighted average of dimension scores.
 - Count the actual words in the draft answer for time_fit_estimate_words.
@@ -169,6 +170,49 @@ RULES:
 Write only the refined answer. No commentary."""
 )
 
+# Edit-script variant of the rewrite: the LLM returns sentence-level edits that
+# are applied locally (graphs.edits), so output tokens scale with the size of
+# the fix rather than the length of the answer.
+REWRITE_EDITS_PROMPT = (
+    """\
+You are the final polish pass. Apply the critic's feedback to the draft answer \
+by editing individual sentences — do not rewrite sentences that are already good.
+
+QUESTION: {question}
+DRAFT ANSWER (numbered sentences):
+{numbered_sentences}
+
+CRITIC FEEDBACK: {critique}
+TIME LIMIT: {time_limit} seconds (~{word_budget} words; the draft has {word_count})
+
+{persona_context}
+
+{evidence_block}
+STYLE INSTRUCTIONS:
+{style_instructions}
+
+"""
+    + _ANSWER_STRUCTURE_SHORT
+    + """
+
+RULES:
+- The first sentence MUST directly answer the question.
+- Apply the critic's top fixes. Keep the contestant's personal anchor intact.
+- Stay within ~{word_budget} words. If over, delete or shorten the weakest sentence.
+- Do NOT introduce statistics, named organisations, or claims not in the evidence.
+
+You MUST respond with valid JSON only (no markdown, no commentary):
+{{
+  "edits": [
+    {{"op": "replace", "index": <sentence number>, "text": "<new sentence(s)>"}},
+    {{"op": "insert", "index": <insert after this sentence number, 0 = at the start>, \
+"text": "<new sentence(s)>"}},
+    {{"op": "delete", "index": <sentence number>}}
+  ]
+}}
+Sentence numbers refer to the numbered draft above. Edit each sentence at most once."""
+)
+
 # ---------------------------------------------------------------------------
 # Coach Report (final formatting node)
 # NOTE: The ## section headings below are rendered by st.markdown() in the
@@ -201,6 +245,24 @@ Highlight the overall score prominently.
 - If the answer is still too long, suggest what to cut first.
 - One tip for body language or delivery."""
 
+# Optional commentary shown under the deterministic coach report (scores,
+# fixes, and flags are rendered locally, so this only covers what needs prose)
+COACH_NARRATIVE_PROMPT = """\
+You are a pageant coach. The scores and practice notes are already shown to \
+the contestant; add only a short commentary on how the answer improved.
+
+QUESTION: {question}
+ORIGINAL ANSWER: {raw_answer}
+REFINED ANSWER: {refined_answer}
+
+{structured_scores}
+
+Write a "## Coach's Commentary" section:
+- 3 bullet points on the key improvements from original to refined.
+- One delivery tip quoting the refined answer: where to pause (mark with [PAUSE]) \
+and which words to stress (mark with *emphasis*).
+Keep it under 120 words."""
+
 # ---------------------------------------------------------------------------
 # Exemplar: Model Winning Answer
 # ---------------------------------------------------------------------------
@@ -235,6 +297,31 @@ GUIDELINES:
 
 Write only the model answer. No commentary, no labels, no preamble."""
 
+# ---------------------------------------------------------------------------
+# Question bank generation (offline, see questions/generate.py)
+# ---------------------------------------------------------------------------
+QUESTION_GENERATION_PROMPT = """\
+You are a veteran pageant interview judge writing questions for contestants \
+to practise with.
+
+Write {count} NEW interview questions with these properties:
+- Pageant: {pageant}
+- Question type: {question_type}
+- Difficulty: {difficulty}
+
+EXAMPLES OF THIS KIND OF QUESTION (match the register, do NOT repeat them):
+{examples}
+
+GUIDELINES:
+- Each question must be answerable aloud in 20-40 seconds.
+- Vary the topic, angle, and wording — no two questions should be rephrasings \
+  of each other or of the examples.
+- One question per item; no numbering, no multi-part questions.
+- Variation seed: {variation} (use it to explore a different set of topics).
+
+Respond ONLY with JSON in this exact format:
+{{"questions": [{{"text": "...", "tags": ["one_or_two", "topic_tags"]}}]}}"""
+
 # ---------------------------------------------------------------------------
 # Style instructions (injected into drafting + rewrite prompts)
 # ---------------------------------------------------------------------------
@@ -2,13 +2,15 @@
 
 Uses ``requests`` (urllib3) instead of the Groq SDK (httpx) because httpx
 fails on Streamlit Community Cloud with Python 3.13.  The ``RequestsGroqChat``
-class exposes the same ``.invoke(prompt)`` interface that LangChain's
-``ChatGroq`` provides, so all graph nodes work without changes.
+class exposes the same ``.invoke(prompt)`` and ``.stream(prompt)`` interface
+that LangChain's ``ChatGroq`` provides, so all graph nodes work without changes.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from typing import Any
 
 import requests as _req
@@ -23,13 +25,14 @@ class _AIMessage:
     """Minimal stand-in for ``langchain_core.messages.AIMessage``."""
 
     content: str
+    usage: dict[str, int] = field(default_factory=dict)  # Groq token counts, if reported
 
 
 class RequestsGroqChat:
     """Drop-in replacement for ``ChatGroq`` using raw HTTP via ``requests``.
 
-    Only implements ``.invoke(prompt)`` — the single method used by every
-    graph node and RAG helper.
+    Only implements ``.invoke(prompt)`` — the method used by every graph node
+    and RAG helper — and ``.stream(prompt)``, used by the streaming critic.
     """
 
     def __init__(
@@ -82,7 +85,7 @@ class RequestsGroqChat:
                 resp.raise_for_status()
                 data = resp.json()
                 content = data["choices"][0]["message"]["content"]
-                return _AIMessage(content=content)
+                return _AIMessage(content=content, usage=data.get("usage") or {})
             except (_req.ConnectionError, _req.Timeout) as exc:
                 last_exc = exc
                 continue
@@ -93,6 +96,58 @@ class RequestsGroqChat:
             f"Failed to connect to Groq after {self.max_retries} attempts: {last_exc}"
         )
 
+    def stream(self, prompt: str | Any) -> Iterator[_AIMessage]:
+        """Stream a single-turn chat completion, yielding content deltas.
+
+        Mirrors ``ChatGroq.stream``: each yielded message holds the next piece
+        of the reply in ``.content``.  Connection errors are retried only
+        before the first chunk arrives.
+
+        Raises:
+            requests.HTTPError: On non-2xx Groq API responses.
+        """
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": str(prompt)}],
+            "temperature": self.temperature,
+            "stream": True,
+        }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+        last_exc: Exception | None = None
+        for _attempt in range(self.max_retries):
+            try:
+                resp = _req.post(
+                    _GROQ_CHAT_URL,
+                    json=payload,
+                    headers=headers,
+                    timeout=120,
+                    stream=True,
+                )
+                resp.raise_for_status()
+                break
+            except (_req.ConnectionError, _req.Timeout) as exc:
+                last_exc = exc
+        else:
+            raise ConnectionError(
+                f"Failed to connect to Groq after {self.max_retries} attempts: {last_exc}"
+            )
+
+        with resp:
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield _AIMessage(content=delta)
+
 
 def get_llm(
     role: str = "drafting",
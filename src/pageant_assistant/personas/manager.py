@@ -1,96 +1,90 @@
 """Persona manager: CRUD operations + prompt formatting for contestant personas."""
 
-import json
-from pathlib import Path
-
-from pydantic import ValidationError
-
-from pageant_assistant.config.settings import PERSONAS_DIR
+import threading
+
+from pageant_assistant.config.settings import (
+    PERSONA_CONTEXT_TOKEN_BUDGET,
+    PERSONA_RELOAD_INTERVAL_S,
+    PERSONA_STORY_TOP_K,
+    PERSONAS_DIR,
+)
 from pageant_assistant.personas.models import Persona
+from pageant_assistant.personas.store import PersonaStore
+from pageant_assistant.personas.stories import (
+    STORIES_HEADING,
+    profile_lines,
+    relevant_persona_context,
+    story_lines,
+)
 
-
-def _persona_path(persona_id: str) -> Path:
-    """Return the file path for a given persona ID."""
-    return PERSONAS_DIR / f"{persona_id}.json"
+# Module-level singleton — see _get_store()
+_store: PersonaStore | None = None
+_store_lock = threading.Lock()
 
 
-def _ensure_dir() -> None:
-    """Create the personas directory if it does not exist."""
-    PERSONAS_DIR.mkdir(parents=True, exist_ok=True)
+def _get_store() -> PersonaStore:
+    """Return the shared persona store for the current ``PERSONAS_DIR``."""
+    global _store
+    with _store_lock:
+        if _store is None or _store.directory != PERSONAS_DIR:
+            _store = PersonaStore(PERSONAS_DIR, reload_interval_s=PERSONA_RELOAD_INTERVAL_S)
+        return _store
 
 
 def list_personas() -> list[dict]:
     """Return a list of {id, name, country} for all saved personas.
 
-    Sorted alphabetically by name. Used for the sidebar dropdown.
+    Sorted alphabetically by name. Used for the sidebar dropdown.  Served
+    from the store's index: files are only re-read when they change.
     """
-    _ensure_dir()
-    personas = []
-    for f in PERSONAS_DIR.glob("*.json"):
-        try:
-            data = json.loads(f.read_text(encoding="utf-8"))
-            personas.append(
-                {
-                    "id": data["id"],
-                    "name": data["name"],
-                    "country": data.get("country", ""),
-                }
-            )
-        except (json.JSONDecodeError, KeyError):
-            continue
-    return sorted(personas, key=lambda p: p["name"].lower())
+    return _get_store().list()
 
 
 def load_persona(persona_id: str) -> Persona | None:
     """Load a single persona by ID. Returns None if not found or invalid."""
-    path = _persona_path(persona_id)
-    if not path.exists():
-        return None
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return Persona(**data)
-    except (json.JSONDecodeError, ValidationError):
-        return None
+    return _get_store().load(persona_id)
 
 
 def save_persona(persona: Persona) -> Persona:
     """Save a persona to disk. Creates or overwrites the file."""
-    _ensure_dir()
-    path = _persona_path(persona.id)
-    path.write_text(persona.model_dump_json(indent=2), encoding="utf-8")
-    return persona
+    return _get_store().save(persona)
 
 
 def delete_persona(persona_id: str) -> bool:
     """Delete a persona file. Returns True if deleted, False if not found."""
-    path = _persona_path(persona_id)
-    if path.exists():
-        path.unlink()
-        return True
-    return False
+    return _get_store().delete(persona_id)
 
 
-def format_persona_context(persona: Persona) -> str:
+def format_persona_context(
+    persona: Persona,
+    question: str | None = None,
+    *,
+    top_k: int = PERSONA_STORY_TOP_K,
+    token_budget: int = PERSONA_CONTEXT_TOKEN_BUDGET,
+) -> str:
     """Format a Persona into a text block for prompt injection.
 
     Returns an empty string if persona is None.
+
+    Args:
+        persona: The active persona.
+        question: When given, include only the *top_k* stories most relevant
+            to it that fit *token_budget* (see ``personas.stories``);
+            otherwise include every story.
+        top_k: Maximum number of stories when *question* is given.
+        token_budget: Approximate token limit for the block when *question*
+            is given.
     """
     if persona is None:
         return ""
+    if question is not None:
+        return relevant_persona_context(persona, question, top_k, token_budget)
 
-    lines = [
-        "CONTESTANT PROFILE:",
-        f"- Name: {persona.name}",
-        f"- Country: {persona.country}",
-        f"- Platform/Advocacy: {persona.platform}",
-        f"- Core Values: {', '.join(persona.values)}",
-    ]
-
+    lines = profile_lines(persona)
     if persona.personal_stories:
         lines.append("")
-        lines.append("PERSONAL STORIES (draw from these for authentic personal anchors):")
+        lines.append(STORIES_HEADING)
         for i, story in enumerate(persona.personal_stories, 1):
-            lines.append(f'{i}. "{story.title}" -- {story.text}')
-            lines.append(f"   Key lesson: {story.key_lesson}")
+            lines.extend(story_lines(i, story))
 
     return "\n".join(lines)
@@ -0,0 +1,225 @@
+"""Indexed persona storage: JSON files on disk, O(1) listing and loading.
+
+Each persona stays a ``<id>.json`` file in ``PERSONAS_DIR`` (the format
+``save_persona`` has always written), but reads no longer glob and parse
+the whole directory:
+
+- A manifest (``.persona_index.json``) maps each file's (mtime, size) stamp
+  to the persona's id, name, and country, so a cold start only parses files
+  that changed since the manifest was written.
+- An in-process cache holds the sorted listing and parsed ``Persona``
+  objects.  ``save``/``delete`` update it directly.  Changes made outside
+  the app are picked up too: a listing costs one directory scan with a
+  ``stat`` per file (an in-place edit leaves the directory's mtime alone,
+  so each file is checked, as ``assets.registry`` does), at most every
+  ``reload_interval_s`` seconds, and a load one ``stat`` of the persona's
+  file.
+
+Writes go through a temp file and ``os.replace`` so a reader never sees a
+half-written persona.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from pageant_assistant.personas.models import Persona
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".persona_index.json"
+
+Stamp = tuple[int, int]  # (mtime_ns, size)
+
+
+def _stamp(st: os.stat_result) -> Stamp:
+    return st.st_mtime_ns, st.st_size
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class PersonaStore:
+    """Cached, manifest-indexed access to a directory of persona JSON files.
+
+    Args:
+        directory: The personas directory (created if missing).
+        reload_interval_s: Minimum seconds between directory scans for
+            changes made outside the app; 0 scans on every listing.
+
+    Example:
+        >>> store = PersonaStore(Path("data/personas"))
+        >>> _ = store.save(Persona(id="p1", name="Ama", country="Ghana", platform="Literacy"))
+        >>> store.list()
+        [{'id': 'p1', 'name': 'Ama', 'country': 'Ghana'}]
+    """
+
+    def __init__(self, directory: Path, reload_interval_s: float = 0.0) -> None:
+        self.directory = directory
+        self.reload_interval_s = reload_interval_s
+        self._checked_at = float("-inf")
+        self._lock = threading.RLock()
+        # file name -> (stamp, summary or None for an unreadable file)
+        self._entries: dict[str, tuple[Stamp, dict[str, str] | None]] = {}
+        self._personas: dict[str, tuple[Stamp, Persona]] = {}
+        self._listing: list[dict[str, str]] | None = None
+        self._load_manifest()
+
+    # -- manifest ------------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    def _load_manifest(self) -> None:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            self._entries = {
+                name: ((entry["mtime_ns"], entry["size"]), entry.get("summary"))
+                for name, entry in data.get("files", {}).items()
+            }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("PersonaStore: ignoring unreadable manifest (%s)", exc)
+
+    def _save_manifest(self) -> None:
+        data = {
+            "files": {
+                name: {"mtime_ns": stamp[0], "size": stamp[1], "summary": summary}
+                for name, (stamp, summary) in self._entries.items()
+            }
+        }
+        try:
+            _atomic_write(self.manifest_path, json.dumps(data, ensure_ascii=False))
+        except OSError as exc:
+            logger.warning("PersonaStore: could not write manifest (%s)", exc)
+
+    # -- reconciliation ------------------------------------------------------
+
+    def _path(self, persona_id: str) -> Path:
+        return self.directory / f"{persona_id}.json"
+
+    @staticmethod
+    def _summary(data: Any) -> dict[str, str] | None:
+        try:
+            return {"id": data["id"], "name": data["name"], "country": data.get("country", "")}
+        except (KeyError, TypeError):
+            return None
+
+    def _refresh(self, force: bool = False) -> None:
+        """Re-stat every persona file and re-parse only those whose stamp changed.
+
+        Skipped within ``reload_interval_s`` of the last scan unless *force*.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval_s:
+            return
+        self._checked_at = now
+        current: dict[str, Stamp] = {}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and not entry.name.startswith("."):
+                        try:
+                            current[entry.name] = _stamp(entry.stat())
+                        except OSError:
+                            continue
+        except OSError as exc:
+            logger.warning("PersonaStore: cannot read %s (%s)", self.directory, exc)
+            return
+
+        changed = False
+        for name in list(self._entries):
+            if name not in current:
+                del self._entries[name]
+                changed = True
+        for name, stamp in current.items():
+            known = self._entries.get(name)
+            if known is not None and known[0] == stamp:
+                continue
+            try:
+                summary = self._summary(json.loads((self.directory / name).read_text("utf-8")))
+            except (OSError, ValueError):
+                summary = None
+            self._entries[name] = (stamp, summary)
+            changed = True
+
+        if changed:
+            self._listing = None
+            self._save_manifest()
+
+    # -- public API ----------------------------------------------------------
+
+    def list(self) -> list[dict[str, str]]:
+        """Return ``{id, name, country}`` for every readable persona, sorted by name."""
+        with self._lock:
+            self._refresh()
+            if self._listing is None:
+                self._listing = sorted(
+                    (dict(s) for _, s in self._entries.values() if s is not None),
+                    key=lambda p: p["name"].lower(),
+                )
+            return [dict(p) for p in self._listing]
+
+    def load(self, persona_id: str) -> Persona | None:
+        """Return the persona, parsing its file only if it changed since last load."""
+        path = self._path(persona_id)
+        try:
+            stamp = _stamp(path.stat())
+        except OSError:
+            with self._lock:
+                self._personas.pop(persona_id, None)
+            return None
+        with self._lock:
+            cached = self._personas.get(persona_id)
+            if cached is not None and cached[0] == stamp:
+                return cached[1].model_copy(deep=True)
+        try:
+            persona = Persona(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError, ValidationError):
+            return None
+        with self._lock:
+            self._personas[persona_id] = (stamp, persona)
+        return persona.model_copy(deep=True)
+
+    def save(self, persona: Persona) -> Persona:
+        """Write *persona* atomically and update the index and caches."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(persona.id)
+            _atomic_write(path, persona.model_dump_json(indent=2))
+            stamp = _stamp(path.stat())
+            self._entries[path.name] = (stamp, self._summary(persona.model_dump()))
+            self._personas[persona.id] = (stamp, persona.model_copy(deep=True))
+            self._refresh(force=True)  # picks up any external changes too
+            self._listing = None
+            self._save_manifest()
+        return persona
+
+    def delete(self, persona_id: str) -> bool:
+        """Remove the persona's file; returns False if it did not exist."""
+        with self._lock:
+            path = self._path(persona_id)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                return False
+            self._personas.pop(persona_id, None)
+            self._entries.pop(path.name, None)
+            self._refresh(force=True)
+            self._listing = None
+            self._save_manifest()
+        return True
@@ -0,0 +1,169 @@
+"""Relevance-ranked, token-budgeted selection of persona stories.
+
+The persona block is injected into the drafting, critic, and rewrite
+prompts, so dumping every ``PersonalStory`` makes three prompts per run grow
+with the contestant's story count.  Instead each run gets only the stories
+most relevant to the current question:
+
+1. Stories are embedded once per persona version (the embedding model of
+   ``rag.embeddings``) into a small unit-norm matrix.
+2. The question is embedded and stories are ranked by cosine similarity.
+3. Stories are taken in rank order, up to ``top_k``, while the whole block
+   stays within ``token_budget`` (estimated at ~4 characters per token).
+
+The formatted block is cached per (persona version, question), so reruns
+of the same question cost nothing.  A persona version is a digest of its
+content, so editing a persona invalidates both caches.  If embedding fails,
+stories keep their saved order (and the block is not cached).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from pageant_assistant.personas.models import Persona, PersonalStory
+from pageant_assistant.rag.cache import normalise_question
+
+logger = logging.getLogger(__name__)
+
+_MATRIX_CACHE_SIZE = 64  # personas whose story embeddings are kept
+_BLOCK_CACHE_SIZE = 512  # formatted (persona version, question) blocks
+
+_matrices: OrderedDict[str, np.ndarray] = OrderedDict()
+_blocks: OrderedDict[tuple[Any, ...], str] = OrderedDict()
+_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count (~4 characters per token for English)."""
+    return (len(text) + 3) // 4
+
+
+def persona_version(persona: Persona) -> str:
+    """Digest of the persona's content; changes whenever it is edited."""
+    return hashlib.sha256(persona.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+
+def profile_lines(persona: Persona) -> list[str]:
+    """The profile header of the persona block."""
+    return [
+        "CONTESTANT PROFILE:",
+        f"- Name: {persona.name}",
+        f"- Country: {persona.country}",
+        f"- Platform/Advocacy: {persona.platform}",
+        f"- Core Values: {', '.join(persona.values)}",
+    ]
+
+
+STORIES_HEADING = "PERSONAL STORIES (draw from these for authentic personal anchors):"
+
+
+def story_lines(number: int, story: PersonalStory) -> list[str]:
+    """The prompt lines for one numbered story."""
+    return [
+        f'{number}. "{story.title}" -- {story.text}',
+        f"   Key lesson: {story.key_lesson}",
+    ]
+
+
+def _remember(cache: OrderedDict, key: Any, value: Any, limit: int) -> None:
+    with _lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+
+def _embed(texts: list[str]) -> np.ndarray:
+    from pageant_assistant.rag.embeddings import get_embedding_function
+
+    matrix = np.asarray(get_embedding_function()(texts), dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def rank_stories(persona: Persona, question: str, version: str | None = None) -> list[int] | None:
+    """Return story indices ordered by relevance to *question* (best first).
+
+    Returns None if embedding is unavailable.
+    """
+    stories = persona.personal_stories
+    if len(stories) <= 1:
+        return list(range(len(stories)))
+    version = version or persona_version(persona)
+    try:
+        with _lock:
+            matrix = _matrices.get(version)
+        if matrix is None:
+            matrix = _embed([f"{s.title}. {s.text} {s.key_lesson}" for s in stories])
+            _remember(_matrices, version, matrix, _MATRIX_CACHE_SIZE)
+        scores = matrix @ _embed([question])[0]
+    except Exception as exc:
+        logger.warning("rank_stories: embedding failed (%s) — keeping saved order", exc)
+        return None
+    return [int(i) for i in np.argsort(-scores, kind="stable")]
+
+
+def relevant_persona_context(persona: Persona, question: str, top_k: int, token_budget: int) -> str:
+    """Format the persona block with the stories most relevant to *question*.
+
+    The profile header is always included; stories are added in relevance
+    order, skipping any that would push the block past *token_budget*.
+
+    Args:
+        persona: The active persona.
+        question: The question being answered.
+        top_k: Maximum number of stories.
+        token_budget: Approximate token limit for the whole block.
+
+    Returns:
+        The formatted block (cached per persona version and question).
+    """
+    version = persona_version(persona)
+    key = (version, normalise_question(question), top_k, token_budget)
+    with _lock:
+        block = _blocks.get(key)
+        if block is not None:
+            _blocks.move_to_end(key)
+            return block
+
+    lines = profile_lines(persona)
+    stories = persona.personal_stories
+    used = estimate_tokens("\n".join(lines)) + (estimate_tokens(STORIES_HEADING) if stories else 0)
+    costs = [estimate_tokens("\n".join(story_lines(i, s))) for i, s in enumerate(stories, 1)]
+    ranked: list[int] | None = list(range(len(stories)))
+    if len(stories) > top_k or used + sum(costs) > token_budget:  # else everything fits
+        ranked = rank_stories(persona, question, version)
+    order = ranked if ranked is not None else range(len(stories))
+
+    chosen: list[str] = []
+    count = 0
+    for i in order:
+        if count >= top_k:
+            break
+        candidate = story_lines(count + 1, stories[i])
+        cost = estimate_tokens("\n".join(candidate))
+        if used + cost > token_budget:
+            continue
+        chosen += candidate
+        used += cost
+        count += 1
+    if chosen:
+        lines += ["", STORIES_HEADING, *chosen]
+    block = "\n".join(lines)
+    if ranked is not None:  # retry the ranking next time rather than cache a fallback
+        _remember(_blocks, key, block, _BLOCK_CACHE_SIZE)
+    return block
+
+
+def clear_story_caches() -> None:
+    """Drop cached story embeddings and formatted blocks (for tests/tools)."""
+    with _lock:
+        _matrices.clear()
+        _blocks.clear()
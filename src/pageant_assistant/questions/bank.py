@@ -1,20 +1,112 @@
-"""Question bank: load, filter, and randomly select pageant questions."""
+"""Question bank: load, filter, and randomly select pageant questions.
+
+Questions live in a ``QuestionStore`` (SQLite compiled from
+``question_bank.json`` plus any JSONL shards).  Filtering goes through a
+``QuestionIndex`` (facet posting lists over ids; full questions are fetched
+lazily), and sessions draw through a ``QuestionCursor`` so questions do not
+repeat until the filtered pool is exhausted.
+
+Hot reload: at most every ``QUESTION_RELOAD_INTERVAL_S`` seconds the source
+files are stat-ed; if any changed, the store re-imports them and the index
+is rebuilt — no Streamlit restart needed.
+"""
 
-import functools
-import json
 import random
+import threading
+import time
 
-from pageant_assistant.config.settings import QUESTIONS_DIR
+from pageant_assistant.config.settings import (
+    QUESTION_DB,
+    QUESTION_RELOAD_INTERVAL_S,
+    QUESTION_SHARDS_DIR,
+    QUESTIONS_DIR,
+)
+from pageant_assistant.questions.index import QuestionCursor, QuestionIndex
+from pageant_assistant.questions.store import QuestionStore
 
 QUESTIONS_FILE = QUESTIONS_DIR / "question_bank.json"
 
+# Module-level singletons — see get_question_index()
+_store: QuestionStore | None = None
+_index: QuestionIndex | None = None
+_index_stamp: tuple = ()
+_checked_at = 0.0
+_questions: tuple[QuestionIndex | None, tuple[dict, ...]] = (None, ())
+_lock = threading.Lock()
+
+# Display labels for known facet values; values found in the bank but not
+# listed here are labelled from their id (``"miss_supranational"`` → "Miss Supranational")
+_FILTER_LABELS: dict[str, dict[str, str]] = {
+    "pageant_type": {
+        "any": "Any Pageant",
+        "miss_universe": "Miss Universe",
+        "miss_world": "Miss World",
+        "miss_usa": "Miss USA",
+        "miss_grand": "Miss Grand International",
+        "miss_earth": "Miss Earth",
+        "miss_charm": "Miss Charm",
+        "general": "General",
+    },
+    "question_type": {
+        "any": "Any Type",
+        "personal": "Personal",
+        "issues_based": "Issues-Based",
+        "advocacy": "Advocacy",
+        "leadership": "Leadership",
+        "fun_creative": "Fun / Creative",
+    },
+    "difficulty": {
+        "any": "Any Difficulty",
+        "beginner": "Beginner",
+        "intermediate": "Intermediate",
+        "advanced": "Advanced",
+    },
+}
+
+
+def get_question_store() -> QuestionStore:
+    """Return the shared question store (lazily opened)."""
+    global _store
+    with _lock:
+        if _store is None:
+            _store = QuestionStore(QUESTION_DB, QUESTIONS_FILE, QUESTION_SHARDS_DIR)
+        return _store
+
+
+def get_question_index() -> QuestionIndex:
+    """Return the facet index, rebuilding it when a bank source has changed.
+
+    Source files are checked at most every ``QUESTION_RELOAD_INTERVAL_S``
+    seconds, so draws in between cost no I/O.
+    """
+    global _index, _index_stamp, _checked_at
+    index = _index
+    if index is not None and time.monotonic() - _checked_at < QUESTION_RELOAD_INTERVAL_S:
+        return index
+    store = get_question_store()
+    with _lock:
+        stamp = store.stamp()
+        if _index is None or stamp != _index_stamp:
+            store.sync()
+            _index = QuestionIndex(store.iter_facets(), fetch=store.get)
+            _index_stamp = stamp
+        _checked_at = time.monotonic()
+        return _index
+
 
-@functools.lru_cache(maxsize=1)
 def load_questions() -> tuple[dict, ...]:
-    """Load the full question bank from JSON (cached for process lifetime)."""
-    with open(QUESTIONS_FILE, encoding="utf-8") as f:
-        data = json.load(f)
-    return tuple(data["questions"])
+    """Return the full question bank (cached until a source file changes).
+
+    Materialises every question; large banks should prefer
+    ``get_random_question`` / ``get_question_index``, which load lazily.
+    """
+    global _questions
+    index = get_question_index()
+    cached_for, questions = _questions
+    if cached_for is not index:
+        questions = tuple(get_question_store().iter_questions())
+        _questions = (index, questions)
+    return questions
 
 
 def get_random_question(
@@ -22,6 +114,8 @@ def get_random_question(
     question_type: str | None = None,
     difficulty: str | None = None,
     exclude_ids: set[str] | None = None,
+    tags: list[str] | None = None,
+    cursor: QuestionCursor | None = None,
 ) -> dict:
     """Return one random question, optionally filtered.
 
@@ -29,56 +123,60 @@ def get_random_question(
         pageant_type: Filter by pageant (e.g. "miss_universe"). None = any.
         question_type: Filter by type (e.g. "personal"). None = any.
         difficulty: Filter by difficulty (e.g. "beginner"). None = any.
-        exclude_ids: Set of question IDs already shown this session.
+        exclude_ids: Set of question IDs already shown this session.  Prefer
+            *cursor*, which avoids repeats without an ever-growing set.
+        tags: Only questions carrying every one of these tags.
+        cursor: The session's ``QuestionCursor``; draws walk the filtered
+            pool in shuffled order and repeat only after exhausting it.
 
     Returns:
         A question dict with id, text, pageant_type, question_type, difficulty, tags.
+
+    Example:
+        >>> cursor = QuestionCursor()
+        >>> first = get_random_question(question_type="personal", cursor=cursor)
+        >>> get_random_question(question_type="personal", cursor=cursor) != first
+        True
     """
-    questions = load_questions()
-
-    if pageant_type and pageant_type != "any":
-        questions = [q for q in questions if q["pageant_type"] == pageant_type]
-    if question_type and question_type != "any":
-        questions = [q for q in questions if q["question_type"] == question_type]
-    if difficulty and difficulty != "any":
-        questions = [q for q in questions if q["difficulty"] == difficulty]
-    if exclude_ids:
-        questions = [q for q in questions if q["id"] not in exclude_ids]
+    index = get_question_index()
+    if not len(index):
+        raise RuntimeError("Question bank is empty or could not be loaded.")
 
-    # Fallback: if all questions exhausted or filters too narrow, reset
-    if not questions:
-        questions = load_questions()
-        if not questions:
-            raise RuntimeError("Question bank is empty or could not be loaded.")
+    filters = (pageant_type, question_type, difficulty, tuple(tags or ()))
+    pool = index.select(pageant_type, question_type, difficulty, tags)
+    # Fallback: if filters too narrow, draw from the whole bank
+    if not len(pool):
+        pool, filters = index.select(), None
 
-    return random.choice(questions)
+    if cursor is not None:
+        return index.question(cursor.next_position(pool, key=(index, filters)))
+
+    if exclude_ids:
+        # Rejection sampling stays O(1) per draw while most of the pool is unseen
+        for _ in range(32):
+            pos = int(pool[random.randrange(len(pool))])
+            if index.ids[pos] not in exclude_ids:
+                return index.question(pos)
+        remaining = [int(p) for p in pool if index.ids[p] not in exclude_ids]
+        # All questions in the pool already shown: reset
+        return index.question(random.choice(remaining) if remaining else int(random.choice(pool)))
+
+    return index.question(int(pool[random.randrange(len(pool))]))
 
 
 def get_filter_options() -> dict:
-    """Return available filter values for UI dropdowns."""
-    return {
-        "pageant_type": [
-            ("any", "Any Pageant"),
-            ("miss_universe", "Miss Universe"),
-            ("miss_world", "Miss World"),
-            ("miss_usa", "Miss USA"),
-            ("miss_grand", "Miss Grand International"),
-            ("miss_earth", "Miss Earth"),
-            ("miss_charm", "Miss Charm"),
-            ("general", "General"),
-        ],
-        "question_type": [
-            ("any", "Any Type"),
-            ("personal", "Personal"),
-            ("issues_based", "Issues-Based"),
-            ("advocacy", "Advocacy"),
-            ("leadership", "Leadership"),
-            ("fun_creative", "Fun / Creative"),
-        ],
-        "difficulty": [
-            ("any", "Any Difficulty"),
-            ("beginner", "Beginner"),
-            ("intermediate", "Intermediate"),
-            ("advanced", "Advanced"),
-        ],
-    }
+    """Return available filter values for UI dropdowns.
+
+    Values come from the question index, so only pageants, types, and
+    difficulties that actually have questions are offered.
+    """
+    index = get_question_index()
+    options: dict[str, list[tuple[str, str]]] = {}
+    for facet, labels in _FILTER_LABELS.items():
+        present = index.values(facet)
+        known = [v for v in labels if v in present]
+        extra = sorted(v for v in present if v not in labels)
+        options[facet] = [("any", labels["any"])] + [
+            (v, labels.get(v) or v.replace("_", " ").title()) for v in known + extra
+        ]
+    return options
@@ -0,0 +1,679 @@
+"""Offline LLM generation of question-bank variants at scale.
+
+Grows the bank from a hundred hand-written questions to tens of thousands by
+asking the LLM for batches of new questions per (pageant, question type,
+difficulty) cell:
+
+- **Fan-out**: generation jobs run on a thread pool (the Groq client is
+  blocking ``requests``) behind a shared ``RateLimiter``; only a bounded
+  number of jobs is in flight, so memory does not grow with the plan size.
+- **Dedup**: every candidate is checked against the existing bank and
+  everything accepted so far — first MinHash/LSH over character shingles
+  (near-verbatim rewordings), then cosine similarity of embeddings
+  (paraphrases that share few characters).
+- **Output**: accepted questions get content-derived ids (``g-<hash>``) and
+  are streamed to JSONL shards in ``QUESTION_SHARDS_DIR``, the format
+  ``QuestionStore`` imports.  Shards are written as ``.jsonl.part`` and
+  renamed when full, so the running app's hot reload never sees a
+  half-written file.
+
+Usage:
+    python -m pageant_assistant.questions.generate --per-cell 200 --workers 4 --rpm 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from pageant_assistant.config.settings import QUESTION_DUPLICATE_THRESHOLD, QUESTION_SHARDS_DIR
+from pageant_assistant.llm.prompts import QUESTION_GENERATION_PROMPT
+from pageant_assistant.questions.semantic import text_hash
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str]], Any]
+
+DEFAULT_BATCH_SIZE = 10  # questions requested per LLM call
+DEFAULT_SHARD_SIZE = 5000  # questions per JSONL shard
+MINHASH_THRESHOLD = 0.7  # estimated Jaccard similarity treated as a duplicate
+
+_MINHASH_PERM = 64
+_LSH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+_SHINGLE = 5
+_PRIME = (1 << 31) - 1
+_RETRIES = 3
+_RETRY_BACKOFF_S = 2.0
+_MIN_WORDS = 4
+_EXAMPLES_PER_PROMPT = 5
+
+_DISPLAY = {
+    "general": "Any pageant",
+    "issues_based": "issues-based",
+    "fun_creative": "fun / creative",
+}
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Spaces calls evenly to at most *per_minute* across all threads.
+
+    Args:
+        per_minute: Allowed calls per minute (0 disables limiting).
+        clock: Monotonic time source (injectable for tests).
+        sleep: Sleep function (injectable for tests).
+
+    Example:
+        >>> limiter = RateLimiter(per_minute=600)
+        >>> limiter.acquire()  # returns immediately, the next call waits 0.1 s
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller may make its call."""
+        if not self._interval:
+            return
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            self._sleep(start - now)
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate detection
+# ---------------------------------------------------------------------------
+
+
+def _normalise(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+
+
+def _shingles(text: str) -> set[str]:
+    norm = _normalise(text)
+    if len(norm) <= _SHINGLE:
+        return {norm}
+    return {norm[i : i + _SHINGLE] for i in range(len(norm) - _SHINGLE + 1)}
+
+
+class MinHashLSH:
+    """MinHash signatures with banded locality-sensitive hashing.
+
+    Signatures are ``_MINHASH_PERM`` uint32 values per text (256 bytes), kept
+    in one growing array; buckets map a band's hash to the rows sharing it.
+
+    Args:
+        threshold: Estimated Jaccard similarity (over character shingles) at
+            or above which a candidate counts as a duplicate.
+        seed: Seed for the hash permutations.
+
+    Example:
+        >>> lsh = MinHashLSH()
+        >>> lsh.add("What inspires you to compete?")
+        0
+        >>> lsh.duplicate_of("What inspires you to compete today?")
+        0
+    """
+
+    def __init__(self, threshold: float = MINHASH_THRESHOLD, seed: int = 1) -> None:
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, _MINHASH_PERM, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, _MINHASH_PERM, dtype=np.uint64)
+        self._rows = _MINHASH_PERM // _LSH_BANDS
+        self._signatures = np.empty((1024, _MINHASH_PERM), dtype=np.uint32)
+        self._count = 0
+        self._buckets: list[dict[int, int | list[int]]] = [{} for _ in range(_LSH_BANDS)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def signature(self, text: str) -> np.ndarray:
+        """Return the MinHash signature of *text*."""
+        digests = b"".join(
+            hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest() for s in _shingles(text)
+        )
+        hashes = np.frombuffer(digests, dtype=np.uint32).astype(np.uint64) % _PRIME
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+
+    def _bands(self, signature: np.ndarray) -> Iterator[tuple[int, int]]:
+        for band in range(_LSH_BANDS):
+            yield band, hash(signature[band * self._rows : (band + 1) * self._rows].tobytes())
+
+    def duplicate_of(self, text: str, signature: np.ndarray | None = None) -> int | None:
+        """Return the row of an added text *text* near-duplicates, or None."""
+        signature = self.signature(text) if signature is None else signature
+        seen: set[int] = set()
+        for band, key in self._bands(signature):
+            rows = self._buckets[band].get(key)
+            if rows is None:
+                continue
+            for row in rows if isinstance(rows, list) else (rows,):
+                if row in seen:
+                    continue
+                seen.add(row)
+                if np.mean(self._signatures[row] == signature) >= self.threshold:
+                    return row
+        return None
+
+    def add(self, text: str, signature: np.ndarray | None = None) -> int:
+        """Index *text* and return its row."""
+        signature = self.signature(text) if signature is None else signature
+        if self._count == len(self._signatures):
+            self._signatures = np.resize(self._signatures, (2 * self._count, _MINHASH_PERM))
+        row = self._count
+        self._signatures[row] = signature
+        self._count += 1
+        for band, key in self._bands(signature):
+            bucket = self._buckets[band]
+            rows = bucket.get(key)
+            if rows is None:
+                bucket[key] = row
+            elif isinstance(rows, list):
+                rows.append(row)
+            else:
+                bucket[key] = [rows, row]
+        return row
+
+
+class QuestionDeduplicator:
+    """Rejects questions that repeat the bank or each other.
+
+    Two stages: ``MinHashLSH`` catches rewordings that share most of their
+    characters cheaply; the embedding check (when *embed_fn* is given)
+    catches paraphrases.  Accepted questions join both indexes, so later
+    candidates are checked against them too.
+
+    Args:
+        embed_fn: Batch embedding function; None skips the embedding stage.
+        minhash_threshold: Estimated Jaccard similarity treated as a duplicate.
+        embedding_threshold: Cosine similarity treated as a duplicate.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn | None = None,
+        *,
+        minhash_threshold: float = MINHASH_THRESHOLD,
+        embedding_threshold: float = QUESTION_DUPLICATE_THRESHOLD,
+    ) -> None:
+        self.embed_fn = embed_fn
+        self.embedding_threshold = embedding_threshold
+        self.lsh = MinHashLSH(minhash_threshold)
+        self._existing: np.ndarray | None = None  # bank vectors (may be memory-mapped)
+        self._accepted = np.empty((0, 0), dtype=np.float32)
+        self._accepted_count = 0
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        matrix = np.asarray(self.embed_fn(texts), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def add_existing(
+        self, questions: Iterable[dict[str, Any]], vectors: np.ndarray | None = None
+    ) -> int:
+        """Index the current bank (streamed); *vectors* are its precomputed embeddings.
+
+        Returns:
+            Number of bank questions indexed.
+        """
+        texts: list[str] = []
+        batches: list[np.ndarray] = []
+        count = 0
+        for q in questions:
+            self.lsh.add(q["text"])
+            count += 1
+            if self.embed_fn is not None and vectors is None:
+                texts.append(q["text"])
+                if len(texts) >= 256:
+                    batches.append(self._embed(texts))
+                    texts = []
+        if self.embed_fn is not None:
+            if vectors is None:
+                if texts:
+                    batches.append(self._embed(texts))
+                vectors = np.concatenate(batches) if batches else None
+            self._existing = vectors
+        return count
+
+    def _accept_vector(self, vector: np.ndarray) -> None:
+        if self._accepted_count == len(self._accepted):
+            grown = np.empty((max(1024, 2 * self._accepted_count), len(vector)), np.float32)
+            grown[: self._accepted_count] = self._accepted[: self._accepted_count]
+            self._accepted = grown
+        self._accepted[self._accepted_count] = vector
+        self._accepted_count += 1
+
+    def _embedding_duplicate(self, vector: np.ndarray) -> bool:
+        for matrix in (self._existing, self._accepted[: self._accepted_count]):
+            if (
+                matrix is not None
+                and len(matrix)
+                and float((matrix @ vector).max()) >= (self.embedding_threshold)
+            ):
+                return True
+        return False
+
+    def filter(self, texts: list[str]) -> tuple[list[bool], int, int]:
+        """Decide which of *texts* to keep, and index the kept ones.
+
+        Returns:
+            ``(keep flags, MinHash duplicates, embedding duplicates)``.
+        """
+        keep = [False] * len(texts)
+        survivors: list[tuple[int, np.ndarray]] = []
+        minhash_dups = 0
+        for i, text in enumerate(texts):
+            signature = self.lsh.signature(text)
+            if self.lsh.duplicate_of(text, signature) is not None:
+                minhash_dups += 1
+                continue
+            # Index now so later texts in the same batch are checked against it
+            self.lsh.add(text, signature)
+            survivors.append((i, signature))
+
+        embedding_dups = 0
+        vectors: np.ndarray | None = None
+        if self.embed_fn is not None and survivors:
+            vectors = self._embed([texts[i] for i, _ in survivors])
+        for j, (i, _) in enumerate(survivors):
+            if vectors is not None:
+                if self._embedding_duplicate(vectors[j]):
+                    embedding_dups += 1
+                    continue
+                self._accept_vector(vectors[j])
+            keep[i] = True
+        return keep, minhash_dups, embedding_dups
+
+
+# ---------------------------------------------------------------------------
+# Generation jobs
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class GenerationJob:
+    """One LLM call: *count* questions for a (pageant, type, difficulty) cell."""
+
+    pageant_type: str
+    question_type: str
+    difficulty: str
+    count: int
+    variation: int = 0
+
+
+@dataclass
+class GenerationStats:
+    """Counters reported by ``generate_questions``."""
+
+    jobs: int = 0
+    jobs_failed: int = 0
+    generated: int = 0
+    invalid: int = 0
+    duplicate_minhash: int = 0
+    duplicate_embedding: int = 0
+    accepted: int = 0
+    shards: list[Path] = field(default_factory=list)
+
+
+def plan_jobs(
+    pageant_types: Iterable[str],
+    question_types: Iterable[str],
+    difficulties: Iterable[str],
+    per_cell: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[GenerationJob]:
+    """Yield jobs requesting *per_cell* questions for every combination.
+
+    Cells are interleaved (one job per cell per round) so a partial run still
+    covers every cell evenly.
+
+    Example:
+        >>> [j.count for j in plan_jobs(["general"], ["personal"], ["beginner"], 25)]
+        [10, 10, 5]
+    """
+    cells = list(product(pageant_types, question_types, difficulties))
+    for variation, start in enumerate(range(0, per_cell, batch_size)):
+        count = min(batch_size, per_cell - start)
+        for pageant, q_type, difficulty in cells:
+            yield GenerationJob(pageant, q_type, difficulty, count, variation)
+
+
+def _label(value: str) -> str:
+    return _DISPLAY.get(value) or value.replace("_", " ")
+
+
+def build_generation_prompt(job: GenerationJob, examples: list[str]) -> str:
+    """Render ``QUESTION_GENERATION_PROMPT`` for *job* with a few bank examples."""
+    return QUESTION_GENERATION_PROMPT.format(
+        count=job.count,
+        pageant=_label(job.pageant_type).title() if job.pageant_type != "general" else "Any",
+        question_type=_label(job.question_type),
+        difficulty=job.difficulty,
+        examples="\n".join(f"- {e}" for e in examples) or "- (none yet)",
+        variation=job.variation,
+    )
+
+
+def parse_generated(content: str) -> list[dict[str, Any]]:
+    """Parse the LLM reply into ``{"text", "tags"}`` items, dropping unusable ones.
+
+    Raises:
+        json.JSONDecodeError: If the reply is not JSON.
+    """
+    content = re.sub(r"^```(?:json)?\s*", "", content.strip())
+    content = re.sub(r"\s*```$", "", content.strip())
+    data = json.loads(content)
+    items = data.get("questions", []) if isinstance(data, dict) else data
+    parsed = []
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, str):
+            item = {"text": item}
+        if not isinstance(item, dict) or not isinstance(item.get("text"), str):
+            continue
+        text = " ".join(item["text"].split())
+        tags = item.get("tags") if isinstance(item.get("tags"), list) else []
+        parsed.append(
+            {"text": text, "tags": [str(t).strip().lower().replace(" ", "_") for t in tags][:4]}
+        )
+    return parsed
+
+
+def _valid(text: str) -> bool:
+    return len(text.split()) >= _MIN_WORDS and len(text) <= 300
+
+
+def _run_job(
+    job: GenerationJob, llm: Any, limiter: RateLimiter, examples: list[str]
+) -> list[dict[str, Any]]:
+    """Call the LLM for one job, retrying transient failures with backoff."""
+    prompt = build_generation_prompt(job, examples)
+    for attempt in range(_RETRIES):
+        limiter.acquire()
+        try:
+            return parse_generated(llm.invoke(prompt).content)
+        except Exception as exc:
+            if attempt == _RETRIES - 1:
+                raise
+            logger.info("Generation job %s failed (%s) — retrying", job, exc)
+            time.sleep(_RETRY_BACKOFF_S * 2**attempt)
+    return []
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+class ShardWriter:
+    """Streams questions into rotating JSONL shards.
+
+    Each shard is written as ``<name>.jsonl.part`` (ignored by
+    ``QuestionStore``) and renamed to ``.jsonl`` once it holds *shard_size*
+    questions or the writer closes.
+
+    Args:
+        directory: Shard directory (normally ``QUESTION_SHARDS_DIR``).
+        prefix: File name prefix; a timestamp and sequence number follow.
+        shard_size: Questions per shard.
+    """
+
+    def __init__(self, directory: Path, prefix: str = "generated", shard_size: int = 5000):
+        self.directory = directory
+        self.prefix = f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}"
+        self.shard_size = shard_size
+        self.completed: list[Path] = []
+        self._file: Any = None
+        self._part: Path | None = None
+        self._in_shard = 0
+
+    def write(self, question: dict[str, Any]) -> None:
+        if self._file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._part = self.directory / f"{self.prefix}-{len(self.completed):04d}.jsonl.part"
+            self._file = open(self._part, "w", encoding="utf-8")
+        self._file.write(json.dumps(question, ensure_ascii=False) + "\n")
+        self._in_shard += 1
+        if self._in_shard >= self.shard_size:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        final = self._part.with_suffix("")  # drop ".part"
+        self._part.replace(final)
+        self.completed.append(final)
+        logger.info("Question generation: wrote %d question(s) to %s", self._in_shard, final)
+        self._file, self._part, self._in_shard = None, None, 0
+
+    def close(self) -> None:
+        """Publish the current partial shard."""
+        self._finish()
+
+
+def generate_questions(
+    jobs: Iterable[GenerationJob],
+    *,
+    llm: Any = None,
+    existing: Iterable[dict[str, Any]] | None = None,
+    existing_vectors: np.ndarray | None = None,
+    embed_fn: EmbedFn | None = None,
+    out_dir: Path = QUESTION_SHARDS_DIR,
+    workers: int = 4,
+    requests_per_minute: float = 30,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    minhash_threshold: float = MINHASH_THRESHOLD,
+    embedding_threshold: float = QUESTION_DUPLICATE_THRESHOLD,
+    seed: int | None = None,
+) -> GenerationStats:
+    """Run *jobs* concurrently, deduplicate, and stream accepted questions to shards.
+
+    Args:
+        jobs: Generation jobs (e.g. from ``plan_jobs``); consumed lazily.
+        llm: Object with ``.invoke(prompt).content``; default ``get_llm("question_generation")``.
+        existing: The current bank, streamed once for dedup and prompt examples.
+        existing_vectors: Unit-norm embeddings of *existing*, in order (skips
+            re-embedding the bank).
+        embed_fn: Batch embedding function; None disables the embedding stage.
+        out_dir: Where shards are written.
+        workers: Concurrent LLM calls.
+        requests_per_minute: Rate limit shared by all workers.
+        shard_size: Questions per JSONL shard.
+        minhash_threshold: Estimated Jaccard similarity treated as a duplicate.
+        embedding_threshold: Cosine similarity treated as a duplicate.
+        seed: Seed for the choice of prompt examples.
+
+    Returns:
+        ``GenerationStats`` with per-stage counts and the shard paths written.
+    """
+    if llm is None:
+        from pageant_assistant.llm.providers import get_llm
+
+        llm = get_llm("question_generation")
+
+    dedup = QuestionDeduplicator(
+        embed_fn, minhash_threshold=minhash_threshold, embedding_threshold=embedding_threshold
+    )
+    # Keep a small reservoir of examples per (pageant, type) for prompts
+    rng = random.Random(seed)
+    examples: dict[tuple[str, str], list[str]] = {}
+    seen_per_cell: dict[tuple[str, str], int] = {}
+
+    def _sample(questions: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for q in questions:
+            cell = (q.get("pageant_type", ""), q.get("question_type", ""))
+            n = seen_per_cell[cell] = seen_per_cell.get(cell, 0) + 1
+            pool = examples.setdefault(cell, [])
+            if len(pool) < _EXAMPLES_PER_PROMPT:
+                pool.append(q["text"])
+            elif (r := rng.randrange(n)) < _EXAMPLES_PER_PROMPT:
+                pool[r] = q["text"]
+            yield q
+
+    known = dedup.add_existing(_sample(existing or ()), existing_vectors)
+    logger.info("Question generation: %d existing question(s) indexed for dedup", known)
+
+    def _examples_for(job: GenerationJob) -> list[str]:
+        return list(
+            examples.get((job.pageant_type, job.question_type))
+            or examples.get(("general", job.question_type))
+            or []
+        )
+
+    stats = GenerationStats()
+    writer = ShardWriter(out_dir, shard_size=shard_size)
+    limiter = RateLimiter(requests_per_minute)
+    in_flight: deque[tuple[GenerationJob, Future]] = deque()
+    job_iter = iter(jobs)
+
+    def _collect(job: GenerationJob, future: Future) -> None:
+        try:
+            items = future.result()
+        except Exception as exc:
+            stats.jobs_failed += 1
+            logger.warning("Question generation: job %s failed (%s)", job, exc)
+            return
+        valid = [item for item in items if _valid(item["text"])]
+        stats.generated += len(items)
+        stats.invalid += len(items) - len(valid)
+        items = valid
+        keep, minhash_dups, embedding_dups = dedup.filter([item["text"] for item in items])
+        stats.duplicate_minhash += minhash_dups
+        stats.duplicate_embedding += embedding_dups
+        for item, kept in zip(items, keep):
+            if not kept:
+                continue
+            writer.write(
+                {
+                    "id": f"g-{text_hash(item['text'])}",
+                    "text": item["text"],
+                    "pageant_type": job.pageant_type,
+                    "question_type": job.question_type,
+                    "difficulty": job.difficulty,
+                    "tags": item["tags"],
+                    "source": "generated",
+                }
+            )
+            stats.accepted += 1
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qgen") as pool:
+            # Keep at most 2x workers jobs in flight; results are deduplicated
+            # and written on this thread in submission order
+            for job in job_iter:
+                stats.jobs += 1
+                in_flight.append(
+                    (job, pool.submit(_run_job, job, llm, limiter, _examples_for(job)))
+                )
+                if len(in_flight) >= 2 * workers:
+                    _collect(*in_flight.popleft())
+            while in_flight:
+                _collect(*in_flight.popleft())
+    finally:
+        writer.close()
+    stats.shards = writer.completed
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: ``python -m pageant_assistant.questions.generate``."""
+    from pageant_assistant.questions.bank import get_filter_options, get_question_store
+
+    options = {facet: [v for v, _ in values[1:]] for facet, values in get_filter_options().items()}
+    parser = argparse.ArgumentParser(description="Generate new questions for the question bank.")
+    parser.add_argument("--pageant", action="append", help="Pageant type (default: all in bank)")
+    parser.add_argument("--type", action="append", dest="question_type", help="Question type")
+    parser.add_argument("--difficulty", action="append", help="Difficulty")
+    parser.add_argument("--per-cell", type=int, default=50, help="Questions per combination")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM calls")
+    parser.add_argument("--rpm", type=float, default=30, help="LLM requests per minute")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--out-dir", type=Path, default=QUESTION_SHARDS_DIR)
+    parser.add_argument(
+        "--no-embeddings", action="store_true", help="Deduplicate with MinHash only"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    store = get_question_store()
+    store.sync()
+    embed_fn = None
+    vectors = None
+    if not args.no_embeddings:
+        from pageant_assistant.questions.semantic import get_question_vectors
+        from pageant_assistant.rag.embeddings import get_embedding_function
+
+        embed_fn = get_embedding_function()
+        bank_vectors = get_question_vectors()
+        # Rows follow the store's id order, the same order iter_questions streams
+        if bank_vectors is not None and len(bank_vectors) == store.count():
+            vectors = bank_vectors.matrix
+
+    jobs = plan_jobs(
+        args.pageant or options["pageant_type"],
+        args.question_type or options["question_type"],
+        args.difficulty or options["difficulty"],
+        args.per_cell,
+        args.batch_size,
+    )
+    stats = generate_questions(
+        jobs,
+        existing=store.iter_questions(),
+        existing_vectors=vectors,
+        embed_fn=embed_fn,
+        out_dir=args.out_dir,
+        workers=args.workers,
+        requests_per_minute=args.rpm,
+        shard_size=args.shard_size,
+    )
+    print(
+        f"Accepted {stats.accepted} of {stats.generated} generated question(s) from "
+        f"{stats.jobs} job(s) ({stats.jobs_failed} failed, {stats.invalid} invalid, "
+        f"{stats.duplicate_minhash} MinHash and {stats.duplicate_embedding} embedding "
+        f"duplicate(s)) into {len(stats.shards)} shard(s)"
+    )
+    return 0 if stats.jobs_failed < stats.jobs or not stats.jobs else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
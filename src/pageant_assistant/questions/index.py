@@ -0,0 +1,195 @@
+"""Faceted index over the question bank and a per-session no-repeat cursor.
+
+``QuestionIndex`` is built once per loaded bank.  For each facet
+(``pageant_type``, ``question_type``, ``difficulty``, ``tags``) it keeps a
+posting list — a sorted array of question positions — per value.  A filter
+is the intersection of its posting lists, smallest first, and each distinct
+filter's pool is memoised, so a draw costs O(1) after the first.
+
+``QuestionCursor`` walks a filtered pool in a shuffled order without
+repeats, using a random affine permutation ``i -> (a*i + b) mod n`` with
+``gcd(a, n) == 1``.  Its state is four integers regardless of bank size, so
+keeping one per Streamlit session is free even for banks of hundreds of
+thousands of questions, unlike an ever-growing set of shown ids.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+FACETS: tuple[str, ...] = ("pageant_type", "question_type", "difficulty", "tags")
+
+_POOL_CACHE_SIZE = 256
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def _active(value: str | None) -> bool:
+    return bool(value) and value != "any"
+
+
+class QuestionIndex:
+    """Posting lists per facet value over an immutable sequence of questions.
+
+    Args:
+        questions: Question dicts, consumed once (positions are their order
+            here).  With *fetch*, only ``id`` and the facet fields are needed
+            and nothing else is kept in memory.
+        fetch: Loads a full question by id; None keeps *questions* in memory.
+
+    Example:
+        >>> index = QuestionIndex([{"id": "a", "difficulty": "beginner", "tags": ["x"]}])
+        >>> index.select(difficulty="beginner").tolist(), index.select(tags=["y"]).tolist()
+        ([0], [])
+    """
+
+    def __init__(
+        self,
+        questions: Iterable[dict[str, Any]],
+        fetch: Callable[[str], dict[str, Any] | None] | None = None,
+    ) -> None:
+        self._fetch = fetch
+        self.ids: list[str] = []
+        rows: list[dict[str, Any]] = []
+        postings: dict[str, dict[str, list[int]]] = {f: defaultdict(list) for f in FACETS}
+        for pos, q in enumerate(questions):
+            self.ids.append(q["id"])
+            if fetch is None:
+                rows.append(q)
+            for facet in FACETS:
+                values = q.get(facet)
+                if facet == "tags":
+                    for tag in dict.fromkeys(values or ()):
+                        postings[facet][tag].append(pos)
+                elif values is not None:
+                    postings[facet][values].append(pos)
+        self._postings = {
+            facet: {value: np.asarray(p, dtype=np.int32) for value, p in by_value.items()}
+            for facet, by_value in postings.items()
+        }
+        self._rows = tuple(rows)
+        self._all = np.arange(len(self.ids), dtype=np.int32)
+        self._pools: dict[tuple[Any, ...], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def question(self, pos: int) -> dict[str, Any]:
+        """Return the full question at position *pos*."""
+        if self._fetch is None:
+            return self._rows[pos]
+        q = self._fetch(self.ids[pos])
+        if q is None:  # removed from storage since this index was built
+            raise KeyError(self.ids[pos])
+        return q
+
+    def values(self, facet: str) -> dict[str, int]:
+        """Return ``{value: question count}`` for *facet*."""
+        return {value: len(p) for value, p in self._postings[facet].items()}
+
+    def select(
+        self,
+        pageant_type: str | None = None,
+        question_type: str | None = None,
+        difficulty: str | None = None,
+        tags: Sequence[str] | None = None,
+    ) -> np.ndarray:
+        """Return the sorted positions matching every given filter.
+
+        ``None`` or ``"any"`` leaves a facet unfiltered; all *tags* must match.
+        """
+        key = (
+            pageant_type if _active(pageant_type) else None,
+            question_type if _active(question_type) else None,
+            difficulty if _active(difficulty) else None,
+            tuple(sorted(set(tags or ()))),
+        )
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+        lists = [
+            self._postings[facet].get(value, _EMPTY)
+            for facet, value in zip(FACETS[:3], key[:3])
+            if value is not None
+        ]
+        lists += [self._postings["tags"].get(tag, _EMPTY) for tag in key[3]]
+        if not lists:
+            pool = self._all
+        else:
+            lists.sort(key=len)
+            pool = lists[0]
+            for other in lists[1:]:
+                if not len(pool):
+                    break
+                pool = np.intersect1d(pool, other, assume_unique=True)
+        with self._lock:
+            if len(self._pools) >= _POOL_CACHE_SIZE:
+                self._pools.pop(next(iter(self._pools)))
+            self._pools[key] = pool
+        return pool
+
+
+class QuestionCursor:
+    """Shuffled, no-repeat iteration over a filtered pool, one per session.
+
+    Every question in the pool is served once before any repeats; after a
+    full pass a new permutation starts (never opening with the question
+    just served).  Changing the filters or reloading the bank restarts the
+    walk over the new pool.
+
+    Args:
+        rng: Random source (seed it for reproducible sequences).
+
+    Example:
+        >>> cursor = QuestionCursor(random.Random(0))
+        >>> pool = np.arange(4)
+        >>> sorted(cursor.next_position(pool, key="k") for _ in range(4))
+        [0, 1, 2, 3]
+    """
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        self._rng = rng or random.Random()
+        self._key: Any = None
+        self._n = 0
+        self._a = 1
+        self._b = 0
+        self._i = 0
+        self._last: int | None = None
+
+    def _reshuffle(self, n: int) -> None:
+        self._n = n
+        self._i = 0
+        self._a = 1
+        if n > 2:
+            self._a = self._rng.randrange(1, n)
+            while math.gcd(self._a, n) != 1:
+                self._a = self._rng.randrange(1, n)
+        self._b = self._rng.randrange(n)
+
+    def next_position(self, pool: np.ndarray, key: Any) -> int:
+        """Return the next position from *pool* (identified by *key*)."""
+        n = len(pool)
+        if key != self._key or n != self._n:
+            self._key = key
+            self._reshuffle(n)
+        elif self._i >= n:
+            self._reshuffle(n)
+            # Avoid serving the same question twice in a row across passes
+            if n > 1 and int(pool[self._b]) == self._last:
+                self._b = (self._b + 1) % n
+        pos = int(pool[(self._a * self._i + self._b) % n])
+        self._i += 1
+        self._last = pos
+        return pos
+
+    @property
+    def served(self) -> int:
+        """Questions served from the current pass."""
+        return self._i
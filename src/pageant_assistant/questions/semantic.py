@@ -0,0 +1,369 @@
+"""Semantic search over the question bank.
+
+Every question is embedded once (with the same model as the evidence store,
+see ``rag.embeddings``) into a unit-norm float32 matrix whose rows line up
+with the ``QuestionIndex`` positions.  The matrix is persisted next to the
+bank (``QUESTION_VECTORS_FILE`` plus a ``.json`` sidecar holding ids and
+text hashes) and rebuilt incrementally: when the bank reloads, only new or
+edited questions are embedded.
+
+Powers:
+- ``similar_questions`` — "practice similar questions" for the current one.
+- ``match_question`` / ``resolve_custom_question`` — map a contestant's
+  own question to a bank entry.
+- ``find_near_duplicates`` — pairs of bank questions that say the same thing.
+
+Search is a single vectorised matrix-vector product plus ``argpartition``.
+Everything degrades gracefully: if the embedding model is unavailable, the
+functions return no results instead of raising.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from pageant_assistant.config.settings import (
+    QUESTION_DUPLICATE_THRESHOLD,
+    QUESTION_MATCH_THRESHOLD,
+    QUESTION_VECTORS_FILE,
+)
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str]], Any]
+
+_EMBED_BATCH = 256
+_DUPLICATE_BLOCK = 1024
+
+# Module-level singleton — (bank index it was built for, vectors)
+_vectors: tuple[Any, QuestionVectors | None] = (None, None)
+_lock = threading.Lock()
+
+
+def text_hash(text: str) -> str:
+    """Digest of whitespace/case-normalised question text."""
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()[:16]
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class QuestionVectors:
+    """Unit-norm question embeddings with their ids and text hashes.
+
+    Args:
+        ids: Question ids, one per matrix row.
+        hashes: ``text_hash`` of each question's text (drives incremental rebuilds).
+        matrix: (N, dim) float32 unit vectors.
+        model: Embedding model id; vectors from another model are never reused.
+    """
+
+    def __init__(self, ids: list[str], hashes: list[str], matrix: np.ndarray, model: str) -> None:
+        self.ids = ids
+        self.hashes = hashes
+        self.matrix = matrix
+        self.model = model
+        self.row_of = {cid: i for i, cid in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # -- persistence -------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: Path) -> QuestionVectors | None:
+        """Load vectors saved by ``save``; None if missing or inconsistent."""
+        meta_path = path.with_suffix(".json")
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            matrix = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if len(meta.get("ids", [])) != len(matrix):
+            logger.warning("QuestionVectors: %s does not match its metadata — ignoring", path)
+            return None
+        return cls(meta["ids"], meta["hashes"], matrix, meta.get("model", ""))
+
+    def save(self, path: Path) -> None:
+        """Write the matrix then its metadata (the metadata acts as the commit marker)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, np.asarray(self.matrix, dtype=np.float32))
+        os.replace(tmp, path)
+        meta_tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        meta_tmp.write_text(
+            json.dumps({"model": self.model, "ids": self.ids, "hashes": self.hashes}),
+            encoding="utf-8",
+        )
+        os.replace(meta_tmp, path.with_suffix(".json"))
+
+    # -- search ------------------------------------------------------------
+
+    def top_k(
+        self,
+        vector: np.ndarray,
+        k: int,
+        *,
+        candidates: np.ndarray | None = None,
+        exclude: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Return up to *k* ``(row, cosine)`` pairs, best first.
+
+        Args:
+            vector: Query embedding (normalised here).
+            k: Number of results.
+            candidates: Restrict the search to these rows (e.g. a filter pool).
+            exclude: A row never returned (the query question itself).
+        """
+        q = _unit(np.asarray(vector).reshape(1, -1))[0]
+        rows = np.arange(len(self.ids)) if candidates is None else np.asarray(candidates)
+        if exclude is not None:
+            rows = rows[rows != exclude]
+        if not len(rows) or k <= 0:
+            return []
+        scores = (self.matrix if candidates is None else self.matrix[rows]) @ q
+        if candidates is None and exclude is not None:
+            scores = scores[rows]
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def near_duplicates(self, threshold: float) -> list[tuple[str, str, float]]:
+        """Return ``(id_a, id_b, cosine)`` for every pair at or above *threshold*.
+
+        Computed blockwise so memory stays bounded for large banks.
+        """
+        pairs: list[tuple[str, str, float]] = []
+        matrix = np.asarray(self.matrix, dtype=np.float32)
+        for lo in range(0, len(matrix), _DUPLICATE_BLOCK):
+            block = matrix[lo : lo + _DUPLICATE_BLOCK] @ matrix.T
+            rows, cols = np.nonzero(block >= threshold)
+            for r, c in zip(rows.tolist(), cols.tolist()):
+                a = lo + r
+                if c > a:
+                    pairs.append((self.ids[a], self.ids[c], round(float(block[r, c]), 4)))
+        pairs.sort(key=lambda p: -p[2])
+        return pairs
+
+
+def build_question_vectors(
+    questions: Iterable[dict[str, Any]],
+    embed_fn: EmbedFn,
+    model: str,
+    previous: QuestionVectors | None = None,
+) -> tuple[QuestionVectors, int]:
+    """Embed *questions*, reusing rows of *previous* whose text is unchanged.
+
+    Returns:
+        ``(vectors, embedded)`` — *embedded* is how many questions were newly
+        embedded (0 means nothing changed apart from removals/reordering).
+    """
+    reusable = previous if previous is not None and previous.model == model else None
+    ids: list[str] = []
+    hashes: list[str] = []
+    rows: list[np.ndarray | None] = []
+    pending: list[tuple[int, str]] = []
+    for q in questions:
+        h = text_hash(q["text"])
+        ids.append(q["id"])
+        hashes.append(h)
+        old = reusable.row_of.get(q["id"]) if reusable else None
+        if old is not None and reusable.hashes[old] == h:
+            rows.append(reusable.matrix[old])
+        else:
+            rows.append(None)
+            pending.append((len(rows) - 1, q["text"]))
+    for lo in range(0, len(pending), _EMBED_BATCH):
+        batch = pending[lo : lo + _EMBED_BATCH]
+        vectors = _unit(np.asarray(embed_fn([text for _, text in batch])))
+        for (pos, _), vec in zip(batch, vectors):
+            rows[pos] = vec
+    dim = len(rows[0]) if rows else 0
+    matrix = np.stack(rows).astype(np.float32) if rows else np.empty((0, dim), np.float32)
+    return QuestionVectors(ids, hashes, matrix, model), len(pending)
+
+
+# ---------------------------------------------------------------------------
+# Bank-level helpers
+# ---------------------------------------------------------------------------
+
+
+def get_question_vectors() -> QuestionVectors | None:
+    """Return vectors aligned with the current bank index (built/loaded lazily).
+
+    Rebuilds incrementally whenever the bank reloads and persists the result
+    to ``QUESTION_VECTORS_FILE``.  Returns None if embedding fails; the
+    failure is cached for the bank index, so reruns do not retry the model
+    load until the bank reloads.
+    """
+    global _vectors
+    from pageant_assistant.questions.bank import get_question_index, get_question_store
+    from pageant_assistant.rag.embeddings import embedding_model_id, get_embedding_function
+
+    index = get_question_index()
+    built_for, vectors = _vectors
+    if built_for is index:
+        return vectors
+    with _lock:
+        built_for, vectors = _vectors
+        if built_for is index:
+            return vectors
+        previous = vectors or QuestionVectors.load(QUESTION_VECTORS_FILE)
+        try:
+            vectors, embedded = build_question_vectors(
+                get_question_store().iter_questions(),
+                get_embedding_function(),
+                embedding_model_id(),
+                previous,
+            )
+        except Exception as exc:
+            logger.warning("Question vectors unavailable (%s) — semantic search disabled", exc)
+            _vectors = (index, None)
+            return None
+        if vectors.ids != index.ids:
+            # The bank changed while streaming; rows would not line up with the
+            # index, so skip this call and rebuild (incrementally) on the next
+            logger.info("Question vectors: bank changed during build — will rebuild")
+            return None
+        if embedded or previous is None or previous.ids != vectors.ids:
+            try:
+                vectors.save(QUESTION_VECTORS_FILE)
+            except OSError as exc:
+                logger.warning("Question vectors: could not persist (%s)", exc)
+        logger.info("Question vectors: %d question(s), %d newly embedded", len(vectors), embedded)
+        _vectors = (index, vectors)
+        return vectors
+
+
+def _embed_text(text: str) -> np.ndarray:
+    from pageant_assistant.rag.embeddings import get_embedding_function
+
+    return np.asarray(get_embedding_function()([text]), dtype=np.float32)[0]
+
+
+def search_questions(
+    text: str, k: int = 5, *, question_type: str | None = None
+) -> list[tuple[dict[str, Any], float]]:
+    """Return the *k* bank questions closest in meaning to *text*.
+
+    Args:
+        text: Free-text query (e.g. a contestant's own question).
+        k: Number of results.
+        question_type: Only search questions of this type.
+
+    Returns:
+        ``(question, cosine)`` pairs, best first; empty if search is unavailable.
+    """
+    from pageant_assistant.questions.bank import get_question_index
+
+    vectors = get_question_vectors()
+    if vectors is None or not text.strip():
+        return []
+    index = get_question_index()
+    try:
+        query = _embed_text(text)
+    except Exception as exc:
+        logger.warning("search_questions: embedding failed (%s)", exc)
+        return []
+    candidates = index.select(question_type=question_type) if question_type else None
+    return [
+        (index.question(row), score)
+        for row, score in vectors.top_k(query, k, candidates=candidates)
+    ]
+
+
+def similar_questions(
+    question_id: str, k: int = 5, *, same_type: bool = False
+) -> list[tuple[dict[str, Any], float]]:
+    """Return the *k* nearest bank questions to *question_id* (itself excluded).
+
+    Example:
+        >>> [q["id"] for q, _ in similar_questions("q001", k=2)]  # doctest: +SKIP
+        ['q014', 'q007']
+    """
+    from pageant_assistant.questions.bank import get_question_index
+
+    vectors = get_question_vectors()
+    if vectors is None or question_id not in vectors.row_of:
+        return []
+    index = get_question_index()
+    row = vectors.row_of[question_id]
+    candidates = None
+    if same_type:
+        candidates = index.select(question_type=index.question(row).get("question_type"))
+    hits = vectors.top_k(vectors.matrix[row], k, candidates=candidates, exclude=row)
+    return [(index.question(r), score) for r, score in hits]
+
+
+def match_question(
+    text: str, threshold: float = QUESTION_MATCH_THRESHOLD
+) -> tuple[dict[str, Any], float] | None:
+    """Return the bank question *text* most likely is, if similar enough.
+
+    Args:
+        text: A contestant's custom question.
+        threshold: Minimum cosine similarity to count as a match.
+
+    Returns:
+        ``(question, cosine)`` or None when nothing in the bank is close.
+    """
+    hits = search_questions(text, k=1)
+    if hits and hits[0][1] >= threshold:
+        return hits[0]
+    return None
+
+
+def find_near_duplicates(
+    threshold: float = QUESTION_DUPLICATE_THRESHOLD,
+) -> list[tuple[str, str, float]]:
+    """Return pairs of bank question ids whose texts are near-duplicates."""
+    vectors = get_question_vectors()
+    return vectors.near_duplicates(threshold) if vectors is not None else []
+
+
+def resolve_custom_question(
+    text: str, threshold: float = QUESTION_MATCH_THRESHOLD
+) -> tuple[dict[str, Any], float | None]:
+    """Turn a contestant's own question into a question dict.
+
+    Returns the matching bank entry (so its metadata is used) when one is
+    within *threshold*; otherwise a ``custom-`` question that borrows the
+    question type of its nearest bank neighbour.
+
+    Returns:
+        ``(question, cosine of the bank match)``; the score is None for a
+        custom question.
+    """
+    text = " ".join(text.split())
+    hits = search_questions(text, k=1)
+    if hits and hits[0][1] >= threshold:
+        return hits[0]
+    return {
+        "id": f"custom-{text_hash(text)}",
+        "text": text,
+        "pageant_type": "general",
+        "question_type": hits[0][0].get("question_type", "personal") if hits else "personal",
+        "difficulty": "intermediate",
+        "tags": [],
+        "custom": True,
+    }, None
+
+
+def reset_question_vectors() -> None:
+    """Forget the in-memory vectors so the next call reloads them (for tests/tools)."""
+    global _vectors
+    with _lock:
+        _vectors = (None, None)
@@ -0,0 +1,288 @@
+"""SQLite-backed question storage with incremental, mtime-based reloads.
+
+Questions are authored as JSON — the shipped ``question_bank.json`` plus any
+number of JSONL shards in ``QUESTION_SHARDS_DIR`` (one question per line,
+the format bulk generators stream to).  ``QuestionStore`` compiles these
+sources into a SQLite database with indexed facet columns:
+
+- ``sync()`` compares each source's mtime and size with what was imported
+  and re-imports only changed sources (streamed line by line for JSONL), so
+  editing or adding a shard is picked up without restarting Streamlit.
+  Ids are global: when several sources define one, the last imported wins,
+  and dropping it from that source restores another source's definition.
+- ``iter_facets()`` streams just the id and facet columns, which is all the
+  in-memory ``QuestionIndex`` needs; full questions are fetched lazily by id
+  with ``get()``.
+
+If the database file cannot be opened (e.g. a read-only deployment), the
+store falls back to an in-memory database built from the same sources.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_FACET_COLUMNS = ("pageant_type", "question_type", "difficulty")
+_CORE_KEYS = frozenset({"id", "text", *_FACET_COLUMNS, "tags"})
+_BATCH = 5000  # rows per insert batch / read page
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    pageant_type TEXT,
+    question_type TEXT,
+    difficulty TEXT,
+    tags TEXT NOT NULL DEFAULT '[]',
+    extra TEXT NOT NULL DEFAULT '{}',
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_pageant ON questions (pageant_type);
+CREATE INDEX IF NOT EXISTS idx_questions_type ON questions (question_type);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions (difficulty);
+CREATE INDEX IF NOT EXISTS idx_questions_source ON questions (source);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+
+def _iter_source(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield questions from a ``{"questions": [...]}`` JSON file or a JSONL shard."""
+    if path.suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("QuestionStore: %s:%d is not valid JSON — skipped", path, lineno)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from json.load(f).get("questions", [])
+
+
+def _row(q: dict[str, Any], source: str) -> tuple[Any, ...]:
+    extra = {k: v for k, v in q.items() if k not in _CORE_KEYS}
+    return (
+        q["id"],
+        q["text"],
+        *(q.get(c) for c in _FACET_COLUMNS),
+        json.dumps(list(q.get("tags") or [])),
+        json.dumps(extra, ensure_ascii=False),
+        source,
+    )
+
+
+def _question(row: sqlite3.Row) -> dict[str, Any]:
+    q = {
+        "id": row["id"],
+        "text": row["text"],
+        **{c: row[c] for c in _FACET_COLUMNS if row[c] is not None},
+        "tags": json.loads(row["tags"]),
+    }
+    q.update(json.loads(row["extra"]))
+    return q
+
+
+class QuestionStore:
+    """Question bank compiled from JSON/JSONL sources into SQLite.
+
+    Args:
+        db_path: Database file (created if missing).
+        json_file: The main ``{"questions": [...]}`` bank file.
+        shards_dir: Directory of ``*.jsonl`` shards (may not exist).
+
+    Example:
+        >>> store = QuestionStore(Path("bank.sqlite"), Path("bank.json"), Path("shards"))
+        >>> store.sync()  # imports whatever changed since the last call
+        True
+        >>> store.get("q001")["text"]
+        'What is the most important lesson you have learned from failure?'
+    """
+
+    def __init__(self, db_path: Path, json_file: Path, shards_dir: Path) -> None:
+        self.db_path = db_path
+        self.json_file = json_file
+        self.shards_dir = shards_dir
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning(
+                "QuestionStore: cannot open %s (%s) — using an in-memory bank", self.db_path, exc
+            )
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.executescript(_SCHEMA)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # -- sources -----------------------------------------------------------
+
+    def sources(self) -> list[Path]:
+        """The JSON bank (if present) followed by every JSONL shard, sorted."""
+        paths = [self.json_file] if self.json_file.exists() else []
+        if self.shards_dir.is_dir():
+            paths += sorted(self.shards_dir.glob("*.jsonl"))
+        return paths
+
+    def stamp(self) -> tuple[tuple[str, int, int], ...]:
+        """(path, mtime_ns, size) of every source — changes whenever a source does."""
+        stamps = []
+        for path in self.sources():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            stamps.append((str(path), st.st_mtime_ns, st.st_size))
+        return tuple(stamps)
+
+    def sync(self) -> bool:
+        """Import new or changed sources and drop removed ones.
+
+        Ids the dropped rows held that no re-imported source defines are then
+        looked up in the unchanged sources, so a question shadowed by another
+        source's definition comes back instead of disappearing.
+
+        Returns:
+            True if anything changed.
+        """
+        current = {path: (mtime, size) for path, mtime, size in self.stamp()}
+        with self._lock:
+            conn = self._conn
+            known = {
+                r["path"]: (r["mtime_ns"], r["size"])
+                for r in conn.execute("SELECT path, mtime_ns, size FROM sources")
+            }
+            changed = [p for p, s in current.items() if known.get(p) != s]
+            removed = [p for p in known if p not in current]
+            if not changed and not removed:
+                return False
+            with conn:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS displaced (id TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM displaced")
+                for path in removed + changed:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO displaced SELECT id FROM questions WHERE source = ?",
+                        (path,),
+                    )
+                    conn.execute("DELETE FROM questions WHERE source = ?", (path,))
+                    conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+                for path in changed:
+                    count = self._import(Path(path))
+                    mtime, size = current[path]
+                    conn.execute(
+                        "INSERT INTO sources (path, mtime_ns, size) VALUES (?, ?, ?)",
+                        (path, mtime, size),
+                    )
+                    logger.info("QuestionStore: imported %d question(s) from %s", count, path)
+                lost = {
+                    r["id"]
+                    for r in conn.execute(
+                        "SELECT id FROM displaced WHERE id NOT IN (SELECT id FROM questions)"
+                    )
+                }
+                if lost:
+                    restored = sum(
+                        self._import(Path(p), only=lost) for p in current if p not in changed
+                    )
+                    if restored:
+                        logger.info(
+                            "QuestionStore: restored %d question(s) shadowed by dropped rows",
+                            restored,
+                        )
+            return True
+
+    def _import(self, path: Path, only: set[str] | None = None) -> int:
+        """Stream one source into the database (caller holds the transaction).
+
+        Args:
+            path: The source file.
+            only: If given, import just the questions with these ids.
+        """
+        source = str(path)
+        batch: list[tuple[Any, ...]] = []
+        count = 0
+        try:
+            for q in _iter_source(path):
+                if not q.get("id") or not q.get("text"):
+                    continue
+                if only is not None and q["id"] not in only:
+                    continue
+                batch.append(_row(q, source))
+                if len(batch) >= _BATCH:
+                    count += self._insert(batch)
+                    batch = []
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("QuestionStore: could not read %s (%s)", path, exc)
+        return count + self._insert(batch)
+
+    def _insert(self, rows: list[tuple[Any, ...]]) -> int:
+        # Duplicate ids: the most recently imported source wins
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO questions "
+            "(id, text, pageant_type, question_type, difficulty, tags, extra, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    # -- reads -------------------------------------------------------------
+
+    def count(self) -> int:
+        """Number of questions in the bank."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def _paged(self, columns: str) -> Iterator[sqlite3.Row]:
+        """Yield rows in id order, one page per lock acquisition (keyset paging)."""
+        last = ""
+        while True:
+            with self._lock:
+                page = self._conn.execute(
+                    f"SELECT {columns} FROM questions WHERE id > ? ORDER BY id LIMIT ?",
+                    (last, _BATCH),
+                ).fetchall()
+            if not page:
+                return
+            yield from page
+            last = page[-1]["id"]
+
+    def iter_facets(self) -> Iterator[dict[str, Any]]:
+        """Stream ``id`` plus facet fields for every question, in id order."""
+        for r in self._paged("id, pageant_type, question_type, difficulty, tags"):
+            yield {
+                "id": r["id"],
+                **{c: r[c] for c in _FACET_COLUMNS},
+                "tags": json.loads(r["tags"]),
+            }
+
+    def iter_questions(self) -> Iterator[dict[str, Any]]:
+        """Stream full questions in id order."""
+        for r in self._paged("*"):
+            yield _question(r)
+
+    def get(self, question_id: str) -> dict[str, Any] | None:
+        """Fetch one full question by id, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM questions WHERE id = ?", (question_id,)
+            ).fetchone()
+        return _question(row) if row else None
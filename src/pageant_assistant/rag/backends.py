@@ -0,0 +1,579 @@
+"""Vector-store backends behind the ``rag.store`` contract.
+
+``ChromaBackend`` wraps a persistent Chroma collection.  ``NumpyBackend`` is
+an in-process engine for small-to-medium corpora (hundreds to low thousands
+of chunks): one contiguous, L2-normalised float32 matrix searched with a
+single matrix-vector product, persisted as a ``.npy`` file that is
+memory-mapped on load so worker processes share the same physical pages.
+Larger corpora can scan a float16 or int8 copy of the matrix and re-score
+only the top candidates in float32.
+
+Backends store and search precomputed vectors only; embedding is done by
+``rag.store`` so every backend uses the same model.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorBackend(ABC):
+    """Minimal storage/search interface used by ``rag.store``."""
+
+    #: File holding this backend's corpus manifest (see ``rag.manifest``).
+    manifest_path: Path
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored chunks."""
+
+    @abstractmethod
+    def query(self, embedding: np.ndarray, n_results: int) -> list[tuple[dict[str, Any], float]]:
+        """Return up to *n_results* ``(chunk, cosine_similarity)`` pairs, best first.
+
+        Each chunk dict has keys ``id``, ``text``, and ``metadata``.
+        """
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+        embeddings: np.ndarray,
+    ) -> None:
+        """Insert or replace chunks by id."""
+
+    @abstractmethod
+    def delete(self, ids: list[str]) -> None:
+        """Remove chunks by id; unknown ids are ignored."""
+
+    @abstractmethod
+    def get(self, ids: list[str] | None = None) -> list[dict[str, Any]]:
+        """Return stored chunks (``id``, ``text``, ``metadata``), all if *ids* is None."""
+
+    def write_lock(self) -> contextlib.AbstractContextManager[None]:
+        """Context manager serialising writers across processes (no-op by default)."""
+        return contextlib.nullcontext()
+
+
+def _save_atomic(path: Path, array: np.ndarray) -> None:
+    """Write *array* as ``.npy`` to a temp file, then rename it over *path*.
+
+    Another process may have the old file memory-mapped; the rename leaves
+    its mapping intact instead of truncating the file under it.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of *matrix* with unit-length rows."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# ---------------------------------------------------------------------------
+# Chroma
+# ---------------------------------------------------------------------------
+
+
+class ChromaBackend(VectorBackend):
+    """Persistent Chroma collection addressed with precomputed embeddings."""
+
+    def __init__(self, path: Path, collection_name: str) -> None:
+        import chromadb
+        from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+        path.mkdir(parents=True, exist_ok=True)
+        logger.debug("Initialising Chroma persistent client at %s", path)
+        self._client = chromadb.PersistentClient(path=str(path))
+        # The embedding function is never invoked (vectors are always passed
+        # explicitly) but is kept so existing collections open unchanged.
+        self._collection = self._client.get_or_create_collection(
+            name=collection_name,
+            embedding_function=DefaultEmbeddingFunction(),
+        )
+        self.manifest_path = path / f"{collection_name}.manifest.json"
+
+    def count(self) -> int:
+        return self._collection.count()
+
+    def query(self, embedding: np.ndarray, n_results: int) -> list[tuple[dict[str, Any], float]]:
+        count = self._collection.count()
+        if count == 0:
+            return []
+        results = self._collection.query(
+            query_embeddings=[np.asarray(embedding, dtype=np.float32)],
+            n_results=min(n_results, count),
+            include=["documents", "metadatas", "distances"],
+        )
+        return [
+            # Squared L2 between unit vectors: cos = 1 - d/2
+            ({"id": cid, "text": doc, "metadata": meta or {}}, 1.0 - dist / 2.0)
+            for cid, doc, meta, dist in zip(
+                results["ids"][0],
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0],
+            )
+        ]
+
+    def upsert(
+        self,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+        embeddings: np.ndarray,
+    ) -> None:
+        self._collection.upsert(
+            ids=ids,
+            documents=texts,
+            metadatas=metadatas,
+            embeddings=_normalise(embeddings),
+        )
+
+    def delete(self, ids: list[str]) -> None:
+        self._collection.delete(ids=ids)
+
+    def get(self, ids: list[str] | None = None) -> list[dict[str, Any]]:
+        results = self._collection.get(ids=ids, include=["documents", "metadatas"])
+        return [
+            {"id": cid, "text": doc, "metadata": meta or {}}
+            for cid, doc, meta in zip(results["ids"], results["documents"], results["metadatas"])
+        ]
+
+
+# ---------------------------------------------------------------------------
+# NumPy
+# ---------------------------------------------------------------------------
+
+
+class _IndexView(NamedTuple):
+    """One consistent snapshot of a ``NumpyBackend``'s in-memory index."""
+
+    ids: list[str]
+    texts: list[str]
+    metadatas: list[dict[str, Any]]
+    row_of: dict[str, int]
+    matrix: np.ndarray  # exact float32, (N, dim)
+    compact: np.ndarray | None  # float16 / int8 copy scanned first, if enabled
+    scales: np.ndarray | None  # per-row dequantisation scale for int8
+
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+# Rows converted per block when scanning a compact matrix.  A cache-sized
+# float32 buffer (~1.5MB at 384 dims) keeps the int8 scan as fast as a plain
+# float32 GEMV; float16 is slower (NumPy converts it in software) and is
+# mainly a memory saving.
+_SCAN_BLOCK = 1024
+
+
+def _compress(matrix: np.ndarray, dtype: str) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """Return the compact ``(matrix, scales)`` representation for *dtype*."""
+    if dtype == "float16":
+        return matrix.astype(np.float16), None
+    if dtype == "int8":
+        # Symmetric per-row quantisation; unit rows keep every scale <= 1/127
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantised = np.rint(matrix / scales[:, None]).astype(np.int8)
+        return quantised, scales.astype(np.float32)
+    return None, None
+
+
+class NumpyBackend(VectorBackend):
+    """Exact cosine search over a memory-mapped float32 matrix.
+
+    On-disk layout inside ``path``:
+        - ``records.json`` — ids, documents, metadatas and the current
+          ``generation`` number.
+        - ``embeddings-<generation>.npy`` — the (N, dim) unit-norm matrix.
+        - ``embeddings-<generation>.<dtype>.npy`` (and ``.int8-scale.npy``)
+          — the compact copy, when ``vector_dtype`` is not float32.
+
+    Writes produce a new generation (matrices first, then ``records.json``
+    via atomic rename), so readers in other processes never see a matrix
+    that does not match the records.  Any process notices a newer
+    generation on its next call and re-maps the files.
+
+    With ``vector_dtype`` set to ``"float16"`` or ``"int8"``, queries scan
+    the compact matrix (2x / 4x fewer bytes touched), then re-score the best
+    ``n_results * rescore_factor`` candidates exactly against the float32
+    matrix.  Because that matrix is memory-mapped, only the candidate rows
+    are paged in, so resident memory per worker tracks the compact size.
+
+    Safe to share between threads: reloads happen under an internal lock and
+    every call works on one consistent view of the index.  Writers in every
+    process serialise on ``write_lock()`` (an ``flock`` on ``.write.lock``
+    in ``path``) and reload under it, so each write extends the latest
+    generation rather than overwriting a concurrent one.
+
+    ``base_path`` optionally names a read-only index with the same layout
+    (e.g. a prebuilt snapshot baked into the container image).  While
+    ``path`` holds no index of its own, reads are served straight from the
+    base; the first write copies the base's manifest across and persists
+    the full updated index under ``path``, leaving the base untouched.
+
+    Raises:
+        ValueError: If ``vector_dtype`` is not one of ``VECTOR_DTYPES``.
+    """
+
+    RECORDS_FILE = "records.json"
+    MANIFEST_FILE = "manifest.json"
+    LOCK_FILE = ".write.lock"
+
+    def __init__(
+        self,
+        path: Path,
+        base_path: Path | None = None,
+        vector_dtype: str = "float32",
+        rescore_factor: int = 4,
+    ) -> None:
+        if vector_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"vector_dtype must be one of {VECTOR_DTYPES}, got {vector_dtype!r}")
+        self.path = path
+        self.base_path = base_path
+        self.vector_dtype = vector_dtype
+        self.rescore_factor = max(1, rescore_factor)
+        self._records_stamp: tuple[int, int] | None = None
+        self._generation = 0
+        self._ids: list[str] = []
+        self._texts: list[str] = []
+        self._metadatas: list[dict[str, Any]] = []
+        self._row_of: dict[str, int] = {}
+        self._matrix: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self._compact: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+        self._reload_lock = threading.RLock()
+        self._write_mutex = threading.RLock()
+        self._write_depth = 0
+        self._lock_handle: IO[bytes] | None = None
+        self._reload_if_changed()
+
+    # -- persistence --------------------------------------------------------
+
+    def _source(self) -> Path:
+        """Directory currently serving reads: own index, else the read-only base."""
+        if (
+            self.base_path is not None
+            and not (self.path / self.RECORDS_FILE).exists()
+            and (self.base_path / self.RECORDS_FILE).exists()
+        ):
+            return self.base_path
+        return self.path
+
+    @property
+    def manifest_path(self) -> Path:
+        return self._source() / self.MANIFEST_FILE
+
+    def _records_file(self) -> Path:
+        return self._source() / self.RECORDS_FILE
+
+    def _matrix_file(
+        self, generation: int, directory: Path | None = None, variant: str = ""
+    ) -> Path:
+        suffix = f".{variant}" if variant else ""
+        return (directory or self._source()) / f"embeddings-{generation}{suffix}.npy"
+
+    @contextlib.contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """Hold the cross-process writer lock; re-entrant within this instance.
+
+        ``rag.store`` holds it around a write and its manifest update, so the
+        two stay consistent when several worker processes write at once.
+        """
+        with self._write_mutex:
+            if self._write_depth == 0:
+                self.path.mkdir(parents=True, exist_ok=True)
+                self._lock_handle = open(self.path / self.LOCK_FILE, "a+b")  # noqa: SIM115
+                fcntl.flock(self._lock_handle, fcntl.LOCK_EX)
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    # Closing the descriptor releases the flock
+                    self._lock_handle.close()
+                    self._lock_handle = None
+
+    def _reload_if_changed(self) -> None:
+        """Re-map the on-disk index if another writer produced a new generation."""
+        with self._reload_lock:
+            self._reload_locked()
+
+    def _reload_locked(self) -> None:
+        try:
+            st = self._records_file().stat()
+        except FileNotFoundError:
+            return
+        # os.replace() gives every generation a new inode, so this also catches
+        # writes that land within the filesystem's mtime resolution.
+        stamp = (st.st_ino, st.st_mtime_ns)
+        if stamp == self._records_stamp:
+            return
+        data = json.loads(self._records_file().read_text(encoding="utf-8"))
+        matrix = np.zeros((0, 0), dtype=np.float32)
+        compact = scales = None
+        if data["ids"]:
+            try:
+                # mmap_mode="r": zero-copy load, pages shared across processes
+                matrix = np.load(self._matrix_file(data["generation"]), mmap_mode="r")
+                compact, scales = self._load_compact(data["generation"], matrix)
+            except FileNotFoundError:
+                # A writer replaced this generation between our two reads — retry
+                self._reload_locked()
+                return
+        self._generation = data["generation"]
+        self._ids = data["ids"]
+        self._texts = data["documents"]
+        self._metadatas = data["metadatas"]
+        self._row_of = {cid: i for i, cid in enumerate(self._ids)}
+        self._matrix = matrix
+        self._compact, self._scales = compact, scales
+        self._records_stamp = stamp
+        logger.debug(
+            "NumpyBackend: loaded generation %d (%d chunk(s), %s scan) from %s",
+            self._generation,
+            len(self._ids),
+            self.vector_dtype,
+            self._source(),
+        )
+
+    def _load_compact(
+        self, generation: int, matrix: np.ndarray
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """Map the compact matrix for *generation*, deriving it if not on disk."""
+        if self.vector_dtype == "float32":
+            return None, None
+        path = self._matrix_file(generation, variant=self.vector_dtype)
+        if path.exists():
+            compact = np.load(path, mmap_mode="r")
+            scales = None
+            if self.vector_dtype == "int8":
+                scales = np.load(self._matrix_file(generation, variant="int8-scale"))
+            return compact, scales
+        # Index written by a float32 instance (e.g. a prebuilt snapshot)
+        logger.info("NumpyBackend: deriving %s vectors in memory", self.vector_dtype)
+        return _compress(np.asarray(matrix), self.vector_dtype)
+
+    def _persist(
+        self,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+        matrix: np.ndarray,
+    ) -> None:
+        """Write a new generation under ``path`` and switch this instance to it."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        source = self._source()
+        if source != self.path and (source / self.MANIFEST_FILE).exists():
+            shutil.copyfile(source / self.MANIFEST_FILE, self.path / self.MANIFEST_FILE)
+        previous = self._generation
+        generation = previous + 1
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if ids:
+            _save_atomic(self._matrix_file(generation, self.path), matrix)
+            compact, scales = _compress(matrix, self.vector_dtype)
+            if compact is not None:
+                _save_atomic(self._matrix_file(generation, self.path, self.vector_dtype), compact)
+            if scales is not None:
+                _save_atomic(self._matrix_file(generation, self.path, "int8-scale"), scales)
+        records = self.path / self.RECORDS_FILE
+        tmp = records.with_suffix(".json.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "generation": generation,
+                    "ids": ids,
+                    "documents": texts,
+                    "metadatas": metadatas,
+                },
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, records)
+        # Processes still mapping the old files keep a valid view until they reload
+        for stale in self.path.glob(f"embeddings-{previous}.*"):
+            stale.unlink(missing_ok=True)
+        with self._reload_lock:
+            self._records_stamp = None
+            self._reload_locked()
+
+    def _view(self) -> _IndexView:
+        """Return one consistent view of the index, reloading first if needed.
+
+        Reloads replace these attributes wholesale, so the returned references
+        stay mutually consistent even if another thread reloads meanwhile.
+        """
+        with self._reload_lock:
+            self._reload_locked()
+            return _IndexView(
+                self._ids,
+                self._texts,
+                self._metadatas,
+                self._row_of,
+                self._matrix,
+                self._compact,
+                self._scales,
+            )
+
+    @staticmethod
+    def _approximate_scores(view: _IndexView, q: np.ndarray) -> np.ndarray:
+        """Score every row against *q* using the compact matrix, block by block."""
+        scores = np.empty(len(view.ids), dtype=np.float32)
+        buffer = np.empty((_SCAN_BLOCK, view.compact.shape[1]), dtype=np.float32)
+        for start in range(0, len(scores), _SCAN_BLOCK):
+            block = view.compact[start : start + _SCAN_BLOCK]
+            rows = buffer[: len(block)]
+            np.copyto(rows, block, casting="unsafe")
+            scores[start : start + len(block)] = rows @ q
+        if view.scales is not None:
+            scores *= view.scales
+        return scores
+
+    # -- VectorBackend ------------------------------------------------------
+
+    def count(self) -> int:
+        return len(self._view().ids)
+
+    def query(self, embedding: np.ndarray, n_results: int) -> list[tuple[dict[str, Any], float]]:
+        view = self._view()
+        if not view.ids or n_results <= 0:
+            return []
+        q = _normalise(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+        k = min(n_results, len(view.ids))
+        n_candidates = k * self.rescore_factor
+        if view.compact is None or n_candidates >= len(view.ids):
+            scores = view.matrix @ q
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            exact = scores[top]
+        else:
+            approx = self._approximate_scores(view, q)
+            candidates = np.sort(np.argpartition(-approx, n_candidates - 1)[:n_candidates])
+            # Exact float32 re-scoring; the memmap pages in only these rows
+            rescored = np.asarray(view.matrix[candidates]) @ q
+            order = np.argsort(-rescored)[:k]
+            top, exact = candidates[order], rescored[order]
+        return [
+            (
+                {"id": view.ids[i], "text": view.texts[i], "metadata": view.metadatas[i]},
+                float(score),
+            )
+            for i, score in zip(top, exact)
+        ]
+
+    def upsert(
+        self,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+        embeddings: np.ndarray,
+    ) -> None:
+        with self.write_lock():
+            self._upsert_locked(ids, texts, metadatas, embeddings)
+
+    def _upsert_locked(
+        self,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+        embeddings: np.ndarray,
+    ) -> None:
+        view = self._view()
+        vectors = _normalise(embeddings)
+        new_ids, new_texts, new_metas = list(view.ids), list(view.texts), list(view.metadatas)
+        row_of = dict(view.row_of)
+        matrix = (
+            np.array(view.matrix, dtype=np.float32)
+            if view.ids
+            else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        )
+        appended: list[np.ndarray] = []
+        for cid, text, meta, vec in zip(ids, texts, metadatas, vectors):
+            row = row_of.get(cid)
+            if row is None:
+                row_of[cid] = len(new_ids)
+                new_ids.append(cid)
+                new_texts.append(text)
+                new_metas.append(meta)
+                appended.append(vec)
+            elif row < len(matrix):
+                new_texts[row], new_metas[row], matrix[row] = text, meta, vec
+            else:  # id repeated within this same batch
+                new_texts[row], new_metas[row] = text, meta
+                appended[row - len(matrix)] = vec
+        if appended:
+            matrix = np.vstack([matrix, np.stack(appended)])
+        self._persist(new_ids, new_texts, new_metas, matrix)
+
+    def delete(self, ids: list[str]) -> None:
+        with self.write_lock():
+            self._delete_locked(ids)
+
+    def _delete_locked(self, ids: list[str]) -> None:
+        view = self._view()
+        drop = {view.row_of[cid] for cid in ids if cid in view.row_of}
+        # Even with no rows to drop, a delete served from the base persists a
+        # writable copy: the caller's manifest update must never touch the base
+        if not drop and self._source() == self.path:
+            return
+        keep = [i for i in range(len(view.ids)) if i not in drop]
+        self._persist(
+            [view.ids[i] for i in keep],
+            [view.texts[i] for i in keep],
+            [view.metadatas[i] for i in keep],
+            np.asarray(view.matrix)[keep] if keep else np.zeros((0, 0), dtype=np.float32),
+        )
+
+    def vectors(self) -> tuple[list[str], np.ndarray]:
+        """Return ``(ids, matrix)``: every chunk id and its unit-norm float32 row.
+
+        The matrix may be memory-mapped and read-only; copy rows before mutating.
+        """
+        view = self._view()
+        return list(view.ids), view.matrix
+
+    def scan_bytes(self) -> int:
+        """Return the bytes a full query scan touches.
+
+        That is the compact matrix (plus int8 scales) when ``vector_dtype`` is
+        not float32, else the float32 matrix.
+        """
+        view = self._view()
+        if view.compact is None:
+            return view.matrix.nbytes
+        return view.compact.nbytes + (view.scales.nbytes if view.scales is not None else 0)
+
+    def get(self, ids: list[str] | None = None) -> list[dict[str, Any]]:
+        view = self._view()
+        rows = (
+            range(len(view.ids))
+            if ids is None
+            else [view.row_of[cid] for cid in ids if cid in view.row_of]
+        )
+        return [
+            {"id": view.ids[i], "text": view.texts[i], "metadata": view.metadatas[i]} for i in rows
+        ]
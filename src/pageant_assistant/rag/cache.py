@@ -0,0 +1,169 @@
+"""Cache of ``rag_research`` results, keyed by question and corpus version.
+
+Retrieval plus the relevance-grading LLM call depend only on the question,
+its inferred type, the shards searched, and the evidence in those shards.
+``ResearchCache`` stores the full research output for that combination so
+the grading call is paid once per question per corpus version.
+
+Invalidation is automatic: the key includes ``corpus_version(shards)`` of
+the searched shards, which changes whenever ``add_chunks``/``delete_chunks``
+(seeding, ingestion, web write-back) touch one of them.  Writes to other
+shards leave the key alone.  Entries for older versions simply stop
+matching; the on-disk copy prunes them, per shard set, the first time a
+newer version is written.
+
+Entries live in an in-process LRU and, when a directory is configured, as
+one JSON file per key under ``<dir>/<shards>/<corpus_version>/`` so they
+survive restarts and are shared between worker processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pageant_assistant.config.settings import RAG_CACHE_DIR, RAG_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def normalise_question(text: str) -> str:
+    """Lower-case, strip punctuation, and collapse whitespace.
+
+    Example:
+        >>> normalise_question("  What is YOUR view on climate-change?! ")
+        'what is your view on climate change'
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+class ResearchKey(NamedTuple):
+    """Everything a ``rag_research`` result depends on."""
+
+    question: str  # normalised with normalise_question()
+    question_type: str
+    shard: str  # searched shards, e.g. "kenya+global", or "*" when every shard is searched
+    corpus_version: str  # corpus_version() of the searched shards
+
+    @property
+    def digest(self) -> str:
+        """Stable file-name-safe digest of the key."""
+        raw = "\0".join(self)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class ResearchCache:
+    """Thread-safe LRU of research results with an optional JSON directory.
+
+    Args:
+        max_entries: In-memory capacity; 0 disables the cache entirely.
+        directory: Where to persist entries, or None for memory only.
+
+    Example:
+        >>> cache = ResearchCache(max_entries=8)
+        >>> key = ResearchKey("q", "advocacy", "*", "v1")
+        >>> cache.put(key, {"rag_evidence": "E"})
+        >>> cache.get(key)
+        {'rag_evidence': 'E'}
+    """
+
+    def __init__(self, max_entries: int = RAG_CACHE_SIZE, directory: Path | None = None) -> None:
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: OrderedDict[ResearchKey, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned_for: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _shard_dir(self, key: ResearchKey) -> Path:
+        assert self.directory is not None
+        return self.directory / ("all" if key.shard == "*" else key.shard)
+
+    def _file(self, key: ResearchKey) -> Path:
+        return self._shard_dir(key) / key.corpus_version / f"{key.digest}.json"
+
+    def get(self, key: ResearchKey) -> dict[str, Any] | None:
+        """Return the cached result for *key*, or None on a miss."""
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = self._read(key) if self.directory else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: ResearchKey, value: dict[str, Any]) -> None:
+        """Store *value* (JSON-serialisable) for *key*."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._remember(key, value)
+        if self.directory:
+            self._write(key, value)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (disk entries are left in place)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: ResearchKey, value: dict[str, Any]) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: ResearchKey) -> dict[str, Any] | None:
+        try:
+            data = json.loads(self._file(key).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        # Guard against digest collisions and hand-edited files
+        return data.get("value") if data.get("key") == list(key) else None
+
+    def _write(self, key: ResearchKey, value: dict[str, Any]) -> None:
+        path = self._file(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps({"key": list(key), "value": value}), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("ResearchCache: could not persist entry (%s)", exc)
+            return
+        if self._pruned_for.get(key.shard) != key.corpus_version:
+            self._prune(key)
+
+    def _prune(self, key: ResearchKey) -> None:
+        """Remove on-disk entries of *key*'s shard set for every other corpus version."""
+        shard_dir = self._shard_dir(key)
+        for child in shard_dir.iterdir():
+            if child.is_dir() and child.name != key.corpus_version:
+                shutil.rmtree(child, ignore_errors=True)
+                logger.info(
+                    "ResearchCache: pruned '%s' entries for corpus version %s",
+                    key.shard,
+                    child.name,
+                )
+        self._pruned_for[key.shard] = key.corpus_version
+
+
+# Module-level singleton shared by every session
+research_cache = ResearchCache(directory=RAG_CACHE_DIR)
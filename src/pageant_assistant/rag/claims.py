@@ -0,0 +1,136 @@
+"""Local extraction and triage of checkable factual claims.
+
+``claim_verifier`` only needs the LLM for claims it cannot settle itself.
+This module finds candidate claims with regexes and a few rules — numbers,
+percentages, years, acronyms, and named acts/policies/organisations — and
+checks each one against the evidence text:
+
+- An answer with no candidate claims needs no verification at all.
+- A claim whose every number and entity appears verbatim (after light
+  normalisation) in the evidence is auto-verified.
+- Everything else is ambiguous and goes to the LLM.
+
+Opinions and aspirations ("I will fight for every girl") contain no
+numbers or named entities and are never extracted, matching the verifier
+prompt's rule that they are not flagged.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+_SMALL_NUMBERS = "one|two|three|four|five|six|seven|eight|nine|ten"
+
+_PERCENT_RE = re.compile(r"\b(\d[\d,]*(?:\.\d+)?)\s*(?:%|percent\b|per cent\b)", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"(?<![\w.])(\d[\d,]*(?:\.\d+)?)\b(?!\s*(?:%|percent|per cent))")
+_RATIO_RE = re.compile(rf"\b(?:{_SMALL_NUMBERS})\s+(?:in|out of)\s+(?:{_SMALL_NUMBERS})\b", re.I)
+_ACRONYM_RE = re.compile(r"\b[A-Z][A-Z0-9]*[A-Z](?:-[A-Z0-9]+)*\b")
+# Capitalised phrase ending in a word that names a law, policy, or body
+_NAMED_RE = re.compile(
+    r"\b(?:[A-Z][\w'’-]*\s+(?:(?:of|for|on|and|the)\s+)*){0,6}"
+    r"(?:Act|Bill|Law|Policy|Strategy|Plan|Programme|Program|Initiative|Agenda|Goals?"
+    r"|Convention|Treaty|Declaration|Charter|Protocol|Framework|Fund|Foundation"
+    r"|Organi[sz]ation|Commission|Council|Agency|Institute|Bank|Alliance|Union)\b"
+)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+# Upper-case words that are not entities
+_NOT_ACRONYMS = frozenset({"I", "OK", "AM", "PM"})
+
+
+@dataclass(frozen=True)
+class Claim:
+    """One sentence containing checkable facts.
+
+    Attributes:
+        sentence: The sentence as written in the answer.
+        numbers: Normalised numeric facts (``"45%"``, ``"2011"``, ``"one in three"``).
+        entities: Acronyms and named acts/policies/organisations.
+    """
+
+    sentence: str
+    numbers: tuple[str, ...]
+    entities: tuple[str, ...]
+
+
+def _normalise_number(raw: str) -> str:
+    return raw.replace(",", "")
+
+
+def _numbers(text: str) -> list[str]:
+    found = [f"{_normalise_number(m)}%" for m in _PERCENT_RE.findall(text)]
+    found += [_normalise_number(m) for m in _NUMBER_RE.findall(text)]
+    found += [" ".join(m.lower().split()) for m in _RATIO_RE.findall(text)]
+    return found
+
+
+def _entities(text: str) -> list[str]:
+    named = [re.sub(r"^the\s+", "", m.strip(), flags=re.I) for m in _NAMED_RE.findall(text)]
+    acronyms = [a for a in _ACRONYM_RE.findall(text) if a not in _NOT_ACRONYMS]
+    # Skip acronyms already covered by a named phrase ("Anti-FGM Act")
+    acronyms = [a for a in acronyms if not any(a in n for n in named)]
+    return [n for n in named if n] + acronyms
+
+
+def extract_claims(text: str) -> list[Claim]:
+    """Split *text* into sentences and return those with checkable facts.
+
+    Example:
+        >>> [c.numbers for c in extract_claims("I love my country. 45% of girls finish school.")]
+        [('45%',)]
+    """
+    claims = []
+    for sentence in _SENTENCE_RE.split(text.strip()):
+        numbers, entities = _numbers(sentence), _entities(sentence)
+        if numbers or entities:
+            claims.append(
+                Claim(
+                    sentence=sentence.strip(),
+                    numbers=tuple(dict.fromkeys(numbers)),
+                    entities=tuple(dict.fromkeys(entities)),
+                )
+            )
+    return claims
+
+
+class EvidenceIndex:
+    """Normalised numbers and text of an evidence block, for verbatim lookups.
+
+    Example:
+        >>> index = EvidenceIndex("About 45 percent of girls (UNICEF, 2020).")
+        >>> index.supports(Claim("45% of girls, says UNICEF", ("45%",), ("UNICEF",)))
+        True
+    """
+
+    def __init__(self, evidence: str) -> None:
+        self.numbers = set(_numbers(evidence))
+        self.text = " ".join(evidence.lower().split())
+
+    def _has_entity(self, entity: str) -> bool:
+        needle = " ".join(entity.lower().split())
+        return re.search(rf"(?<!\w){re.escape(needle)}(?!\w)", self.text) is not None
+
+    def supports(self, claim: Claim) -> bool:
+        """True if every number and entity of *claim* appears in the evidence."""
+        return all(n in self.numbers for n in claim.numbers) and all(
+            self._has_entity(e) for e in claim.entities
+        )
+
+
+def triage_claims(answer: str, evidence: str) -> tuple[list[Claim], list[Claim]]:
+    """Split the answer's claims into auto-verified and ambiguous ones.
+
+    Args:
+        answer: The refined answer text.
+        evidence: The evidence block (or concatenated chunk texts) it may cite.
+
+    Returns:
+        ``(verified, ambiguous)`` — both empty when the answer makes no
+        checkable claims.
+    """
+    index = EvidenceIndex(evidence)
+    verified: list[Claim] = []
+    ambiguous: list[Claim] = []
+    for claim in extract_claims(answer):
+        (verified if index.supports(claim) else ambiguous).append(claim)
+    return verified, ambiguous
@@ -0,0 +1,74 @@
+"""Synchronisation primitives shared by the evidence store layer."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one exclusive writer.
+
+    Phase-fair: once a writer is waiting, new readers queue behind it, and
+    readers that queued during a write are admitted before the next writer.
+    Neither a steady stream of retrieval queries nor back-to-back ingestion
+    batches can starve the other side.  Not re-entrant — do not take
+    ``read()`` while holding ``write()`` or vice versa.
+
+    Example:
+        >>> lock = ReadWriteLock()
+        >>> with lock.read():
+        ...     pass
+        >>> with lock.write():
+        ...     pass
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._readers_waiting = 0
+        self._readers_turn = False
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold a shared lock for the duration of the ``with`` block."""
+        with self._cond:
+            self._readers_waiting += 1
+            try:
+                while self._writer or (self._writers_waiting and not self._readers_turn):
+                    self._cond.wait()
+            finally:
+                self._readers_waiting -= 1
+            self._readers += 1
+            if not self._readers_waiting:
+                self._readers_turn = False
+                self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the exclusive lock for the duration of the ``with`` block."""
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers or self._readers_turn:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._readers_turn = self._readers_waiting > 0
+                self._cond.notify_all()
@@ -0,0 +1,374 @@
+"""Shared embedding sidecar for multi-worker deployments.
+
+Every Streamlit worker that embeds in-process loads its own ~80MB copy of
+all-MiniLM-L6-v2.  This module runs the model once per host behind a Unix
+socket (or localhost TCP port) and serves all workers from it:
+
+- ``MicroBatcher`` coalesces concurrent requests into one model call, up to
+  ``max_batch`` texts or ``max_wait_ms`` after the first request arrives.
+- ``EmbeddingServer`` accepts connections (one thread each) and feeds the
+  batcher.
+- ``SidecarEmbeddingFunction`` is the client; ``rag.embeddings`` returns it
+  when ``EMBEDDING_SERVICE`` is set, so the store uses it transparently.
+
+Wire protocol (per request, over a persistent connection): a length-prefixed
+JSON frame ``{"texts": [...]}``, answered by a JSON frame
+``{"count": n, "dim": d}`` followed by a frame of ``n*d`` little-endian
+float32 values, or by a single ``{"error": "..."}`` frame.
+
+Usage:
+    python -m pageant_assistant.rag.embed_service --address unix:/tmp/pageant-embed.sock
+    EMBEDDING_SERVICE=unix:/tmp/pageant-embed.sock streamlit run apps/streamlit_app.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from pageant_assistant.config.settings import EMBEDDING_BATCH_MAX, EMBEDDING_BATCH_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct(">I")
+
+
+# ---------------------------------------------------------------------------
+# Framing
+# ---------------------------------------------------------------------------
+
+
+def _send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("embedding service connection closed")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (length,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    return _recv_exact(sock, length)
+
+
+def parse_address(address: str) -> tuple[int, Any]:
+    """Parse ``unix:/path`` or ``tcp:host:port`` into ``(socket family, address)``.
+
+    Raises:
+        ValueError: If *address* uses neither scheme.
+
+    Example:
+        >>> parse_address("tcp:127.0.0.1:8765")[1]
+        ('127.0.0.1', 8765)
+    """
+    scheme, _, rest = address.partition(":")
+    if scheme == "unix" and rest:
+        return socket.AF_UNIX, rest
+    if scheme == "tcp" and rest:
+        host, _, port = rest.rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    raise ValueError(
+        f"Invalid embedding service address {address!r} (use unix:/… or tcp:host:port)"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+
+class MicroBatcher:
+    """Coalesce concurrent embedding requests into batched model calls.
+
+    A single worker thread owns the model.  It blocks for the first pending
+    request, then keeps collecting requests until ``max_batch`` texts are
+    queued or ``max_wait_ms`` has elapsed, embeds them in one call, and
+    resolves each caller's future with its own slice of the result.
+
+    Args:
+        embed_fn: Callable mapping a list of texts to vectors.
+        max_batch: Soft cap on texts per model call (a single larger request
+            is still embedded whole).
+        max_wait_ms: How long to hold a batch open for more requests.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Any,
+        max_batch: int = EMBEDDING_BATCH_MAX,
+        max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS,
+    ) -> None:
+        self._embed_fn = embed_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: queue.Queue[tuple[list[str], Future] | None] = queue.Queue()
+        self.batches = 0  # model calls made, for logging/tests
+        self._thread = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: Sequence[str]) -> Future:
+        """Queue *texts*; the returned future resolves to a float32 (n, dim) array."""
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+        else:
+            self._queue.put((list(texts), future))
+        return future
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Blocking convenience wrapper around ``submit``."""
+        return self.submit(texts).result()
+
+    def close(self) -> None:
+        """Stop the worker thread after draining queued requests."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            size = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list[tuple[list[str], Future]]) -> None:
+        texts = [t for texts, _ in batch for t in texts]
+        try:
+            vectors = np.asarray(self._embed_fn(texts), dtype=np.float32)
+        except Exception as exc:
+            logger.warning("MicroBatcher: embedding %d text(s) failed: %s", len(texts), exc)
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        logger.debug("MicroBatcher: %d request(s), %d text(s)", len(batch), len(texts))
+        start = 0
+        for request_texts, future in batch:
+            future.set_result(vectors[start : start + len(request_texts)])
+            start += len(request_texts)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        batcher: MicroBatcher = self.server.batcher  # type: ignore[attr-defined]
+        while True:
+            try:
+                request = json.loads(_recv_frame(self.request))
+            except (ConnectionError, OSError):
+                return
+            except json.JSONDecodeError as exc:
+                _send_frame(self.request, json.dumps({"error": f"bad request: {exc}"}).encode())
+                continue
+            try:
+                vectors = batcher.embed(request.get("texts") or [])
+            except Exception as exc:
+                _send_frame(self.request, json.dumps({"error": str(exc)}).encode())
+                continue
+            count, dim = vectors.shape if vectors.size else (0, 0)
+            _send_frame(self.request, json.dumps({"count": count, "dim": dim}).encode())
+            _send_frame(self.request, vectors.astype("<f4", copy=False).tobytes())
+
+
+class EmbeddingServer:
+    """Serve a ``MicroBatcher`` on a Unix socket or localhost TCP port.
+
+    Args:
+        address: ``unix:/path`` or ``tcp:host:port``.
+        embed_fn: Embedding callable; defaults to the in-process model.
+        max_batch: See ``MicroBatcher``.
+        max_wait_ms: See ``MicroBatcher``.
+
+    Example:
+        >>> server = EmbeddingServer("tcp:127.0.0.1:0", embed_fn=my_embed)
+        >>> server.start()   # background thread; server.serve_forever() blocks
+        >>> server.close()
+    """
+
+    def __init__(
+        self,
+        address: str,
+        embed_fn: Any = None,
+        max_batch: int = EMBEDDING_BATCH_MAX,
+        max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS,
+    ) -> None:
+        if embed_fn is None:
+            from pageant_assistant.rag.embeddings import local_embedding_function
+
+            embed_fn = local_embedding_function()
+        family, target = parse_address(address)
+        self.batcher = MicroBatcher(embed_fn, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        if family == socket.AF_UNIX:
+            Path(target).unlink(missing_ok=True)  # stale socket from a previous run
+            self._server: socketserver.BaseServer = socketserver.ThreadingUnixStreamServer(
+                target, _Handler
+            )
+            self.address = f"unix:{target}"
+        else:
+            self._server = socketserver.ThreadingTCPServer(target, _Handler)
+            host, port = self._server.server_address[:2]
+            self.address = f"tcp:{host}:{port}"
+        self._server.daemon_threads = True  # type: ignore[attr-defined]
+        self._server.batcher = self.batcher  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until ``close()``."""
+        logger.info("Embedding service listening on %s", self.address)
+        self._server.serve_forever()
+
+    def start(self) -> None:
+        """Serve requests on a background daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop serving, release the socket, and stop the batcher."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self.address.startswith("unix:"):
+            Path(self.address[5:]).unlink(missing_ok=True)
+        self.batcher.close()
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+
+class SidecarEmbeddingFunction:
+    """Embedding callable that delegates to a running ``EmbeddingServer``.
+
+    Keeps one connection per calling thread, so concurrent sessions reach
+    the server in parallel and get batched together there.  If the service
+    is unreachable, falls back to the in-process model (logged once) so
+    retrieval keeps working at the cost of loading a local copy.
+
+    Args:
+        address: ``unix:/path`` or ``tcp:host:port``.
+        timeout: Socket timeout in seconds per request.
+        fallback: Whether to embed locally when the service is down.
+    """
+
+    def __init__(self, address: str, timeout: float = 30.0, fallback: bool = True) -> None:
+        self.address = address
+        self._family, self._target = parse_address(address)
+        self.timeout = timeout
+        self.fallback = fallback
+        self._local = threading.local()
+        self._warned = False
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(self._family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self._target)
+            self._local.sock = sock
+        return sock
+
+    def _drop_connection(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, texts: list[str]) -> np.ndarray:
+        sock = self._connection()
+        _send_frame(sock, json.dumps({"texts": texts}).encode("utf-8"))
+        header = json.loads(_recv_frame(sock))
+        if "error" in header:
+            raise RuntimeError(f"embedding service error: {header['error']}")
+        data = _recv_frame(sock)
+        return np.frombuffer(data, dtype="<f4").reshape(header["count"], header["dim"])
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        try:
+            try:
+                return self._request(texts)
+            except (ConnectionError, BrokenPipeError):
+                # Server restarted since this thread connected — reconnect once
+                self._drop_connection()
+                return self._request(texts)
+        except OSError as exc:
+            self._drop_connection()
+            if not self.fallback:
+                raise
+            if not self._warned:
+                logger.warning(
+                    "Embedding service %s unavailable (%s) — embedding in-process",
+                    self.address,
+                    exc,
+                )
+                self._warned = True
+            from pageant_assistant.rag.embeddings import local_embedding_function
+
+            return np.asarray(local_embedding_function()(texts), dtype=np.float32)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: ``python -m pageant_assistant.rag.embed_service``."""
+    parser = argparse.ArgumentParser(description="Run the shared embedding sidecar.")
+    parser.add_argument(
+        "--address",
+        default=os.getenv("EMBEDDING_SERVICE") or "unix:/tmp/pageant-embed.sock",
+        help="unix:/path or tcp:host:port",
+    )
+    parser.add_argument("--max-batch", type=int, default=EMBEDDING_BATCH_MAX)
+    parser.add_argument("--max-wait-ms", type=float, default=EMBEDDING_BATCH_WAIT_MS)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    server = EmbeddingServer(args.address, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
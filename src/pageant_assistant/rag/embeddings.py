@@ -0,0 +1,96 @@
+"""Embedding function used by the evidence store.
+
+The store embeds documents and queries itself (rather than letting a Chroma
+collection do it) so that every backend shares one embedding model and
+precomputed vectors can be written directly.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from pageant_assistant.config.settings import (
+    EMBEDDING_MODEL,
+    EMBEDDING_SERVICE,
+    RAG_RETRIEVAL_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+EmbeddingFn = Callable[[Sequence[str]], Any]
+
+_embedding_fn: EmbeddingFn | None = None
+_local_fn: EmbeddingFn | None = None
+_lock = threading.Lock()
+
+
+def embedding_model_id() -> str:
+    """Return an identifier for the active embedding model.
+
+    Persisted alongside prebuilt vectors (e.g. index snapshots) so vectors
+    produced by a different model are never mixed into the same index.
+    """
+    if EMBEDDING_MODEL == "minilm-int8":
+        return "all-MiniLM-L6-v2-int8"
+    return "all-MiniLM-L6-v2"
+
+
+def local_embedding_function() -> EmbeddingFn:
+    """Return the in-process embedding model (lazily constructed, shared).
+
+    Chroma's DefaultEmbeddingFunction (all-MiniLM-L6-v2 via onnxruntime),
+    which downloads/loads its model on first call, or the int8-quantized
+    variant when ``EMBEDDING_MODEL=minilm-int8`` (see ``rag.quantized``).
+
+    Raises:
+        ValueError: If ``EMBEDDING_MODEL`` names an unknown model.
+    """
+    global _local_fn
+    if _local_fn is None:
+        with _lock:
+            if _local_fn is None:
+                if EMBEDDING_MODEL == "minilm-int8":
+                    from pageant_assistant.rag.quantized import QuantizedMiniLM
+
+                    logger.debug("Initialising QuantizedMiniLM (all-MiniLM-L6-v2, int8)")
+                    _local_fn = QuantizedMiniLM()
+                elif EMBEDDING_MODEL == "minilm":
+                    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+                    logger.debug("Initialising DefaultEmbeddingFunction (all-MiniLM-L6-v2)")
+                    _local_fn = DefaultEmbeddingFunction()
+                else:
+                    raise ValueError(
+                        f"Unknown EMBEDDING_MODEL {EMBEDDING_MODEL!r} "
+                        "(expected 'minilm' or 'minilm-int8')"
+                    )
+    return _local_fn
+
+
+def get_embedding_function() -> EmbeddingFn:
+    """Return the process-wide embedding callable (lazily constructed).
+
+    When ``EMBEDDING_SERVICE`` is set, returns a client for the shared
+    embedding sidecar (see ``rag.embed_service``) so worker processes do not
+    each load their own model; otherwise the in-process model.
+
+    Returns:
+        A callable mapping a list of texts to a list of float vectors.
+    """
+    global _embedding_fn
+    if _embedding_fn is None:
+        if EMBEDDING_SERVICE:
+            from pageant_assistant.rag.embed_service import SidecarEmbeddingFunction
+
+            logger.info("Using embedding service at %s", EMBEDDING_SERVICE)
+            # A stalled sidecar must not hold a retrieval pool thread past the
+            # point where retrieve_evidence has already given up on it
+            _embedding_fn = SidecarEmbeddingFunction(
+                EMBEDDING_SERVICE, timeout=RAG_RETRIEVAL_TIMEOUT
+            )
+        else:
+            _embedding_fn = local_embedding_function()
+    return _embedding_fn
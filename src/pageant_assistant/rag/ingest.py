@@ -0,0 +1,560 @@
+"""Bulk corpus ingestion: stream report files from a directory into the evidence store.
+
+Walks a directory of reports (plain text, markdown, HTML, or text extracted
+from PDFs), splits each document into paragraph-aligned chunks carrying the
+same metadata as the seed corpus (topic, chunk_type, source, region), drops
+duplicate chunks by content hash, embeds them in large batches across a
+process pool, and upserts them via ``add_chunks`` in bounded batches.
+
+Progress is written to a JSON state file after every upserted batch, so an
+interrupted run resumes where it stopped instead of re-embedding everything.
+The state remembers which chunks each file produced: when an edited file is
+re-ingested, chunks it no longer contains are deleted from the store.  A
+state that lists chunks the store no longer holds (a wiped or rebuilt store)
+is discarded and the directory is ingested from scratch.
+
+Usage:
+    python -m pageant_assistant.rag.ingest reports/kenya --region "Kenya/Africa"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any
+
+from pageant_assistant.config.settings import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_SUFFIXES: frozenset[str] = frozenset({".txt", ".md", ".markdown", ".html", ".htm"})
+DEFAULT_STATE_FILE = DATA_DIR / "ingest_state.json"
+
+# Chunks of roughly one to two paragraphs keep retrieval precise while still
+# giving the relevance grader enough context to judge each chunk on its own.
+DEFAULT_MAX_WORDS = 180
+DEFAULT_OVERLAP_WORDS = 30
+DEFAULT_BATCH_SIZE = 256
+
+_STAT_RE = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(?:%|percent|per cent|per \d[\d,]*)|\b\d{1,3}(?:,\d{3})+\b"
+)
+_FRONT_MATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+_MD_MARKUP_RE = re.compile(r"^\s{0,3}(?:#{1,6}\s+|[-*+]\s+|>\s?)", re.MULTILINE)
+
+EmbedFn = Callable[[list[str]], list[list[float]]]
+
+
+# ---------------------------------------------------------------------------
+# Document reading
+# ---------------------------------------------------------------------------
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collect visible text from HTML, turning block elements into paragraph breaks."""
+
+    _BLOCK_TAGS = frozenset({"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr"})
+    _SKIP_TAGS = frozenset({"script", "style", "noscript", "head"})
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.parts: list[str] = []
+        self.title = ""
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "title":
+            self._in_title = True
+        elif tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag in self._SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data.strip()
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+
+def read_document(path: Path) -> tuple[str, dict[str, str]]:
+    """Read a report file and return its plain text plus metadata overrides.
+
+    Markdown files may start with a ``---`` front-matter block of
+    ``key: value`` lines (e.g. ``topic``, ``source``, ``region``) that
+    override the CLI defaults for that document.  HTML files contribute their
+    ``<title>`` as the source.
+
+    Args:
+        path: A file with one of the ``SUPPORTED_SUFFIXES``.
+
+    Returns:
+        Tuple of ``(text, overrides)``.
+    """
+    raw = path.read_text(encoding="utf-8", errors="replace")
+    overrides: dict[str, str] = {}
+    suffix = path.suffix.lower()
+
+    if suffix in (".html", ".htm"):
+        parser = _HTMLTextExtractor()
+        parser.feed(raw)
+        if parser.title:
+            overrides["source"] = parser.title
+        return "".join(parser.parts), overrides
+
+    if suffix in (".md", ".markdown"):
+        match = _FRONT_MATTER_RE.match(raw)
+        if match:
+            for line in match.group(1).splitlines():
+                key, sep, value = line.partition(":")
+                if sep and value.strip():
+                    overrides[key.strip().lower()] = value.strip().strip("\"'")
+            raw = raw[match.end() :]
+        raw = _MD_MARKUP_RE.sub("", raw)
+
+    return raw, overrides
+
+
+def iter_documents(root: Path) -> Iterator[Path]:
+    """Yield supported report files under *root* in a stable (sorted) order."""
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES:
+            yield path
+
+
+# ---------------------------------------------------------------------------
+# Chunking
+# ---------------------------------------------------------------------------
+
+
+def _split_long_paragraph(words: list[str], max_words: int, overlap_words: int) -> list[str]:
+    """Split an oversized paragraph into overlapping word windows."""
+    step = max(1, max_words - overlap_words)
+    windows = []
+    for start in range(0, len(words), step):
+        windows.append(" ".join(words[start : start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return windows
+
+
+def chunk_text(
+    text: str,
+    max_words: int = DEFAULT_MAX_WORDS,
+    overlap_words: int = DEFAULT_OVERLAP_WORDS,
+) -> list[str]:
+    """Split a document into paragraph-aligned chunks of at most ``max_words``.
+
+    Consecutive short paragraphs are packed together; a single paragraph
+    longer than ``max_words`` is split into windows overlapping by
+    ``overlap_words`` so no sentence loses its surrounding context.
+
+    Example:
+        >>> chunk_text("First paragraph.\\n\\nSecond paragraph.", max_words=50)
+        ['First paragraph. Second paragraph.']
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_words = 0
+
+    for para in re.split(r"\n\s*\n", text):
+        words = para.split()
+        if not words:
+            continue
+        if len(words) > max_words:
+            if current:
+                chunks.append(" ".join(current))
+                current, current_words = [], 0
+            chunks.extend(_split_long_paragraph(words, max_words, overlap_words))
+            continue
+        if current_words + len(words) > max_words and current:
+            chunks.append(" ".join(current))
+            current, current_words = [], 0
+        current.append(" ".join(words))
+        current_words += len(words)
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def classify_chunk(text: str, position: int) -> str:
+    """Assign a seed-corpus ``chunk_type`` to an ingested chunk (heuristic).
+
+    Chunks quoting several figures are ``stat``; the opening chunk of a
+    document is ``framing``; everything else is treated as an ``example``.
+    """
+    if len(_STAT_RE.findall(text)) >= 2:
+        return "stat"
+    if position == 0:
+        return "framing"
+    return "example"
+
+
+def content_hash(text: str) -> str:
+    """Return a whitespace- and case-insensitive SHA-256 digest of chunk text."""
+    normalised = " ".join(text.lower().split())
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+
+def chunk_id(digest: str) -> str:
+    """Store id of the ingested chunk with content hash *digest*."""
+    return f"ing-{digest[:20]}"
+
+
+# ---------------------------------------------------------------------------
+# Resumable state
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class IngestState:
+    """Checkpoint of an ingestion run, persisted as JSON after every batch.
+
+    Attributes:
+        completed_files: Relative path → SHA-256 of file bytes for every file
+            whose chunks are all in the store.  A changed file is re-ingested.
+        seen_hashes: Content hashes of every chunk already upserted, used to
+            drop duplicates across files and across runs.
+        file_chunks: Relative path → content hashes of every chunk the file
+            produced (duplicates of other files' chunks included), so chunks
+            an edit removes can be deleted.
+    """
+
+    completed_files: dict[str, str] = field(default_factory=dict)
+    seen_hashes: set[str] = field(default_factory=set)
+    file_chunks: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> IngestState:
+        """Load state from *path*, or return an empty state if missing/corrupt."""
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls(
+                completed_files=dict(data.get("completed_files", {})),
+                seen_hashes=set(data.get("seen_hashes", [])),
+                file_chunks={k: list(v) for k, v in data.get("file_chunks", {}).items()},
+            )
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            logger.warning("IngestState: unreadable state file %s — starting fresh", path)
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Atomically write the state to *path* (write-then-rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "completed_files": self.completed_files,
+                    "seen_hashes": sorted(self.seen_hashes),
+                    "file_chunks": self.file_chunks,
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+
+@dataclass
+class IngestStats:
+    """Counters reported at the end of an ingestion run."""
+
+    files_seen: int = 0
+    files_skipped: int = 0
+    chunks_total: int = 0
+    chunks_duplicate: int = 0
+    chunks_upserted: int = 0
+    chunks_deleted: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Embedding workers
+# ---------------------------------------------------------------------------
+
+_worker_embedder: Any = None
+
+
+def _init_embed_worker() -> None:
+    """Process-pool initializer: load one embedding model per worker process."""
+    global _worker_embedder
+    from pageant_assistant.rag.embeddings import get_embedding_function
+
+    _worker_embedder = get_embedding_function()
+
+
+def _embed_in_worker(texts: list[str]) -> list[list[float]]:
+    """Embed a batch inside a worker process (returns plain lists for pickling)."""
+    return [[float(x) for x in vec] for vec in _worker_embedder(texts)]
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+
+def _document_chunks(
+    path: Path,
+    root: Path,
+    *,
+    region: str,
+    topic: str | None,
+    max_words: int,
+) -> list[dict[str, Any]]:
+    """Read and chunk one document into ``add_chunks``-shaped dicts (no ids yet)."""
+    text, overrides = read_document(path)
+    rel = path.relative_to(root)
+    default_topic = topic or (rel.parts[0] if len(rel.parts) > 1 else "general")
+    metadata_base = {
+        "topic": overrides.get("topic", default_topic),
+        "source": overrides.get("source", rel.as_posix()),
+        "region": overrides.get("region", region),
+    }
+    return [
+        {
+            "text": chunk,
+            "metadata": {**metadata_base, "chunk_type": classify_chunk(chunk, i)},
+        }
+        for i, chunk in enumerate(chunk_text(text, max_words=max_words))
+    ]
+
+
+def ingest_directory(
+    root: Path,
+    *,
+    region: str,
+    topic: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    max_words: int = DEFAULT_MAX_WORDS,
+    state_path: Path = DEFAULT_STATE_FILE,
+    embed_fn: EmbedFn | None = None,
+    progress: Callable[[IngestStats], None] | None = None,
+) -> IngestStats:
+    """Ingest every supported document under *root* into the evidence store.
+
+    Documents are streamed one at a time; new chunks accumulate into batches
+    of ``batch_size`` that are embedded concurrently (up to ``workers``
+    batches in flight) and upserted in submission order.  After each upsert
+    the state file is updated, so the run can be resumed after interruption.
+    Once a re-ingested file is complete, chunks it used to produce that no
+    file still references are deleted.  If the store no longer holds every
+    chunk the state recorded, the state is discarded first.
+
+    Args:
+        root: Directory to scan recursively.
+        region: Default ``region`` metadata (front matter may override).
+        topic: Default ``topic``; if None, the first sub-directory name under
+            *root* is used, or ``"general"`` for top-level files.
+        batch_size: Chunks per embedding job and per ``add_chunks`` call.
+        workers: Embedding processes.  Defaults to ``os.cpu_count()``; 0 or 1
+            embeds in-process.
+        max_words: Maximum words per chunk.
+        state_path: JSON checkpoint file for resumability.
+        embed_fn: Optional in-process embedding callable (disables the pool).
+        progress: Optional callback invoked with running stats after each batch.
+
+    Returns:
+        Final ``IngestStats`` for the run.
+    """
+    # local import avoids circular deps
+    from pageant_assistant.rag.store import add_chunks, delete_chunks, load_manifest
+
+    root = Path(root).resolve()
+    state = IngestState.load(state_path)
+    stored = load_manifest().ids_with_origin("ingest")
+    missing = {chunk_id(h) for h in state.seen_hashes} - stored
+    if missing:
+        logger.warning(
+            "ingest: %d recorded chunk(s) missing from the store — ignoring %s",
+            len(missing),
+            state_path,
+        )
+        state = IngestState()
+    stats = IngestStats()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    pool: ProcessPoolExecutor | None = None
+    if embed_fn is None and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_embed_worker)
+    elif embed_fn is None:
+        _init_embed_worker()
+        embed_fn = _embed_in_worker
+
+    unflushed: dict[str, int] = {}  # file key → chunks not yet upserted
+    file_shas: dict[str, str] = {}
+    file_hashes: dict[str, list[str]] = {}  # file key → chunk hashes, until completed
+    # hash → files referencing it (completed files' recorded hashes + pending files' new ones)
+    references: Counter[str] = Counter()
+    for hashes in state.file_chunks.values():
+        references.update(set(hashes))
+    reading: list[str] = []  # key of the file currently being chunked (never "complete")
+    batch: list[dict[str, Any]] = []
+    in_flight: deque[tuple[list[dict[str, Any]], Future[list[list[float]]]]] = deque()
+
+    def _mark_completed() -> None:
+        for key in [k for k, n in unflushed.items() if n == 0 and k not in reading]:
+            new_hashes = file_hashes.pop(key)
+            stale = []
+            for digest in set(state.file_chunks.get(key, [])):
+                references[digest] -= 1
+                if references[digest] <= 0:
+                    del references[digest]
+                    stale.append(digest)
+            stale.sort()
+            if stale:
+                delete_chunks([chunk_id(h) for h in stale])
+                state.seen_hashes.difference_update(stale)
+                stats.chunks_deleted += len(stale)
+                logger.info("ingest: %s changed — deleted %d stale chunk(s)", key, len(stale))
+            state.completed_files[key] = file_shas.pop(key)
+            state.file_chunks[key] = new_hashes
+            del unflushed[key]
+
+    def _upsert(chunks: list[dict[str, Any]], vectors: list[list[float]]) -> None:
+        for chunk, vec in zip(chunks, vectors):
+            chunk["embedding"] = vec
+        add_chunks(
+            [{k: c[k] for k in ("id", "text", "metadata", "embedding")} for c in chunks],
+            origin="ingest",
+        )
+        for chunk in chunks:
+            state.seen_hashes.add(chunk["hash"])
+            unflushed[chunk["file"]] -= 1
+        stats.chunks_upserted += len(chunks)
+        _mark_completed()
+        state.save(state_path)
+        if progress:
+            progress(stats)
+        logger.info(
+            "ingest: %d chunk(s) upserted (%d duplicate, %d file(s) skipped)",
+            stats.chunks_upserted,
+            stats.chunks_duplicate,
+            stats.files_skipped,
+        )
+
+    def _dispatch(chunks: list[dict[str, Any]]) -> None:
+        texts = [c["text"] for c in chunks]
+        if pool is None:
+            _upsert(chunks, embed_fn(texts))
+            return
+        in_flight.append((chunks, pool.submit(_embed_in_worker, texts)))
+        # Bound memory: never hold more than `workers` embedded-but-unsaved batches
+        while len(in_flight) >= workers:
+            done_chunks, future = in_flight.popleft()
+            _upsert(done_chunks, future.result())
+
+    try:
+        run_hashes: set[str] = set()
+        for path in iter_documents(root):
+            stats.files_seen += 1
+            key = path.relative_to(root).as_posix()
+            file_sha = hashlib.sha256(path.read_bytes()).hexdigest()
+            if state.completed_files.get(key) == file_sha:
+                stats.files_skipped += 1
+                continue
+
+            unflushed[key] = 0
+            file_shas[key] = file_sha
+            file_hashes[key] = []
+            in_file: set[str] = set()
+            reading[:] = [key]
+            for chunk in _document_chunks(
+                path, root, region=region, topic=topic, max_words=max_words
+            ):
+                stats.chunks_total += 1
+                digest = content_hash(chunk["text"])
+                file_hashes[key].append(digest)
+                if digest not in in_file:
+                    in_file.add(digest)
+                    references[digest] += 1
+                if digest in state.seen_hashes or digest in run_hashes:
+                    stats.chunks_duplicate += 1
+                    continue
+                run_hashes.add(digest)
+                chunk.update(id=chunk_id(digest), hash=digest, file=key)
+                batch.append(chunk)
+                unflushed[key] += 1
+                if len(batch) >= batch_size:
+                    _dispatch(batch)
+                    batch = []
+            reading.clear()
+
+        if batch:
+            _dispatch(batch)
+        while in_flight:
+            done_chunks, future = in_flight.popleft()
+            _upsert(done_chunks, future.result())
+        _mark_completed()
+        state.save(state_path)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: ``python -m pageant_assistant.rag.ingest``."""
+    parser = argparse.ArgumentParser(
+        description="Ingest a directory of reports into the evidence store."
+    )
+    parser.add_argument("root", type=Path, help="Directory of .txt/.md/.html report files")
+    parser.add_argument("--region", required=True, help='Region metadata, e.g. "Kenya/Africa"')
+    parser.add_argument("--topic", help="Topic for all documents (default: sub-directory name)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Embedding processes")
+    parser.add_argument("--max-words", type=int, default=DEFAULT_MAX_WORDS)
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE_FILE, help="Checkpoint file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if not args.root.is_dir():
+        parser.error(f"not a directory: {args.root}")
+
+    stats = ingest_directory(
+        args.root,
+        region=args.region,
+        topic=args.topic,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        max_words=args.max_words,
+        state_path=args.state,
+    )
+    print(
+        f"Ingested {stats.chunks_upserted} chunk(s) from {stats.files_seen} file(s) "
+        f"({stats.files_skipped} unchanged, {stats.chunks_duplicate} duplicate chunk(s) skipped, "
+        f"{stats.chunks_deleted} stale chunk(s) deleted)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+"""Corpus manifest: chunk id → content hash, stored next to the vector index.
+
+The manifest records the content hash and origin (``seed``, ``ingest``, …)
+of every chunk written through ``add_chunks``, plus a ``corpus_version``
+digest over all (id, hash) pairs.  Startup seeding diffs the desired seed
+corpus against it to upsert only changed chunks and delete removed ones, and
+downstream caches key on ``corpus_version`` so they invalidate automatically
+whenever the corpus changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+def chunk_hash(text: str, metadata: dict[str, Any]) -> str:
+    """Return a SHA-256 digest over chunk text and metadata.
+
+    Metadata is included so that re-attributing a chunk (e.g. a corrected
+    ``source``) also counts as a change.
+
+    Example:
+        >>> chunk_hash("Hello", {"topic": "x"}) == chunk_hash("Hello", {"topic": "x"})
+        True
+    """
+    payload = json.dumps({"text": text, "metadata": metadata}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CorpusManifest:
+    """In-memory view of a collection's manifest file.
+
+    Attributes:
+        chunks: Chunk id → ``{"hash": str, "origin": str}``.
+    """
+
+    chunks: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    @property
+    def corpus_version(self) -> str:
+        """Short digest over every (id, hash) pair — changes whenever any chunk does."""
+        digest = hashlib.sha256()
+        for chunk_id in sorted(self.chunks):
+            digest.update(f"{chunk_id}\0{self.chunks[chunk_id]['hash']}\n".encode())
+        return digest.hexdigest()[:16]
+
+    def ids_with_origin(self, origin: str) -> set[str]:
+        """Return the ids of all chunks recorded with the given *origin*."""
+        return {cid for cid, entry in self.chunks.items() if entry.get("origin") == origin}
+
+    def diff(self, desired: dict[str, str], origin: str) -> tuple[list[str], list[str]]:
+        """Compare a desired ``{id: hash}`` set against chunks of one origin.
+
+        Args:
+            desired: The full set of chunks that *origin* should own.
+            origin: Only chunks recorded with this origin are candidates for
+                deletion, so seed syncs never remove ingested chunks.
+
+        Returns:
+            Tuple of ``(ids_to_upsert, ids_to_delete)``, each sorted.
+        """
+        to_upsert = sorted(
+            cid for cid, h in desired.items() if self.chunks.get(cid, {}).get("hash") != h
+        )
+        to_delete = sorted(self.ids_with_origin(origin) - desired.keys())
+        return to_upsert, to_delete
+
+    @classmethod
+    def load(cls, path: Path) -> CorpusManifest:
+        """Load a manifest from *path*; returns an empty manifest if missing/corrupt."""
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls(chunks=dict(data.get("chunks", {})))
+        except (json.JSONDecodeError, AttributeError):
+            logger.warning("CorpusManifest: unreadable manifest %s — treating as empty", path)
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Atomically write the manifest (write-then-rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "corpus_version": self.corpus_version,
+                    "updated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+                    "chunks": self.chunks,
+                },
+                indent=1,
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+
+def record_chunks(path: Path, chunks: list[dict[str, Any]], origin: str) -> str:
+    """Record upserted chunks in the manifest at *path*; return the new corpus version."""
+    with _lock:
+        manifest = CorpusManifest.load(path)
+        for c in chunks:
+            manifest.chunks[c["id"]] = {
+                "hash": chunk_hash(c["text"], c["metadata"]),
+                "origin": origin,
+            }
+        manifest.save(path)
+        return manifest.corpus_version
+
+
+def forget_chunks(path: Path, ids: list[str]) -> str:
+    """Remove deleted ids from the manifest at *path*; return the new corpus version."""
+    with _lock:
+        manifest = CorpusManifest.load(path)
+        for cid in ids:
+            manifest.chunks.pop(cid, None)
+        manifest.save(path)
+        return manifest.corpus_version
@@ -14,9 +14,18 @@ import logging
 import re
 from typing import Any
 
+from pageant_assistant.config.settings import WEB_SEARCH_PROVIDER
 from pageant_assistant.llm.providers import get_llm
+from pageant_assistant.rag.cache import ResearchKey, normalise_question, research_cache
+from pageant_assistant.rag.claims import triage_claims
 from pageant_assistant.rag.prompts import CLAIM_VERIFY_PROMPT, RELEVANCE_GRADE_PROMPT
-from pageant_assistant.rag.store import retrieve_evidence
+from pageant_assistant.rag.store import (
+    corpus_version,
+    list_shards,
+    retrieve_evidence,
+    search_shards,
+)
+from pageant_assistant.rag.web import search_web_evidence, store_web_evidence
 from pageant_assistant.schemas.state import RefinerState
 
 logger = logging.getLogger(__name__)
@@ -157,9 +166,19 @@ def rag_research(state: RefinerState) -> dict[str, Any]:
     Selection cap: at most 1 framing chunk + 1 stat chunk + 1 example chunk
     are injected downstream, ensuring concise, signal-dense evidence blocks.
 
+    When no local chunk passes grading and ``WEB_SEARCH_PROVIDER`` is set,
+    live web evidence (``rag.web``) is fetched within a strict time budget
+    and graded the same way; only the chunks graded relevant are written
+    back to the store for future runs.
+
+    Results are cached (``rag.cache``) by normalised question, question type,
+    searched shards, and their corpus version, so retrieval and the grading
+    call run once per question until the evidence in those shards changes.
+
     Args:
-        state: Current graph state.  Reads ``question`` and
-               ``question_analysis``.
+        state: Current graph state.  Reads ``question``,
+               ``question_analysis``, and ``persona_country`` (routes the
+               query to that country's evidence shard plus the global one).
 
     Returns:
         Dict with keys:
@@ -180,14 +199,67 @@ def rag_research(state: RefinerState) -> dict[str, Any]:
         )
         return {"rag_evidence": None, "rag_question_type": q_type}
 
-    raw_chunks = retrieve_evidence(question, n_results=6)
-    if not raw_chunks:
-        logger.info("rag_research: no chunks retrieved from store")
-        return {"rag_evidence": None, "rag_question_type": q_type}
+    country = state.get("persona_country") or None
+    key = _research_key(question, q_type, country)
+    cached = research_cache.get(key) if key else None
+    if cached is not None:
+        logger.info(
+            "rag_research: cache hit — %d chunk(s) (corpus %s)",
+            len(cached["selected"]),
+            key.corpus_version,
+        )
+        return {"rag_evidence": cached["rag_evidence"], "rag_question_type": q_type}
 
-    # Batch-grade all chunks for relevance in a single LLM call
-    llm = get_llm("critic")
-    verdicts = _batch_grade_chunks(llm, question, raw_chunks)
+    research = _research(question, country)
+    if key and research["web"]:
+        # Web write-back changed the corpus; file the result under the new version
+        key = _research_key(question, q_type, country)
+    # An empty retrieval may be a transient store failure, and a failed web
+    # fallback is worth retrying; never pin either
+    if key and research["chunks"] and not research["web_failed"]:
+        research_cache.put(key, research)
+    return {"rag_evidence": research["rag_evidence"], "rag_question_type": q_type}
+
+
+def _research_key(question: str, q_type: str, country: str | None) -> ResearchKey | None:
+    """Build the cache key for a research call, or None if the corpus is unreadable.
+
+    The key covers only the shards retrieval will search, so writes to other
+    shards (another country's ingest or web write-back) keep it valid.
+    """
+    try:
+        shards = search_shards(country)
+        version = corpus_version(shards)
+        everything = shards == list_shards()
+    except Exception as exc:
+        logger.warning("rag_research: corpus version unavailable (%s) — not caching", exc)
+        return None
+    return ResearchKey(
+        question=normalise_question(question),
+        question_type=q_type,
+        shard="*" if everything else "+".join(shards),
+        corpus_version=version,
+    )
+
+
+def _research(question: str, country: str | None) -> dict[str, Any]:
+    """Retrieve, grade, and select evidence for *question* (uncached).
+
+    Returns:
+        Dict with ``chunks`` (retrieved), ``verdicts`` (parallel relevance
+        flags), ``selected`` (chunks injected downstream),
+        ``rag_evidence`` (formatted block, or None when nothing survived),
+        ``web`` (number of relevant web chunks written back to the store),
+        and ``web_failed`` (the web fallback failed or timed out, so the
+        result should not be cached).
+    """
+    raw_chunks = retrieve_evidence(question, n_results=6, country=country)
+    verdicts: list[bool] = []
+    if raw_chunks:
+        # Batch-grade all chunks for relevance in a single LLM call
+        verdicts = _batch_grade_chunks(get_llm("critic"), question, raw_chunks)
+    else:
+        logger.info("rag_research: no chunks retrieved from store")
     graded: list[dict[str, Any]] = [
         chunk for chunk, relevant in zip(raw_chunks, verdicts) if relevant
     ]
@@ -197,8 +269,31 @@ def rag_research(state: RefinerState) -> dict[str, Any]:
         len(raw_chunks),
     )
 
-    if not graded:
-        return {"rag_evidence": None, "rag_question_type": q_type}
+    # Nothing relevant locally: fall back to live web evidence, if enabled
+    web_chunks: list[dict[str, Any]] | None = []
+    written = 0
+    if not graded and WEB_SEARCH_PROVIDER:
+        web_chunks = search_web_evidence(question, country)
+        if web_chunks:
+            web_verdicts = _batch_grade_chunks(get_llm("critic"), question, web_chunks)
+            raw_chunks, verdicts = raw_chunks + web_chunks, verdicts + web_verdicts
+            graded = [chunk for chunk, relevant in zip(web_chunks, web_verdicts) if relevant]
+            logger.info(
+                "rag_research: %d/%d web chunk(s) passed relevance grading",
+                len(graded),
+                len(web_chunks),
+            )
+            written = store_web_evidence(graded)
+    web_failed = web_chunks is None
+    if not raw_chunks:
+        return {
+            "chunks": [],
+            "verdicts": [],
+            "selected": [],
+            "rag_evidence": None,
+            "web": 0,
+            "web_failed": web_failed,
+        }
 
     # Select at most 1 chunk per type to keep the evidence block focused
     selected: list[dict[str, Any]] = []
@@ -211,13 +306,20 @@ def rag_research(state: RefinerState) -> dict[str, Any]:
         if len(selected) >= 3:
             break
 
-    evidence_block = _format_evidence_block(selected)
-    logger.info(
-        "rag_research: %d chunk(s) selected — types: [%s]",
-        len(selected),
-        ", ".join(c.get("chunk_type", "?") for c in selected),
-    )
-    return {"rag_evidence": evidence_block, "rag_question_type": q_type}
+    if selected:
+        logger.info(
+            "rag_research: %d chunk(s) selected — types: [%s]",
+            len(selected),
+            ", ".join(c.get("chunk_type", "?") for c in selected),
+        )
+    return {
+        "chunks": raw_chunks,
+        "verdicts": verdicts,
+        "selected": selected,
+        "rag_evidence": _format_evidence_block(selected) or None,
+        "web": written,
+        "web_failed": web_failed,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -232,6 +334,11 @@ def claim_verifier(state: RefinerState) -> dict[str, Any]:
     Skips gracefully when the question type did not use retrieval or when
     parsing fails.
 
+    Candidate claims are first extracted locally (``rag.claims``).  The LLM
+    is not called when the answer makes no checkable claims, and claims whose
+    numbers and entities all appear verbatim in the evidence are accepted
+    without it — only the remaining ambiguous sentences are sent for checking.
+
     Args:
         state: Current graph state.  Reads ``refined_answer`` and
                ``rag_evidence``.
@@ -253,10 +360,20 @@ def claim_verifier(state: RefinerState) -> dict[str, Any]:
         )
         return {"claim_flags": []}
 
+    verified, ambiguous = triage_claims(refined, evidence)
+    logger.info(
+        "claim_verifier: %d candidate claim(s) — %d verified locally, %d ambiguous",
+        len(verified) + len(ambiguous),
+        len(verified),
+        len(ambiguous),
+    )
+    if not ambiguous:
+        return {"claim_flags": []}
+
     llm = get_llm("critic")
     try:
         prompt = CLAIM_VERIFY_PROMPT.format(
-            answer=refined,
+            answer=" ".join(c.sentence for c in ambiguous),
             evidence_block=evidence,
         )
         response = llm.invoke(prompt)
@@ -30,7 +30,8 @@ named programmes, or examples related to the question topic. \
 Mark false ONLY if the chunk is completely off-topic."""
 
 # ---------------------------------------------------------------------------
-# Claim verifier — called once per refined answer inside claim_verifier
+# Claim verifier — called at most once per refined answer inside claim_verifier,
+# with only the claim sentences that could not be verified locally (rag.claims)
 # ---------------------------------------------------------------------------
 
 CLAIM_VERIFY_PROMPT = """\
@@ -0,0 +1,128 @@
+"""Int8-quantized all-MiniLM-L6-v2 for CPU embedding.
+
+``QuantizedMiniLM`` is a drop-in replacement for Chroma's
+``DefaultEmbeddingFunction`` (selected with ``EMBEDDING_MODEL=minilm-int8``).
+It differs in two ways:
+
+- It runs ``model.int8.onnx``, a dynamically quantized copy of the stock
+  model (int8 weights, ~4x smaller on disk and in memory, faster MatMuls
+  on CPU).  The file is produced by ``quantize_model`` — normally at image
+  build time — next to the downloaded float32 model.
+- It pads each batch to its longest text instead of a fixed 256 tokens,
+  so a short query costs a short forward pass.
+
+Quantization needs the optional ``onnx`` package
+(``pip install "pageant-assistant[quantize]"``); running an
+already-quantized model only needs onnxruntime.
+
+Usage:
+    python -m pageant_assistant.rag.quantized   # write model.int8.onnx
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+logger = logging.getLogger(__name__)
+
+QUANTIZED_MODEL_FILE = "model.int8.onnx"
+MAX_SEQ_LENGTH = 256  # matches the stock embedding function's truncation
+
+
+def _model_dir() -> Path:
+    return Path(ONNXMiniLM_L6_V2.DOWNLOAD_PATH) / ONNXMiniLM_L6_V2.EXTRACTED_FOLDER_NAME
+
+
+def quantize_model(source: Path | None = None, target: Path | None = None) -> Path:
+    """Write a dynamically int8-quantized copy of the MiniLM ONNX model.
+
+    Args:
+        source: float32 model (default: Chroma's downloaded ``model.onnx``,
+            fetched first if missing).
+        target: Output path (default: ``model.int8.onnx`` beside the source).
+
+    Returns:
+        Path of the quantized model.
+
+    Raises:
+        ImportError: If the optional ``onnx`` package is not installed.
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as exc:  # onnxruntime.quantization imports onnx
+        raise ImportError(
+            'Quantizing the embedding model requires "onnx": '
+            'pip install "pageant-assistant[quantize]"'
+        ) from exc
+
+    if source is None:
+        ONNXMiniLM_L6_V2()._download_model_if_not_exists()
+        source = _model_dir() / "model.onnx"
+    target = target or source.with_name(QUANTIZED_MODEL_FILE)
+    tmp = target.with_suffix(".tmp.onnx")
+    logger.info("quantize_model: %s → %s", source, target)
+    quantize_dynamic(str(source), str(tmp), weight_type=QuantType.QInt8)
+    os.replace(tmp, target)
+    return target
+
+
+class QuantizedMiniLM(ONNXMiniLM_L6_V2):
+    """all-MiniLM-L6-v2 on an int8 ONNX session with per-batch dynamic padding."""
+
+    @cached_property
+    def tokenizer(self) -> Any:
+        tokenizer = self.Tokenizer.from_file(str(_model_dir() / "tokenizer.json"))
+        tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")  # pad to longest in batch
+        return tokenizer
+
+    @cached_property
+    def model(self) -> Any:
+        path = _model_dir() / QUANTIZED_MODEL_FILE
+        if not path.exists():
+            logger.info("QuantizedMiniLM: %s missing — quantizing now", path)
+            quantize_model(target=path)
+        so = self.ort.SessionOptions()
+        so.log_severity_level = 3
+        so.graph_optimization_level = self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return self.ort.InferenceSession(
+            str(path), providers=["CPUExecutionProvider"], sess_options=so
+        )
+
+    def _forward(self, documents: list[str], batch_size: int = 32) -> np.ndarray:
+        all_embeddings = []
+        for i in range(0, len(documents), batch_size):
+            encoded = self.tokenizer.encode_batch(documents[i : i + batch_size])
+            input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            last_hidden_state = self.model.run(
+                None,
+                {
+                    "input_ids": input_ids,
+                    "attention_mask": attention_mask,
+                    "token_type_ids": np.zeros_like(input_ids),
+                },
+            )[0]
+            # Mean pooling over real (non-pad) tokens
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (last_hidden_state * mask).sum(1) / np.clip(mask.sum(1), 1e-9, None)
+            all_embeddings.append(self._normalize(pooled).astype(np.float32))
+        return np.concatenate(all_embeddings)
+
+
+def main() -> int:
+    """Command-line entry point: ``python -m pageant_assistant.rag.quantized``."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    print(f"Quantized model written to {quantize_model()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,8 +8,11 @@ or body so the claim_verifier node can surface attributions when flagging.
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 from typing import Any
 
+from pageant_assistant.rag.manifest import CorpusManifest, chunk_hash, record_chunks
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -343,37 +346,119 @@ SEED_CORPUS: list[dict[str, Any]] = [
 ]
 
 
-def seed_if_empty() -> int:
-    """Seed the Chroma collection with the Kenya/Africa corpus if it is empty.
+def sync_seed_corpus() -> int:
+    """Bring every shard's seed chunks in line with ``SEED_CORPUS``.
+
+    Seed chunks are routed to region shards by their ``region`` metadata
+    (see ``rag.shards``).  Each shard is diffed against its own corpus
+    manifest: only new or edited chunks are upserted (and re-embedded), and
+    seed chunks that were removed from ``SEED_CORPUS`` — or that now belong
+    to a different shard — are deleted.  Chunks added by ingestion are never
+    touched.  A collection created before manifests existed is backfilled by
+    hashing what is already stored, so upgrading does not require wiping
+    ``data/chroma``.
+
+    Vectors for chunks whose hash matches the prebuilt snapshot (see
+    ``rag.snapshot``) are reused, so only chunks edited since the image was
+    built are embedded live.
 
-    Idempotent: skips seeding if the collection already contains documents.
     Designed to be called once at application startup (e.g. via
     ``@st.cache_resource``).
 
     Returns:
-        Number of chunks in the collection after the operation.
+        Number of chunks in the store (all shards) after the operation.
 
     Example:
-        >>> n = seed_if_empty()
+        >>> n = sync_seed_corpus()
         >>> n >= 18
         True
     """
+    from pageant_assistant.rag.shards import shard_for_chunk
     from pageant_assistant.rag.store import (  # local import avoids circular deps
-        add_chunks,
         collection_size,
+        list_shards,
     )
 
+    desired_by_shard: dict[str, list[dict[str, Any]]] = {}
+    for c in SEED_CORPUS:
+        desired_by_shard.setdefault(shard_for_chunk(c), []).append(c)
+
+    changed = False
+    for shard in sorted(set(list_shards()) | set(desired_by_shard)):
+        changed |= _sync_shard(shard, desired_by_shard.get(shard, []))
     size = collection_size()
-    if size > 0:
-        logger.info("seed_if_empty: collection already has %d chunk(s) — skipping", size)
-        return size
+    if changed:
+        logger.info("sync_seed_corpus: sync complete — %d chunk(s) now in store", size)
+    return size
+
+
+def _sync_shard(shard: str, corpus: list[dict[str, Any]]) -> bool:
+    """Diff one shard against its share of the seed corpus; return True if it changed."""
+    from pageant_assistant.rag.store import (  # local import avoids circular deps
+        add_chunks,
+        collection_size,
+        delete_chunks,
+        get_chunks,
+        load_manifest,
+        manifest_path,
+    )
+
+    manifest = load_manifest(shard)
+    size = collection_size(shard)
+    if size == 0:
+        manifest = CorpusManifest()  # stale manifest for a wiped/empty collection
+    elif not manifest.chunks:
+        _backfill_manifest(manifest_path(shard), get_chunks(shard=shard))
+        manifest = load_manifest(shard)
+
+    desired = {c["id"]: chunk_hash(c["text"], c["metadata"]) for c in corpus}
+    to_upsert, to_delete = manifest.diff(desired, origin="seed")
+    if not to_upsert and not to_delete:
+        logger.info(
+            "sync_seed_corpus: shard '%s' up to date (version %s, %d chunk(s))",
+            shard,
+            manifest.corpus_version,
+            size,
+        )
+        return False
 
     logger.info(
-        "seed_if_empty: collection empty — seeding %d Kenya/Africa chunks …",
-        len(SEED_CORPUS),
+        "sync_seed_corpus: shard '%s' — %d chunk(s) to upsert, %d to delete",
+        shard,
+        len(to_upsert),
+        len(to_delete),
     )
-    chunks = [{"id": c["id"], "text": c["text"], "metadata": c["metadata"]} for c in SEED_CORPUS]
-    add_chunks(chunks)
-    final_size = collection_size()
-    logger.info("seed_if_empty: seeding complete — %d chunk(s) now in collection", final_size)
-    return final_size
+    from pageant_assistant.rag.snapshot import snapshot_embeddings
+
+    delete_chunks(to_delete, shard=shard)
+    upsert_ids = set(to_upsert)
+    chunks = [
+        {"id": c["id"], "text": c["text"], "metadata": c["metadata"]}
+        for c in corpus
+        if c["id"] in upsert_ids
+    ]
+    prebuilt = snapshot_embeddings() if chunks else {}
+    for chunk in chunks:
+        cached = prebuilt.get(chunk["id"])
+        if cached and cached[0] == desired[chunk["id"]]:
+            chunk["embedding"] = cached[1]
+    reused = [c for c in chunks if "embedding" in c]
+    fresh = [c for c in chunks if "embedding" not in c]
+    if reused:
+        logger.info("sync_seed_corpus: reusing %d prebuilt vector(s)", len(reused))
+        add_chunks(reused, origin="seed", shard=shard)
+    if fresh:
+        add_chunks(fresh, origin="seed", shard=shard)
+    return True
+
+
+def _backfill_manifest(path: Path, stored: list[dict[str, Any]]) -> None:
+    """Record already-stored chunks in a fresh manifest without re-embedding them."""
+    seed_ids = {c["id"] for c in SEED_CORPUS}
+    seed = [c for c in stored if c["id"] in seed_ids]
+    other = [c for c in stored if c["id"] not in seed_ids]
+    if seed:
+        record_chunks(path, seed, origin="seed")
+    if other:
+        record_chunks(path, other, origin="unknown")
+    logger.info("sync_seed_corpus: backfilled manifest from %d stored chunk(s)", len(stored))
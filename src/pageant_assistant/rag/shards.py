@@ -0,0 +1,91 @@
+"""Region shards of the evidence store.
+
+Evidence is partitioned into one collection per country plus a ``global``
+shard.  Chunks are routed by their ``region`` metadata: a single country
+(``"Kenya"``) lands in that country's shard; chunks with no region, a
+label such as ``"Global"``, a continent (``"Africa"``) or several regions
+(``"Kenya/Africa"``) go to the global shard, which every contestant's
+search includes.  Retrieval for a contestant searches their country's shard
+plus the global shard (see ``store.search_shards`` for the fallback when
+the country has no shard yet).
+
+The global shard keeps the original ``RAG_COLLECTION_NAME`` collection, so
+existing stores open unchanged; regional shards are named
+``<RAG_COLLECTION_NAME>_<shard>``.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any
+
+from pageant_assistant.config.settings import RAG_COLLECTION_NAME
+
+GLOBAL_SHARD = "global"
+
+# Region labels that mean "relevant everywhere" rather than a country
+_GLOBAL_ALIASES = {"", "global", "international", "world", "worldwide"}
+# Continental labels: relevant to every country in the region, so stored globally
+_CONTINENTS = {
+    "africa",
+    "asia",
+    "europe",
+    "north_america",
+    "south_america",
+    "latin_america",
+    "oceania",
+    "middle_east",
+    "caribbean",
+}
+
+
+def shard_key(region: str | None) -> str:
+    """Normalise a country or region label to a shard key.
+
+    Labels naming several regions (``"Kenya/Africa"``) or a continent map to
+    the global shard, so continent-wide evidence reaches every country.
+
+    Example:
+        >>> shard_key("Kenya"), shard_key("Côte d'Ivoire"), shard_key("Kenya/Africa")
+        ('kenya', 'cote_d_ivoire', 'global')
+    """
+    parts = [p for p in (region or "").split("/") if p.strip()]
+    if len(parts) != 1:
+        return GLOBAL_SHARD
+    ascii_text = unicodedata.normalize("NFKD", parts[0]).encode("ascii", "ignore").decode()
+    key = re.sub(r"[^a-z0-9]+", "_", ascii_text.lower()).strip("_")
+    return GLOBAL_SHARD if key in _GLOBAL_ALIASES | _CONTINENTS else key
+
+
+def shard_for_chunk(chunk: dict[str, Any]) -> str:
+    """Return the shard a chunk belongs to, from its ``region`` metadata."""
+    return shard_key(chunk.get("metadata", {}).get("region"))
+
+
+def shards_for_country(country: str | None) -> list[str] | None:
+    """Shards to search for a contestant from *country*.
+
+    Returns:
+        ``[<country shard>, "global"]``, just ``["global"]`` for a global
+        label, or None when no country is known (callers search every shard).
+        This is the preferred set; ``store.search_shards`` widens it when the
+        country shard does not exist.
+    """
+    if not country or not country.strip():
+        return None
+    key = shard_key(country)
+    return [GLOBAL_SHARD] if key == GLOBAL_SHARD else [key, GLOBAL_SHARD]
+
+
+def collection_name(shard: str) -> str:
+    """Collection (or NumPy index directory) name for *shard*."""
+    return RAG_COLLECTION_NAME if shard == GLOBAL_SHARD else f"{RAG_COLLECTION_NAME}_{shard}"
+
+
+def shard_from_collection(name: str) -> str | None:
+    """Inverse of ``collection_name``; None if *name* is not an evidence shard."""
+    if name == RAG_COLLECTION_NAME:
+        return GLOBAL_SHARD
+    prefix = f"{RAG_COLLECTION_NAME}_"
+    return name[len(prefix) :] if name.startswith(prefix) else None
@@ -0,0 +1,212 @@
+"""Prebuilt evidence index snapshot for instant cold start.
+
+``build_snapshot`` embeds the seed corpus once (at image build time) and
+writes a ready-to-serve NumPy index per region shard — embeddings,
+metadata, and corpus manifest, in ``<snapshot>/<collection name>/`` — plus
+a ``snapshot.json`` descriptor recording the corpus version, embedding
+model, and a checksum over the index files.
+
+At startup the store opens a valid snapshot read-only (NumPy backend) or
+reuses its vectors while seeding (any backend), so a fresh container never
+loads the embedding model just to index the seed corpus.  Live embedding is
+only needed for seed chunks whose content differs from the snapshot.
+
+Usage:
+    python -m pageant_assistant.rag.snapshot build [--out data/snapshot]
+    python -m pageant_assistant.rag.snapshot check [--out data/snapshot]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from pageant_assistant.config.settings import RAG_SNAPSHOT_DIR
+from pageant_assistant.rag.backends import NumpyBackend
+from pageant_assistant.rag.embeddings import embedding_model_id, get_embedding_function
+from pageant_assistant.rag.manifest import CorpusManifest, chunk_hash, record_chunks
+from pageant_assistant.rag.seed import SEED_CORPUS
+from pageant_assistant.rag.shards import collection_name, shard_for_chunk
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.json"
+SNAPSHOT_FORMAT = 2  # 2: one sub-directory per region shard
+
+
+def seed_corpus_version() -> str:
+    """Return the corpus version the current ``SEED_CORPUS`` would have."""
+    manifest = CorpusManifest(
+        chunks={
+            c["id"]: {"hash": chunk_hash(c["text"], c["metadata"]), "origin": "seed"}
+            for c in SEED_CORPUS
+        }
+    )
+    return manifest.corpus_version
+
+
+def _checksum(directory: Path) -> str:
+    """SHA-256 over every index file under *directory* except the descriptor."""
+    digest = hashlib.sha256()
+    for path in sorted(directory.rglob("*")):
+        if path == directory / SNAPSHOT_FILE or not path.is_file():
+            continue
+        digest.update(path.relative_to(directory).as_posix().encode())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def build_snapshot(out_dir: Path = RAG_SNAPSHOT_DIR) -> dict[str, Any]:
+    """Embed ``SEED_CORPUS`` and write a versioned, checksummed index to *out_dir*.
+
+    The index is assembled in a sibling temporary directory and swapped in
+    at the end, so a failed build never leaves a half-written snapshot.
+
+    Args:
+        out_dir: Destination directory (replaced if it exists).
+
+    Returns:
+        The ``snapshot.json`` descriptor that was written.
+    """
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    texts = [c["text"] for c in SEED_CORPUS]
+    logger.info("build_snapshot: embedding %d seed chunk(s) …", len(texts))
+    vectors = np.asarray(get_embedding_function()(texts), dtype=np.float32)
+
+    rows_by_shard: dict[str, list[int]] = {}
+    for i, c in enumerate(SEED_CORPUS):
+        rows_by_shard.setdefault(shard_for_chunk(c), []).append(i)
+    for shard, rows in rows_by_shard.items():
+        chunks = [SEED_CORPUS[i] for i in rows]
+        backend = NumpyBackend(tmp_dir / collection_name(shard))
+        backend.upsert(
+            ids=[c["id"] for c in chunks],
+            texts=[c["text"] for c in chunks],
+            metadatas=[c["metadata"] for c in chunks],
+            embeddings=vectors[rows],
+        )
+        record_chunks(backend.manifest_path, chunks, origin="seed")
+    corpus_version = seed_corpus_version()
+
+    info = {
+        "format": SNAPSHOT_FORMAT,
+        "corpus_version": corpus_version,
+        "embedding_model": embedding_model_id(),
+        "chunk_count": len(texts),
+        "shards": {shard: len(rows) for shard, rows in sorted(rows_by_shard.items())},
+        "dimension": int(vectors.shape[1]),
+        "checksum": _checksum(tmp_dir),
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+    (tmp_dir / SNAPSHOT_FILE).write_text(json.dumps(info, indent=2), encoding="utf-8")
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    logger.info("build_snapshot: wrote corpus version %s to %s", corpus_version, out_dir)
+    return info
+
+
+def _read_info(path: Path) -> dict[str, Any] | None:
+    """Return the snapshot descriptor if present, intact, and built by this model."""
+    try:
+        info = json.loads((path / SNAPSHOT_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if info.get("format") != SNAPSHOT_FORMAT:
+        logger.info("snapshot: unsupported format %s at %s", info.get("format"), path)
+        return None
+    if info.get("embedding_model") != embedding_model_id():
+        logger.info(
+            "snapshot: built with %s, active model is %s — ignoring",
+            info.get("embedding_model"),
+            embedding_model_id(),
+        )
+        return None
+    if info.get("checksum") != _checksum(path):
+        logger.warning("snapshot: checksum mismatch at %s — ignoring", path)
+        return None
+    return info
+
+
+def validate_snapshot(path: Path = RAG_SNAPSHOT_DIR) -> dict[str, Any] | None:
+    """Return the descriptor if the snapshot at *path* can be served as-is.
+
+    A snapshot is servable when its checksum verifies, it was built with the
+    active embedding model, and its corpus version equals the version of the
+    current ``SEED_CORPUS``.
+
+    Returns:
+        The ``snapshot.json`` dict, or None if the snapshot is missing or stale.
+    """
+    info = _read_info(path)
+    if info is None:
+        return None
+    current = seed_corpus_version()
+    if info.get("corpus_version") != current:
+        logger.info(
+            "snapshot: corpus version %s differs from current %s — live embedding needed",
+            info.get("corpus_version"),
+            current,
+        )
+        return None
+    return info
+
+
+def snapshot_embeddings(path: Path = RAG_SNAPSHOT_DIR) -> dict[str, tuple[str, list[float]]]:
+    """Return reusable snapshot vectors as ``{chunk_id: (chunk_hash, vector)}``.
+
+    Unlike ``validate_snapshot`` this tolerates a different corpus version:
+    callers compare the per-chunk hash and only re-embed chunks that changed.
+    Returns an empty dict if the snapshot is missing, corrupt, or was built
+    with another embedding model.
+    """
+    if _read_info(path) is None:
+        return {}
+    vectors: dict[str, tuple[str, list[float]]] = {}
+    for shard_dir in sorted(p for p in path.iterdir() if p.is_dir()):
+        backend = NumpyBackend(shard_dir)
+        manifest = CorpusManifest.load(backend.manifest_path)
+        ids, matrix = backend.vectors()
+        for row, cid in enumerate(ids):
+            entry = manifest.chunks.get(cid)
+            if entry:
+                vectors[cid] = (entry["hash"], matrix[row].tolist())
+    return vectors
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: ``python -m pageant_assistant.rag.snapshot``."""
+    parser = argparse.ArgumentParser(description="Build or check the prebuilt evidence index.")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--out", type=Path, default=RAG_SNAPSHOT_DIR, help="Snapshot directory")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "build":
+        info = build_snapshot(args.out)
+        print(f"Snapshot {info['corpus_version']} ({info['chunk_count']} chunks) → {args.out}")
+        return 0
+
+    info = validate_snapshot(args.out)
+    if info is None:
+        print(f"Snapshot at {args.out} is missing or stale (current: {seed_corpus_version()})")
+        return 1
+    print(f"Snapshot at {args.out} is current ({info['corpus_version']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
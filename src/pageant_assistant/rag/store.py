@@ -1,113 +1,283 @@
-"""Chroma vector store: initialisation, retrieval, and chunk management.
+"""Evidence store: initialisation, retrieval, and chunk management.
 
-Provides a module-level singleton client and collection, lazily initialised
-on first access.  All public functions degrade gracefully on failure so that
-the coaching pipeline always continues even if the evidence store is unavailable.
+Evidence is split into region shards (see ``rag.shards``): one collection
+per country plus a global shard, each a lazily initialised vector backend.
+The engine is chosen by ``RAG_BACKEND`` (``"chroma"`` or ``"numpy"``; see
+``rag.backends``); all shards are addressed with embeddings computed here,
+so switching engines does not change retrieval results.  Writes are routed
+to shards by each chunk's ``region`` metadata, and ``retrieve_evidence``
+searches only the contestant's country shard plus the global shard (every
+shard when the country has none).  Only writes create shards: reads of a
+shard that does not exist return nothing.  All
+read functions degrade gracefully on failure so that the coaching pipeline
+always continues even if the evidence store is unavailable.
+
+Concurrency: every Streamlit session thread shares the same backends.
+Initialisation happens exactly once per shard under a lock; reads (queries,
+counts) run concurrently while writes (``add_chunks``/``delete_chunks``,
+including the manifest update) are serialised by a phase-fair read/write
+lock.  Embedding is always done outside the lock.  ``retrieve_evidence``
+executes on a bounded worker pool with a timeout, so a slow query or
+embedding batch occupies one worker rather than stalling every session.
 """
 
 from __future__ import annotations
 
 import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
 from typing import Any
 
-import chromadb
-from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+import numpy as np
 
-from pageant_assistant.config.settings import CHROMA_DIR, RAG_COLLECTION_NAME
+from pageant_assistant.config.settings import (
+    CHROMA_DIR,
+    RAG_BACKEND,
+    RAG_RETRIEVAL_TIMEOUT,
+    RAG_RETRIEVAL_WORKERS,
+    RAG_SNAPSHOT_DIR,
+    RAG_VECTOR_DTYPE,
+    VECTOR_DIR,
+)
+from pageant_assistant.rag.backends import ChromaBackend, NumpyBackend, VectorBackend
+from pageant_assistant.rag.concurrency import ReadWriteLock
+from pageant_assistant.rag.embeddings import get_embedding_function
+from pageant_assistant.rag.manifest import CorpusManifest, forget_chunks, record_chunks
+from pageant_assistant.rag.shards import (
+    GLOBAL_SHARD,
+    collection_name,
+    shard_for_chunk,
+    shard_from_collection,
+    shards_for_country,
+)
 
 logger = logging.getLogger(__name__)
 
-# Module-level singletons — lazily initialised by _get_collection()
-_client: chromadb.PersistentClient | None = None
-_collection: chromadb.Collection | None = None
+# Module-level singletons — lazily initialised by _get_backend() / _get_pool()
+_backends: dict[str, VectorBackend] = {}
+_pool: ThreadPoolExecutor | None = None
+_init_lock = threading.Lock()
+_rw_lock = ReadWriteLock()
+# shards -> (manifest file stamps, corpus version) — see corpus_version()
+_version_memo: dict[tuple[str, ...], tuple[tuple[Any, ...], str]] = {}
+
+
+def _create_backend(shard: str) -> VectorBackend:
+    """Instantiate the ``RAG_BACKEND`` engine for one shard.
+
+    The NumPy engine serves a current prebuilt snapshot (``RAG_SNAPSHOT_DIR``)
+    directly until the first write, so a fresh container starts with a
+    populated index and no embedding work.
+
+    Raises:
+        ValueError: If ``RAG_BACKEND`` names an unknown engine.
+    """
+    name = collection_name(shard)
+    if RAG_BACKEND == "chroma":
+        return ChromaBackend(CHROMA_DIR, name)
+    if RAG_BACKEND == "numpy":
+        from pageant_assistant.rag.snapshot import validate_snapshot
+
+        base = RAG_SNAPSHOT_DIR / name
+        if not (base.is_dir() and validate_snapshot(RAG_SNAPSHOT_DIR)):
+            base = None
+        return NumpyBackend(VECTOR_DIR / name, base_path=base, vector_dtype=RAG_VECTOR_DTYPE)
+    raise ValueError(f"Unknown RAG_BACKEND {RAG_BACKEND!r} (expected 'chroma' or 'numpy')")
 
 
-def _get_collection() -> chromadb.Collection:
-    """Return (or create) the singleton Chroma collection.
+def _get_backend(shard: str = GLOBAL_SHARD) -> VectorBackend:
+    """Return (or create) the vector backend for *shard*.
 
-    Creates CHROMA_DIR on disk if it does not exist.  The collection uses
-    Chroma's DefaultEmbeddingFunction (all-MiniLM-L6-v2 via onnxruntime) so
-    no additional API keys are required.
+    Creating a backend may persist an empty collection, so only write paths
+    call this for arbitrary shards; reads go through ``_existing_backend``.
 
     Returns:
-        The active Chroma Collection instance.
+        The shard's VectorBackend instance.
 
     Raises:
-        Exception: Propagates any Chroma initialisation error to the caller.
+        Exception: Propagates any backend initialisation error to the caller.
     """
-    global _client, _collection
-    if _collection is None:
-        CHROMA_DIR.mkdir(parents=True, exist_ok=True)
-        logger.debug("Initialising Chroma persistent client at %s", CHROMA_DIR)
-        _client = chromadb.PersistentClient(path=str(CHROMA_DIR))
-        _collection = _client.get_or_create_collection(
-            name=RAG_COLLECTION_NAME,
-            embedding_function=DefaultEmbeddingFunction(),
-        )
-        logger.info(
-            "Chroma collection '%s' ready — %d chunk(s) on disk",
-            RAG_COLLECTION_NAME,
-            _collection.count(),
+    backend = _backends.get(shard)
+    if backend is None:
+        with _init_lock:
+            backend = _backends.get(shard)
+            if backend is None:  # re-check: another thread may have won the race
+                backend = _create_backend(shard)
+                logger.info(
+                    "%s for '%s' ready — %d chunk(s) on disk",
+                    type(backend).__name__,
+                    collection_name(shard),
+                    backend.count(),
+                )
+                _backends[shard] = backend
+    return backend
+
+
+def _existing_backend(shard: str) -> VectorBackend | None:
+    """Return *shard*'s backend if the shard exists, without creating it.
+
+    The global shard always exists.  Any other shard exists once a write
+    created it (this process, a manifest, or an index directory on disk).
+    """
+    if shard == GLOBAL_SHARD or shard in _backends or shard in list_shards():
+        return _get_backend(shard)
+    return None
+
+
+def _backends_for(shard: str | None) -> list[VectorBackend]:
+    """Backends of one existing shard (none if unknown), or of every shard."""
+    if shard:
+        backend = _existing_backend(shard)
+        return [backend] if backend is not None else []
+    return [_get_backend(s) for s in list_shards()]
+
+
+def list_shards() -> list[str]:
+    """Return every shard that exists on disk or in this process (global first).
+
+    Shards are discovered from their manifests (written on every
+    ``add_chunks``) and, for the NumPy engine, from index directories,
+    including those of a prebuilt snapshot.
+    """
+    names: set[str] = set()
+    if RAG_BACKEND == "chroma":
+        names.update(
+            p.name.removesuffix(".manifest.json") for p in CHROMA_DIR.glob("*.manifest.json")
         )
-    return _collection
+    else:
+        for root in (VECTOR_DIR, RAG_SNAPSHOT_DIR):
+            if root.is_dir():
+                names.update(p.name for p in root.iterdir() if p.is_dir())
+    shards = {shard_from_collection(n) for n in names} | set(_backends)
+    shards.discard(None)
+    return [GLOBAL_SHARD] + sorted(shards - {GLOBAL_SHARD})
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Return (or create) the bounded retrieval worker pool."""
+    global _pool
+    if _pool is None:
+        with _init_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=RAG_RETRIEVAL_WORKERS, thread_name_prefix="rag-retrieve"
+                )
+    return _pool
+
+
+def _embed(texts: list[str]) -> np.ndarray:
+    """Embed *texts* with the shared embedding function as a float32 matrix."""
+    return np.asarray(get_embedding_function()(texts), dtype=np.float32)
 
 
-def collection_size() -> int:
-    """Return the number of documents in the collection.
+def collection_size(shard: str | None = None) -> int:
+    """Return the number of documents in one shard, or across all shards.
+
+    Args:
+        shard: Shard key (e.g. ``"kenya"``), or None for the whole store.
 
     Returns:
-        Document count, or 0 if the collection cannot be accessed.
+        Document count, or 0 if the store cannot be accessed.
 
     Example:
         >>> collection_size()
         18
     """
     try:
-        return _get_collection().count()
+        backends = _backends_for(shard)
+        with _rw_lock.read():
+            return sum(b.count() for b in backends)
     except Exception as exc:
         logger.warning("collection_size() failed: %s", exc)
         return 0
 
 
-def retrieve_evidence(query: str, n_results: int = 6) -> list[dict[str, Any]]:
+def _search(query: str, n_results: int, shards: list[str]) -> list[dict[str, Any]]:
+    """Embed *query* once and merge the best hits across *shards* (runs on the pool)."""
+    backends = [b for b in map(_existing_backend, shards) if b is not None]
+    with _rw_lock.read():
+        backends = [b for b in backends if b.count() > 0]
+    if not backends:
+        logger.debug("retrieve_evidence: shards %s empty — skipping query", shards)
+        return []
+    logger.debug("retrieve_evidence: querying top-%d in %s for %r …", n_results, shards, query[:80])
+    vector = _embed([query])[0]
+    with _rw_lock.read():
+        hits = [hit for b in backends for hit in b.query(vector, n_results)]
+    # Cosine scores from one embedding model are comparable across shards
+    hits.sort(key=lambda hit: hit[1], reverse=True)
+    return [
+        {
+            "text": chunk["text"],
+            "source": chunk["metadata"].get("source", ""),
+            "chunk_type": chunk["metadata"].get("chunk_type", "general"),
+            "topic": chunk["metadata"].get("topic", ""),
+        }
+        for chunk, _score in hits[:n_results]
+    ]
+
+
+def search_shards(country: str | None) -> list[str]:
+    """Shards ``retrieve_evidence`` searches for a contestant from *country*.
+
+    The country's shard plus the global shard when the country shard holds
+    evidence; otherwise every shard, so contestants from countries without
+    their own evidence still get the whole corpus.
+
+    Example:
+        >>> search_shards("Kenya")
+        ['kenya', 'global']
+    """
+    preferred = shards_for_country(country)
+    existing = list_shards()
+    if preferred is None:
+        return existing
+    for shard in preferred:
+        if shard != GLOBAL_SHARD and (shard not in existing or collection_size(shard) == 0):
+            logger.debug("search_shards: no '%s' evidence — searching every shard", shard)
+            return existing
+    return preferred
+
+
+def retrieve_evidence(
+    query: str, n_results: int = 6, country: str | None = None
+) -> list[dict[str, Any]]:
     """Retrieve the top-n most semantically similar chunks for *query*.
 
     Args:
         query: The natural-language question or topic to search for.
         n_results: Maximum number of candidates to return.
+        country: The contestant's country (``Persona.country``).  Only that
+            country's shard and the global shard are searched when the country
+            has evidence of its own; otherwise, or for None, every shard is
+            searched (see ``search_shards``).
 
     Returns:
         List of dicts with keys ``text``, ``source``, ``chunk_type``, and
-        ``topic``.  Returns an empty list if the collection is empty or if
-        retrieval fails for any reason.
+        ``topic``.  Returns an empty list if the store is empty, if
+        retrieval fails for any reason, or if it does not finish within
+        ``RAG_RETRIEVAL_TIMEOUT`` seconds.
 
     Example:
-        >>> chunks = retrieve_evidence("women's rights in Kenya", n_results=3)
+        >>> chunks = retrieve_evidence("women's rights", n_results=3, country="Kenya")
         >>> len(chunks) <= 3
         True
     """
     try:
-        col = _get_collection()
-        count = col.count()
-        if count == 0:
-            logger.debug("retrieve_evidence: collection empty — skipping query")
+        shards = search_shards(country)
+        future = _get_pool().submit(_search, query, n_results, shards)
+        try:
+            chunks = future.result(timeout=RAG_RETRIEVAL_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning(
+                "retrieve_evidence: no result within %.1fs — continuing without evidence",
+                RAG_RETRIEVAL_TIMEOUT,
+            )
             return []
-        actual_n = min(n_results, count)
-        logger.debug("retrieve_evidence: querying top-%d for %r …", actual_n, query[:80])
-        results = col.query(
-            query_texts=[query],
-            n_results=actual_n,
-            include=["documents", "metadatas"],
-        )
-        chunks: list[dict[str, Any]] = [
-            {
-                "text": doc,
-                "source": meta.get("source", ""),
-                "chunk_type": meta.get("chunk_type", "general"),
-                "topic": meta.get("topic", ""),
-            }
-            for doc, meta in zip(results["documents"][0], results["metadatas"][0])
-        ]
         logger.info("retrieve_evidence: returned %d candidate chunk(s)", len(chunks))
         return chunks
     except Exception as exc:
@@ -115,14 +285,25 @@ def retrieve_evidence(query: str, n_results: int = 6) -> list[dict[str, Any]]:
         return []
 
 
-def add_chunks(chunks: list[dict[str, Any]]) -> None:
-    """Upsert evidence chunks into the collection.
+def add_chunks(
+    chunks: list[dict[str, Any]], *, origin: str = "runtime", shard: str | None = None
+) -> None:
+    """Upsert evidence chunks into the store and record them in the manifest.
 
     Args:
         chunks: List of dicts, each requiring keys:
             - ``id`` (str): Unique chunk identifier (used for upsert dedup).
             - ``text`` (str): The document content to embed and store.
-            - ``metadata`` (dict): String-valued metadata (topic, chunk_type, source).
+            - ``metadata`` (dict): String-valued metadata (topic, chunk_type,
+              source, region).
+
+            Optionally ``embedding`` (list[float]): a precomputed vector.  When
+            every chunk carries one, no embedding model call is made (used by
+            the bulk ingestion pipeline).
+        origin: Manifest label for who owns these chunks (``"seed"``,
+            ``"ingest"``, …).  Seed syncs only ever delete ``"seed"`` chunks.
+        shard: Force every chunk into this shard instead of routing each by
+            its ``region`` metadata.
 
     Example:
         >>> add_chunks([{"id": "test-01", "text": "Hello world", "metadata": {}}])
@@ -130,14 +311,126 @@ def add_chunks(chunks: list[dict[str, Any]]) -> None:
     if not chunks:
         logger.debug("add_chunks: empty list — nothing to upsert")
         return
-    col = _get_collection()
-    col.upsert(
-        ids=[c["id"] for c in chunks],
-        documents=[c["text"] for c in chunks],
-        metadatas=[c["metadata"] for c in chunks],
-    )
-    logger.info(
-        "add_chunks: upserted %d chunk(s) into collection '%s'",
-        len(chunks),
-        RAG_COLLECTION_NAME,
-    )
+    if all(c.get("embedding") is not None for c in chunks):
+        embeddings = np.asarray([c["embedding"] for c in chunks], dtype=np.float32)
+    else:
+        embeddings = _embed([c["text"] for c in chunks])
+    rows_by_shard: dict[str, list[int]] = defaultdict(list)
+    for i, c in enumerate(chunks):
+        rows_by_shard[shard or shard_for_chunk(c)].append(i)
+    for target, rows in rows_by_shard.items():
+        backend = _get_backend(target)
+        group = [chunks[i] for i in rows]
+        with _rw_lock.write(), backend.write_lock():
+            backend.upsert(
+                ids=[c["id"] for c in group],
+                texts=[c["text"] for c in group],
+                metadatas=[c["metadata"] for c in group],
+                embeddings=embeddings[rows],
+            )
+            version = record_chunks(backend.manifest_path, group, origin)
+        logger.info(
+            "add_chunks: upserted %d chunk(s) into '%s' (shard version %s)",
+            len(group),
+            collection_name(target),
+            version,
+        )
+
+
+def delete_chunks(ids: list[str], shard: str | None = None) -> None:
+    """Delete chunks by id from the store and the manifest.
+
+    Args:
+        ids: Chunk identifiers to remove.  Unknown ids are ignored.
+        shard: Only delete from this shard; None checks every shard.
+    """
+    if not ids:
+        return
+    for target in [shard] if shard else list_shards():
+        backend = _existing_backend(target)
+        if backend is None:
+            continue
+        with _rw_lock.write(), backend.write_lock():
+            known = CorpusManifest.load(backend.manifest_path).chunks
+            present = [cid for cid in ids if cid in known]
+            stored = {c["id"] for c in backend.get(ids)}
+            if not present and not stored:
+                continue
+            backend.delete(ids)
+            version = forget_chunks(backend.manifest_path, ids)
+        logger.info(
+            "delete_chunks: removed %d chunk(s) from '%s' (shard version %s)",
+            len(set(present) | stored),
+            collection_name(target),
+            version,
+        )
+
+
+def get_chunks(ids: list[str] | None = None, shard: str | None = None) -> list[dict[str, Any]]:
+    """Return stored chunks (without embeddings) as ``add_chunks``-shaped dicts.
+
+    Args:
+        ids: Chunk identifiers to fetch, or None for every chunk.
+        shard: Only read this shard; None reads every shard.
+
+    Returns:
+        List of dicts with keys ``id``, ``text``, and ``metadata``.
+    """
+    backends = _backends_for(shard)
+    with _rw_lock.read():
+        return [c for b in backends for c in b.get(ids)]
+
+
+def manifest_path(shard: str = GLOBAL_SHARD) -> Path:
+    """Return the corpus manifest file of one shard."""
+    return _get_backend(shard).manifest_path
+
+
+def load_manifest(shard: str | None = None) -> CorpusManifest:
+    """Return one shard's manifest, or the union over all shards if *shard* is None."""
+    if shard:
+        backend = _existing_backend(shard)
+        return CorpusManifest.load(backend.manifest_path) if backend else CorpusManifest()
+    merged = CorpusManifest()
+    for s in list_shards():
+        merged.chunks.update(CorpusManifest.load(manifest_path(s)).chunks)
+    return merged
+
+
+def corpus_version(shards: list[str] | None = None) -> str:
+    """Return the manifest digest of the evidence corpus, or of *shards* only.
+
+    Changes whenever a chunk in those shards is added, edited, or removed
+    through this module, so it is safe to use as a cache key for retrieval
+    results; keying on the searched shards only means writes to other shards
+    leave the key alone.  The digest is memoised against the manifest files'
+    mtime and size, so calling this per query only costs a ``stat`` per shard.
+
+    Args:
+        shards: Shards to cover (unknown ones count as empty), or None for
+            every shard.
+    """
+    names = tuple(list_shards() if shards is None else shards)
+    backends = [_existing_backend(s) for s in names]
+    stamps: list[tuple[Any, ...]] = []
+    for shard, backend in zip(names, backends):
+        if backend is None:
+            stamps.append((shard, None, None))
+            continue
+        path = backend.manifest_path
+        try:
+            st = path.stat()
+            stamps.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append((str(path), None, None))
+    stamp = tuple(stamps)
+    memo = _version_memo.get(names)
+    if memo is not None and memo[0] == stamp:
+        return memo[1]
+    merged = CorpusManifest()
+    for backend in backends:
+        if backend is not None:
+            merged.chunks.update(CorpusManifest.load(backend.manifest_path).chunks)
+    version = merged.corpus_version
+    _version_memo[names] = (stamp, version)
+    return version
@@ -0,0 +1,382 @@
+"""Optional live web evidence for questions the local corpus does not cover.
+
+When ``rag_research`` finds no relevant local evidence and a search provider
+is configured (``WEB_SEARCH_PROVIDER``), it calls ``search_web_evidence``:
+
+1. The query (question plus contestant country) is looked up in a disk
+   cache keyed by the normalised query, so repeat questions never touch the
+   network while the entry is fresh (``WEB_CACHE_TTL_HOURS``).
+2. On a miss the provider is awaited under a strict time budget
+   (``WEB_SEARCH_BUDGET_S``).  A slow or failing provider yields no web
+   evidence rather than delaying the coaching run.
+3. The snippets are returned unstored.  ``rag_research`` grades them and
+   passes only the relevant ones to ``store_web_evidence``, which writes them
+   back via ``add_chunks`` (origin ``"web"``, routed to the country's shard)
+   so future runs retrieve them from the local index.  Rejected snippets are
+   never stored.
+
+Providers implement ``SearchProvider``: ``DuckDuckGoProvider`` wraps the
+``duckduckgo-search`` package; ``StubSearchProvider`` returns canned results
+for tests and offline development.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from pageant_assistant.config.settings import (
+    WEB_CACHE_DIR,
+    WEB_CACHE_TTL_HOURS,
+    WEB_SEARCH_BUDGET_S,
+    WEB_SEARCH_MAX_RESULTS,
+    WEB_SEARCH_PROVIDER,
+)
+from pageant_assistant.rag.cache import normalise_question
+
+logger = logging.getLogger(__name__)
+
+# Blocking provider calls run here rather than on asyncio's default executor:
+# asyncio.run() waits for the default executor on exit, which would let a
+# hung HTTP request outlive the time budget.
+_search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="web-search")
+_provider: SearchProvider | None = None
+_provider_lock = threading.Lock()
+_unknown_provider_logged = False
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """One web search hit."""
+
+    title: str
+    url: str
+    snippet: str
+
+
+# ---------------------------------------------------------------------------
+# Providers
+# ---------------------------------------------------------------------------
+
+
+class SearchProvider(ABC):
+    """Interface for web search backends."""
+
+    name: str = "provider"
+
+    @abstractmethod
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        """Return up to *max_results* hits for *query*."""
+
+
+class DuckDuckGoProvider(SearchProvider):
+    """Text search through the ``duckduckgo-search`` package (no API key).
+
+    Args:
+        timeout: Per-request HTTP timeout in seconds.
+    """
+
+    name = "duckduckgo"
+
+    def __init__(self, timeout: int = 10) -> None:
+        self.timeout = timeout
+
+    def _search_sync(self, query: str, max_results: int) -> list[SearchResult]:
+        from duckduckgo_search import DDGS
+
+        hits = DDGS(timeout=self.timeout).text(query, max_results=max_results) or []
+        return [
+            SearchResult(title=h.get("title", ""), url=h.get("href", ""), snippet=h.get("body", ""))
+            for h in hits
+        ]
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_search_pool, self._search_sync, query, max_results)
+
+
+class StubSearchProvider(SearchProvider):
+    """Offline provider returning canned results.
+
+    Args:
+        results: Normalised query → hits.  Unknown queries return *default*.
+        default: Hits for any query not in *results*.
+        delay_s: Simulated network latency.
+
+    Example:
+        >>> hit = SearchResult("T", "https://example.org", "45% of girls...")
+        >>> provider = StubSearchProvider(default=[hit])
+        >>> asyncio.run(provider.search("anything", 3)) == [hit]
+        True
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        results: dict[str, list[SearchResult]] | None = None,
+        default: list[SearchResult] | None = None,
+        delay_s: float = 0.0,
+    ) -> None:
+        self.results = results or {}
+        self.default = default or []
+        self.delay_s = delay_s
+        self.queries: list[str] = []
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        self.queries.append(query)
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        return self.results.get(normalise_question(query), self.default)[:max_results]
+
+
+_PROVIDERS: dict[str, type[SearchProvider]] = {
+    "duckduckgo": DuckDuckGoProvider,
+    "stub": StubSearchProvider,
+}
+
+
+def get_search_provider() -> SearchProvider | None:
+    """Return the configured provider (shared), or None when web search is off.
+
+    An unknown ``WEB_SEARCH_PROVIDER`` is logged once and treated as off, so
+    a typo in the environment disables web fallback instead of failing runs.
+    """
+    global _provider, _unknown_provider_logged
+    if not WEB_SEARCH_PROVIDER:
+        return None
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                if WEB_SEARCH_PROVIDER not in _PROVIDERS:
+                    if not _unknown_provider_logged:
+                        logger.error(
+                            "Unknown WEB_SEARCH_PROVIDER %r (expected one of %s) "
+                            "— web search disabled",
+                            WEB_SEARCH_PROVIDER,
+                            sorted(_PROVIDERS),
+                        )
+                        _unknown_provider_logged = True
+                    return None
+                _provider = _PROVIDERS[WEB_SEARCH_PROVIDER]()
+    return _provider
+
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+
+
+class WebSearchCache:
+    """Search results on disk, one JSON file per normalised query.
+
+    Empty result lists are cached too, so a query with no hits is not
+    retried until its entry expires.
+
+    Args:
+        directory: Cache directory (created on first write).
+        ttl_hours: Entries older than this are treated as misses.
+    """
+
+    def __init__(self, directory: Path, ttl_hours: float = WEB_CACHE_TTL_HOURS) -> None:
+        self.directory = directory
+        self.ttl_s = ttl_hours * 3600
+
+    def _file(self, provider: str, query: str) -> Path:
+        key = f"{provider}\0{normalise_question(query)}"
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json"
+
+    def get(self, provider: str, query: str) -> list[SearchResult] | None:
+        """Return fresh cached hits, or None on a miss."""
+        try:
+            data = json.loads(self._file(provider, query).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if data.get("query") != normalise_question(query):
+            return None
+        if time.time() - data.get("fetched_at", 0) > self.ttl_s:
+            return None
+        return [SearchResult(**r) for r in data.get("results", [])]
+
+    def put(self, provider: str, query: str, results: list[SearchResult]) -> None:
+        """Persist *results* for *query* (write-then-rename)."""
+        path = self._file(provider, query)
+        payload = {
+            "query": normalise_question(query),
+            "fetched_at": time.time(),
+            "results": [asdict(r) for r in results],
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("WebSearchCache: could not persist results (%s)", exc)
+
+
+web_cache = WebSearchCache(WEB_CACHE_DIR)
+
+
+# ---------------------------------------------------------------------------
+# Fetch + write-back
+# ---------------------------------------------------------------------------
+
+
+def build_query(question: str, country: str | None) -> str:
+    """Search query for a pageant question, localised to the contestant's country."""
+    return f"{question} {country}" if country else question
+
+
+def results_to_chunks(
+    results: list[SearchResult], *, topic: str, region: str | None
+) -> list[dict[str, Any]]:
+    """Turn search hits into ``add_chunks``-shaped evidence chunks.
+
+    Ids are derived from the snippet text, so the same snippet found by
+    different queries is stored once.
+    """
+    from pageant_assistant.rag.ingest import classify_chunk, content_hash
+
+    chunks = []
+    for r in results:
+        text = " ".join(r.snippet.split())
+        if not text:
+            continue
+        metadata = {
+            "topic": topic,
+            "chunk_type": classify_chunk(text, position=1),
+            "source": r.title or r.url,
+            "url": r.url,
+        }
+        if region:
+            metadata["region"] = region
+        chunks.append({"id": f"web-{content_hash(text)[:16]}", "text": text, "metadata": metadata})
+    return chunks
+
+
+async def fetch_web_results(
+    query: str,
+    *,
+    provider: SearchProvider,
+    budget_s: float = WEB_SEARCH_BUDGET_S,
+    max_results: int = WEB_SEARCH_MAX_RESULTS,
+    cache: WebSearchCache | None = None,
+) -> list[SearchResult] | None:
+    """Return hits for *query* from the cache, or from *provider* within *budget_s*.
+
+    Returns:
+        The hits (possibly empty), or None when the provider fails or
+        exceeds the budget (failures are not cached).
+    """
+    cache = cache or web_cache
+    cached = cache.get(provider.name, query)
+    if cached is not None:
+        logger.info("web evidence: cache hit for %r (%d result(s))", query, len(cached))
+        return cached
+    start = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(provider.search(query, max_results), timeout=budget_s)
+    except TimeoutError:
+        logger.warning("web evidence: %s exceeded %.1fs budget — skipping", provider.name, budget_s)
+        return None
+    except Exception as exc:
+        logger.warning("web evidence: %s search failed (%s) — skipping", provider.name, exc)
+        return None
+    logger.info(
+        "web evidence: %d result(s) from %s in %.2fs",
+        len(results),
+        provider.name,
+        time.perf_counter() - start,
+    )
+    cache.put(provider.name, query, results)
+    return results
+
+
+def _run(coro: Any) -> Any:
+    """Run *coro* to completion from synchronous code (graph nodes are sync)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside an event loop (e.g. an async caller): use a helper thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def search_web_evidence(
+    question: str,
+    country: str | None = None,
+    *,
+    topic: str = "web",
+    provider: SearchProvider | None = None,
+    budget_s: float = WEB_SEARCH_BUDGET_S,
+) -> list[dict[str, Any]] | None:
+    """Fetch web evidence for *question* (nothing is stored; see ``store_web_evidence``).
+
+    Args:
+        question: The pageant question.
+        country: Contestant country — added to the query and used as the
+            chunks' region, so they land in that country's shard.
+        topic: Topic metadata for stored chunks.
+        provider: Search provider (default: the configured one).
+        budget_s: Hard limit on time spent waiting for the provider.
+
+    Returns:
+        Retrieval-shaped dicts (``text``, ``source``, ``chunk_type``,
+        ``topic``), the same shape ``retrieve_evidence`` returns, plus the
+        chunk ``id`` and ``metadata`` needed to store them; empty when web
+        search is disabled or finds nothing, None when the provider failed
+        or exceeded the budget (worth retrying on a later run).
+    """
+    provider = provider or get_search_provider()
+    if provider is None:
+        return []
+    query = build_query(question, country)
+    results = _run(fetch_web_results(query, provider=provider, budget_s=budget_s))
+    if results is None:
+        return None
+    return [
+        {
+            "id": c["id"],
+            "text": c["text"],
+            "source": c["metadata"]["source"],
+            "chunk_type": c["metadata"]["chunk_type"],
+            "topic": c["metadata"]["topic"],
+            "metadata": c["metadata"],
+        }
+        for c in results_to_chunks(results, topic=topic, region=country)
+    ]
+
+
+def store_web_evidence(evidence: list[dict[str, Any]]) -> int:
+    """Write web evidence that passed grading back to the local store.
+
+    Args:
+        evidence: Dicts returned by ``search_web_evidence``.
+
+    Returns:
+        Number of chunks written (0 when the write fails; the evidence is
+        still usable for the current run).
+    """
+    chunks = [{"id": e["id"], "text": e["text"], "metadata": e["metadata"]} for e in evidence]
+    if not chunks:
+        return 0
+    try:
+        from pageant_assistant.rag.store import add_chunks
+
+        add_chunks(chunks, origin="web")
+    except Exception as exc:
+        logger.warning("web evidence: write-back failed (%s) — using results for this run", exc)
+        return 0
+    return len(chunks)
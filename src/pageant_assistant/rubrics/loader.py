@@ -1,8 +1,12 @@
-"""Rubric loader: load rubric definitions from JSON and format for prompts."""
+"""Rubric loader: load rubric definitions from JSON and format for prompts.
 
-import json
+Rubric files are read, validated, and pre-rendered once by the asset
+registry (``assets.registry``); ``load_rubric`` serves copies from there.
+"""
 
-from pageant_assistant.config.settings import RUBRICS_DIR
+import copy
+
+from pageant_assistant.assets.registry import get_assets
 
 # Fallback rubric used when the JSON file is missing or corrupted.
 _DEFAULT_DIMENSIONS = [
@@ -29,25 +33,27 @@ _DEFAULT_DIMENSIONS = [
 ]
 
 
-def load_rubric(pageant: str = "miss_universe") -> dict:
-    """Load a rubric by pageant name. Falls back to defaults if file missing."""
-    path = RUBRICS_DIR / f"{pageant}.json"
-    if path.exists():
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            if "dimensions" in data:
-                return data
-        except (json.JSONDecodeError, KeyError):
-            pass
+def fallback_rubric(pageant: str) -> dict:
+    """The default rubric used when a pageant's JSON file is missing or invalid."""
     return {
         "pageant": pageant.replace("_", " ").title(),
         "version": "fallback",
-        "dimensions": _DEFAULT_DIMENSIONS,
+        "dimensions": copy.deepcopy(_DEFAULT_DIMENSIONS),
         "cap_rules": [],
         "genericness_signals": [],
     }
 
 
+def load_rubric(pageant: str = "miss_universe") -> dict:
+    """Load a rubric by pageant name. Falls back to defaults if file missing.
+
+    Returns a copy the caller may modify; hot paths should use
+    ``get_assets().rubric(pageant)``, which also carries the pre-rendered
+    prompt text.
+    """
+    return copy.deepcopy(dict(get_assets().rubric(pageant).data))
+
+
 def format_rubric_for_prompt(rubric: dict) -> str:
     """Format rubric dimensions into a prompt-injectable string."""
     lines = []
@@ -0,0 +1,100 @@
+"""Deterministic coach report rendered from the critic's structured output.
+
+Produces the same sections the coach report prompt asked the LLM for
+(``## Rubric Score``, ``## What Changed``, ``## Practice Notes``) from data
+the pipeline already has: the rubric-weighted scores, the critic's top
+fixes and flags, and the answers' word counts.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pageant_assistant.rubrics.scoring import ScoreBreakdown
+
+
+def _cell(text: str) -> str:
+    """Make *text* safe for a markdown table cell."""
+    return " ".join(str(text).split()).replace("|", "\\|")
+
+
+def _label(flag: str) -> str:
+    return flag.replace("_", " ")
+
+
+def render_coach_report(
+    breakdown: ScoreBreakdown,
+    critic_scores: dict[str, Any],
+    *,
+    raw_answer: str,
+    refined_answer: str,
+    time_limit: int,
+    word_budget: int,
+    rewritten: bool = True,
+) -> str:
+    """Render the coach report as markdown.
+
+    Args:
+        breakdown: Scores aggregated with the rubric (``score_with_rubric``).
+        critic_scores: ``CriticOutput.model_dump()`` (for fixes and flags).
+        raw_answer: The contestant's original answer.
+        refined_answer: The polished answer.
+        time_limit: Target length in seconds.
+        word_budget: Target length in words.
+        rewritten: Whether *refined_answer* is a rewrite addressing these
+            fixes.  False when the early exit kept the answer as scored, in
+            which case What Changed lists no rewrites.
+
+    Returns:
+        Markdown with Rubric Score, What Changed, and Practice Notes sections.
+    """
+    lines = ["## Rubric Score", "", f"**Overall: {breakdown.overall:.1f} / 10**"]
+    for rule in breakdown.applied_caps:
+        lines.append(
+            f"\n_Capped at {rule.then_max_overall:g}: {rule.if_dimension} "
+            f"scored below {rule.below:g}._"
+        )
+    if breakdown.dimensions:
+        lines += ["", "| Dimension | Weight | Score | Why |", "|---|---|---|---|"]
+        for dim in breakdown.dimensions:
+            lines.append(
+                f"| {_cell(dim.name)} | {dim.weight:g} | {dim.score:.1f} | {_cell(dim.reason)} |"
+            )
+    if breakdown.unscored:
+        lines.append(f"\nNot scored: {', '.join(breakdown.unscored)}.")
+
+    raw_words = len(raw_answer.split())
+    refined_words = len(refined_answer.split())
+    fixes = critic_scores.get("top_fixes") or []
+    lines += ["", "## What Changed", ""]
+    lines.append(
+        f"- Length: {raw_words} → {refined_words} words "
+        f"(budget ~{word_budget} words for {time_limit} seconds)."
+    )
+    if rewritten:
+        for fix in fixes:
+            target = fix.get("target", "")
+            if target:
+                lines.append(f"- Rewritten to strengthen **{_label(target)}**.")
+    else:
+        lines.append("- Not rewritten: another pass was not expected to raise the score.")
+
+    lines += ["", "## Practice Notes", ""]
+    for fix in fixes:
+        lines.append(f"- **{_label(fix.get('target', ''))}**: {fix.get('instruction', '')}")
+    genericness = critic_scores.get("genericness_flags") or []
+    if genericness:
+        lines.append(f"- Watch for: {', '.join(_label(f) for f in genericness)}.")
+    risks = critic_scores.get("risk_flags") or []
+    if risks:
+        lines.append(f"- Risks to avoid on stage: {', '.join(_label(f) for f in risks)}.")
+    over = refined_words - word_budget
+    if over > 0:
+        lines.append(
+            f"- Still {over} words over budget — cut the weakest supporting sentence first."
+        )
+    else:
+        lines.append(
+            "- Fits the time limit — rehearse it at a calm pace with a pause before the close."
+        )
+    return "\n".join(lines)
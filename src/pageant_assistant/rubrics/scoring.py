@@ -0,0 +1,117 @@
+"""Apply a rubric's weights and cap rules to the critic's dimension scores.
+
+The critic reports a score per rubric dimension plus its own overall score,
+but LLM arithmetic is unreliable: the overall rarely equals the weighted
+mean of the dimensions and cap rules are applied inconsistently.  The
+weighted overall computed here is the score shown to the contestant.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from pageant_assistant.schemas.rubric import CapRule, RubricDefinition
+
+
+@dataclass(frozen=True)
+class DimensionResult:
+    """One scored dimension with the weight the rubric gives it."""
+
+    name: str
+    score: float
+    weight: float
+    reason: str = ""
+
+
+@dataclass(frozen=True)
+class ScoreBreakdown:
+    """The critic's scores re-aggregated with the rubric.
+
+    Attributes:
+        overall: Weighted mean of the dimension scores, after cap rules.
+        uncapped: Weighted mean before cap rules.
+        critic_overall: The overall score the critic reported itself.
+        dimensions: Scored dimensions in rubric order (unknown ones last).
+        applied_caps: Cap rules that lowered (or bounded) the overall.
+        unscored: Rubric dimensions the critic did not score.
+    """
+
+    overall: float
+    uncapped: float
+    critic_overall: float | None
+    dimensions: list[DimensionResult]
+    applied_caps: list[CapRule] = field(default_factory=list)
+    unscored: list[str] = field(default_factory=list)
+
+
+def _key(name: str) -> str:
+    return " ".join(name.lower().replace("&", "and").split())
+
+
+def score_with_rubric(critic_scores: dict[str, Any], rubric: RubricDefinition) -> ScoreBreakdown:
+    """Compute the weighted overall of *critic_scores* under *rubric*.
+
+    Dimension names are matched case-insensitively (``&`` and ``and`` are
+    interchangeable).  Dimensions the rubric does not define get weight 1.0;
+    rubric dimensions the critic skipped are left out of the mean.  A cap
+    rule applies when its dimension scored below ``below``.
+
+    Args:
+        critic_scores: ``CriticOutput.model_dump()``.
+        rubric: The rubric the critic scored against.
+
+    Returns:
+        The breakdown.  With no dimension scores, the critic's own overall
+        (or 0) is used.
+
+    Example:
+        >>> rubric = RubricDefinition(
+        ...     pageant="Test",
+        ...     dimensions=[
+        ...         {"name": "Clarity", "weight": 2, "description": ""},
+        ...         {"name": "Warmth", "weight": 1, "description": ""},
+        ...     ],
+        ...     cap_rules=[{"if_dimension": "Clarity", "below": 5, "then_max_overall": 6}],
+        ... )
+        >>> scores = [{"name": "Clarity", "score": 4}, {"name": "Warmth", "score": 10}]
+        >>> score_with_rubric({"dimension_scores": scores}, rubric).overall
+        6.0
+    """
+    weights = {_key(d.name): (d.name, d.weight) for d in rubric.dimensions}
+    order = {_key(d.name): i for i, d in enumerate(rubric.dimensions)}
+    scored: dict[str, DimensionResult] = {}
+    for dim in critic_scores.get("dimension_scores") or []:
+        try:
+            score = float(dim["score"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        key = _key(str(dim.get("name", "")))
+        name, weight = weights.get(key, (str(dim.get("name", "")), 1.0))
+        scored[key] = DimensionResult(name, score, weight, str(dim.get("reason", "")))
+
+    critic_overall = critic_scores.get("overall_score")
+    critic_overall = float(critic_overall) if critic_overall is not None else None
+    dimensions = sorted(scored.values(), key=lambda d: order.get(_key(d.name), len(order)))
+    total_weight = sum(d.weight for d in dimensions)
+    if total_weight:
+        uncapped = sum(d.score * d.weight for d in dimensions) / total_weight
+    else:
+        uncapped = critic_overall or 0.0
+
+    overall = uncapped
+    applied: list[CapRule] = []
+    for rule in rubric.cap_rules:
+        dim = scored.get(_key(rule.if_dimension))
+        if dim is not None and dim.score < rule.below:
+            applied.append(rule)
+            overall = min(overall, rule.then_max_overall)
+
+    return ScoreBreakdown(
+        overall=round(overall, 1),
+        uncapped=round(uncapped, 1),
+        critic_overall=critic_overall,
+        dimensions=dimensions,
+        applied_caps=applied,
+        unscored=[d.name for d in rubric.dimensions if _key(d.name) not in scored],
+    )
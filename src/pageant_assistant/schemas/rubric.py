@@ -1,6 +1,40 @@
-"""Pydantic models for the Milestone 3 structured critic output."""
+"""Pydantic models for rubric definitions and the Milestone 3 structured critic output."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+class RubricDimension(BaseModel):
+    """One scored dimension of a pageant rubric."""
+
+    name: str = Field(min_length=1)
+    weight: float = Field(default=1.0, gt=0)
+    description: str
+
+
+class CapRule(BaseModel):
+    """Caps the overall score when one dimension scores too low."""
+
+    if_dimension: str
+    below: float = Field(ge=0, le=10)
+    then_max_overall: float = Field(ge=0, le=10)
+
+
+class RubricDefinition(BaseModel):
+    """A rubric file (``rubrics/<pageant>.json``), validated on load."""
+
+    pageant: str
+    version: str = "1.0"
+    dimensions: list[RubricDimension] = Field(min_length=1)
+    cap_rules: list[CapRule] = Field(default_factory=list)
+    genericness_signals: list[str] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _cap_rules_name_dimensions(self) -> "RubricDefinition":
+        names = {d.name for d in self.dimensions}
+        unknown = [r.if_dimension for r in self.cap_rules if r.if_dimension not in names]
+        if unknown:
+            raise ValueError(f"cap_rules reference unknown dimension(s): {unknown}")
+        return self
 
 
 class DimensionScore(BaseModel):
@@ -41,6 +41,7 @@ class RefinerState(TypedDict, total=False):
     # --- Persona context (set at graph invocation, optional) ---
     persona_id: str  # ID of the active persona
     persona_context: str  # Pre-formatted persona text block for prompts
+    persona_country: str  # Persona.country — selects the regional evidence shard
 
     # --- Intermediate outputs (set by nodes) ---
     question_analysis: str  # From question understanding node
@@ -49,12 +50,15 @@ class RefinerState(TypedDict, total=False):
 
     # --- Final outputs ---
     refined_answer: str  # The polished on-stage answer
+    rewrite_stats: list[dict[str, Any]]  # Per rewrite pass: mode, output/saved tokens
     coach_report: str  # Rubric scores + practice notes
+    coach_narrative: str  # Optional LLM commentary under the coach report
     exemplar_answer: str  # Model winning answer for reference
 
     # --- Structured scoring (M3) ---
     critic_scores: CriticScoresState  # Parsed CriticOutput as dict (from model_dump)
     rubric_name: str  # Which rubric was used (e.g. "miss_universe")
+    rubric_score: float  # Weighted overall with cap rules applied (from coach_report)
     exemplar_ref: ExemplarRefState  # Matched exemplar metadata (if any)
 
     # --- RAG evidence (M4) ---
@@ -64,3 +68,6 @@ class RefinerState(TypedDict, total=False):
 
     # --- Control ---
     iteration_count: int  # Tracks critic->rewrite loops (max 2)
+    loop_features: list[float]  # Early-exit features of the last critic-scored answer
+    loop_decisions: list[dict[str, Any]]  # Early-exit model decisions (stage, gain, reason)
+    rewrite_latency_s: float  # Duration of the last rewrite (for cycle latency logging)
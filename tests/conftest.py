@@ -9,6 +9,14 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "integration: requires GROQ_API_KEY (may incur API costs)")
 
 
+@pytest.fixture(autouse=True)
+def no_loop_exploration(monkeypatch):
+    """Keep critic -> rewrite routing deterministic (tests opt in to exploration)."""
+    import pageant_assistant.graphs.early_exit as early_exit
+
+    monkeypatch.setattr(early_exit, "EARLY_EXIT_EXPLORE_RATE", 0.0)
+
+
 @pytest.fixture
 def groq_key():
     """Return the Groq API key or skip the test if unavailable."""
@@ -16,3 +24,43 @@ def groq_key():
     if not key:
         pytest.skip("GROQ_API_KEY not set — skipping integration test")
     return key
+
+
+def hashing_embed(texts: list[str], dim: int = 64) -> list[list[float]]:
+    """Deterministic bag-of-words embedding for offline tests (no ONNX model)."""
+    import hashlib
+    import math
+    import re
+
+    vectors = []
+    for text in texts:
+        vec = [0.0] * dim
+        for token in re.findall(r"[a-z0-9]+", text.lower()):
+            bucket = int(hashlib.md5(token.encode()).hexdigest(), 16) % dim
+            vec[bucket] += 1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        vectors.append([v / norm for v in vec])
+    return vectors
+
+
+@pytest.fixture
+def fake_embed():
+    """Offline stand-in for the all-MiniLM-L6-v2 embedding function."""
+    return hashing_embed
+
+
+@pytest.fixture(params=["chroma", "numpy"])
+def evidence_store(request, tmp_path, monkeypatch):
+    """Point rag.store at throwaway shards (both engines) embedded offline.
+
+    Returns the global shard's backend.
+    """
+    import pageant_assistant.rag.store as store
+
+    monkeypatch.setattr(store, "RAG_BACKEND", request.param)
+    monkeypatch.setattr(store, "CHROMA_DIR", tmp_path / "chroma")
+    monkeypatch.setattr(store, "VECTOR_DIR", tmp_path / "vectors")
+    monkeypatch.setattr(store, "RAG_SNAPSHOT_DIR", tmp_path / "snapshot")
+    monkeypatch.setattr(store, "_backends", {})
+    monkeypatch.setattr(store, "get_embedding_function", lambda: hashing_embed)
+    return store._get_backend()
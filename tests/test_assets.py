@@ -0,0 +1,148 @@
+"""Tests for the static asset registry (rubrics, exemplars, styles)."""
+
+import json
+import os
+
+import pytest
+
+import pageant_assistant.assets.registry as registry
+from pageant_assistant.assets.registry import AssetSnapshot, get_assets
+from pageant_assistant.config.settings import RUBRICS_DIR
+from pageant_assistant.exemplars import library
+from pageant_assistant.rubrics.loader import format_rubric_for_prompt, load_rubric
+
+RUBRIC = {
+    "pageant": "Test Pageant",
+    "version": "1",
+    "dimensions": [
+        {"name": "Clarity", "weight": 0.6, "description": "Clear."},
+        {"name": "Authenticity", "weight": 0.4, "description": "Genuine."},
+    ],
+    "cap_rules": [{"if_dimension": "Clarity", "below": 4, "then_max_overall": 6}],
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def asset_dirs(tmp_path, monkeypatch):
+    """Point the registry at a temp rubric dir and exemplar file, reloading on every call."""
+    rubrics = tmp_path / "rubrics"
+    rubrics.mkdir()
+    _write(rubrics / "test_pageant.json", RUBRIC)
+    exemplars = tmp_path / "exemplars.json"
+    _write(exemplars, {"exemplars": []})
+    monkeypatch.setattr(registry, "RUBRICS_DIR", rubrics)
+    monkeypatch.setattr(registry, "EXEMPLARS_FILE", exemplars)
+    monkeypatch.setattr(registry, "ASSET_RELOAD_INTERVAL_S", 0)
+    monkeypatch.setattr(registry, "_snapshot", None)
+    return rubrics, exemplars
+
+
+def _touch_later(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestAssetSnapshot:
+    def test_prompt_text_matches_formatter(self):
+        assets = get_assets()
+        for path in RUBRICS_DIR.glob("*.json"):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            assert assets.rubric(path.stem).prompt_text == format_rubric_for_prompt(data)
+
+    def test_index_agrees_with_linear_scan(self):
+        """The indexed lookup must pick what the original list scan picked."""
+        exemplars = library.load_exemplars()
+        assets = get_assets()
+
+        def scan(question_type, theme_tags=None, pageant="Miss Universe"):
+            pool = [e for e in exemplars if e.get("pageant") == pageant] or exemplars
+            matches = [e for e in pool if e.get("question_type") == question_type]
+            if matches and theme_tags:
+                tags = {t.lower() for t in theme_tags}
+                matches.sort(
+                    key=lambda e: len(tags & {t.lower() for t in e.get("theme_tags", [])}),
+                    reverse=True,
+                )
+            if matches:
+                return matches[0]
+            return max(pool, key=lambda e: e.get("year", 0))
+
+        pageants = {e.get("pageant") for e in exemplars} | {"Unknown Pageant"}
+        types = {e.get("question_type") for e in exemplars} | {"no_such_type"}
+        tag_sets = [None, ["education"], ["women", "leadership"]]
+        for pageant in pageants:
+            for q_type in types:
+                for tags in tag_sets:
+                    assert assets.find_exemplar(q_type, tags, pageant) == scan(
+                        q_type, tags, pageant
+                    )
+
+    def test_exemplar_reference_prerendered(self):
+        assets = get_assets()
+        ex = assets.find_exemplar("personal")
+        assert assets.exemplar_reference(ex) == library.format_exemplar_reference(ex)
+        assert assets.exemplar_reference(None) == ""
+
+    def test_unknown_style_is_empty(self):
+        assert get_assets().style("no_such_style") == ""
+        assert get_assets().style("structured_narrative")
+
+
+class TestHotReload:
+    def test_no_reload_without_changes(self, asset_dirs, monkeypatch):
+        first = get_assets()
+        monkeypatch.setattr(AssetSnapshot, "load", classmethod(lambda *a: pytest.fail("reloaded")))
+        assert get_assets() is first
+
+    def test_no_stat_within_interval(self, asset_dirs, monkeypatch):
+        first = get_assets()
+        monkeypatch.setattr(registry, "ASSET_RELOAD_INTERVAL_S", 3600)
+        monkeypatch.setattr(registry, "_stamp", lambda paths: pytest.fail("stat'ed"))
+        assert get_assets() is first
+
+    def test_changed_rubric_swaps_snapshot(self, asset_dirs):
+        rubrics, _ = asset_dirs
+        first = get_assets()
+        changed = dict(RUBRIC, pageant="Renamed Pageant")
+        _write(rubrics / "test_pageant.json", changed)
+        _touch_later(rubrics / "test_pageant.json")
+
+        second = get_assets()
+        assert second is not first
+        assert second.rubric("test_pageant").data["pageant"] == "Renamed Pageant"
+        # A run holding the old snapshot keeps a consistent view
+        assert first.rubric("test_pageant").data["pageant"] == "Test Pageant"
+
+    def test_new_exemplars_picked_up(self, asset_dirs):
+        _, exemplars = asset_dirs
+        assert get_assets().find_exemplar("personal") is None
+        ex = {"id": "e1", "pageant": "Miss Universe", "question_type": "personal", "year": 2020}
+        _write(exemplars, {"exemplars": [ex]})
+        _touch_later(exemplars)
+        assert get_assets().find_exemplar("personal")["id"] == "e1"
+
+    def test_invalid_rubric_falls_back(self, asset_dirs):
+        rubrics, _ = asset_dirs
+        bad = dict(RUBRIC, cap_rules=[{"if_dimension": "Nope", "below": 4, "then_max_overall": 6}])
+        _write(rubrics / "broken.json", bad)
+        (rubrics / "garbled.json").write_text("{not json", encoding="utf-8")
+        assets = get_assets()
+        assert assets.rubric("broken").is_fallback
+        assert assets.rubric("garbled").is_fallback
+        assert not assets.rubric("test_pageant").is_fallback
+
+
+class TestLoaderCompatibility:
+    def test_load_rubric_returns_private_copy(self):
+        rubric = load_rubric("miss_universe")
+        rubric["dimensions"].clear()
+        assert len(load_rubric("miss_universe")["dimensions"]) == 8
+
+    def test_find_exemplar_returns_private_copy(self):
+        ex = library.find_exemplar("personal")
+        ex["answer_text"] = "mutated"
+        assert library.find_exemplar("personal")["answer_text"] != "mutated"
@@ -0,0 +1,169 @@
+"""Tests for the streaming critic and speculative rewrite."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from pageant_assistant.graphs import critic_stream, refiner
+from pageant_assistant.graphs.critic_stream import CriticStreamParser, stream_critic
+from pageant_assistant.graphs.early_exit import LoopDecision
+
+CRITIC_REPLY = {
+    "overall_score": 6.5,
+    "top_fixes": [
+        {"type": "rewrite_sentence", "target": "opening [1]", "instruction": 'Say "yes" first.'}
+    ],
+    "genericness_flags": ["template_language"],
+    "risk_flags": [],
+    "time_fit_estimate_words": 70,
+    "dimension_scores": [
+        {"name": "Directness & Clarity", "score": 6, "reason": "Slow start, then {clear}."}
+    ],
+}
+REPLY_TEXT = json.dumps(CRITIC_REPLY, indent=2)
+
+
+def _chunks(text, size=7):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestCriticStreamParser:
+    def test_early_fields_ready_before_dimension_scores(self):
+        parser = CriticStreamParser()
+        ready_at = None
+        for chunk in _chunks(REPLY_TEXT, size=1):
+            early = parser.feed(chunk)
+            if early is not None:
+                assert ready_at is None, "early fields reported twice"
+                ready_at = len(parser.text)
+                fields = early
+        assert ready_at is not None and ready_at < REPLY_TEXT.index('"dimension_scores"')
+        assert fields == {k: CRITIC_REPLY[k] for k in critic_stream.EARLY_FIELDS}
+        assert parser.text == REPLY_TEXT
+
+    def test_partial_values_are_not_reported(self):
+        parser = CriticStreamParser()
+        parser.feed('{"overall_score": 6')
+        assert "overall_score" not in parser.fields  # could still become 6.5
+        parser.feed('.5, "top_fixes": [{"type": "a", "target": "]", "instruction": "x"')
+        assert parser.fields == {"overall_score": 6.5}
+
+    def test_fields_in_old_order_still_parse_at_end(self):
+        old_order = dict(reversed(list(CRITIC_REPLY.items())))
+        parser = CriticStreamParser()
+        results = [parser.feed(c) for c in _chunks(json.dumps(old_order))]
+        assert results[-1] is not None and results.count(None) == len(results) - 1
+
+    def test_invalid_fix_not_reported(self):
+        parser = CriticStreamParser()
+        parser.feed('{"overall_score": 5, "top_fixes": [{"type": "a"}], ')
+        assert "top_fixes" not in parser.fields
+
+    def test_falls_back_to_invoke(self):
+        llm = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content="whole"))
+        assert stream_critic(llm, "p", lambda early: pytest.fail("no stream")) == "whole"
+
+
+class _StreamingCritic:
+    """Streams the critic reply; records how much had streamed when the rewrite started."""
+
+    def __init__(self, text):
+        self.text = text
+        self.streamed = 0
+
+    def stream(self, prompt):
+        for chunk in _chunks(self.text):
+            self.streamed += len(chunk)
+            yield SimpleNamespace(content=chunk)
+
+
+class _Rewriter:
+    def __init__(self, critic):
+        self.critic = critic
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self.lock:
+            self.calls.append((prompt, self.critic.streamed))
+        return SimpleNamespace(content="Refined answer.", usage={"completion_tokens": 5})
+
+
+class TestSpeculativeRewrite:
+    STATE = {
+        "question": "What changed your life?",
+        "draft_answer": "Books changed my life.",
+        "iteration_count": 0,
+    }
+
+    @pytest.fixture
+    def llms(self, monkeypatch):
+        critic_stream.clear_speculations()
+        monkeypatch.setattr(refiner, "REWRITE_MODE", "full")
+        monkeypatch.setattr(refiner, "CRITIC_STREAMING", True)
+        monkeypatch.setattr(refiner, "get_gain_predictor", lambda: None)
+        monkeypatch.setattr(refiner, "match_exemplar", lambda *a, **k: None)
+
+        def install(critic_text):
+            critic = _StreamingCritic(critic_text)
+            rewriter = _Rewriter(critic)
+            roles = {"critic": critic, "rewrite": rewriter}
+            monkeypatch.setattr(refiner, "get_llm", lambda role: roles[role])
+            return critic, rewriter
+
+        yield install
+        critic_stream.clear_speculations()
+
+    def test_rewrite_starts_mid_stream_and_is_reused(self, llms):
+        critic, rewriter = llms(REPLY_TEXT)
+        state = {**self.STATE, **refiner.critic(self.STATE)}
+        assert state["critic_scores"]["overall_score"] == 6.5
+
+        out = refiner.rewrite(state)
+        assert out["refined_answer"] == "Refined answer."
+        assert out["rewrite_stats"][0]["speculative"] is True
+        [(prompt, streamed_at_start)] = rewriter.calls  # no second call from the node
+        assert streamed_at_start < len(REPLY_TEXT)
+        assert 'Say "yes" first.' in prompt
+        assert critic_stream.speculation_stats()["used"] == 1
+
+    def test_speculation_discarded_when_final_output_differs(self, llms):
+        # Early fields parse, but the full reply is not valid JSON
+        critic, rewriter = llms(REPLY_TEXT[:-2])
+        state = {**self.STATE, **refiner.critic(self.STATE)}
+        assert "critic_scores" not in state
+        # The critic drops the call as soon as the final prompt differs
+        assert not critic_stream._speculations
+        stats = critic_stream.speculation_stats()
+        assert stats["started"] == 1 and stats["cancelled"] + stats["wasted"] == 1
+
+        out = refiner.rewrite(state)
+        assert out["rewrite_stats"][0]["speculative"] is False
+
+    def test_speculation_discarded_when_rewrite_skipped(self, llms, monkeypatch):
+        skip = LoopDecision(False, 0.0, 0.0, 8.0, 0.0, "not worth it")
+        monkeypatch.setattr(
+            refiner, "get_gain_predictor", lambda: SimpleNamespace(decide=lambda f: skip)
+        )
+        critic, rewriter = llms(REPLY_TEXT)
+        state = {**self.STATE, **refiner.critic(self.STATE)}
+        # Started from the early fields; the final decision drops it
+        assert refiner.should_rewrite(state) == "accept_answer"
+        assert not critic_stream._speculations
+        assert critic_stream.speculation_stats()["started"] == 1
+
+
+class TestSpeculationAccounting:
+    def test_eviction_and_discard_are_counted(self, monkeypatch):
+        critic_stream.clear_speculations()
+        monkeypatch.setattr(critic_stream, "_MAX_SPECULATIONS", 1)
+        critic_stream.speculate("a", lambda: "A")
+        critic_stream.speculate("b", lambda: "B")  # evicts "a"
+        assert critic_stream.discard_speculation("b", "test")
+        assert not critic_stream.discard_speculation("b", "test")
+        stats = critic_stream.speculation_stats()
+        assert stats["started"] == 2 and stats["used"] == 0
+        assert stats["cancelled"] + stats["wasted"] == 2
+        critic_stream.clear_speculations()
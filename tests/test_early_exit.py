@@ -0,0 +1,214 @@
+"""Tests for the critic → rewrite early-exit model."""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import pageant_assistant.graphs.early_exit as early_exit
+from pageant_assistant.graphs import refiner
+from pageant_assistant.graphs.early_exit import (
+    FEATURE_NAMES,
+    GainPredictor,
+    answer_features,
+    load_cycles,
+    log_cycle,
+    persona_mentions,
+)
+
+SCORES = {
+    "overall_score": 6.0,
+    "dimension_scores": [
+        {"name": "Clarity", "score": 4.0, "reason": ""},
+        {"name": "Closing", "score": 7.0, "reason": ""},
+    ],
+    "top_fixes": [{"type": "t", "target": "x", "instruction": "y"}],
+    "genericness_flags": ["template_language"],
+    "risk_flags": [],
+}
+
+
+def _synthetic_cycles(n=200, seed=1):
+    """Low-scoring answers gain a lot from a rewrite; high-scoring ones barely move."""
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(n):
+        features = [float(v) for v in rng.uniform(0, 10, len(FEATURE_NAMES))]
+        overall = rng.uniform(3, 9.5)
+        features[0] = overall
+        gain = 0.6 * (8.5 - overall) + rng.normal(0, 0.2)
+        records.append({"features": features, "gain": gain, "seconds": 5.0})
+    return records
+
+
+class TestFeatures:
+    def test_answer_features(self):
+        answer = "Literacy changed Nairobi. My grandmother taught me. Thank you!"
+        persona = "CONTESTANT PROFILE:\n- Country: Kenya\n- Platform/Advocacy: Literacy in Nairobi"
+        features = dict(
+            zip(
+                FEATURE_NAMES,
+                answer_features(answer, SCORES, word_budget=18, persona_context=persona),
+            )
+        )
+        assert features["overall_score"] == 6.0 and features["min_dimension_score"] == 4.0
+        assert (features["top_fixes"], features["genericness_flags"]) == (1, 1)
+        assert features["word_ratio"] == pytest.approx(9 / 18) and features["over_budget"] == 0
+        assert features["sentences"] == 3
+        assert features["persona_mentions"] == 2  # literacy, nairobi (not template labels)
+
+    def test_no_persona_no_mentions(self):
+        assert persona_mentions("anything at all", "") == 0
+
+
+class TestGainPredictor:
+    def test_learns_gain_and_reports_calibration(self):
+        predictor = GainPredictor.fit(_synthetic_cycles())
+        low = [5.0] * len(FEATURE_NAMES)
+        low[0] = 4.0
+        high = list(low)
+        high[0] = 9.0
+        assert predictor.predict(low)[0] == pytest.approx(2.7, abs=0.3)
+        assert predictor.decide(low).proceed
+        assert not predictor.decide(high).proceed
+        assert predictor.cycle_seconds == 5.0
+
+        cal = predictor.calibration
+        assert cal["n"] == 200 and cal["rmse"] < 0.4 and cal["r2"] > 0.9
+        assert 0.6 <= cal["interval80_coverage"] <= 1.0
+        assert cal["brier"] < 0.1
+        assert sum(b["n"] for b in cal["reliability"]) == 200
+
+    def test_log_round_trip_skips_bad_lines(self, tmp_path):
+        path = tmp_path / "cycles.jsonl"
+        log_cycle([1.0] * len(FEATURE_NAMES), 0.5, 4.0, path)
+        with path.open("a") as f:
+            f.write("not json\n" + json.dumps({"features": [1], "gain": 0}) + "\n")
+        assert load_cycles(path) == [
+            {"features": [1.0] * len(FEATURE_NAMES), "gain": 0.5, "seconds": 4.0}
+        ]
+
+    def test_no_model_below_min_samples(self, tmp_path, monkeypatch):
+        path = tmp_path / "cycles.jsonl"
+        monkeypatch.setattr(early_exit, "EARLY_EXIT_LOG_FILE", path)
+        monkeypatch.setattr(early_exit, "EARLY_EXIT_MIN_SAMPLES", 50)
+        early_exit.reset_gain_predictor()
+        for record in _synthetic_cycles(n=49):
+            log_cycle(record["features"], record["gain"], record["seconds"])
+        assert early_exit.get_gain_predictor() is None
+
+        log_cycle([5.0] * len(FEATURE_NAMES), 0.1, 5.0)
+        early_exit.reset_gain_predictor()
+        assert early_exit.get_gain_predictor().n_samples == 50
+        early_exit.reset_gain_predictor()
+
+
+class TestLoopRouting:
+    def test_without_model_keeps_fixed_rules(self):
+        assert refiner.should_rewrite({}) == "rewrite"
+        assert refiner.should_reloop({"iteration_count": 1, "critic_scores": SCORES}) == (
+            "claim_verifier"
+        )
+        low = {**SCORES, "overall_score": 4.0}
+        assert refiner.should_reloop({"iteration_count": 1, "critic_scores": low}) == "critic"
+
+    def test_model_decisions_route(self):
+        skip = {"loop_decisions": [{"stage": "rewrite", "proceed": False}]}
+        assert refiner.should_rewrite(skip) == "accept_answer"
+        loop = {
+            "iteration_count": 1,
+            "critic_scores": SCORES,
+            "loop_decisions": [{"stage": "reloop", "proceed": True}],
+        }
+        assert refiner.should_reloop(loop) == "critic"
+        assert refiner.should_reloop({**loop, "iteration_count": 2}) == "claim_verifier"
+
+    def test_exploration_runs_skipped_cycles(self, monkeypatch):
+        monkeypatch.setattr(early_exit, "EARLY_EXIT_EXPLORE_RATE", 1.0)
+        predictor = GainPredictor.fit(_synthetic_cycles())
+        monkeypatch.setattr(refiner, "get_gain_predictor", lambda: predictor)
+        high = [9.5] + [5.0] * (len(FEATURE_NAMES) - 1)
+        assert not predictor.decide(high).proceed
+        decision = refiner._predict_cycle(high, "rewrite")
+        assert decision["proceed"] and decision["explored"]
+        assert "explore" in decision["reason"]
+
+    def test_no_exploration_on_final_pass(self, monkeypatch):
+        monkeypatch.setattr(early_exit, "EARLY_EXIT_EXPLORE_RATE", 1.0)
+        predictor = GainPredictor.fit(_synthetic_cycles())
+        monkeypatch.setattr(refiner, "get_gain_predictor", lambda: predictor)
+        monkeypatch.setattr(refiner, "match_exemplar", lambda *a, **k: None)
+        reply = json.dumps({**SCORES, "overall_score": 9.5})
+        llm = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content=reply))
+        monkeypatch.setattr(refiner, "get_llm", lambda role: llm)
+        state = {"question": "Q?", "draft_answer": "Draft.", "iteration_count": 0}
+
+        first = refiner.critic(state)["loop_decisions"][-1]
+        assert first["proceed"] and first["explored"]
+        # The second pass's rewrite would never be scored, so it is not explored
+        second = refiner.critic({**state, "iteration_count": 1})["loop_decisions"][-1]
+        assert not second["proceed"] and not second["explored"]
+
+    def test_exploration_without_model_reloops_high_scores(self, monkeypatch):
+        monkeypatch.setattr(early_exit, "EARLY_EXIT_EXPLORE_RATE", 1.0)
+        monkeypatch.setattr(refiner, "get_gain_predictor", lambda: None)
+        state = {"draft_answer": "Draft.", "critic_scores": SCORES, "iteration_count": 1}
+        out = refiner._rewrite_result(state, "Refined.", [], 1.0)
+        assert out["loop_decisions"][-1]["explored"] is True
+        assert refiner.should_reloop({**state, **out}) == "critic"
+
+    def test_accept_answer_keeps_current_answer(self):
+        assert refiner.accept_answer({"draft_answer": "Draft."}) == {"refined_answer": "Draft."}
+
+
+class TestCriticLogging:
+    def test_second_pass_logs_cycle(self, tmp_path, monkeypatch):
+        path = tmp_path / "cycles.jsonl"
+        monkeypatch.setattr(early_exit, "EARLY_EXIT_LOG_FILE", path)
+        monkeypatch.setattr(refiner, "get_gain_predictor", lambda: None)
+        monkeypatch.setattr(refiner, "match_exemplar", lambda *a, **k: None)
+        reply = json.dumps({**SCORES, "overall_score": 7.5})
+        llm = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content=reply))
+        monkeypatch.setattr(refiner, "get_llm", lambda role: llm)
+
+        previous_features = [6.0] * len(FEATURE_NAMES)
+        out = refiner.critic(
+            {
+                "question": "Q?",
+                "draft_answer": "Draft.",
+                "refined_answer": "Refined answer. With two sentences.",
+                "critic_scores": SCORES,
+                "loop_features": previous_features,
+                "rewrite_latency_s": 3.0,
+                "iteration_count": 1,
+            }
+        )
+        [record] = load_cycles(path)
+        assert record["features"] == previous_features and record["gain"] == 1.5
+        assert record["seconds"] >= 3.0
+        assert out["loop_features"][0] == 7.5 and out["loop_features"][-1] == 2.0
+        assert "loop_decisions" not in out
+
+    def test_explored_cycle_flagged_in_log(self, tmp_path, monkeypatch):
+        path = tmp_path / "cycles.jsonl"
+        monkeypatch.setattr(early_exit, "EARLY_EXIT_LOG_FILE", path)
+        monkeypatch.setattr(refiner, "get_gain_predictor", lambda: None)
+        monkeypatch.setattr(refiner, "match_exemplar", lambda *a, **k: None)
+        reply = json.dumps({**SCORES, "overall_score": 6.5})
+        llm = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content=reply))
+        monkeypatch.setattr(refiner, "get_llm", lambda role: llm)
+
+        refiner.critic(
+            {
+                "question": "Q?",
+                "draft_answer": "Draft.",
+                "refined_answer": "Refined.",
+                "critic_scores": SCORES,
+                "loop_features": [6.0] * len(FEATURE_NAMES),
+                "loop_decisions": [{"stage": "reloop", "proceed": True, "explored": True}],
+                "iteration_count": 1,
+            }
+        )
+        [record] = load_cycles(path)
+        assert record["explored"] is True
@@ -0,0 +1,133 @@
+"""Tests for edit-script rewrites."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from pageant_assistant.graphs import refiner
+from pageant_assistant.graphs.edits import (
+    EditScript,
+    EditScriptError,
+    apply_edit_script,
+    number_sentences,
+    parse_edit_script,
+    split_sentences,
+    summarize_rewrite_stats,
+)
+
+DRAFT = "Education changed my life. My mother taught me to read. I will open libraries. Thank you!"
+
+
+def _script(*edits):
+    return EditScript(edits=list(edits))
+
+
+class TestApplyEditScript:
+    def test_split_and_number(self):
+        sentences = split_sentences(DRAFT)
+        assert len(sentences) == 4
+        assert number_sentences(sentences[:2]).splitlines() == [
+            "[1] Education changed my life.",
+            "[2] My mother taught me to read.",
+        ]
+
+    def test_indices_refer_to_original_numbering(self):
+        sentences = split_sentences(DRAFT)
+        script = _script(
+            {"op": "insert", "index": 0, "text": "Yes."},
+            {"op": "delete", "index": 2},
+            {"op": "replace", "index": 3, "text": "I will  open a library in every county."},
+            {"op": "insert", "index": 4, "text": "Asante."},
+        )
+        assert apply_edit_script(sentences, script) == (
+            "Yes. Education changed my life. I will open a library in every county. "
+            "Thank you! Asante."
+        )
+
+    @pytest.mark.parametrize(
+        "edits",
+        [
+            [{"op": "replace", "index": 5, "text": "x"}],
+            [{"op": "delete", "index": 0}],
+            [{"op": "insert", "index": 5, "text": "x"}],
+            [{"op": "replace", "index": 1, "text": "   "}],
+            [{"op": "replace", "index": 1, "text": "x"}, {"op": "delete", "index": 1}],
+            [{"op": "delete", "index": i} for i in range(1, 5)],
+        ],
+    )
+    def test_invalid_scripts_rejected(self, edits):
+        with pytest.raises(EditScriptError):
+            apply_edit_script(split_sentences(DRAFT), _script(*edits))
+
+    def test_parse_tolerates_fences_and_rejects_garbage(self):
+        script = parse_edit_script('```json\n{"edits": [{"op": "delete", "index": 2}]}\n```')
+        assert script.edits[0].op == "delete"
+        for reply in ("Here is the answer.", '{"edits": []}', '{"edits": [{"op": "move"}]}'):
+            with pytest.raises(EditScriptError):
+                parse_edit_script(reply)
+
+
+class _FakeLLM:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        content, tokens = self.replies.pop(0)
+        return SimpleNamespace(content=content, usage={"completion_tokens": tokens})
+
+
+class TestRewriteNode:
+    STATE = {"question": "What changed your life?", "draft_answer": DRAFT, "critique": "text"}
+
+    @pytest.fixture
+    def use_llm(self, monkeypatch):
+        def install(llm, mode="edits"):
+            monkeypatch.setattr(refiner, "REWRITE_MODE", mode)
+            monkeypatch.setattr(refiner, "get_llm", lambda role: llm)
+            return llm
+
+        return install
+
+    def test_edit_script_applied_locally(self, use_llm):
+        reply = json.dumps({"edits": [{"op": "replace", "index": 4, "text": "Read, then lead."}]})
+        llm = use_llm(_FakeLLM((reply, 20)))
+        out = refiner.rewrite(self.STATE)
+        assert out["refined_answer"].endswith("I will open libraries. Read, then lead.")
+        assert "[2] My mother taught me to read." in llm.prompts[0]
+        [stats] = out["rewrite_stats"]
+        assert stats["mode"] == "edits" and stats["output_tokens"] == 20
+        assert stats["saved_tokens"] == stats["full_rewrite_tokens"] - 20
+
+    def test_invalid_script_falls_back_to_full_rewrite(self, use_llm):
+        llm = use_llm(_FakeLLM(("Sorry, here is a rewrite.", 8), ("Full new answer.", 30)))
+        out = refiner.rewrite({**self.STATE, "rewrite_stats": [{"mode": "edits"}]})
+        assert out["refined_answer"] == "Full new answer." and len(llm.prompts) == 2
+        assert out["rewrite_stats"][-1] == {
+            "mode": "fallback",
+            "output_tokens": 38,
+            "full_rewrite_tokens": 30,
+            "saved_tokens": -8,
+            "speculative": False,
+        }
+
+    def test_full_mode_makes_one_call(self, use_llm):
+        llm = use_llm(_FakeLLM(("Full new answer.", 30)), mode="full")
+        out = refiner.rewrite(self.STATE)
+        assert len(llm.prompts) == 1 and "DRAFT ANSWER: " + DRAFT in llm.prompts[0]
+        assert out["rewrite_stats"][0]["saved_tokens"] == 0
+
+    def test_summary(self):
+        stats = [
+            {"mode": "edits", "output_tokens": 20, "saved_tokens": 60},
+            {"mode": "fallback", "output_tokens": 90, "saved_tokens": -10},
+        ]
+        assert summarize_rewrite_stats(stats) == {
+            "passes": 2,
+            "edit_passes": 1,
+            "fallbacks": 1,
+            "output_tokens": 110,
+            "saved_tokens": 50,
+        }
@@ -1,5 +1,7 @@
 """Tests for the exemplar library."""
 
+import pytest
+
 from pageant_assistant.exemplars.library import (
     find_exemplar,
     format_exemplar_reference,
@@ -72,3 +74,112 @@ class TestFormatExemplarReference:
         text = format_exemplar_reference(ex)
         if ex.get("structural_notes"):
             assert "Structural notes" in text
+
+
+# ---------------------------------------------------------------------------
+# Semantic matching
+# ---------------------------------------------------------------------------
+
+SEMANTIC_LIBRARY = [
+    {
+        "id": "a",
+        "pageant": "Miss Universe",
+        "year": 2015,
+        "question_type": "personal",
+        "question_text": "What is the biggest lesson failure has taught you?",
+        "theme_tags": ["resilience"],
+        "structural_notes": "Personal anchor then lesson.",
+    },
+    {
+        "id": "b",
+        "pageant": "Miss Universe",
+        "year": 2016,
+        "question_type": "personal",
+        "question_text": "Which woman in your family do you admire most?",
+        "theme_tags": ["family", "women"],
+        "structural_notes": "Names the person first.",
+    },
+    {
+        "id": "c",
+        "pageant": "Miss Earth",
+        "year": 2017,
+        "question_type": "advocacy",
+        "question_text": "How should young people fight climate change?",
+        "theme_tags": ["environment"],
+        "structural_notes": "Concrete action then call to act.",
+    },
+]
+
+
+class TestSemanticExemplarMatching:
+    @pytest.fixture
+    def embed_calls(self):
+        return []
+
+    @pytest.fixture
+    def semantic(self, tmp_path, monkeypatch, embed_calls):
+        import json
+
+        import pageant_assistant.assets.registry as registry
+        import pageant_assistant.exemplars.semantic as semantic
+        import pageant_assistant.rag.embeddings as embeddings
+        from tests.conftest import hashing_embed
+
+        library_file = tmp_path / "exemplars.json"
+        library_file.write_text(json.dumps({"exemplars": SEMANTIC_LIBRARY}), encoding="utf-8")
+        monkeypatch.setattr(registry, "EXEMPLARS_FILE", library_file)
+        monkeypatch.setattr(registry, "ASSET_RELOAD_INTERVAL_S", 0)
+        monkeypatch.setattr(registry, "_snapshot", None)
+        monkeypatch.setattr(semantic, "EXEMPLAR_VECTORS_FILE", tmp_path / "vectors.npy")
+        monkeypatch.setattr(semantic, "_index", (None, None))
+
+        def embed(texts):
+            embed_calls.append(list(texts))
+            return hashing_embed(texts)
+
+        monkeypatch.setattr(embeddings, "get_embedding_function", lambda: embed)
+        return semantic
+
+    def test_nearest_question_not_first_of_type(self, semantic):
+        ex = semantic.match_exemplar("Which woman do you admire most?", pageant="Miss Universe")
+        assert ex["id"] == "b"
+
+    def test_pageant_filter(self, semantic):
+        question = "How would you fight climate change?"
+        assert semantic.match_exemplar(question, pageant="Miss Earth")["id"] == "c"
+        assert semantic.match_exemplar(question, pageant="Miss Universe")["id"] != "c"
+        # A pageant with no exemplars searches the whole library
+        assert semantic.match_exemplar(question, pageant="Miss Charm")["id"] == "c"
+
+    def test_index_built_once_and_reused_from_disk(self, semantic, embed_calls, monkeypatch):
+        first = semantic.get_exemplar_index()
+        assert semantic.get_exemplar_index() is first and len(first) == 3
+        # A fresh process reloads the persisted vectors instead of re-embedding
+        monkeypatch.setattr(semantic, "_index", (None, None))
+        embed_calls.clear()
+        semantic.get_exemplar_index()
+        assert embed_calls == []
+
+    def test_embedding_failure_falls_back_to_type(self, semantic, monkeypatch):
+        import pageant_assistant.rag.embeddings as embeddings
+
+        def broken():
+            raise RuntimeError("model unavailable")
+
+        monkeypatch.setattr(embeddings, "get_embedding_function", broken)
+        ex = semantic.match_exemplar("Anything at all?", question_type="personal")
+        assert ex["id"] == "a"  # first of the type, as find_exemplar returns
+
+    def test_embedding_failure_cached_for_snapshot(self, semantic, monkeypatch):
+        import pageant_assistant.rag.embeddings as embeddings
+
+        loads = []
+
+        def broken():
+            loads.append(1)
+            raise RuntimeError("model unavailable")
+
+        monkeypatch.setattr(embeddings, "get_embedding_function", broken)
+        assert semantic.get_exemplar_index() is None
+        assert semantic.get_exemplar_index() is None
+        assert loads == [1]  # not retried until the library reloads
@@ -126,3 +126,182 @@ class TestFormatPersonaContext:
 
     def test_format_none_returns_empty(self):
         assert format_persona_context(None) == ""
+
+
+class TestPersonaStore:
+    @pytest.fixture
+    def parse_counter(self, monkeypatch):
+        """Count JSON parses done by the store."""
+        import pageant_assistant.personas.store as store_mod
+
+        calls = []
+
+        def counting_loads(text):
+            calls.append(text)
+            return json.loads(text)
+
+        monkeypatch.setattr(
+            store_mod, "json", type("J", (), {"loads": counting_loads, "dumps": json.dumps})
+        )
+        return calls
+
+    def test_repeat_listing_and_loading_do_not_reparse(
+        self, sample_persona, personas_dir, parse_counter
+    ):
+        save_persona(sample_persona)
+        list_personas()
+        load_persona(sample_persona.id)
+        parse_counter.clear()
+        for _ in range(5):
+            assert list_personas()[0]["id"] == sample_persona.id
+            assert load_persona(sample_persona.id).name == sample_persona.name
+        assert parse_counter == []
+
+    def test_cold_start_uses_manifest(self, sample_persona, personas_dir, parse_counter):
+        from pageant_assistant.personas.store import MANIFEST_NAME, PersonaStore
+
+        save_persona(sample_persona)
+        assert (personas_dir / MANIFEST_NAME).exists()
+        parse_counter.clear()
+        listing = PersonaStore(personas_dir).list()
+        assert [p["id"] for p in listing] == [sample_persona.id]
+        assert len(parse_counter) == 1  # the manifest itself, no persona files
+
+    def test_external_changes_picked_up(self, sample_persona, personas_dir, monkeypatch):
+        monkeypatch.setattr("pageant_assistant.personas.manager.PERSONA_RELOAD_INTERVAL_S", 0)
+        save_persona(sample_persona)
+        assert len(list_personas()) == 1
+        other = Persona(id="ext000000001", name="Amara", country="Ghana", platform="Literacy")
+        tmp = personas_dir / "incoming.tmp"
+        tmp.write_text(other.model_dump_json(), encoding="utf-8")
+        tmp.replace(personas_dir / f"{other.id}.json")
+        assert [p["name"] for p in list_personas()] == ["Amara", "Test Contestant"]
+
+        edited = other.model_copy(update={"name": "Amara Osei"})
+        (personas_dir / f"{other.id}.json").write_text(edited.model_dump_json(), encoding="utf-8")
+        assert load_persona(other.id).name == "Amara Osei"
+
+        (personas_dir / f"{sample_persona.id}.json").unlink()
+        assert [p["id"] for p in list_personas()] == [other.id]
+        assert load_persona(sample_persona.id) is None
+
+    def test_in_place_edit_picked_up_by_listing(self, sample_persona, personas_dir, monkeypatch):
+        import os
+
+        monkeypatch.setattr("pageant_assistant.personas.manager.PERSONA_RELOAD_INTERVAL_S", 0)
+        save_persona(sample_persona)
+        assert list_personas()[0]["name"] == "Test Contestant"
+        path = personas_dir / f"{sample_persona.id}.json"
+        dir_mtime = personas_dir.stat().st_mtime_ns
+        edited = sample_persona.model_copy(update={"name": "Renamed Contestant"})
+        path.write_text(edited.model_dump_json(), encoding="utf-8")
+        os.utime(personas_dir, ns=(dir_mtime, dir_mtime))  # in-place: directory unchanged
+        assert list_personas()[0]["name"] == "Renamed Contestant"
+
+    def test_scans_throttled_by_reload_interval(self, sample_persona, personas_dir):
+        from pageant_assistant.personas.store import PersonaStore
+
+        store = PersonaStore(personas_dir, reload_interval_s=60)
+        assert store.list() == []
+        other = Persona(id="ext000000002", name="Amara", country="Ghana", platform="Literacy")
+        (personas_dir / f"{other.id}.json").write_text(other.model_dump_json(), encoding="utf-8")
+        assert store.list() == []  # external change not scanned for yet
+        store.save(sample_persona)  # saves rescan at once
+        assert [p["name"] for p in store.list()] == ["Amara", "Test Contestant"]
+
+    def test_loaded_persona_is_a_copy(self, sample_persona, personas_dir):
+        save_persona(sample_persona)
+        load_persona(sample_persona.id).values.append("mutated")
+        assert "mutated" not in load_persona(sample_persona.id).values
+
+    def test_corrupt_manifest_ignored(self, sample_persona, personas_dir):
+        from pageant_assistant.personas.store import MANIFEST_NAME, PersonaStore
+
+        save_persona(sample_persona)
+        (personas_dir / MANIFEST_NAME).write_text("[not a manifest", encoding="utf-8")
+        assert [p["id"] for p in PersonaStore(personas_dir).list()] == [sample_persona.id]
+
+
+def _story(title, text):
+    return PersonalStory(title=title, text=text, key_lesson=f"What {title.lower()} taught me.")
+
+
+class TestRelevantPersonaContext:
+    @pytest.fixture
+    def embed_calls(self, monkeypatch):
+        import pageant_assistant.rag.embeddings as embeddings
+        from pageant_assistant.personas.stories import clear_story_caches
+        from tests.conftest import hashing_embed
+
+        calls = []
+
+        def counting(texts):
+            calls.append(list(texts))
+            return hashing_embed(texts)
+
+        monkeypatch.setattr(embeddings, "get_embedding_function", lambda: counting)
+        clear_story_caches()
+        yield calls
+        clear_story_caches()
+
+    @pytest.fixture
+    def storied_persona(self, sample_persona):
+        return sample_persona.model_copy(
+            update={
+                "personal_stories": [
+                    _story("Football Captain", "I captained my school football team to finals."),
+                    _story("Climate Clean-up", "I organised a climate march and river clean-up."),
+                    _story("Grandmother", "My grandmother raised six children on her own."),
+                    _story("Piano Recital", "I froze at my first piano recital and recovered."),
+                    _story("Tree Planting", "We planted trees to fight climate change locally."),
+                ]
+            }
+        )
+
+    def test_top_k_most_relevant_stories(self, storied_persona, embed_calls):
+        text = format_persona_context(
+            storied_persona, question="How should we respond to the climate crisis?", top_k=2
+        )
+        assert "Test Contestant" in text and "Core Values" in text
+        assert "Climate Clean-up" in text and "Tree Planting" in text
+        assert "Football Captain" not in text and "Piano Recital" not in text
+
+    def test_token_budget_respected(self, storied_persona, embed_calls):
+        from pageant_assistant.personas.stories import estimate_tokens
+
+        header_only = format_persona_context(storied_persona, question="Q?", token_budget=1)
+        assert "PERSONAL STORIES" not in header_only and "Kenya" in header_only
+        counts = []
+        for budget in (100, 120, 140, 160):
+            text = format_persona_context(storied_persona, question="climate", token_budget=budget)
+            assert estimate_tokens(text) <= budget
+            counts.append(text.count("Key lesson"))
+        assert counts == sorted(counts) and counts[0] < counts[-1] == 3
+
+    def test_cached_per_persona_version_and_question(self, storied_persona, embed_calls):
+        question = "What would you do about climate change?"
+        first = format_persona_context(storied_persona, question=question)
+        calls = len(embed_calls)
+        assert format_persona_context(storied_persona, question=question.upper()) == first
+        assert len(embed_calls) == calls
+        format_persona_context(storied_persona, question="Who raised you?")
+        assert len(embed_calls) == calls + 1  # story embeddings reused, question embedded
+        edited = storied_persona.model_copy(update={"platform": "Climate justice"})
+        assert "Climate justice" in format_persona_context(edited, question=question)
+
+    def test_small_persona_skips_embedding(self, sample_persona, embed_calls):
+        text = format_persona_context(sample_persona, question="Anything?")
+        assert text == format_persona_context(sample_persona)
+        assert embed_calls == []
+
+    def test_embedding_failure_keeps_saved_order(self, storied_persona, monkeypatch):
+        import pageant_assistant.rag.embeddings as embeddings
+        from pageant_assistant.personas.stories import clear_story_caches
+
+        def broken():
+            raise RuntimeError("model missing")
+
+        clear_story_caches()
+        monkeypatch.setattr(embeddings, "get_embedding_function", broken)
+        text = format_persona_context(storied_persona, question="climate", top_k=1)
+        assert "Football Captain" in text and "Climate" not in text.split("STORIES")[1]
@@ -0,0 +1,194 @@
+"""Tests for the offline question generation pipeline."""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import pageant_assistant.questions.generate as generate
+from pageant_assistant.questions.generate import (
+    GenerationJob,
+    MinHashLSH,
+    QuestionDeduplicator,
+    RateLimiter,
+    generate_questions,
+    parse_generated,
+    plan_jobs,
+)
+from pageant_assistant.questions.store import QuestionStore
+from tests.conftest import hashing_embed
+
+BANK = [
+    {
+        "id": "q001",
+        "text": "What is the most important lesson you have learned from failure?",
+        "pageant_type": "miss_universe",
+        "question_type": "personal",
+    },
+    {
+        "id": "q002",
+        "text": "How would you fight climate change in your country?",
+        "pageant_type": "general",
+        "question_type": "advocacy",
+    },
+]
+
+
+class _FakeLLM:
+    """Returns canned questions per call; records concurrency and prompts."""
+
+    def __init__(self, replies, delay_s=0.0):
+        self._replies = list(replies)
+        self.prompts = []
+        self.delay_s = delay_s
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            reply = self._replies.pop(0) if self._replies else []
+        time.sleep(self.delay_s)
+        with self._lock:
+            self.active -= 1
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(content=json.dumps({"questions": [{"text": t} for t in reply]}))
+
+
+class TestRateLimiter:
+    def test_calls_spaced_evenly(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(s):
+            sleeps.append(s)
+            now[0] += s
+
+        limiter = RateLimiter(per_minute=120, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire()
+        assert sleeps == [0.5, 0.5, 0.5]
+
+    def test_zero_disables(self):
+        limiter = RateLimiter(0, sleep=lambda s: pytest.fail("should not sleep"))
+        limiter.acquire()
+
+
+class TestMinHash:
+    def test_rewording_detected_and_distinct_text_not(self):
+        lsh = MinHashLSH()
+        lsh.add(BANK[0]["text"])
+        reworded = "What's the most important lesson you have learned from a failure?"
+        assert lsh.duplicate_of(reworded) == 0
+        assert lsh.duplicate_of("Which leader do you admire most, and why?") is None
+
+    def test_signatures_are_deterministic(self):
+        assert (MinHashLSH().signature("abc def") == MinHashLSH().signature("abc def")).all()
+
+
+class TestQuestionDeduplicator:
+    def test_within_batch_and_against_bank(self):
+        dedup = QuestionDeduplicator()
+        dedup.add_existing(BANK)
+        keep, minhash, _ = dedup.filter(
+            [
+                "What is the most important lesson you've learned from failure?",
+                "Who is a woman you admire, and why?",
+                "Who is a woman you admire and why?",
+            ]
+        )
+        assert keep == [False, True, False] and minhash == 2
+
+    def test_embedding_stage_catches_paraphrase(self):
+        dedup = QuestionDeduplicator(hashing_embed, minhash_threshold=0.99, embedding_threshold=0.9)
+        dedup.add_existing(BANK)
+        # Same words in a different order: not a MinHash match at this threshold,
+        # but the (bag-of-words) embedding is identical
+        keep, minhash, embedding = dedup.filter(
+            ["In your country how would you fight climate change?"]
+        )
+        assert keep == [False] and (minhash, embedding) == (0, 1)
+
+
+class TestParsing:
+    def test_plan_interleaves_cells(self):
+        jobs = list(plan_jobs(["a", "b"], ["personal"], ["beginner"], per_cell=15, batch_size=10))
+        assert [(j.pageant_type, j.count, j.variation) for j in jobs] == [
+            ("a", 10, 0),
+            ("b", 10, 0),
+            ("a", 5, 1),
+            ("b", 5, 1),
+        ]
+
+    def test_parse_tolerates_fences_and_strings(self):
+        reply = (
+            '```json\n{"questions": ["One  two three four?", {"text": "x", "tags": ["A b"]}]}\n```'
+        )
+        assert parse_generated(reply) == [
+            {"text": "One two three four?", "tags": []},
+            {"text": "x", "tags": ["a_b"]},
+        ]
+
+
+class TestGenerateQuestions:
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        monkeypatch.setattr(generate, "_RETRY_BACKOFF_S", 0)
+
+    def test_end_to_end_shards_import_into_store(self, tmp_path):
+        llm = _FakeLLM(
+            [
+                ["Who is a woman you admire, and why?", "Too short?"],
+                ["What is the most important lesson you've learned from failure?"],
+                ["What would you change about social media for teenagers?"],
+            ]
+        )
+        jobs = plan_jobs(["miss_universe"], ["personal"], ["beginner"], per_cell=3, batch_size=1)
+        stats = generate_questions(
+            jobs,
+            llm=llm,
+            existing=BANK,
+            out_dir=tmp_path / "shards",
+            requests_per_minute=0,
+            shard_size=1,
+            seed=0,
+        )
+        assert (stats.jobs, stats.generated, stats.invalid) == (3, 4, 1)
+        assert (stats.duplicate_minhash, stats.accepted) == (1, 2)
+        assert len(stats.shards) == 2 and not list((tmp_path / "shards").glob("*.part"))
+        # Bank questions from the same cell are used as prompt examples
+        assert BANK[0]["text"] in llm.prompts[0] and BANK[1]["text"] not in llm.prompts[0]
+
+        store = QuestionStore(tmp_path / "bank.sqlite", tmp_path / "none.json", tmp_path / "shards")
+        store.sync()
+        questions = list(store.iter_questions())
+        assert {q["text"] for q in questions} == {
+            "Who is a woman you admire, and why?",
+            "What would you change about social media for teenagers?",
+        }
+        assert all(q["id"].startswith("g-") and q["source"] == "generated" for q in questions)
+
+    def test_concurrency_bounded_and_failures_counted(self, tmp_path):
+        class _FlakyLLM(_FakeLLM):
+            def invoke(self, prompt):
+                if "Variation seed: 3 " in prompt:
+                    self.prompts.append(prompt)
+                    raise ConnectionError("rate limited")
+                return super().invoke(prompt)
+
+        topics = ["art", "sport", "science", "family", "music", "travel", "books", "food"]
+        llm = _FlakyLLM([[f"What does {t} mean to you personally?"] for t in topics], 0.02)
+        jobs = [GenerationJob("general", "personal", "beginner", 1, v) for v in range(8)]
+        stats = generate_questions(
+            jobs, llm=llm, out_dir=tmp_path, workers=2, requests_per_minute=0
+        )
+        assert llm.max_active <= 2
+        assert stats.jobs == 8 and stats.jobs_failed == 1
+        assert sum("Variation seed: 3 " in p for p in llm.prompts) == generate._RETRIES
+        assert stats.accepted == 7
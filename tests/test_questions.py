@@ -1,5 +1,9 @@
 """Tests for the question bank module."""
 
+import json
+import random
+
+import numpy as np
 import pytest
 
 from pageant_assistant.questions.bank import (
@@ -7,6 +11,10 @@ from pageant_assistant.questions.bank import (
     get_random_question,
     load_questions,
 )
+from pageant_assistant.questions.index import QuestionCursor, QuestionIndex
+from pageant_assistant.questions.semantic import QuestionVectors, build_question_vectors
+from pageant_assistant.questions.store import QuestionStore
+from tests.conftest import hashing_embed
 
 
 class TestLoadQuestions:
@@ -99,3 +107,327 @@ class TestNewPageantQuestions:
     def test_filter_by_new_pageant_type(self, pageant_type):
         q = get_random_question(pageant_type=pageant_type)
         assert q["pageant_type"] == pageant_type
+
+
+def _synthetic_bank(n):
+    types = ["personal", "issues_based", "advocacy"]
+    return [
+        {
+            "id": f"s{i}",
+            "text": f"Question {i}?",
+            "pageant_type": "miss_universe" if i % 2 else "general",
+            "question_type": types[i % 3],
+            "difficulty": "beginner" if i % 5 else "advanced",
+            "tags": ["youth"] + (["climate"] if i % 7 == 0 else []),
+        }
+        for i in range(n)
+    ]
+
+
+class TestQuestionIndex:
+    def test_intersection_matches_linear_filter(self):
+        bank = _synthetic_bank(2000)
+        index = QuestionIndex(bank)
+        got = index.select("general", "advocacy", "advanced", ["climate"]).tolist()
+        expected = [
+            i
+            for i, q in enumerate(bank)
+            if q["pageant_type"] == "general"
+            and q["question_type"] == "advocacy"
+            and q["difficulty"] == "advanced"
+            and "climate" in q["tags"]
+        ]
+        assert got == expected and got
+
+    def test_any_and_unknown_values(self):
+        index = QuestionIndex(_synthetic_bank(10))
+        assert len(index.select("any", None, "any")) == 10
+        assert len(index.select(pageant_type="miss_mars")) == 0
+
+    def test_filter_options_derived_from_index(self, monkeypatch):
+        import pageant_assistant.questions.bank as bank
+
+        bank_questions = _synthetic_bank(10) + [
+            {**_synthetic_bank(1)[0], "id": "x", "pageant_type": "miss_supranational"}
+        ]
+        monkeypatch.setattr(bank, "get_question_index", lambda: QuestionIndex(bank_questions))
+        opts = bank.get_filter_options()
+        assert opts["pageant_type"] == [
+            ("any", "Any Pageant"),
+            ("miss_universe", "Miss Universe"),
+            ("general", "General"),
+            ("miss_supranational", "Miss Supranational"),
+        ]
+        assert [v for v, _ in opts["difficulty"]] == ["any", "beginner", "advanced"]
+
+
+class TestQuestionCursor:
+    def test_no_repeats_until_pool_exhausted(self):
+        cursor = QuestionCursor(random.Random(1))
+        drawn = [
+            get_random_question(question_type="personal", cursor=cursor)["id"]
+            for _ in range(sum(q["question_type"] == "personal" for q in load_questions()))
+        ]
+        assert len(drawn) == len(set(drawn))
+        assert all(q["question_type"] == "personal" for q in load_questions() if q["id"] in drawn)
+
+    def test_new_pass_after_exhaustion_without_back_to_back_repeat(self):
+        cursor = QuestionCursor(random.Random(2))
+        pool = np.arange(5)
+        seq = [cursor.next_position(pool, key="k") for _ in range(15)]
+        for start in (0, 5, 10):
+            assert sorted(seq[start : start + 5]) == [0, 1, 2, 3, 4]
+        assert all(a != b for a, b in zip(seq, seq[1:]))
+
+    def test_changing_filters_restarts_walk(self):
+        cursor = QuestionCursor(random.Random(3))
+        get_random_question(difficulty="beginner", cursor=cursor)
+        q = get_random_question(difficulty="advanced", cursor=cursor)
+        assert q["difficulty"] == "advanced"
+        assert cursor.served == 1
+
+    def test_large_pool_draw_is_constant_memory(self):
+        index = QuestionIndex(_synthetic_bank(200_000))
+        cursor = QuestionCursor(random.Random(4))
+        pool = index.select(question_type="advocacy")
+        seen = {cursor.next_position(pool, key="k") for _ in range(1000)}
+        assert len(seen) == 1000
+        assert vars(cursor).keys() == {"_rng", "_key", "_n", "_a", "_b", "_i", "_last"}
+
+
+def _write_bank(path, questions):
+    path.write_text(json.dumps({"version": "1.0", "questions": questions}), encoding="utf-8")
+
+
+def _write_shard(path, questions):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(q) + "\n" for q in questions), encoding="utf-8")
+
+
+@pytest.fixture
+def bank_sources(tmp_path):
+    json_file = tmp_path / "question_bank.json"
+    _write_bank(json_file, _synthetic_bank(5))
+    return json_file, tmp_path / "shards"
+
+
+class TestQuestionStore:
+    def test_imports_json_and_shards(self, tmp_path, bank_sources):
+        json_file, shards = bank_sources
+        _write_shard(shards / "gen-1.jsonl", [{**_synthetic_bank(1)[0], "id": "g1", "hint": "x"}])
+        store = QuestionStore(tmp_path / "bank.sqlite", json_file, shards)
+        assert store.sync() is True
+        assert store.count() == 6
+        assert store.get("g1")["hint"] == "x"  # extra fields round-trip
+        assert [f["id"] for f in store.iter_facets()][:2] == ["g1", "s0"]
+        assert store.sync() is False
+
+    def test_only_changed_sources_reimported(self, tmp_path, bank_sources, caplog):
+        json_file, shards = bank_sources
+        _write_shard(shards / "a.jsonl", [{**_synthetic_bank(1)[0], "id": "a1"}])
+        store = QuestionStore(tmp_path / "bank.sqlite", json_file, shards)
+        store.sync()
+        _write_shard(shards / "a.jsonl", [{**_synthetic_bank(1)[0], "id": "a2"}])
+        caplog.clear()
+        with caplog.at_level("INFO", logger="pageant_assistant.questions.store"):
+            assert store.sync() is True
+        assert [r.getMessage() for r in caplog.records] == [
+            f"QuestionStore: imported 1 question(s) from {shards / 'a.jsonl'}"
+        ]
+        assert store.get("a1") is None and store.get("a2") is not None
+
+    def test_removed_shard_dropped_and_db_persists(self, tmp_path, bank_sources):
+        json_file, shards = bank_sources
+        _write_shard(shards / "a.jsonl", [{**_synthetic_bank(1)[0], "id": "a1"}])
+        QuestionStore(tmp_path / "bank.sqlite", json_file, shards).sync()
+        reopened = QuestionStore(tmp_path / "bank.sqlite", json_file, shards)
+        assert reopened.sync() is False and reopened.count() == 6
+        (shards / "a.jsonl").unlink()
+        assert reopened.sync() is True and reopened.count() == 5
+
+    def test_shadowed_id_restored_when_overriding_source_drops_it(self, tmp_path, bank_sources):
+        json_file, shards = bank_sources
+        original = QuestionStore(tmp_path / "orig.sqlite", json_file, shards)
+        original.sync()
+        _write_shard(shards / "a.jsonl", [{**_synthetic_bank(1)[0], "text": "Override?"}])
+        store = QuestionStore(tmp_path / "bank.sqlite", json_file, shards)
+        store.sync()
+        assert store.get("s0")["text"] == "Override?"
+
+        _write_shard(shards / "a.jsonl", [{**_synthetic_bank(1)[0], "id": "a1"}])
+        assert store.sync() is True
+        assert store.get("s0") == original.get("s0") and store.count() == 6
+        (shards / "a.jsonl").unlink()
+        store.sync()
+        assert store.get("s0") == original.get("s0") and store.count() == 5
+
+    def test_bad_jsonl_lines_skipped(self, tmp_path, bank_sources):
+        json_file, shards = bank_sources
+        shards.mkdir()
+        good = json.dumps({**_synthetic_bank(1)[0], "id": "ok"})
+        (shards / "a.jsonl").write_text(f"{good}\nnot json\n\n", encoding="utf-8")
+        store = QuestionStore(tmp_path / "bank.sqlite", json_file, shards)
+        store.sync()
+        assert store.get("ok") is not None
+
+
+@pytest.fixture
+def bank_module(tmp_path, bank_sources, monkeypatch):
+    import pageant_assistant.questions.bank as bank
+
+    json_file, shards = bank_sources
+    monkeypatch.setattr(bank, "QUESTIONS_FILE", json_file)
+    monkeypatch.setattr(bank, "QUESTION_SHARDS_DIR", shards)
+    monkeypatch.setattr(bank, "QUESTION_DB", tmp_path / "bank.sqlite")
+    monkeypatch.setattr(bank, "QUESTION_RELOAD_INTERVAL_S", 0)
+    for name, value in (("_store", None), ("_index", None), ("_questions", (None, ()))):
+        monkeypatch.setattr(bank, name, value)
+    return bank
+
+
+class TestHotReload:
+    def test_new_shard_visible_without_restart(self, bank_module, bank_sources):
+        _, shards = bank_sources
+        assert len(bank_module.load_questions()) == 5
+        _write_shard(shards / "new.jsonl", [{**_synthetic_bank(1)[0], "id": "n1", "tags": ["new"]}])
+        assert len(bank_module.load_questions()) == 6
+        assert bank_module.get_random_question(tags=["new"])["id"] == "n1"
+
+    def test_draws_fetch_lazily(self, bank_module):
+        index = bank_module.get_question_index()
+        assert index._rows == ()
+        q = bank_module.get_random_question(question_type="advocacy")
+        assert q["question_type"] == "advocacy" and "text" in q
+
+    def test_index_not_rebuilt_while_unchanged(self, bank_module):
+        assert bank_module.get_question_index() is bank_module.get_question_index()
+
+
+_TOPICAL = [
+    ("t1", "How would you fight climate change in your country?", "advocacy"),
+    ("t2", "What would you do about climate change as a leader?", "leadership"),
+    ("t3", "Who is your role model and why?", "personal"),
+    ("t4", "Which person in your family is your role model?", "personal"),
+    ("t5", "If you could be any animal, which would you be?", "fun_creative"),
+]
+
+
+def _topical_bank():
+    return [
+        {**_synthetic_bank(1)[0], "id": qid, "text": text, "question_type": q_type}
+        for qid, text, q_type in _TOPICAL
+    ]
+
+
+class _CountingEmbed:
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts += texts
+        return hashing_embed(texts)
+
+
+class TestQuestionVectors:
+    def test_incremental_rebuild_embeds_only_changed_text(self):
+        bank = _topical_bank()
+        first, embedded = build_question_vectors(bank, _CountingEmbed(), "m")
+        assert embedded == 5
+        bank[1] = {**bank[1], "text": "Describe a leader you admire."}
+        embed = _CountingEmbed()
+        second, embedded = build_question_vectors(
+            bank + [bank[0] | {"id": "t6"}], embed, "m", first
+        )
+        assert embedded == 2 and embed.texts == ["Describe a leader you admire.", bank[0]["text"]]
+        assert np.array_equal(second.matrix[0], first.matrix[0])
+
+    def test_other_model_vectors_not_reused(self):
+        first, _ = build_question_vectors(_topical_bank(), hashing_embed, "m")
+        _, embedded = build_question_vectors(_topical_bank(), hashing_embed, "other", first)
+        assert embedded == 5
+
+    def test_save_load_round_trip(self, tmp_path):
+        vectors, _ = build_question_vectors(_topical_bank(), hashing_embed, "m")
+        path = tmp_path / "vectors.npy"
+        vectors.save(path)
+        loaded = QuestionVectors.load(path)
+        assert loaded.ids == vectors.ids and loaded.model == "m"
+        assert np.allclose(loaded.matrix, vectors.matrix)
+        assert QuestionVectors.load(tmp_path / "missing.npy") is None
+
+    def test_top_k_matches_brute_force(self):
+        vectors, _ = build_question_vectors(_synthetic_bank(300), hashing_embed, "m")
+        query = vectors.matrix[7]
+        scores = vectors.matrix @ query
+        expected = [int(i) for i in np.argsort(-scores, kind="stable") if i != 7][:5]
+        got = [row for row, _ in vectors.top_k(query, 5, exclude=7)]
+        assert np.allclose(scores[got], scores[expected])
+        pool = np.array([3, 7, 11])
+        assert {r for r, _ in vectors.top_k(query, 10, candidates=pool, exclude=7)} == {3, 11}
+
+    def test_near_duplicates(self):
+        bank = _topical_bank() + [
+            {**_topical_bank()[2], "id": "t3b", "text": "Who is your role model, and why?"}
+        ]
+        vectors, _ = build_question_vectors(bank, hashing_embed, "m")
+        assert vectors.near_duplicates(0.99) == [("t3", "t3b", 1.0)]
+
+
+class TestSemanticSearch:
+    @pytest.fixture
+    def semantic(self, bank_module, bank_sources, tmp_path, monkeypatch):
+        import pageant_assistant.questions.semantic as semantic
+        import pageant_assistant.rag.embeddings as embeddings
+
+        _write_bank(bank_sources[0], _topical_bank())
+        monkeypatch.setattr(embeddings, "get_embedding_function", lambda: hashing_embed)
+        monkeypatch.setattr(semantic, "QUESTION_VECTORS_FILE", tmp_path / "vectors.npy")
+        semantic.reset_question_vectors()
+        yield semantic
+        semantic.reset_question_vectors()
+
+    def test_similar_questions(self, semantic):
+        (best, score), *_ = semantic.similar_questions("t3", k=2)
+        assert best["id"] == "t4" and 0 < score < 1
+        same_type = semantic.similar_questions("t1", k=5, same_type=True)
+        assert same_type == []  # t1 is the only advocacy question
+        assert semantic.similar_questions("missing") == []
+
+    def test_vectors_persisted_and_follow_reloads(self, semantic, bank_sources, tmp_path):
+        assert semantic.get_question_vectors().ids == ["t1", "t2", "t3", "t4", "t5"]
+        assert (tmp_path / "vectors.npy").exists()
+        _write_shard(bank_sources[1] / "x.jsonl", [{**_topical_bank()[0], "id": "t6"}])
+        assert semantic.get_question_vectors().ids[-1] == "t6"
+
+    def test_custom_question_matching(self, semantic):
+        q, score = semantic.resolve_custom_question("who is your  role model and why")
+        assert q["id"] == "t3" and score == pytest.approx(1.0)
+        q, score = semantic.resolve_custom_question("How should cities handle climate change?")
+        assert score is None and q["custom"] and q["id"].startswith("custom-")
+        assert q["question_type"] in {"advocacy", "leadership"}
+        assert semantic.match_question("How should cities handle climate change?") is None
+
+    def test_embedding_failure_disables_search(self, semantic, monkeypatch):
+        import pageant_assistant.rag.embeddings as embeddings
+
+        def broken():
+            raise RuntimeError("model missing")
+
+        monkeypatch.setattr(embeddings, "get_embedding_function", broken)
+        assert semantic.similar_questions("t3") == []
+        q, score = semantic.resolve_custom_question("Anything?")
+        assert score is None and q["question_type"] == "personal"
+
+    def test_embedding_failure_cached_for_bank(self, semantic, monkeypatch):
+        import pageant_assistant.rag.embeddings as embeddings
+
+        loads = []
+
+        def broken():
+            loads.append(1)
+            raise RuntimeError("model missing")
+
+        monkeypatch.setattr(embeddings, "get_embedding_function", broken)
+        assert semantic.get_question_vectors() is None
+        assert semantic.get_question_vectors() is None
+        assert loads == [1]  # not retried until the bank reloads
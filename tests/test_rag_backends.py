@@ -0,0 +1,137 @@
+"""Tests for the pluggable vector-store backends and the rag.store contract."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from pageant_assistant.rag.backends import NumpyBackend
+from pageant_assistant.rag.store import (
+    add_chunks,
+    collection_size,
+    delete_chunks,
+    get_chunks,
+    retrieve_evidence,
+)
+from tests.conftest import hashing_embed
+
+CHUNKS = [
+    {
+        "id": "mh-01",
+        "text": "One in seven adolescents globally experiences a mental health condition.",
+        "metadata": {"topic": "mental_health", "chunk_type": "stat", "source": "WHO 2021"},
+    },
+    {
+        "id": "edu-01",
+        "text": "244 million children and youth are out of school worldwide.",
+        "metadata": {"topic": "education", "chunk_type": "stat", "source": "UNESCO 2022"},
+    },
+    {
+        "id": "lead-01",
+        "text": "Companies with women in leadership outperform peers by 39 percent.",
+        "metadata": {"topic": "leadership", "chunk_type": "stat", "source": "McKinsey 2023"},
+    },
+]
+
+
+def _upsert(backend, chunks):
+    backend.upsert(
+        ids=[c["id"] for c in chunks],
+        texts=[c["text"] for c in chunks],
+        metadatas=[c["metadata"] for c in chunks],
+        embeddings=np.asarray(hashing_embed([c["text"] for c in chunks])),
+    )
+
+
+class TestStoreContract:
+    """Runs once per backend via the parametrised evidence_store fixture."""
+
+    def test_empty_store(self, evidence_store):
+        assert collection_size() == 0
+        assert retrieve_evidence("anything") == []
+
+    def test_add_and_retrieve(self, evidence_store):
+        add_chunks(CHUNKS)
+        assert collection_size() == 3
+        top = retrieve_evidence("women in leadership", n_results=1)
+        assert top[0]["source"] == "McKinsey 2023"
+        assert set(top[0]) == {"text", "source", "chunk_type", "topic"}
+
+    def test_n_results_capped(self, evidence_store):
+        add_chunks(CHUNKS)
+        assert len(retrieve_evidence("any topic", n_results=100)) == 3
+
+    def test_upsert_is_idempotent(self, evidence_store):
+        add_chunks(CHUNKS)
+        add_chunks([{**CHUNKS[0], "text": "Updated text for the same ID."}])
+        assert collection_size() == 3
+        assert get_chunks(["mh-01"])[0]["text"] == "Updated text for the same ID."
+
+    def test_delete(self, evidence_store):
+        add_chunks(CHUNKS)
+        delete_chunks(["edu-01", "missing"])
+        assert {c["id"] for c in get_chunks()} == {"mh-01", "lead-01"}
+
+    def test_precomputed_embeddings_skip_model(self, evidence_store, monkeypatch):
+        def _fail():
+            raise AssertionError("embedding model should not be called")
+
+        monkeypatch.setattr("pageant_assistant.rag.store.get_embedding_function", _fail)
+        add_chunks([{**c, "embedding": hashing_embed([c["text"]])[0]} for c in CHUNKS])
+        assert collection_size() == 3
+
+
+class TestNumpyBackend:
+    def test_persists_and_memory_maps(self, tmp_path):
+        _upsert(NumpyBackend(tmp_path), CHUNKS)
+        reopened = NumpyBackend(tmp_path)
+        assert reopened.count() == 3
+        assert isinstance(reopened._matrix, np.memmap)
+        assert reopened._matrix.dtype == np.float32
+        assert reopened._matrix.flags["C_CONTIGUOUS"]
+
+    def test_cosine_scores_sorted(self, tmp_path):
+        backend = NumpyBackend(tmp_path)
+        _upsert(backend, CHUNKS)
+        hits = backend.query(np.asarray(hashing_embed([CHUNKS[1]["text"]])[0]), 3)
+        scores = [score for _, score in hits]
+        assert hits[0][0]["id"] == "edu-01"
+        assert scores[0] == pytest.approx(1.0, abs=1e-5)
+        assert scores == sorted(scores, reverse=True)
+
+    def test_other_instance_sees_new_generation(self, tmp_path):
+        reader = NumpyBackend(tmp_path)
+        writer = NumpyBackend(tmp_path)
+        _upsert(writer, CHUNKS[:1])
+        assert reader.count() == 1
+        _upsert(writer, CHUNKS[1:])
+        assert reader.count() == 3
+        assert len(list(tmp_path.glob("embeddings-*.npy"))) == 1
+
+    def test_writers_on_one_path_serialise(self, tmp_path):
+        first, second = NumpyBackend(tmp_path), NumpyBackend(tmp_path)
+        done = threading.Event()
+        with first.write_lock():
+            writer = threading.Thread(target=lambda: (_upsert(second, CHUNKS[1:]), done.set()))
+            writer.start()
+            assert not done.wait(0.2)
+            _upsert(first, CHUNKS[:1])
+        writer.join(5)
+        assert done.is_set()
+        assert NumpyBackend(tmp_path).count() == 3
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_duplicate_ids_within_batch(self, tmp_path):
+        backend = NumpyBackend(tmp_path)
+        _upsert(backend, [CHUNKS[0], {**CHUNKS[0], "text": "second copy"}])
+        assert backend.count() == 1
+        assert backend.get(["mh-01"])[0]["text"] == "second copy"
+
+    def test_delete_everything(self, tmp_path):
+        backend = NumpyBackend(tmp_path)
+        _upsert(backend, CHUNKS)
+        backend.delete([c["id"] for c in CHUNKS])
+        assert backend.count() == 0
+        assert backend.query(np.ones(64), 3) == []
+        _upsert(backend, CHUNKS[:1])
+        assert backend.count() == 1
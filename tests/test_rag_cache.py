@@ -0,0 +1,153 @@
+"""Tests for caching rag_research results by question and corpus version."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import pageant_assistant.rag.nodes as nodes
+import pageant_assistant.rag.store as store
+from pageant_assistant.rag.cache import ResearchCache, ResearchKey, normalise_question
+
+
+def _chunk(cid, text, chunk_type="stat", region=None):
+    meta = {"topic": "youth", "chunk_type": chunk_type, "source": "S"}
+    if region:
+        meta["region"] = region
+    return {"id": cid, "text": text, "metadata": meta}
+
+
+class _GradingLLM:
+    """Counts grading calls and marks every chunk relevant."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        count = int(prompt.split("exactly ")[1].split()[0])
+        return SimpleNamespace(content=json.dumps({"relevant": [True] * count}))
+
+
+@pytest.fixture
+def research(evidence_store, tmp_path, monkeypatch):
+    """rag_research against a small store with a counting grader and fresh cache."""
+    llm = _GradingLLM()
+    monkeypatch.setattr(nodes, "get_llm", lambda role: llm)
+    monkeypatch.setattr(nodes, "research_cache", ResearchCache(16, tmp_path / "cache"))
+    store.add_chunks(
+        [
+            _chunk("s-1", "youth unemployment statistics rose sharply"),
+            _chunk("f-1", "youth unemployment framing as lost potential", "framing"),
+        ]
+    )
+    return llm
+
+
+def _state(question="What would you do about youth unemployment?", country=""):
+    return {
+        "question": question,
+        "question_analysis": "Question type: issues-based",
+        "persona_country": country,
+    }
+
+
+class TestResearchCache:
+    def test_normalise_question(self):
+        assert normalise_question(" Youth  unemployment?! ") == "youth unemployment"
+
+    def test_lru_evicts_oldest(self):
+        cache = ResearchCache(max_entries=2)
+        keys = [ResearchKey(f"q{i}", "advocacy", "*", "v") for i in range(3)]
+        for k in keys:
+            cache.put(k, {"n": k.question})
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[2]) == {"n": "q2"}
+
+    def test_disk_entries_survive_restart_and_old_versions_pruned(self, tmp_path):
+        old = ResearchKey("q", "advocacy", "*", "v1")
+        new = old._replace(corpus_version="v2")
+        ResearchCache(4, tmp_path).put(old, {"rag_evidence": "A"})
+        reopened = ResearchCache(4, tmp_path)
+        assert reopened.get(old) == {"rag_evidence": "A"}
+        other = ResearchKey("q", "advocacy", "kenya+global", "v1")
+        reopened.put(other, {"rag_evidence": "K"})
+        reopened.put(new, {"rag_evidence": "B"})
+        # Pruning is per shard set: the kenya entry keeps its own version
+        assert [p.name for p in (tmp_path / "all").iterdir()] == ["v2"]
+        assert reopened.get(other) == {"rag_evidence": "K"}
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = ResearchCache(max_entries=0)
+        key = ResearchKey("q", "advocacy", "*", "v")
+        cache.put(key, {"x": 1})
+        assert cache.get(key) is None
+
+
+class TestCachedRagResearch:
+    def test_grading_paid_once_per_question(self, research):
+        first = nodes.rag_research(_state())
+        second = nodes.rag_research(_state("what would you do about YOUTH unemployment"))
+        assert research.calls == 1
+        assert first == second
+        assert first["rag_evidence"].startswith("EVIDENCE")
+
+    def test_ingestion_invalidates(self, research):
+        nodes.rag_research(_state())
+        store.add_chunks([_chunk("e-1", "youth unemployment example programme", "example")])
+        result = nodes.rag_research(_state())
+        assert research.calls == 2
+        assert "example programme" in result["rag_evidence"]
+        nodes.rag_research(_state())
+        assert research.calls == 2
+
+    def test_searched_shards_are_part_of_key(self, research):
+        store.add_chunks(
+            [
+                _chunk("ng-1", "youth unemployment in nigeria statistics", region="Nigeria"),
+                _chunk("ke-1", "youth unemployment in kenya statistics", region="Kenya"),
+            ]
+        )
+        nodes.rag_research(_state(country="Kenya"))
+        nodes.rag_research(_state(country="Nigeria"))
+        nodes.rag_research(_state(country="kenya"))
+        assert research.calls == 2
+        # Countries without a shard search every shard and share that entry
+        nodes.rag_research(_state(country="Peru"))
+        nodes.rag_research(_state(country="Chile"))
+        assert research.calls == 3
+
+    def test_writes_to_other_shards_keep_entry(self, research):
+        store.add_chunks(
+            [
+                _chunk("ng-1", "youth unemployment in nigeria statistics", region="Nigeria"),
+                _chunk("ke-1", "youth unemployment in kenya statistics", region="Kenya"),
+            ]
+        )
+        nodes.rag_research(_state(country="Nigeria"))
+        store.add_chunks([_chunk("ke-2", "kenya youth jobs example", "example", "Kenya")])
+        nodes.rag_research(_state(country="Nigeria"))
+        assert research.calls == 1
+        store.add_chunks([_chunk("ng-2", "nigeria youth jobs example", "example", "Nigeria")])
+        nodes.rag_research(_state(country="Nigeria"))
+        assert research.calls == 2
+
+    def test_empty_retrieval_not_cached(self, research, monkeypatch):
+        real = nodes.retrieve_evidence
+        outages = [[]]  # first call fails transiently
+
+        def flaky(*args, **kwargs):
+            return outages.pop() if outages else real(*args, **kwargs)
+
+        monkeypatch.setattr(nodes, "retrieve_evidence", flaky)
+        assert nodes.rag_research(_state())["rag_evidence"] is None
+        assert nodes.rag_research(_state())["rag_evidence"] is not None
+        assert research.calls == 1
+
+    def test_ineligible_type_skips_cache(self, research):
+        state = {**_state(), "question_analysis": "Question type: personal"}
+        assert nodes.rag_research(state) == {
+            "rag_evidence": None,
+            "rag_question_type": "personal",
+        }
+        assert research.calls == 0
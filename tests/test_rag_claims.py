@@ -0,0 +1,85 @@
+"""Tests for local claim extraction and the claim_verifier shortcut."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import pageant_assistant.rag.nodes as nodes
+from pageant_assistant.rag.claims import extract_claims, triage_claims
+
+EVIDENCE = """EVIDENCE — use only if directly relevant.
+[1] (stat) About 45 percent of girls in Kenya marry before age 18.
+    Source: UNICEF 2020
+[2] (example) Kenya passed the Prohibition of Female Genital Mutilation Act in 2011.
+"""
+
+
+class TestExtractClaims:
+    def test_opinions_have_no_claims(self):
+        assert extract_claims("I believe every girl deserves a chance. I am ready!") == []
+
+    def test_numbers_percentages_years_and_ratios(self):
+        (claim,) = extract_claims("Since 2015, 1,200 girls (30 per cent) joined; one in three")
+        assert claim.numbers == ("30%", "2015", "1200", "one in three")
+
+    def test_acronyms_and_named_policies(self):
+        (claim,) = extract_claims("With WHO support, the National Youth Policy grew.")
+        assert set(claim.entities) == {"National Youth Policy", "WHO"}
+
+    def test_ordinals_and_pronoun_ignored(self):
+        assert extract_claims("My 1st priority is what I love.") == []
+
+
+class TestTriageClaims:
+    def test_verbatim_claims_verified_others_ambiguous(self):
+        answer = (
+            "According to UNICEF, 45% of Kenyan girls marry before 18. "
+            "The Prohibition of Female Genital Mutilation Act 2011 changed lives. "
+            "Only 12% of girls reach university."
+        )
+        verified, ambiguous = triage_claims(answer, EVIDENCE)
+        assert len(verified) == 2
+        assert [c.sentence for c in ambiguous] == ["Only 12% of girls reach university."]
+
+    def test_entity_must_match_whole_words(self):
+        _, ambiguous = triage_claims("The UN agrees.", "Source: UNICEF")
+        assert len(ambiguous) == 1
+
+
+class _VerifierLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=json.dumps({"claim_flags": ["x"], "verdict": "partial"}))
+
+
+@pytest.fixture
+def verifier_llm(monkeypatch):
+    llm = _VerifierLLM()
+    monkeypatch.setattr(nodes, "get_llm", lambda role: llm)
+    return llm
+
+
+class TestClaimVerifierShortcut:
+    def test_no_claims_skips_llm(self, verifier_llm):
+        state = {"refined_answer": "I will lead with compassion.", "rag_evidence": EVIDENCE}
+        assert nodes.claim_verifier(state) == {"claim_flags": []}
+        assert verifier_llm.prompts == []
+
+    def test_all_verified_skips_llm(self, verifier_llm):
+        state = {"refined_answer": "UNICEF says 45% marry by 18.", "rag_evidence": EVIDENCE}
+        assert nodes.claim_verifier(state) == {"claim_flags": []}
+        assert verifier_llm.prompts == []
+
+    def test_only_ambiguous_claims_sent(self, verifier_llm):
+        state = {
+            "refined_answer": "UNICEF says 45% marry by 18. Only 12% reach university.",
+            "rag_evidence": EVIDENCE,
+        }
+        assert nodes.claim_verifier(state) == {"claim_flags": ["x"]}
+        (prompt,) = verifier_llm.prompts
+        assert "Only 12% reach university." in prompt
+        assert "UNICEF says" not in prompt
@@ -0,0 +1,141 @@
+"""Tests for the shared embedding sidecar (micro-batching server + client)."""
+
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pageant_assistant.rag import embeddings
+from pageant_assistant.rag.embed_service import (
+    EmbeddingServer,
+    MicroBatcher,
+    SidecarEmbeddingFunction,
+    parse_address,
+)
+from tests.conftest import hashing_embed
+
+
+class _CountingEmbed:
+    """hashing_embed that records the size of every model call."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls: list[int] = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.calls.append(len(texts))
+        time.sleep(self.delay)
+        return hashing_embed(texts)
+
+
+@pytest.fixture
+def tcp_server():
+    embed = _CountingEmbed(delay=0.01)
+    server = EmbeddingServer("tcp:127.0.0.1:0", embed_fn=embed, max_batch=64, max_wait_ms=20)
+    server.start()
+    yield server, embed
+    server.close()
+
+
+class TestParseAddress:
+    def test_unix_and_tcp(self):
+        assert parse_address("unix:/tmp/x.sock") == (socket.AF_UNIX, "/tmp/x.sock")
+        assert parse_address("tcp:127.0.0.1:8765") == (socket.AF_INET, ("127.0.0.1", 8765))
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_address("http://localhost:8765")
+
+
+class TestMicroBatcher:
+    def test_concurrent_requests_are_coalesced(self):
+        embed = _CountingEmbed(delay=0.01)
+        batcher = MicroBatcher(embed, max_batch=64, max_wait_ms=30)
+        texts = [f"question number {i}" for i in range(24)]
+        try:
+            with ThreadPoolExecutor(max_workers=24) as pool:
+                results = list(pool.map(lambda t: batcher.embed([t]), texts))
+        finally:
+            batcher.close()
+        assert len(embed.calls) < len(texts)
+        assert sum(embed.calls) == len(texts)
+        for text, vec in zip(texts, results):
+            np.testing.assert_allclose(vec[0], hashing_embed([text])[0], rtol=1e-6)
+
+    def test_batch_size_is_capped(self):
+        embed = _CountingEmbed()
+        batcher = MicroBatcher(embed, max_batch=4, max_wait_ms=50)
+        futures = [batcher.submit([f"t{i}", f"u{i}"]) for i in range(6)]
+        for f in futures:
+            assert f.result().shape == (2, 64)
+        batcher.close()
+        assert max(embed.calls) <= 4
+
+    def test_errors_reach_every_caller(self):
+        def _boom(texts):
+            raise RuntimeError("model failed")
+
+        batcher = MicroBatcher(_boom, max_wait_ms=1)
+        with pytest.raises(RuntimeError, match="model failed"):
+            batcher.embed(["x"])
+        batcher.close()
+
+
+class TestSidecar:
+    def test_client_round_trip_over_tcp(self, tcp_server):
+        server, _embed = tcp_server
+        client = SidecarEmbeddingFunction(server.address, fallback=False)
+        vectors = client(["kenya climate", "mental health"])
+        assert vectors.dtype == np.float32
+        np.testing.assert_allclose(
+            vectors, hashing_embed(["kenya climate", "mental health"]), rtol=1e-6
+        )
+
+    def test_many_clients_share_batches(self, tcp_server):
+        server, embed = tcp_server
+        client = SidecarEmbeddingFunction(server.address, fallback=False)
+        texts = [f"query {i}" for i in range(40)]
+        with ThreadPoolExecutor(max_workers=40) as pool:
+            results = list(pool.map(lambda t: client([t]), texts))
+        assert all(r.shape == (1, 64) for r in results)
+        assert len(embed.calls) < len(texts)
+
+    def test_unix_socket(self):
+        # AF_UNIX paths are length-limited, so keep the directory short
+        with tempfile.TemporaryDirectory(dir="/tmp") as d:
+            address = f"unix:{Path(d) / 'e.sock'}"
+            server = EmbeddingServer(address, embed_fn=hashing_embed, max_wait_ms=1)
+            server.start()
+            try:
+                assert SidecarEmbeddingFunction(address, fallback=False)(["hi"]).shape == (1, 64)
+            finally:
+                server.close()
+            assert not (Path(d) / "e.sock").exists()
+
+    def test_falls_back_to_local_model_when_service_down(self, monkeypatch):
+        monkeypatch.setattr(embeddings, "local_embedding_function", lambda: hashing_embed)
+        client = SidecarEmbeddingFunction("unix:/tmp/pageant-no-such.sock")
+        np.testing.assert_allclose(client(["hello"]), hashing_embed(["hello"]), rtol=1e-6)
+
+    def test_no_fallback_raises(self):
+        client = SidecarEmbeddingFunction("unix:/tmp/pageant-no-such.sock", fallback=False)
+        with pytest.raises(OSError):
+            client(["hello"])
+
+    def test_store_uses_sidecar_when_configured(self, monkeypatch):
+        monkeypatch.setattr(embeddings, "EMBEDDING_SERVICE", "tcp:127.0.0.1:9")
+        monkeypatch.setattr(embeddings, "_embedding_fn", None)
+        assert isinstance(embeddings.get_embedding_function(), SidecarEmbeddingFunction)
+
+    def test_sidecar_timeout_within_retrieval_timeout(self, monkeypatch):
+        monkeypatch.setattr(embeddings, "EMBEDDING_SERVICE", "tcp:127.0.0.1:9")
+        monkeypatch.setattr(embeddings, "RAG_RETRIEVAL_TIMEOUT", 3.0)
+        monkeypatch.setattr(embeddings, "_embedding_fn", None)
+        assert embeddings.get_embedding_function().timeout == 3.0
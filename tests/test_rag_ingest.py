@@ -0,0 +1,180 @@
+"""Tests for the bulk corpus ingestion pipeline (no embedding model required)."""
+
+import json
+
+import pytest
+
+from pageant_assistant.rag.ingest import (
+    IngestState,
+    chunk_id,
+    chunk_text,
+    classify_chunk,
+    content_hash,
+    ingest_directory,
+    read_document,
+)
+from pageant_assistant.rag.manifest import CorpusManifest
+
+
+@pytest.fixture
+def manifest():
+    return CorpusManifest()
+
+
+@pytest.fixture
+def deleted():
+    return []
+
+
+@pytest.fixture
+def upserted(monkeypatch, manifest, deleted):
+    """Capture add_chunks/delete_chunks calls against an in-memory manifest, not Chroma."""
+    calls: list[list[dict]] = []
+
+    def add_chunks(chunks, origin):
+        calls.append(chunks)
+        manifest.chunks.update({c["id"]: {"hash": "", "origin": origin} for c in chunks})
+
+    def delete_chunks(ids, shard=None):
+        deleted.extend(ids)
+        for cid in ids:
+            manifest.chunks.pop(cid, None)
+
+    monkeypatch.setattr("pageant_assistant.rag.store.add_chunks", add_chunks)
+    monkeypatch.setattr("pageant_assistant.rag.store.delete_chunks", delete_chunks)
+    monkeypatch.setattr("pageant_assistant.rag.store.load_manifest", lambda: manifest)
+    return calls
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    root = tmp_path / "reports"
+    (root / "education_access").mkdir(parents=True)
+    (root / "education_access" / "unesco.txt").write_text(
+        "Education is the foundation of opportunity.\n\n"
+        "Around 98 million children in sub-Saharan Africa are out of school, "
+        "and only 42% complete lower secondary.",
+        encoding="utf-8",
+    )
+    (root / "brief.md").write_text(
+        "---\ntopic: climate\nsource: Kenya NDC 2020\n---\n# Climate\n\nKenya plants trees.",
+        encoding="utf-8",
+    )
+    (root / "page.html").write_text(
+        "<html><head><title>WHO Atlas</title><style>p{}</style></head>"
+        "<body><p>Mental health matters.</p><script>x()</script></body></html>",
+        encoding="utf-8",
+    )
+    return root
+
+
+class TestReadAndChunk:
+    def test_markdown_front_matter_overrides(self, corpus_dir):
+        text, overrides = read_document(corpus_dir / "brief.md")
+        assert overrides == {"topic": "climate", "source": "Kenya NDC 2020"}
+        assert "#" not in text
+        assert "Kenya plants trees." in text
+
+    def test_html_strips_markup_and_scripts(self, corpus_dir):
+        text, overrides = read_document(corpus_dir / "page.html")
+        assert overrides["source"] == "WHO Atlas"
+        assert "Mental health matters." in text
+        assert "x()" not in text and "p{}" not in text
+
+    def test_short_paragraphs_are_packed(self):
+        assert chunk_text("One two.\n\nThree four.", max_words=10) == ["One two. Three four."]
+
+    def test_long_paragraph_split_with_overlap(self):
+        words = " ".join(f"w{i}" for i in range(100))
+        chunks = chunk_text(words, max_words=40, overlap_words=10)
+        assert all(len(c.split()) <= 40 for c in chunks)
+        assert chunks[1].split()[0] == "w30"
+
+    def test_classify_chunk(self):
+        assert classify_chunk("Only 42% finish; 1,200,000 remain out of school.", 3) == "stat"
+        assert classify_chunk("A framing statement.", 0) == "framing"
+        assert classify_chunk("A programme in Nakuru.", 2) == "example"
+
+    def test_content_hash_ignores_case_and_whitespace(self):
+        assert content_hash("Hello  World") == content_hash("hello world\n")
+
+
+class TestIngestDirectory:
+    def test_ingests_with_metadata(self, corpus_dir, tmp_path, upserted, fake_embed):
+        stats = ingest_directory(
+            corpus_dir, region="Kenya/Africa", state_path=tmp_path / "s.json", embed_fn=fake_embed
+        )
+        chunks = [c for call in upserted for c in call]
+        assert stats.chunks_upserted == len(chunks) == 3
+        by_source = {c["metadata"]["source"]: c for c in chunks}
+        edu = by_source["education_access/unesco.txt"]
+        assert edu["metadata"]["topic"] == "education_access"
+        assert edu["metadata"]["region"] == "Kenya/Africa"
+        assert by_source["Kenya NDC 2020"]["metadata"]["topic"] == "climate"
+        assert all(len(c["embedding"]) == 64 for c in chunks)
+
+    def test_batches_are_bounded(self, corpus_dir, tmp_path, upserted, fake_embed):
+        ingest_directory(
+            corpus_dir,
+            region="Kenya",
+            batch_size=1,
+            state_path=tmp_path / "s.json",
+            embed_fn=fake_embed,
+        )
+        assert all(len(call) == 1 for call in upserted)
+
+    def test_duplicate_chunks_are_dropped(self, corpus_dir, tmp_path, upserted, fake_embed):
+        (corpus_dir / "copy.txt").write_text("climate\n\nkenya  plants TREES.", encoding="utf-8")
+        stats = ingest_directory(
+            corpus_dir, region="Kenya", state_path=tmp_path / "s.json", embed_fn=fake_embed
+        )
+        assert stats.chunks_duplicate == 1
+        assert stats.chunks_upserted == 3
+
+    def test_rerun_resumes_and_skips_unchanged(self, corpus_dir, tmp_path, upserted, fake_embed):
+        state_path = tmp_path / "s.json"
+        ingest_directory(corpus_dir, region="Kenya", state_path=state_path, embed_fn=fake_embed)
+        state = IngestState.load(state_path)
+        assert len(state.completed_files) == 3
+        assert len(json.loads(state_path.read_text())["seen_hashes"]) == 3
+
+        upserted.clear()
+        (corpus_dir / "new.txt").write_text("A brand new report on leadership.", encoding="utf-8")
+        stats = ingest_directory(
+            corpus_dir, region="Kenya", state_path=state_path, embed_fn=fake_embed
+        )
+        assert stats.files_skipped == 3
+        assert [c["metadata"]["source"] for call in upserted for c in call] == ["new.txt"]
+
+    def test_edited_file_deletes_stale_chunks(
+        self, corpus_dir, tmp_path, upserted, deleted, fake_embed
+    ):
+        state_path = tmp_path / "s.json"
+        brief = corpus_dir / "brief.md"
+        (corpus_dir / "copy.txt").write_text("Climate\n\nKenya plants trees.", encoding="utf-8")
+        ingest_directory(corpus_dir, region="Kenya", state_path=state_path, embed_fn=fake_embed)
+        old_page = chunk_id(content_hash("Mental health matters."))
+
+        (corpus_dir / "page.html").write_text("<p>Mental health matters a lot.</p>")
+        brief.write_text("# Climate\n\nKenya restores forests.", encoding="utf-8")
+        stats = ingest_directory(
+            corpus_dir, region="Kenya", state_path=state_path, embed_fn=fake_embed
+        )
+        # The old brief chunk is still in copy.txt, so only the old page chunk goes
+        assert deleted == [old_page] and stats.chunks_deleted == 1
+        state = IngestState.load(state_path)
+        assert content_hash("Mental health matters.") not in state.seen_hashes
+        assert state.file_chunks["page.html"] == [content_hash("Mental health matters a lot.")]
+
+    def test_wiped_store_invalidates_state(
+        self, corpus_dir, tmp_path, upserted, manifest, fake_embed
+    ):
+        state_path = tmp_path / "s.json"
+        ingest_directory(corpus_dir, region="Kenya", state_path=state_path, embed_fn=fake_embed)
+        manifest.chunks.clear()
+
+        upserted.clear()
+        stats = ingest_directory(
+            corpus_dir, region="Kenya", state_path=state_path, embed_fn=fake_embed
+        )
+        assert stats.files_skipped == 0 and stats.chunks_upserted == 3
@@ -0,0 +1,161 @@
+"""Tests for compact stored vectors, the quantized model option, and the benchmarks."""
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+from pageant_assistant.eval.retrieval_bench import (
+    bench_embedding,
+    bench_scale,
+    bench_storage,
+    exact_top_k,
+    find_regressions,
+    recall_at_k,
+    synthetic_corpus,
+    synthetic_documents,
+)
+from pageant_assistant.rag import embeddings
+from pageant_assistant.rag.backends import NumpyBackend
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return synthetic_corpus(3000, dim=32, n_queries=40, seed=1)
+
+
+def _index(path, vectors, **kwargs):
+    backend = NumpyBackend(path, **kwargs)
+    ids = [f"c{i}" for i in range(len(vectors))]
+    backend.upsert(ids, [f"doc {i}" for i in range(len(ids))], [{}] * len(ids), vectors)
+    return backend
+
+
+class TestCompactVectors:
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_rescoring_matches_exact_search(self, tmp_path, corpus, dtype):
+        vectors, queries = corpus
+        backend = _index(tmp_path / dtype, vectors, vector_dtype=dtype)
+        truth = exact_top_k(vectors, queries, 5)
+        found = [[int(c["id"][1:]) for c, _ in backend.query(q, 5)] for q in queries]
+        assert recall_at_k(found, truth) >= 0.98
+
+    def test_returned_scores_are_exact_float32(self, tmp_path, corpus):
+        vectors, queries = corpus
+        backend = _index(tmp_path / "i8", vectors, vector_dtype="int8")
+        for chunk, score in backend.query(queries[0], 5):
+            expected = float(vectors[int(chunk["id"][1:])] @ queries[0])
+            assert score == pytest.approx(expected, abs=1e-5)
+
+    def test_compact_files_follow_generations(self, tmp_path, corpus):
+        vectors, _ = corpus
+        path = tmp_path / "i8"
+        backend = _index(path, vectors[:100], vector_dtype="int8")
+        assert (path / "embeddings-1.int8.npy").exists()
+        assert (path / "embeddings-1.int8-scale.npy").exists()
+        backend.delete(["c0"])
+        assert sorted(p.name for p in path.glob("embeddings-*")) == [
+            "embeddings-2.int8-scale.npy",
+            "embeddings-2.int8.npy",
+            "embeddings-2.npy",
+        ]
+        assert np.load(path / "embeddings-2.int8.npy").dtype == np.int8
+
+    def test_compact_view_derived_from_float32_index(self, tmp_path, corpus):
+        vectors, queries = corpus
+        _index(tmp_path / "idx", vectors[:500])  # written by a float32 instance
+        reader = NumpyBackend(tmp_path / "idx", vector_dtype="int8", rescore_factor=2)
+        assert reader._compact.dtype == np.int8
+        assert (
+            reader.query(queries[0], 3)[0][0]["id"]
+            == f"c{exact_top_k(vectors[:500], queries[:1], 1)[0][0]}"
+        )
+
+    def test_scan_bytes_track_dtype(self, tmp_path, corpus):
+        vectors, _ = corpus
+        full = _index(tmp_path / "f32", vectors[:100])
+        small = _index(tmp_path / "i8", vectors[:100], vector_dtype="int8")
+        assert full.scan_bytes() == vectors[:100].astype(np.float32).nbytes
+        assert small.scan_bytes() < full.scan_bytes() / 3
+
+    def test_unknown_dtype_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="vector_dtype"):
+            NumpyBackend(tmp_path, vector_dtype="bfloat16")
+
+
+class TestQuantizedModelOption:
+    def test_model_id_distinguishes_quantized_vectors(self, monkeypatch):
+        monkeypatch.setattr(embeddings, "EMBEDDING_MODEL", "minilm-int8")
+        assert embeddings.embedding_model_id() == "all-MiniLM-L6-v2-int8"
+        monkeypatch.setattr(embeddings, "EMBEDDING_MODEL", "minilm")
+        assert embeddings.embedding_model_id() == "all-MiniLM-L6-v2"
+
+    def test_unknown_model_rejected(self, monkeypatch):
+        monkeypatch.setattr(embeddings, "EMBEDDING_MODEL", "bert-huge")
+        monkeypatch.setattr(embeddings, "_local_fn", None)
+        with pytest.raises(ValueError, match="EMBEDDING_MODEL"):
+            embeddings.local_embedding_function()
+
+    @pytest.mark.skipif(importlib.util.find_spec("onnx") is not None, reason="onnx installed")
+    def test_quantize_without_onnx_explains_extra(self, tmp_path):
+        from pageant_assistant.rag.quantized import quantize_model
+
+        with pytest.raises(ImportError, match="quantize"):
+            quantize_model(source=tmp_path / "model.onnx")
+
+
+class TestBenchmark:
+    def test_recall_at_k(self):
+        assert recall_at_k([[1, 2, 3]], [[3, 2, 1]]) == 1.0
+        assert recall_at_k([[1, 2], [5, 6]], [[1, 9], [7, 8]]) == 0.25
+
+    def test_bench_storage_reports_each_dtype(self, tmp_path, corpus):
+        vectors, queries = corpus
+        rows = bench_storage(vectors, queries[:10], k=5, work_dir=tmp_path)
+        by_dtype = {r["dtype"]: r for r in rows}
+        assert set(by_dtype) == {"float32", "float16", "int8"}
+        assert by_dtype["float32"]["recall_at_k"] == 1.0
+        assert by_dtype["int8"]["scan_mb"] < by_dtype["float32"]["scan_mb"]
+        assert all({"p50_ms", "p95_ms", "p99_ms"} <= set(r) for r in rows)
+
+
+class TestScaleSuite:
+    def test_cases_per_backend_and_size(self, tmp_path):
+        rows = bench_scale(
+            [200, 500],
+            ["numpy", "numpy:int8", "chroma"],
+            isolate=False,
+            dim=16,
+            n_queries=10,
+            repeats=1,
+            work_dir=tmp_path,
+        )
+        assert [(r["backend"], r["dtype"], r["n"]) for r in rows] == [
+            ("numpy", "float32", 200),
+            ("numpy", "int8", 200),
+            ("chroma", "-", 200),
+            ("numpy", "float32", 500),
+            ("numpy", "int8", 500),
+            ("chroma", "-", 500),
+        ]
+        assert all(r["recall_at_k"] >= 0.9 for r in rows)
+        assert all(
+            {"index_s", "open_s", "p99_ms", "qps", "rss_mb", "disk_mb"} <= set(r) for r in rows
+        )
+
+    def test_synthetic_inputs_are_repeatable(self):
+        assert synthetic_documents(5, seed=3) == synthetic_documents(5, seed=3)
+        a, _ = synthetic_corpus(50, dim=8, seed=3)
+        b, _ = synthetic_corpus(50, dim=8, seed=3)
+        assert np.array_equal(a, b)
+
+    def test_embedding_throughput(self):
+        row = bench_embedding(lambda texts: [[0.0]] * len(texts), n_docs=20, n_queries=5)
+        assert row["n_docs"] == 20 and row["docs_per_s"] > 0
+
+    def test_regressions_detected_against_baseline(self):
+        base = {"backend": "numpy", "dtype": "int8", "n": 1000, "p95_ms": 1.0}
+        base["recall_at_k"] = 1.0
+        assert find_regressions([{**base, "p95_ms": 1.2}], [base]) == []
+        assert len(find_regressions([{**base, "p95_ms": 2.0, "recall_at_k": 0.9}], [base])) == 2
+        assert find_regressions([{**base, "n": 10}], [base]) == []
@@ -0,0 +1,116 @@
+"""Tests for manifest-driven, diff-based seeding of the evidence store."""
+
+import copy
+
+import pytest
+
+from pageant_assistant.rag import seed
+from pageant_assistant.rag.manifest import CorpusManifest, chunk_hash
+from pageant_assistant.rag.store import add_chunks, corpus_version, get_chunks, load_manifest
+from tests.conftest import hashing_embed
+
+
+@pytest.fixture
+def small_corpus(monkeypatch):
+    """Replace SEED_CORPUS with a mutable 3-chunk copy."""
+    corpus = copy.deepcopy(seed.SEED_CORPUS[:3])
+    monkeypatch.setattr(seed, "SEED_CORPUS", corpus)
+    return corpus
+
+
+@pytest.fixture
+def upsert_log(monkeypatch):
+    """Record the ids passed to every add_chunks call while still writing them."""
+    import pageant_assistant.rag.store as store
+
+    log: list[list[str]] = []
+    original = store.add_chunks
+
+    def _spy(chunks, **kwargs):
+        log.append([c["id"] for c in chunks])
+        original(chunks, **kwargs)
+
+    monkeypatch.setattr(store, "add_chunks", _spy)
+    return log
+
+
+class TestCorpusManifest:
+    def test_diff_detects_new_changed_and_removed(self):
+        manifest = CorpusManifest(
+            chunks={
+                "a": {"hash": "1", "origin": "seed"},
+                "b": {"hash": "2", "origin": "seed"},
+                "c": {"hash": "3", "origin": "ingest"},
+            }
+        )
+        to_upsert, to_delete = manifest.diff({"a": "1", "b": "changed", "d": "4"}, origin="seed")
+        assert to_upsert == ["b", "d"]
+        assert to_delete == []
+        _, to_delete = manifest.diff({"b": "2"}, origin="seed")
+        assert to_delete == ["a"]  # ingest-owned "c" is never deleted by a seed sync
+
+    def test_version_changes_with_content(self):
+        m1 = CorpusManifest(chunks={"a": {"hash": "1", "origin": "seed"}})
+        m2 = CorpusManifest(chunks={"a": {"hash": "2", "origin": "seed"}})
+        assert m1.corpus_version != m2.corpus_version
+
+    def test_chunk_hash_covers_metadata(self):
+        assert chunk_hash("t", {"source": "A"}) != chunk_hash("t", {"source": "B"})
+
+
+class TestSyncSeedCorpus:
+    def test_seeds_empty_collection(self, evidence_store, small_corpus, upsert_log):
+        assert seed.sync_seed_corpus() == 3
+        assert sorted(upsert_log[0]) == sorted(c["id"] for c in small_corpus)
+        assert load_manifest().ids_with_origin("seed") == {c["id"] for c in small_corpus}
+
+    def test_unchanged_corpus_is_a_no_op(self, evidence_store, small_corpus, upsert_log):
+        seed.sync_seed_corpus()
+        version = corpus_version()
+        upsert_log.clear()
+        assert seed.sync_seed_corpus() == 3
+        assert upsert_log == []
+        assert corpus_version() == version
+
+    def test_only_edited_chunk_is_upserted(self, evidence_store, small_corpus, upsert_log):
+        seed.sync_seed_corpus()
+        upsert_log.clear()
+        small_corpus[1]["text"] = "Edited statistic text."
+        seed.sync_seed_corpus()
+        assert upsert_log == [[small_corpus[1]["id"]]]
+        stored = {c["id"]: c["text"] for c in get_chunks()}
+        assert stored[small_corpus[1]["id"]] == "Edited statistic text."
+
+    def test_removed_chunk_is_deleted_but_ingested_kept(
+        self, evidence_store, small_corpus, upsert_log
+    ):
+        seed.sync_seed_corpus()
+        add_chunks(
+            [{"id": "ing-1", "text": "Ingested report.", "metadata": {"topic": "x"}}],
+            origin="ingest",
+        )
+        removed = small_corpus.pop()
+        assert seed.sync_seed_corpus() == 3
+        ids = {c["id"] for c in get_chunks()}
+        assert removed["id"] not in ids
+        assert "ing-1" in ids
+
+    def test_pre_manifest_collection_is_backfilled_and_migrated(
+        self, evidence_store, small_corpus, upsert_log
+    ):
+        for chunk in small_corpus:
+            chunk["metadata"]["region"] = "Kenya"
+        # Simulate a single-collection deployment seeded before manifests existed
+        legacy = small_corpus + [{"id": "old-1", "text": "Old runtime chunk.", "metadata": {}}]
+        evidence_store.upsert(
+            ids=[c["id"] for c in legacy],
+            texts=[c["text"] for c in legacy],
+            metadatas=[c["metadata"] or {"topic": "x"} for c in legacy],
+            embeddings=hashing_embed([c["text"] for c in legacy]),
+        )
+        assert seed.sync_seed_corpus() == 4
+        # Seed chunks move to their region shard; other chunks stay global
+        assert upsert_log == [[c["id"] for c in small_corpus]]
+        assert load_manifest("kenya").ids_with_origin("seed") == {c["id"] for c in small_corpus}
+        assert set(load_manifest("global").chunks) == {"old-1"}
+        assert {c["id"] for c in get_chunks(shard="global")} == {"old-1"}
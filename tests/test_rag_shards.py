@@ -0,0 +1,103 @@
+"""Tests for region-sharded evidence collections and country routing."""
+
+import pageant_assistant.rag.store as store
+from pageant_assistant.rag.shards import (
+    collection_name,
+    shard_from_collection,
+    shard_key,
+    shards_for_country,
+)
+
+
+def _chunk(cid, text, region=None):
+    meta = {"topic": "t", "chunk_type": "stat", "source": "S"}
+    if region is not None:
+        meta["region"] = region
+    return {"id": cid, "text": text, "metadata": meta}
+
+
+class TestShardKeys:
+    def test_region_and_country_normalise_to_same_key(self):
+        assert shard_key("Kenya") == shard_key(" kenya ") == "kenya"
+        assert shard_key("Côte d'Ivoire") == "cote_d_ivoire"
+        assert shard_key("United States") == "united_states"
+
+    def test_global_labels(self):
+        for label in (None, "", "Global", "International", "world", "Africa", "Kenya/Africa"):
+            assert shard_key(label) == "global"
+
+    def test_shards_for_country(self):
+        assert shards_for_country("Kenya") == ["kenya", "global"]
+        assert shards_for_country("Global") == ["global"]
+        assert shards_for_country("") is None
+        assert shards_for_country(None) is None
+
+    def test_collection_names_round_trip(self):
+        assert collection_name("global") == "pageant_evidence"
+        assert collection_name("kenya") == "pageant_evidence_kenya"
+        for shard in ("global", "kenya", "south_africa"):
+            assert shard_from_collection(collection_name(shard)) == shard
+        assert shard_from_collection("something_else") is None
+
+
+class TestShardRouting:
+    def _populate(self):
+        store.add_chunks(
+            [
+                _chunk("ke-1", "kenya youth unemployment statistics", "Kenya"),
+                _chunk("ng-1", "nigeria youth unemployment statistics", "Nigeria"),
+                _chunk("gl-1", "global youth unemployment statistics"),
+                _chunk("af-1", "africa youth unemployment statistics", "Kenya/Africa"),
+            ]
+        )
+
+    def test_chunks_routed_by_region(self, evidence_store):
+        self._populate()
+        assert store.list_shards() == ["global", "kenya", "nigeria"]
+        assert [c["id"] for c in store.get_chunks(shard="kenya")] == ["ke-1"]
+        assert {c["id"] for c in store.get_chunks(shard="global")} == {"gl-1", "af-1"}
+        assert store.collection_size() == 4
+        assert store.collection_size("nigeria") == 1
+
+    def test_country_query_searches_own_and_global_shard_only(self, evidence_store):
+        self._populate()
+        hits = store.retrieve_evidence("youth unemployment", n_results=5, country="Nigeria")
+        texts = {h["text"] for h in hits}
+        assert texts == {
+            "nigeria youth unemployment statistics",
+            "global youth unemployment statistics",
+            "africa youth unemployment statistics",
+        }
+
+    def test_no_country_searches_every_shard(self, evidence_store):
+        self._populate()
+        assert len(store.retrieve_evidence("youth unemployment", n_results=5)) == 4
+
+    def test_country_without_shard_searches_every_shard(self, evidence_store):
+        self._populate()
+        assert store.search_shards("Peru") == ["global", "kenya", "nigeria"]
+        hits = store.retrieve_evidence("youth unemployment", n_results=5, country="Peru")
+        assert len(hits) == 4
+        store.delete_chunks(["ng-1"])
+        assert store.search_shards("Nigeria") == ["global", "kenya", "nigeria"]
+
+    def test_reads_never_create_shards(self, evidence_store):
+        self._populate()
+        assert store.collection_size("atlantis") == 0
+        assert store.get_chunks(shard="atlantis") == []
+        assert store.load_manifest("atlantis").chunks == {}
+        store.retrieve_evidence("youth unemployment", country="Atlantis")
+        assert "atlantis" not in store.list_shards()
+        assert "atlantis" not in store._backends
+
+    def test_delete_without_shard_finds_chunk(self, evidence_store):
+        self._populate()
+        store.delete_chunks(["ng-1"])
+        assert store.collection_size("nigeria") == 0
+        assert "ng-1" not in store.load_manifest().chunks
+
+    def test_corpus_version_spans_all_shards(self, evidence_store):
+        self._populate()
+        version = store.corpus_version()
+        store.add_chunks([_chunk("ng-1", "edited nigeria chunk", "Nigeria")])
+        assert store.corpus_version() != version
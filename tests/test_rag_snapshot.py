@@ -0,0 +1,112 @@
+"""Tests for the prebuilt evidence index snapshot."""
+
+import copy
+import json
+
+import pytest
+
+from pageant_assistant.rag import seed, snapshot
+from pageant_assistant.rag.backends import NumpyBackend
+from pageant_assistant.rag.shards import collection_name
+from tests.conftest import hashing_embed
+
+
+@pytest.fixture
+def small_corpus(monkeypatch):
+    """Replace SEED_CORPUS (as seen by both modules) with a mutable 3-chunk copy."""
+    corpus = copy.deepcopy(seed.SEED_CORPUS[:3])
+    monkeypatch.setattr(seed, "SEED_CORPUS", corpus)
+    monkeypatch.setattr(snapshot, "SEED_CORPUS", corpus)
+    return corpus
+
+
+@pytest.fixture
+def built(tmp_path, small_corpus, monkeypatch):
+    """Build a snapshot with the hashing embedder and return its directory."""
+    monkeypatch.setattr(snapshot, "get_embedding_function", lambda: hashing_embed)
+    out = tmp_path / "snapshot"
+    snapshot.build_snapshot(out)
+    return out
+
+
+class TestBuildAndValidate:
+    def test_build_writes_versioned_descriptor(self, built, small_corpus):
+        info = json.loads((built / snapshot.SNAPSHOT_FILE).read_text())
+        assert info["chunk_count"] == len(small_corpus)
+        assert info["corpus_version"] == snapshot.seed_corpus_version()
+        assert info["dimension"] == 64
+        assert info["shards"] == {"global": len(small_corpus)}  # "Kenya/Africa" chunks
+        assert not built.with_name("snapshot.tmp").exists()
+
+    def test_current_snapshot_validates(self, built):
+        assert snapshot.validate_snapshot(built) is not None
+
+    def test_edited_corpus_invalidates(self, built, small_corpus):
+        small_corpus[0]["text"] += " Updated."
+        assert snapshot.validate_snapshot(built) is None
+
+    def test_tampered_file_fails_checksum(self, built):
+        (built / collection_name("global") / "manifest.json").write_text("{}")
+        assert snapshot.validate_snapshot(built) is None
+
+    def test_other_embedding_model_rejected(self, built, monkeypatch):
+        monkeypatch.setattr(snapshot, "embedding_model_id", lambda: "some-other-model")
+        assert snapshot.validate_snapshot(built) is None
+        assert snapshot.snapshot_embeddings(built) == {}
+
+    def test_missing_snapshot(self, tmp_path):
+        assert snapshot.validate_snapshot(tmp_path / "absent") is None
+        assert snapshot.main(["check", "--out", str(tmp_path / "absent")]) == 1
+
+
+class TestServingFromSnapshot:
+    def test_numpy_backend_serves_base_until_first_write(self, built, tmp_path, small_corpus):
+        base = built / collection_name("global")
+        backend = NumpyBackend(tmp_path / "live", base_path=base)
+        assert backend.count() == len(small_corpus)
+        assert backend.manifest_path == base / "manifest.json"
+
+        backend.upsert(
+            ids=["extra-01"],
+            texts=["extra chunk"],
+            metadatas=[{"topic": "x"}],
+            embeddings=hashing_embed(["extra chunk"]),
+        )
+        assert backend.count() == len(small_corpus) + 1
+        assert backend.manifest_path == tmp_path / "live" / "manifest.json"
+        assert backend.manifest_path.exists()
+        # The baked-in snapshot is never modified
+        assert snapshot.validate_snapshot(built) is not None
+        assert NumpyBackend(base).count() == len(small_corpus)
+
+    def test_delete_never_touches_base_manifest(self, built, tmp_path, monkeypatch):
+        import pageant_assistant.rag.store as store
+
+        monkeypatch.setattr(store, "RAG_BACKEND", "numpy")
+        monkeypatch.setattr(store, "VECTOR_DIR", tmp_path / "vectors")
+        monkeypatch.setattr(store, "RAG_SNAPSHOT_DIR", built)
+        monkeypatch.setattr(store, "_backends", {})
+        backend = store._get_backend()
+        assert backend.manifest_path.is_relative_to(built)
+        # No rows match, but the manifest still changes: the write must not land in the base
+        backend.delete(["not-stored"])
+        assert not backend.manifest_path.is_relative_to(built)
+        store.delete_chunks([store.get_chunks()[0]["id"]])
+        assert snapshot.validate_snapshot(built) is not None
+
+    def test_sync_reuses_snapshot_vectors(self, built, evidence_store, small_corpus, monkeypatch):
+        prebuilt = snapshot.snapshot_embeddings(built)
+        monkeypatch.setattr(snapshot, "snapshot_embeddings", lambda: prebuilt)
+        small_corpus[2]["text"] += " Edited after the image was built."
+
+        embedded: list[str] = []
+
+        def _counting_embed(texts):
+            embedded.extend(texts)
+            return hashing_embed(texts)
+
+        monkeypatch.setattr(
+            "pageant_assistant.rag.store.get_embedding_function", lambda: _counting_embed
+        )
+        assert seed.sync_seed_corpus() == len(small_corpus)
+        assert embedded == [small_corpus[2]["text"]]
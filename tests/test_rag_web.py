@@ -0,0 +1,188 @@
+"""Tests for the optional live web-evidence stage."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import pageant_assistant.rag.nodes as nodes
+import pageant_assistant.rag.store as store
+import pageant_assistant.rag.web as web
+from pageant_assistant.rag.cache import ResearchCache
+from pageant_assistant.rag.web import (
+    SearchProvider,
+    SearchResult,
+    StubSearchProvider,
+    WebSearchCache,
+    fetch_web_results,
+    search_web_evidence,
+    store_web_evidence,
+)
+
+HITS = [
+    SearchResult("Ocean Report", "https://example.org/a", "Plastic waste in oceans doubled."),
+    SearchResult("Coastal NGO", "https://example.org/b", "Beach clean-ups removed 12 tonnes."),
+]
+
+
+class _FailingProvider(SearchProvider):
+    name = "failing"
+
+    def __init__(self):
+        self.queries = []
+
+    async def search(self, query, max_results):
+        self.queries.append(query)
+        raise ConnectionError("offline")
+
+
+class _BlockingProvider(SearchProvider):
+    """Simulates a hung synchronous HTTP client running on the search pool."""
+
+    name = "blocking"
+
+    async def search(self, query, max_results):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(web._search_pool, time.sleep, 1.0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return WebSearchCache(tmp_path / "web")
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    """Configure web search with a stub provider and a throwaway cache."""
+    provider = StubSearchProvider(default=HITS)
+    monkeypatch.setattr(web, "WEB_SEARCH_PROVIDER", "stub")
+    monkeypatch.setattr(web, "_provider", provider)
+    monkeypatch.setattr(web, "web_cache", WebSearchCache(tmp_path / "web"))
+    return provider
+
+
+class TestFetchWebResults:
+    def test_results_cached_on_disk_by_query(self, cache):
+        provider = StubSearchProvider(default=HITS)
+        first = asyncio.run(fetch_web_results("Ocean plastic?", provider=provider, cache=cache))
+        again = asyncio.run(fetch_web_results("ocean  PLASTIC", provider=provider, cache=cache))
+        assert first == again == HITS
+        assert provider.queries == ["Ocean plastic?"]
+
+    def test_expired_entries_refetched(self, tmp_path):
+        cache = WebSearchCache(tmp_path, ttl_hours=0)
+        provider = StubSearchProvider(default=HITS)
+        for _ in range(2):
+            asyncio.run(fetch_web_results("q", provider=provider, cache=cache))
+        assert len(provider.queries) == 2
+
+    def test_budget_is_strict(self, cache):
+        start = time.perf_counter()
+        results = asyncio.run(
+            fetch_web_results("q", provider=_BlockingProvider(), budget_s=0.1, cache=cache)
+        )
+        assert results is None
+        assert time.perf_counter() - start < 0.5
+
+    def test_failures_are_not_cached(self, cache):
+        assert asyncio.run(fetch_web_results("q", provider=_FailingProvider(), cache=cache)) is None
+        assert cache.get("failing", "q") is None
+
+
+class TestSearchWebEvidence:
+    def test_disabled_without_provider(self, monkeypatch):
+        monkeypatch.setattr(web, "WEB_SEARCH_PROVIDER", "")
+        assert search_web_evidence("anything") == []
+
+    def test_search_stores_nothing_until_graded(self, evidence_store, stub):
+        found = search_web_evidence("How do we stop ocean plastic?", "Fiji")
+        assert [f["source"] for f in found] == ["Ocean Report", "Coastal NGO"]
+        assert stub.queries == ["How do we stop ocean plastic? Fiji"]
+        assert store.collection_size() == 0
+
+        assert store_web_evidence(found) == 2
+        stored = store.get_chunks(shard="fiji")
+        assert {c["metadata"]["url"] for c in stored} == {h.url for h in HITS}
+        assert store.load_manifest("fiji").ids_with_origin("web") == {c["id"] for c in stored}
+        hits = store.retrieve_evidence("ocean plastic waste", n_results=1, country="Fiji")
+        assert hits[0]["text"] == "Plastic waste in oceans doubled."
+
+    def test_unknown_provider_disables_web_search(self, monkeypatch, caplog):
+        monkeypatch.setattr(web, "WEB_SEARCH_PROVIDER", "altavista")
+        monkeypatch.setattr(web, "_provider", None)
+        monkeypatch.setattr(web, "_unknown_provider_logged", False)
+        assert web.get_search_provider() is None
+        assert web.search_web_evidence("Is plastic a crisis?", country="Fiji") == []
+        assert caplog.text.count("WEB_SEARCH_PROVIDER") == 1
+
+
+class _GradingLLM:
+    def __init__(self, reject=()):
+        self.calls = 0
+        self.reject = reject
+
+    def invoke(self, prompt):
+        self.calls += 1
+        count = int(prompt.split("exactly ")[1].split()[0])
+        return SimpleNamespace(
+            content=json.dumps({"relevant": [i not in self.reject for i in range(count)]})
+        )
+
+
+class TestRagResearchWebFallback:
+    def test_web_used_only_when_local_evidence_missing(
+        self, evidence_store, stub, monkeypatch, tmp_path
+    ):
+        llm = _GradingLLM()
+        monkeypatch.setattr(nodes, "get_llm", lambda role: llm)
+        monkeypatch.setattr(nodes, "WEB_SEARCH_PROVIDER", "stub")
+        monkeypatch.setattr(nodes, "research_cache", ResearchCache(8, tmp_path / "cache"))
+        state = {
+            "question": "How would you tackle ocean plastic?",
+            "question_analysis": "Question type: advocacy",
+            "persona_country": "Fiji",
+        }
+        result = nodes.rag_research(state)
+        assert "Plastic waste in oceans doubled." in result["rag_evidence"]
+        assert len(stub.queries) == 1
+        # Cached under the post-write-back corpus version
+        assert nodes.rag_research(state) == result
+        assert llm.calls == 1
+        # A new question now finds the written-back chunks locally
+        nodes.rag_research({**state, "question": "Is ocean plastic waste growing?"})
+        assert len(stub.queries) == 1
+
+    def test_failed_web_fallback_not_cached(self, evidence_store, monkeypatch, tmp_path):
+        store.add_chunks(
+            [{"id": "off-topic", "text": "Tea grows in Kenya.", "metadata": {"topic": "farming"}}]
+        )
+        failing = _FailingProvider()
+        monkeypatch.setattr(web, "WEB_SEARCH_PROVIDER", "stub")
+        monkeypatch.setattr(web, "_provider", failing)
+        monkeypatch.setattr(nodes, "get_llm", lambda role: _GradingLLM(reject={0}))
+        monkeypatch.setattr(nodes, "WEB_SEARCH_PROVIDER", "stub")
+        monkeypatch.setattr(nodes, "research_cache", ResearchCache(8, tmp_path / "cache"))
+        state = {
+            "question": "How would you tackle ocean plastic?",
+            "question_analysis": "Question type: advocacy",
+        }
+        assert nodes.rag_research(state)["rag_evidence"] is None
+        nodes.rag_research(state)
+        assert len(failing.queries) == 2  # retried, not served from the research cache
+
+    def test_only_relevant_web_chunks_written_back(
+        self, evidence_store, stub, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(nodes, "get_llm", lambda role: _GradingLLM(reject={1}))
+        monkeypatch.setattr(nodes, "WEB_SEARCH_PROVIDER", "stub")
+        monkeypatch.setattr(nodes, "research_cache", ResearchCache(8, tmp_path / "cache"))
+        nodes.rag_research(
+            {
+                "question": "How would you tackle ocean plastic?",
+                "question_analysis": "Question type: advocacy",
+                "persona_country": "Fiji",
+            }
+        )
+        assert [c["text"] for c in store.get_chunks()] == ["Plastic waste in oceans doubled."]
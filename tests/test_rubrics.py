@@ -91,3 +91,127 @@ class TestNewRubrics:
         assert "SCORING DIMENSIONS" in text
         for dim in rubric["dimensions"]:
             assert dim["name"] in text
+
+
+# ---------------------------------------------------------------------------
+# Rubric-weighted scoring and the deterministic coach report
+# ---------------------------------------------------------------------------
+
+CRITIC_SCORES = {
+    "overall_score": 8.5,
+    "dimension_scores": [
+        {"name": "Directness & Clarity", "score": 4, "reason": "Buries the answer"},
+        {"name": "authenticity and specificity", "score": 9, "reason": "Uses | her story"},
+        {"name": "Closing Strength", "score": 8, "reason": "Memorable"},
+    ],
+    "top_fixes": [
+        {
+            "type": "rewrite_sentence",
+            "target": "directness",
+            "instruction": "Answer in the first sentence.",
+        }
+    ],
+    "genericness_flags": ["vague_call_to_action"],
+    "risk_flags": [],
+}
+
+
+class TestScoreWithRubric:
+    @pytest.fixture
+    def rubric(self):
+        from pageant_assistant.assets.registry import get_assets
+
+        return get_assets().rubric("miss_universe").definition
+
+    def test_weighted_mean_and_cap(self, rubric):
+        from pageant_assistant.rubrics.scoring import score_with_rubric
+
+        breakdown = score_with_rubric(CRITIC_SCORES, rubric)
+        # (4*1.0 + 9*1.2 + 8*1.0) / 3.2
+        assert breakdown.uncapped == 7.1
+        assert breakdown.overall == 7.0  # Directness below 5 caps at 7
+        assert [r.if_dimension for r in breakdown.applied_caps] == ["Directness & Clarity"]
+        assert breakdown.critic_overall == 8.5
+        # Names are matched loosely and reported with the rubric's spelling, in rubric order
+        assert [d.name for d in breakdown.dimensions] == [
+            "Directness & Clarity",
+            "Authenticity & Specificity",
+            "Closing Strength",
+        ]
+        assert len(breakdown.unscored) == 5
+
+    def test_no_cap_when_dimension_passes(self, rubric):
+        from pageant_assistant.rubrics.scoring import score_with_rubric
+
+        scores = {"dimension_scores": [{"name": "Directness & Clarity", "score": 9}]}
+        breakdown = score_with_rubric(scores, rubric)
+        assert breakdown.overall == 9.0 and not breakdown.applied_caps
+
+    def test_no_dimensions_uses_critic_overall(self, rubric):
+        from pageant_assistant.rubrics.scoring import score_with_rubric
+
+        assert score_with_rubric({"overall_score": 6.5}, rubric).overall == 6.5
+
+
+class TestCoachReport:
+    def test_node_renders_without_llm(self, monkeypatch):
+        from pageant_assistant.graphs import refiner
+
+        monkeypatch.setattr(refiner, "get_llm", lambda role: pytest.fail("LLM called"))
+        out = refiner.coach_report(
+            {
+                "question": "Q?",
+                "raw_answer": "word " * 100,
+                "refined_answer": "word " * 80,
+                "critique": "{}",
+                "critic_scores": CRITIC_SCORES,
+                "rubric_name": "miss_universe",
+                "time_limit": 30,
+            }
+        )
+        report = out["coach_report"]
+        assert out["rubric_score"] == 7.0
+        assert "**Overall: 7.0 / 10**" in report and "_Capped at 7" in report
+        for heading in ("## Rubric Score", "## What Changed", "## Practice Notes"):
+            assert heading in report
+        assert "Uses \\| her story" in report  # table cells escaped
+        assert "100 → 80 words (budget ~75 words" in report
+        assert "Still 5 words over budget" in report
+        assert "**directness**: Answer in the first sentence." in report
+        assert "Watch for: vague call to action." in report
+
+    def test_what_changed_omits_rewrites_that_did_not_run(self, monkeypatch):
+        from pageant_assistant.graphs import refiner
+
+        state = {
+            "question": "Q?",
+            "raw_answer": "word " * 60,
+            "draft_answer": "word " * 70,
+            "refined_answer": "word " * 70,
+            "critic_scores": CRITIC_SCORES,
+            "rubric_name": "miss_universe",
+            "time_limit": 30,
+        }
+        accepted = {**state, "loop_decisions": [{"stage": "rewrite", "proceed": False}]}
+        assert "Rewritten to strengthen" not in refiner.coach_report(accepted)["coach_report"]
+        rewritten = {**state, "rewrite_stats": [{"mode": "full"}]}
+        assert "Rewritten to strengthen" in refiner.coach_report(rewritten)["coach_report"]
+
+    def test_unstructured_critique_falls_back_to_llm(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from pageant_assistant.graphs import refiner
+
+        llm = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content="LLM report"))
+        monkeypatch.setattr(refiner, "get_llm", lambda role: llm)
+        out = refiner.coach_report(
+            {"question": "Q?", "raw_answer": "a", "refined_answer": "b", "critique": "text"}
+        )
+        assert out == {"coach_report": "LLM report"}
+
+    def test_narrative_node_only_in_parallel_mode(self, monkeypatch):
+        from pageant_assistant.graphs import refiner
+
+        assert "coach_narrative" not in refiner.build_refiner_graph().get_graph().nodes
+        monkeypatch.setattr(refiner, "COACH_NARRATIVE_MODE", "parallel")
+        assert "coach_narrative" in refiner.build_refiner_graph().get_graph().nodes
@@ -0,0 +1,143 @@
+"""Tests for the multi-variant (style × time limit) fan-out."""
+
+import json
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from pageant_assistant.assets.registry import get_assets
+from pageant_assistant.config.settings import STYLE_PRESETS, VALID_TIME_LIMITS
+from pageant_assistant.graphs import refiner, variants
+from pageant_assistant.graphs.variants import (
+    Variant,
+    rank_variants,
+    run_variants,
+    time_fit,
+    variant_grid,
+)
+
+CRITIC_REPLY = json.dumps(
+    {
+        "overall_score": 6.0,
+        "top_fixes": [{"type": "t", "target": "opening", "instruction": "Answer first."}],
+        "genericness_flags": [],
+        "risk_flags": [],
+        "time_fit_estimate_words": 70,
+        "dimension_scores": [{"name": "Directness & Clarity", "score": 6, "reason": "ok"}],
+    }
+)
+ANSWER_75_WORDS = " ".join(["word"] * 74) + " end."
+
+
+class TestRanking:
+    def test_time_fit_penalises_running_over(self):
+        assert time_fit(75, 75) == 1.0
+        assert time_fit(60, 75) == pytest.approx(0.8)
+        assert time_fit(90, 75) == pytest.approx(0.6)
+        assert time_fit(500, 75) == 0.0 and time_fit(10, 0) == 0.0
+
+    def test_rank_variants(self):
+        ranked = rank_variants(
+            [
+                Variant("a", 20, word_budget=50, word_count=75),
+                Variant("b", 30, word_budget=75, word_count=75),
+                Variant("c", 40, word_budget=100, error="boom"),
+            ],
+            base_score=8.0,
+        )
+        assert [(v.style_preset, v.rank_score) for v in ranked] == [
+            ("b", 8.0),
+            ("a", 0.0),
+            ("c", 0.0),
+        ]
+        assert rank_variants([Variant("a", 30, 75, word_count=75)], None)[0].rank_score == 10.0
+
+    def test_grid_covers_every_style_and_time_limit(self):
+        grid = variant_grid()
+        assert len(grid) == len(STYLE_PRESETS) * len(VALID_TIME_LIMITS)
+        assert grid[0] == (next(iter(STYLE_PRESETS)), VALID_TIME_LIMITS[0])
+
+
+class _FakeLLM:
+    """Answers by role and tracks how many calls are in flight at once."""
+
+    def __init__(self, role, tracker):
+        self.role = role
+        self.tracker = tracker
+
+    def invoke(self, prompt):
+        tracker = self.tracker
+        with tracker["lock"]:
+            tracker["calls"][self.role] += 1
+            tracker["in_flight"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["in_flight"])
+        try:
+            if self.role in tracker["fail"] and tracker["fail"][self.role] in prompt:
+                raise RuntimeError("rate limited")
+            time.sleep(0.01)
+            content = {
+                "question_analysis": "Question type: personal",
+                "critic": CRITIC_REPLY,
+                "drafting": "A styled draft.",
+            }.get(self.role, ANSWER_75_WORDS)
+            return SimpleNamespace(content=content, usage={"completion_tokens": 10})
+        finally:
+            with tracker["lock"]:
+                tracker["in_flight"] -= 1
+
+
+class TestRunVariants:
+    INPUT = {
+        "question": "What changed your life?",
+        "raw_answer": "Books changed my life.",
+        "rubric_name": "miss_universe",
+    }
+
+    @pytest.fixture
+    def tracker(self, monkeypatch):
+        tracker = {
+            "lock": threading.Lock(),
+            "calls": Counter(),
+            "in_flight": 0,
+            "peak": 0,
+            "fail": {},
+        }
+        monkeypatch.setattr(refiner, "REWRITE_MODE", "full")
+        monkeypatch.setattr(refiner, "get_gain_predictor", lambda: None)
+        monkeypatch.setattr(refiner, "match_exemplar", lambda *a, **k: None)
+        monkeypatch.setattr(refiner, "get_llm", lambda role: _FakeLLM(role, tracker))
+        monkeypatch.setattr(variants, "rag_research", lambda state: {"rag_evidence": None})
+        return tracker
+
+    def test_shares_upstream_and_bounds_concurrency(self, tracker):
+        seen = []
+        run = run_variants(self.INPUT, max_in_flight=3, on_variant=seen.append)
+
+        n = len(STYLE_PRESETS) * len(VALID_TIME_LIMITS)
+        assert tracker["calls"] == {
+            "question_analysis": 1,
+            "critic": 1,
+            "drafting": n,
+            "rewrite": n,
+        }
+        assert tracker["peak"] <= 3
+        assert len(seen) == len(run.variants) == n
+        assert run.shared["critic_scores"]["overall_score"] == 6.0
+
+        # 75 words fit the 30s budget of the 2.5 wps styles exactly
+        best = run.variants[0]
+        assert (best.style_preset, best.time_limit) == ("structured_narrative", 30)
+        assert best.time_fit == 1.0 and best.rank_score == run.base_score
+        assert [v.rank_score for v in run.variants] == sorted(
+            (v.rank_score for v in run.variants), reverse=True
+        )
+
+    def test_failed_variant_recorded_and_ranked_last(self, tracker):
+        tracker["fail"]["drafting"] = get_assets().style("bold_punchy")
+        run = run_variants(self.INPUT, time_limits=[30], max_in_flight=2)
+        failed = [v for v in run.variants if v.error]
+        assert [v.style_preset for v in failed] == ["bold_punchy"]
+        assert run.variants[-1] is failed[0] and failed[0].error == "rate limited"